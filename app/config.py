@@ -8,7 +8,7 @@ using pydantic-settings for type-safe configuration management.
 import os
 import subprocess
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -56,6 +56,56 @@ class Settings(BaseSettings):
         description="Time-to-live for cached files in hours"
     )
 
+    # Per-category cache size budgets (0 = unlimited, TTL only)
+    cache_max_videos_mb: int = Field(
+        default=0,
+        validation_alias="CACHE_MAX_VIDEOS_MB",
+        description="Maximum size of CACHE_DIR/videos in MB (0 = unlimited)"
+    )
+
+    cache_max_audio_mb: int = Field(
+        default=0,
+        validation_alias="CACHE_MAX_AUDIO_MB",
+        description="Maximum size of CACHE_DIR/audio in MB (0 = unlimited)"
+    )
+
+    cache_max_screenshots_mb: int = Field(
+        default=0,
+        validation_alias="CACHE_MAX_SCREENSHOTS_MB",
+        description="Maximum size of CACHE_DIR/screenshots in MB (0 = unlimited)"
+    )
+
+    cache_max_transcriptions_mb: int = Field(
+        default=0,
+        validation_alias="CACHE_MAX_TRANSCRIPTIONS_MB",
+        description="Maximum size of CACHE_DIR/transcriptions in MB (0 = unlimited)"
+    )
+
+    cache_eviction_policy: str = Field(
+        default="lru",
+        validation_alias="CACHE_EVICTION_POLICY",
+        description="Eviction order when a cache budget is exceeded (lru or lfu)"
+    )
+
+    # Background cache janitor
+    cache_janitor_enabled: bool = Field(
+        default=True,
+        validation_alias="CACHE_JANITOR_ENABLED",
+        description="Run cache cleanup in a background janitor instead of on requests"
+    )
+
+    cache_janitor_interval: int = Field(
+        default=60,
+        validation_alias="CACHE_JANITOR_INTERVAL",
+        description="Seconds between incremental janitor sweeps (TTL sweep of one category, budget check of all)"
+    )
+
+    transcription_cache_enabled: bool = Field(
+        default=True,
+        validation_alias="TRANSCRIPTION_CACHE_ENABLED",
+        description="Reuse transcription results for identical audio, provider, model and language"
+    )
+
     # Deprecated - kept for backward compatibility
     transcriptions_dir: Optional[str] = Field(
         default=None,
@@ -94,6 +144,48 @@ class Settings(BaseSettings):
         description="Seconds between API requests"
     )
 
+    rate_limits: str = Field(
+        default="youtube=4:2,tiktok=20:5,instagram=10:3,facebook=10:3,twitter=20:5,vimeo=30:5",
+        validation_alias="RATE_LIMITS",
+        description="Per-platform token buckets as platform=requests_per_minute:burst, comma separated"
+    )
+
+    rate_limit_default: str = Field(
+        default="60:10",
+        validation_alias="RATE_LIMIT_DEFAULT",
+        description="requests_per_minute:burst for platforms not in RATE_LIMITS (empty = unlimited)"
+    )
+
+    ytdlp_library_workers: int = Field(
+        default=4,
+        validation_alias="YTDLP_LIBRARY_WORKERS",
+        description="Threads for yt-dlp Python library calls (extract_info/download)"
+    )
+
+    ytdlp_library_timeout: int = Field(
+        default=120,
+        validation_alias="YTDLP_LIBRARY_TIMEOUT",
+        description="Timeout in seconds for yt-dlp library metadata extraction"
+    )
+
+    ytdlp_library_download_timeout: int = Field(
+        default=900,
+        validation_alias="YTDLP_LIBRARY_DOWNLOAD_TIMEOUT",
+        description="Timeout in seconds for yt-dlp library downloads"
+    )
+
+    info_cache_ttl_seconds: int = Field(
+        default=300,
+        validation_alias="INFO_CACHE_TTL_SECONDS",
+        description="Seconds to reuse an extracted yt-dlp info dict for the same URL"
+    )
+
+    info_disk_cache_ttl_seconds: int = Field(
+        default=21600,
+        validation_alias="INFO_DISK_CACHE_TTL_SECONDS",
+        description="Seconds to keep sanitized info dicts in CACHE_DIR/info (0 = disabled)"
+    )
+
     # YouTube Cookie Refresh
     youtube_email: Optional[str] = Field(
         default=None,
@@ -120,6 +212,196 @@ class Settings(BaseSettings):
         description="Maximum concurrent transcription requests"
     )
 
+    # Batch job scheduler (per-class concurrency within one job batch;
+    # GPU transcription is limited by MAX_CONCURRENT_TRANSCRIPTIONS)
+    batch_subtitle_concurrency: int = Field(
+        default=8,
+        validation_alias="BATCH_SUBTITLE_CONCURRENCY",
+        description="Concurrent platform subtitle lookups per job batch"
+    )
+
+    batch_download_concurrency: int = Field(
+        default=3,
+        validation_alias="BATCH_DOWNLOAD_CONCURRENCY",
+        description="Concurrent audio/video downloads per job batch"
+    )
+
+    batch_db_concurrency: int = Field(
+        default=4,
+        validation_alias="BATCH_DB_CONCURRENCY",
+        description="Concurrent database/storage writes per job batch"
+    )
+
+    batch_audio_prefetch: int = Field(
+        default=2,
+        validation_alias="BATCH_AUDIO_PREFETCH",
+        description="Jobs per batch that may download audio ahead of the GPU"
+    )
+
+    # /batch-download engine
+    download_concurrency: str = Field(
+        default="youtube=1",
+        validation_alias="DOWNLOAD_CONCURRENCY",
+        description="Concurrent /batch-download downloads per platform as platform=n, comma separated"
+    )
+
+    download_concurrency_default: int = Field(
+        default=4,
+        validation_alias="DOWNLOAD_CONCURRENCY_DEFAULT",
+        description="Concurrent /batch-download downloads per host for platforms not in DOWNLOAD_CONCURRENCY"
+    )
+
+    # WhisperX Model Pool
+    model_pool_max_models: int = Field(
+        default=2,
+        validation_alias="MODEL_POOL_MAX_MODELS",
+        description="Maximum number of WhisperX models kept resident in memory"
+    )
+
+    model_pool_memory_mb: int = Field(
+        default=0,
+        validation_alias="MODEL_POOL_MEMORY_MB",
+        description="Memory budget for resident WhisperX models in MB (0 = unlimited)"
+    )
+
+    model_prewarm: bool = Field(
+        default=True,
+        validation_alias="MODEL_PREWARM",
+        description="Load the WORKER_MODEL_SIZE model at startup when provider is local"
+    )
+
+    # Cross-file batched inference for short clips
+    batch_transcribe_enabled: bool = Field(
+        default=True,
+        validation_alias="BATCH_TRANSCRIBE_ENABLED",
+        description="Pack VAD segments of several short clips into one WhisperX inference batch"
+    )
+
+    batch_transcribe_max_audio_seconds: int = Field(
+        default=120,
+        validation_alias="BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS",
+        description="Clips up to this length (seconds) are eligible for cross-file batching"
+    )
+
+    batch_transcribe_window_ms: int = Field(
+        default=200,
+        validation_alias="BATCH_TRANSCRIBE_WINDOW_MS",
+        description="How long to wait for more clips before running a batch (milliseconds)"
+    )
+
+    batch_transcribe_max_files: int = Field(
+        default=8,
+        validation_alias="BATCH_TRANSCRIBE_MAX_FILES",
+        description="Maximum clips packed into one inference batch"
+    )
+
+    # Streaming audio decode for local transcription
+    audio_pcm_streaming: bool = Field(
+        default=False,
+        validation_alias="AUDIO_PCM_STREAMING",
+        description="Decode job audio straight to 16 kHz float32 PCM instead of an MP3 round-trip"
+    )
+
+    # Long-form transcription (chunked at silences)
+    long_form_enabled: bool = Field(
+        default=True,
+        validation_alias="LONG_FORM_ENABLED",
+        description="Transcribe long media in silence-aligned chunks instead of one array"
+    )
+
+    long_form_min_seconds: int = Field(
+        default=1800,
+        validation_alias="LONG_FORM_MIN_SECONDS",
+        description="Media at least this long (seconds) is transcribed in chunks"
+    )
+
+    long_form_chunk_seconds: int = Field(
+        default=600,
+        validation_alias="LONG_FORM_CHUNK_SECONDS",
+        description="Target chunk length in seconds (bounds peak audio memory)"
+    )
+
+    long_form_overlap_seconds: float = Field(
+        default=2.0,
+        validation_alias="LONG_FORM_OVERLAP_SECONDS",
+        description="Audio shared by neighbouring chunks, de-duplicated when stitching"
+    )
+
+    long_form_devices: str = Field(
+        default="",
+        validation_alias="LONG_FORM_DEVICES",
+        description="Comma-separated devices transcribing chunks in parallel (e.g. cuda:0,cuda:1; empty = WHISPER_DEVICE)"
+    )
+
+    transcribe_stream_chunk_seconds: int = Field(
+        default=30,
+        validation_alias="TRANSCRIBE_STREAM_CHUNK_SECONDS",
+        description="Chunk length for /transcribe/stream (smaller = earlier first segment)"
+    )
+
+    partial_transcript_min_seconds: int = Field(
+        default=300,
+        validation_alias="PARTIAL_TRANSCRIPT_MIN_SECONDS",
+        description="Queue jobs chunk media at least this long (seconds) by TRANSCRIBE_STREAM_CHUNK_SECONDS to save partial transcripts (0 = long-form media only)"
+    )
+
+    # Async job API (/v2/jobs)
+    job_queue_workers: int = Field(
+        default=2,
+        validation_alias="JOB_QUEUE_WORKERS",
+        description="Jobs from POST /v2/jobs run concurrently per API process"
+    )
+
+    job_retention_hours: int = Field(
+        default=24,
+        validation_alias="JOB_RETENTION_HOURS",
+        description="Hours finished /v2/jobs records (and results) are kept"
+    )
+
+    # faster-whisper (CTranslate2) engine, provider=faster-whisper
+    faster_whisper_cpu_threads: int = Field(
+        default=0,
+        validation_alias="FASTER_WHISPER_CPU_THREADS",
+        description="Intra-op threads per model (0 = available cores / workers)"
+    )
+
+    faster_whisper_num_workers: int = Field(
+        default=0,
+        validation_alias="FASTER_WHISPER_NUM_WORKERS",
+        description="Inter-op workers per model, i.e. parallel transcriptions (0 = from core count)"
+    )
+
+    faster_whisper_compute_type: str = Field(
+        default="int8",
+        validation_alias="FASTER_WHISPER_COMPUTE_TYPE",
+        description="CTranslate2 compute type on CPU (int8, int8_float32, float32)"
+    )
+
+    faster_whisper_beam_size: int = Field(
+        default=5,
+        validation_alias="FASTER_WHISPER_BEAM_SIZE",
+        description="Beam size (1 = greedy decoding, fastest)"
+    )
+
+    faster_whisper_vad_filter: bool = Field(
+        default=True,
+        validation_alias="FASTER_WHISPER_VAD_FILTER",
+        description="Skip non-speech with the Silero VAD before decoding"
+    )
+
+    faster_whisper_vad_min_silence_ms: int = Field(
+        default=500,
+        validation_alias="FASTER_WHISPER_VAD_MIN_SILENCE_MS",
+        description="Minimum silence (ms) the VAD filter splits speech on"
+    )
+
+    # Metrics
+    metrics_require_api_key: bool = Field(
+        default=True,
+        validation_alias="METRICS_REQUIRE_API_KEY",
+        description="Require X-API-Key on /metrics (disable for scrapers on a private network)"
+    )
+
     # Supabase Configuration
     supabase_url: Optional[str] = Field(
         default=None,
@@ -179,7 +461,7 @@ class Settings(BaseSettings):
     worker_provider: str = Field(
         default="local",
         validation_alias="WORKER_PROVIDER",
-        description="Transcription provider (local or openai)"
+        description="Transcription provider (local, faster-whisper or openai)"
     )
 
     provider_name: str = Field(
@@ -219,6 +501,40 @@ DOWNLOADS_DIR = settings.downloads_dir
 CACHE_DIR = settings.cache_dir
 CACHE_TTL_HOURS = settings.cache_ttl_hours
 
+# Per-category cache budgets in bytes (0 = unlimited)
+CACHE_MAX_BYTES = {
+    "videos": settings.cache_max_videos_mb * 1024 * 1024,
+    "audio": settings.cache_max_audio_mb * 1024 * 1024,
+    "screenshots": settings.cache_max_screenshots_mb * 1024 * 1024,
+    "transcriptions": settings.cache_max_transcriptions_mb * 1024 * 1024,
+}
+CACHE_EVICTION_POLICY = settings.cache_eviction_policy.lower()
+
+
+def _parse_rate_limit(spec: str) -> Optional[Tuple[float, int]]:
+    """Parse 'requests_per_minute:burst' into (tokens per second, burst)."""
+    spec = spec.strip()
+    if not spec:
+        return None
+    per_minute, _, burst = spec.partition(":")
+    per_minute = float(per_minute)
+    if per_minute <= 0:
+        return None
+    return per_minute / 60.0, max(1, int(burst or 1))
+
+
+# Per-platform token bucket limits: platform -> (tokens per second, burst)
+RATE_LIMITS: Dict[str, Optional[Tuple[float, int]]] = {}
+for _entry in settings.rate_limits.split(","):
+    if "=" in _entry:
+        _platform, _spec = _entry.split("=", 1)
+        RATE_LIMITS[_platform.strip().lower()] = _parse_rate_limit(_spec)
+RATE_LIMIT_DEFAULT = _parse_rate_limit(settings.rate_limit_default)
+
+# Background cache janitor
+CACHE_JANITOR_ENABLED = settings.cache_janitor_enabled
+CACHE_JANITOR_INTERVAL = settings.cache_janitor_interval
+
 # Create directories on startup
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
@@ -228,6 +544,7 @@ for subdir in ["videos", "audio", "transcriptions", "screenshots"]:
 
 # TRANSCRIPTIONS_DIR - derived from cache directory structure
 TRANSCRIPTIONS_DIR = os.path.join(CACHE_DIR, "transcriptions")
+TRANSCRIPTION_CACHE_ENABLED = settings.transcription_cache_enabled
 
 # yt-dlp Configuration
 YTDLP_BINARY = settings.ytdlp_binary
@@ -235,6 +552,11 @@ YTDLP_COOKIES_FILE = settings.ytdlp_cookies_file
 YTDLP_MIN_SLEEP = settings.ytdlp_min_sleep
 YTDLP_MAX_SLEEP = settings.ytdlp_max_sleep
 YTDLP_SLEEP_REQUESTS = settings.ytdlp_sleep_requests
+YTDLP_LIBRARY_WORKERS = settings.ytdlp_library_workers
+YTDLP_LIBRARY_TIMEOUT = settings.ytdlp_library_timeout
+YTDLP_LIBRARY_DOWNLOAD_TIMEOUT = settings.ytdlp_library_download_timeout
+INFO_CACHE_TTL_SECONDS = settings.info_cache_ttl_seconds
+INFO_DISK_CACHE_TTL_SECONDS = settings.info_disk_cache_ttl_seconds
 
 # yt-dlp extractor args (currently empty but used throughout main.py)
 YTDLP_EXTRACTOR_ARGS = {}
@@ -242,6 +564,60 @@ YTDLP_EXTRACTOR_ARGS = {}
 # Concurrency control
 MAX_CONCURRENT_TRANSCRIPTIONS = settings.max_concurrent_transcriptions
 
+# Batch job scheduler concurrency classes
+BATCH_CONCURRENCY = {
+    "subtitle": settings.batch_subtitle_concurrency,
+    "download": settings.batch_download_concurrency,
+    "db": settings.batch_db_concurrency,
+    # Downloaded-but-not-transcribed audio: jobs on the GPU plus prefetched ones
+    "audio_buffer": settings.max_concurrent_transcriptions + settings.batch_audio_prefetch,
+}
+
+# /batch-download concurrency: platform -> concurrent downloads
+DOWNLOAD_CONCURRENCY: Dict[str, int] = {}
+for _entry in settings.download_concurrency.split(","):
+    if "=" in _entry:
+        _platform, _count = _entry.split("=", 1)
+        DOWNLOAD_CONCURRENCY[_platform.strip().lower()] = max(1, int(_count))
+DOWNLOAD_CONCURRENCY_DEFAULT = max(1, settings.download_concurrency_default)
+
+# WhisperX model pool
+MODEL_POOL_MAX_MODELS = settings.model_pool_max_models
+MODEL_POOL_MEMORY_MB = settings.model_pool_memory_mb
+
+# Cross-file batched inference for short clips
+BATCH_TRANSCRIBE_ENABLED = settings.batch_transcribe_enabled
+BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS = settings.batch_transcribe_max_audio_seconds
+BATCH_TRANSCRIBE_WINDOW_MS = settings.batch_transcribe_window_ms
+BATCH_TRANSCRIBE_MAX_FILES = settings.batch_transcribe_max_files
+
+# Streaming audio decode for local transcription
+AUDIO_PCM_STREAMING = settings.audio_pcm_streaming
+
+# Long-form transcription (chunked at silences)
+LONG_FORM_ENABLED = settings.long_form_enabled
+LONG_FORM_MIN_SECONDS = settings.long_form_min_seconds
+LONG_FORM_CHUNK_SECONDS = settings.long_form_chunk_seconds
+LONG_FORM_OVERLAP_SECONDS = settings.long_form_overlap_seconds
+LONG_FORM_DEVICES = [d.strip() for d in settings.long_form_devices.split(",") if d.strip()]
+TRANSCRIBE_STREAM_CHUNK_SECONDS = settings.transcribe_stream_chunk_seconds
+PARTIAL_TRANSCRIPT_MIN_SECONDS = settings.partial_transcript_min_seconds
+
+# Async job API (/v2/jobs)
+JOB_QUEUE_WORKERS = settings.job_queue_workers
+JOB_RETENTION_HOURS = settings.job_retention_hours
+
+# faster-whisper (CTranslate2) engine
+FASTER_WHISPER_CPU_THREADS = settings.faster_whisper_cpu_threads
+FASTER_WHISPER_NUM_WORKERS = settings.faster_whisper_num_workers
+FASTER_WHISPER_COMPUTE_TYPE = settings.faster_whisper_compute_type
+FASTER_WHISPER_BEAM_SIZE = settings.faster_whisper_beam_size
+FASTER_WHISPER_VAD_FILTER = settings.faster_whisper_vad_filter
+FASTER_WHISPER_VAD_MIN_SILENCE_MS = settings.faster_whisper_vad_min_silence_ms
+
+# Metrics (/metrics)
+METRICS_REQUIRE_API_KEY = settings.metrics_require_api_key
+
 # Supabase Configuration
 SUPABASE_URL = settings.supabase_url
 SUPABASE_SERVICE_KEY = settings.supabase_service_key
@@ -4,10 +4,11 @@ FastAPI dependency injection functions.
 This module provides reusable dependencies for:
 - API key authentication and verification
 - Job worker token verification (for Supabase Edge Function calls)
+- Metrics endpoint access (API key unless METRICS_REQUIRE_API_KEY=false)
 """
 
 from fastapi import Header, HTTPException
-from app.config import get_settings
+from app.config import get_settings, METRICS_REQUIRE_API_KEY
 
 
 def verify_api_key(x_api_key: str = Header(None)) -> bool:
@@ -53,3 +54,15 @@ def verify_job_token(authorization: str = Header(None)) -> bool:
         raise HTTPException(status_code=401, detail="Invalid job worker token")
 
     return True
+
+
+def verify_metrics_access(x_api_key: str = Header(None)) -> bool:
+    """
+    Dependency guarding /metrics.
+
+    Same check as verify_api_key, skipped when METRICS_REQUIRE_API_KEY is
+    false so Prometheus can scrape without custom headers.
+    """
+    if not METRICS_REQUIRE_API_KEY:
+        return True
+    return verify_api_key(x_api_key)
@@ -14,6 +14,8 @@ from .schemas import (
     ScreenshotRequest,
     ScreenshotResult,
     ScreenshotResponse,
+    AsyncJobRequest,
+    AsyncJobResponse,
 )
 
 __all__ = [
@@ -25,4 +27,6 @@ __all__ = [
     "ScreenshotRequest",
     "ScreenshotResult",
     "ScreenshotResponse",
+    "AsyncJobRequest",
+    "AsyncJobResponse",
 ]
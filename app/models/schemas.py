@@ -14,9 +14,13 @@ class BatchDownloadRequest(BaseModel):
     urls: List[str] = Field(..., description="List of video URLs to download", min_items=1)
     format: str = Field("best[height<=720]", description="Video quality format")
     keep: bool = Field(True, description="Save videos to server storage")
-    min_delay: int = Field(5, description="Minimum delay between downloads (seconds)", ge=0, le=300)
-    max_delay: int = Field(10, description="Maximum delay between downloads (seconds)", ge=0, le=300)
+    min_delay: int = Field(5, description="Minimum delay between downloads from the same platform (seconds)", ge=0, le=300)
+    max_delay: int = Field(10, description="Maximum delay between downloads from the same platform (seconds)", ge=0, le=300)
     cookies_file: Optional[str] = Field(None, description="Path to cookies file")
+    batch_id: Optional[str] = Field(
+        None, pattern=r"^[A-Za-z0-9_-]{1,64}$",
+        description="Resume this batch: URLs it already downloaded or skipped are not fetched again"
+    )
 
 
 class VideoDownloadResult(BaseModel):
@@ -29,6 +33,7 @@ class VideoDownloadResult(BaseModel):
     platform: Optional[str] = None
     title: Optional[str] = None
     error: Optional[str] = None
+    status: Optional[str] = None  # downloaded, skipped, failed
 
 
 class BatchDownloadResponse(BaseModel):
@@ -40,6 +45,8 @@ class BatchDownloadResponse(BaseModel):
     downloads: List[VideoDownloadResult]
     total_size: int
     duration_seconds: float
+    batch_id: Optional[str] = None
+    resumed: int = 0  # URLs completed by an earlier run of the same batch
 
 
 class TranscriptionSaveRequest(BaseModel):
@@ -89,3 +96,27 @@ class ScreenshotResponse(BaseModel):
     video_cached: bool
     total_extracted: int
     failed_timestamps: List[str] = []
+
+
+class AsyncJobRequest(BaseModel):
+    """Request model for POST /v2/jobs: the endpoint to run and its query parameters."""
+    type: str = Field(..., description="Job type: 'extract-audio' or 'transcribe'")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Query parameters of the synchronous endpoint")
+
+
+class AsyncJobResponse(BaseModel):
+    """Job status: progress while queued/running, result or error once finished."""
+    id: str
+    type: str
+    status: str  # queued, running, completed, failed
+    progress: float = 0.0  # 0.0-1.0 (long-form transcriptions report per chunk)
+    stage: Optional[str] = None
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    status_code: Optional[int] = None  # HTTP status the synchronous endpoint would have returned
+    attempts: int = 0
+    created_at: float
+    started_at: Optional[float] = None
+    updated_at: float
+    finished_at: Optional[float] = None
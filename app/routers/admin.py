@@ -5,6 +5,10 @@ This module provides endpoints for:
 - Manual cookie refresh triggering
 - Cookie scheduler status monitoring
 - Transcription worker status monitoring
+- WhisperX model pool monitoring
+- yt-dlp library thread pool monitoring
+- Per-platform rate limiter monitoring
+- Queue job stage timing histograms
 """
 
 from fastapi import APIRouter, Depends
@@ -12,6 +16,11 @@ from fastapi.responses import JSONResponse
 
 from app.dependencies import verify_api_key
 from scripts.cookie_scheduler import trigger_manual_refresh, get_scheduler_status
+from app.services.model_pool import model_pool
+from app.services.batch_transcriber import batch_transcriber
+from app.services.ytdlp_pool import get_ytdlp_pool_stats
+from app.services.rate_limiter import get_rate_limit_stats
+from app.utils.timing_utils import job_stage_histograms
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -88,3 +97,69 @@ async def get_transcription_worker_status(_: bool = Depends(verify_api_key)):
             content={"running": False, "error": "Worker module not available"},
             status_code=200
         )
+
+
+@router.get("/model-pool/status")
+async def get_model_pool_status(_: bool = Depends(verify_api_key)):
+    """
+    Get current status of the WhisperX model pool.
+
+    Returns information about:
+    - Pool limits (max_models, memory_budget_mb)
+    - Cache hits, misses, evictions and cumulative load time
+    - Resident models with device, compute type, uses and idle time
+    - Cross-file batching of short clips (batches, files per batch, queued clips)
+
+    Useful for verifying that transcriptions reuse warm models.
+    """
+    return JSONResponse(
+        content={**model_pool.stats(), "batching": batch_transcriber.stats()},
+        status_code=200
+    )
+
+
+@router.get("/ytdlp-pool/status")
+async def get_ytdlp_pool_status(_: bool = Depends(verify_api_key)):
+    """
+    Get current status of the yt-dlp library thread pool.
+
+    Returns information about:
+    - Worker count, current queue depth and running calls
+    - Max queue depth, completed/failed/timed out totals
+    - Average queue wait and run time per call
+
+    A growing queue depth means YTDLP_LIBRARY_WORKERS is too low for the load.
+    """
+    return JSONResponse(content=get_ytdlp_pool_stats(), status_code=200)
+
+
+@router.get("/rate-limits/status")
+async def get_rate_limits_status(_: bool = Depends(verify_api_key)):
+    """
+    Get current status of the per-platform request rate limiter.
+
+    Returns information about:
+    - Configured requests per minute and burst per platform (and the default)
+    - Per platform/cookie identity bucket: available tokens and queued waiters
+    - Acquired and delayed request counts with total, max and average wait
+
+    Sustained waits on one platform mean its RATE_LIMITS entry is the bottleneck.
+    """
+    return JSONResponse(content=get_rate_limit_stats(), status_code=200)
+
+
+@router.get("/job-timings")
+async def get_job_timings(_: bool = Depends(verify_api_key)):
+    """
+    Get per-stage duration histograms of queue jobs processed by this process.
+
+    Stages: claim, fetch_document, subtitles, audio_buffer_wait,
+    audio_download, transcription_wait, transcription, save, complete, ack
+    and total (whole job). Per stage:
+    - count, sum, mean, max and estimated p50/p95 in seconds
+    - cumulative bucket counts keyed by upper bound in seconds
+
+    Waits (audio_buffer_wait, transcription_wait) show time spent queued
+    behind BATCH_AUDIO_PREFETCH and MAX_CONCURRENT_TRANSCRIPTIONS.
+    """
+    return JSONResponse(content={"stages": job_stage_histograms.snapshot()}, status_code=200)
@@ -0,0 +1,74 @@
+"""
+Async job API router.
+
+POST /v2/jobs queues an /extract-audio or /transcribe call and returns its job
+id immediately; GET /v2/jobs/{job_id} reports progress and, once finished, the
+response the synchronous endpoint would have returned. Jobs run in the
+in-process job queue and are stored in CACHE_DIR/jobs.sqlite3, so any API
+process can answer status requests and queued jobs survive restarts.
+"""
+
+import asyncio
+from typing import List
+from fastapi import APIRouter, Query, Depends, HTTPException
+
+from app.dependencies import verify_api_key
+from app.models import AsyncJobRequest, AsyncJobResponse
+from app.services import job_store
+from app.services.job_queue import submit_job
+
+
+router = APIRouter(tags=["Jobs v2"])
+
+
+@router.post("/v2/jobs", response_model=AsyncJobResponse, status_code=202)
+async def create_async_job(
+    request: AsyncJobRequest,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Queue an /extract-audio or /transcribe call.
+
+    Body:
+    - type: "extract-audio" or "transcribe"
+    - params: the query parameters of that endpoint (same names and defaults)
+
+    Returns 202 with the queued job; poll GET /v2/jobs/{id} until status is
+    "completed" (result holds the endpoint response) or "failed" (error and
+    status_code hold the HTTP error the endpoint would have raised).
+
+    Example:
+        {"type": "transcribe", "params": {"audio_file": "/app/cache/audio/ab12cd34.mp3", "model_size": "small"}}
+    """
+    return await submit_job(request.type, request.params)
+
+
+@router.get("/v2/jobs/{job_id}", response_model=AsyncJobResponse)
+async def get_async_job(
+    job_id: str,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Get a job's status, progress and (once finished) result or error.
+
+    Finished jobs are kept for JOB_RETENTION_HOURS.
+    """
+    job = await asyncio.to_thread(job_store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.get("/v2/jobs", response_model=List[AsyncJobResponse])
+async def list_async_jobs(
+    status: str = Query(None, description="Filter by status: queued, running, completed, failed"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum jobs to return (newest first)"),
+    _: bool = Depends(verify_api_key)
+):
+    """List recent jobs, newest first."""
+    if status is not None and status not in job_store.JOB_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status '{status}'. Must be one of: {', '.join(job_store.JOB_STATUSES)}"
+        )
+    return await asyncio.to_thread(job_store.list_jobs, status=status, limit=limit)
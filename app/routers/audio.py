@@ -7,15 +7,17 @@ Extracted audio files are stored in cache and automatically cleaned up based on
 
 import os
 import uuid
+import asyncio
 import hashlib
-import subprocess
-import yt_dlp
 from fastapi import APIRouter, Query, Depends, HTTPException
 
 from app.dependencies import verify_api_key
-from app.config import CACHE_DIR, CACHE_TTL_HOURS, YTDLP_EXTRACTOR_ARGS, YTDLP_BINARY
-from app.services.ytdlp_service import run_ytdlp_binary, youtube_rate_limit
-from app.services.cache_service import cleanup_cache
+from app.config import CACHE_DIR, CACHE_TTL_HOURS, YTDLP_BINARY
+from app.services.rate_limiter import rate_limit
+from app.utils.process_utils import run_process
+from app.services.cache_service import find_cached_output
+from app.services import cache_index
+from app.services.info_cache import get_video_info, download_with_info
 from app.utils.platform_utils import get_platform_from_url, get_video_id_from_url, is_youtube_url
 
 
@@ -57,9 +59,6 @@ async def extract_audio(
                 detail="Provide either 'url' OR 'local_file', not both"
             )
 
-        # Run cleanup
-        cleanup_cache()
-
         # Generate unique ID for audio file
         audio_uid = uuid.uuid4().hex[:8]
         audio_path = os.path.join(CACHE_DIR, "audio", f"{audio_uid}.{output_format}")
@@ -89,21 +88,18 @@ async def extract_audio(
                     audio_path
                 ]
 
-                result = subprocess.run(
-                    ffmpeg_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300
-                )
+                result = await run_process(ffmpeg_cmd, timeout=300)
 
+                if result.timed_out:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Audio extraction timed out (>5 minutes)"
+                    )
                 if result.returncode != 0:
                     raise Exception(f"FFmpeg error: {result.stderr}")
 
-            except subprocess.TimeoutExpired:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Audio extraction timed out (>5 minutes)"
-                )
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
@@ -115,57 +111,45 @@ async def extract_audio(
             source_type = "url"
             use_binary = is_youtube_url(url) and os.path.exists(YTDLP_BINARY)
 
-            # Apply rate limiting for YouTube
-            if is_youtube_url(url):
-                await youtube_rate_limit()
+            # Apply per-platform rate limiting
+            await rate_limit(url, None if use_binary else cookies_file)
 
-            # Get metadata
+            # Resolve metadata once; the download reuses this info dict
+            info = None
             try:
-                if use_binary:
-                    stdout, stderr, code = run_ytdlp_binary([
-                        '--skip-download', '--print', '%(title)s',
-                        url
-                    ])
-                    title = stdout.strip() if code == 0 else "Unknown"
-                else:
-                    meta_opts = {'quiet': True, 'skip_download': True}
-                    if cookies_file and os.path.exists(cookies_file):
-                        meta_opts['cookiefile'] = cookies_file
-                    with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
-                        title = info.get("title", "Unknown")
+                info = await get_video_info(url, use_binary=use_binary, cookies_file=cookies_file)
+                title = info.get("title", "Unknown")
             except Exception:
                 title = "Unknown"
 
             # Extract audio using yt-dlp
+            ydl_opts = {
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': output_format,
+                    'preferredquality': quality,
+                }],
+                'outtmpl': audio_path.replace(f'.{output_format}', '.%(ext)s'),
+                'quiet': True,
+            }
+            if cookies_file and os.path.exists(cookies_file):
+                ydl_opts['cookiefile'] = cookies_file
+
             try:
-                if use_binary:
-                    # Use standalone binary for YouTube
-                    stdout, stderr, code = run_ytdlp_binary([
+                await download_with_info(
+                    source,
+                    info,
+                    use_binary=use_binary,
+                    binary_args=[
                         '-f', 'bestaudio/best',
                         '-x', '--audio-format', output_format,
                         '--audio-quality', quality,
                         '-o', audio_path.replace(f'.{output_format}', '.%(ext)s'),
-                        url
-                    ], timeout=600)
-                    if code != 0:
-                        raise Exception(stderr)
-                else:
-                    # Use Python library for non-YouTube
-                    ydl_opts = {
-                        'format': 'bestaudio/best',
-                        'postprocessors': [{
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': output_format,
-                            'preferredquality': quality,
-                        }],
-                        'outtmpl': audio_path.replace(f'.{output_format}', '.%(ext)s'),
-                        'quiet': True,
-                    }
-                    if cookies_file and os.path.exists(cookies_file):
-                        ydl_opts['cookiefile'] = cookies_file
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([source])
+                    ],
+                    ydl_opts=ydl_opts,
+                    timeout=600
+                )
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
@@ -178,12 +162,9 @@ async def extract_audio(
             actual_audio_path = audio_path
         else:
             # For URLs, yt-dlp may change extension, so search for it
-            actual_audio_path = None
-            audio_cache_dir = os.path.join(CACHE_DIR, "audio")
-            for f in os.listdir(audio_cache_dir):
-                if f.startswith(audio_uid):
-                    actual_audio_path = os.path.join(audio_cache_dir, f)
-                    break
+            actual_audio_path = find_cached_output(
+                os.path.join(CACHE_DIR, "audio"), audio_uid, [output_format]
+            )
 
         if not actual_audio_path or not os.path.exists(actual_audio_path):
             raise HTTPException(
@@ -204,23 +185,19 @@ async def extract_audio(
             # For URLs, get metadata from yt-dlp
             video_url = url
             platform = get_platform_from_url(url)
-            try:
-                meta_opts = {'quiet': True, 'skip_download': True, 'extractor_args': YTDLP_EXTRACTOR_ARGS}
-                if cookies_file and os.path.exists(cookies_file):
-                    meta_opts['cookiefile'] = cookies_file
-
-                with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    video_id = info.get("id")
-                    video_duration = info.get("duration")
-            except Exception:
-                # If metadata extraction fails, use hash fallback
+            if info:
+                video_id = info.get("id")
+                video_duration = info.get("duration")
+            if not video_id:
+                # If metadata extraction failed, use hash fallback
                 video_id = get_video_id_from_url(url)
         else:
             # For local files, generate video_id from filename
             video_id = hashlib.md5(os.path.basename(local_file).encode()).hexdigest()[:12]
             platform = "local"
 
+        await asyncio.to_thread(cache_index.record_file, actual_audio_path, "audio", platform, video_id)
+
         return {
             "audio_file": actual_audio_path,
             "format": output_format,
@@ -3,12 +3,14 @@ Cache router module for managing cached files and downloads.
 
 This module provides endpoints for:
 - Cleaning up expired cache files
+- Reporting background cache janitor status
 - Listing cached files by type
 - Listing saved downloads
 """
 
 import os
 import time
+import asyncio
 from datetime import datetime
 from fastapi import APIRouter, Query, Depends, HTTPException
 from typing import Dict, List, Any
@@ -16,6 +18,7 @@ from typing import Dict, List, Any
 from app.dependencies import verify_api_key
 from app.config import CACHE_DIR, DOWNLOADS_DIR, CACHE_TTL_HOURS
 from app.services.cache_service import cleanup_cache
+from app.services.cache_janitor import get_janitor_status
 
 
 router = APIRouter(tags=["Cache"])
@@ -24,23 +27,37 @@ router = APIRouter(tags=["Cache"])
 @router.delete("/cache/cleanup")
 async def cache_cleanup(_: bool = Depends(verify_api_key)):
     """
-    Delete all cached files older than CACHE_TTL_HOURS.
+    Delete all cached files older than CACHE_TTL_HOURS and evict
+    least-recently-used files from categories over their size budget.
 
     Use cases:
     - Cron job target: 0 * * * * curl -X DELETE .../cache/cleanup
     - Manual cleanup trigger
 
-    Note: Also triggered automatically on transcription requests.
+    Note: The background cache janitor also sweeps continuously (see
+    GET /cache/janitor/status); this endpoint forces a full pass.
     """
-    result = cleanup_cache()
+    result = await asyncio.to_thread(cleanup_cache)
     return {
         "message": f"Cleanup complete. Deleted {result['total_deleted']} files.",
         "deleted": result["deleted"],
+        "evicted": result.get("evicted", {}),
         "freed_bytes": result["freed_bytes"],
         "ttl_hours": CACHE_TTL_HOURS
     }
 
 
+@router.get("/cache/janitor/status")
+async def cache_janitor_status(_: bool = Depends(verify_api_key)):
+    """
+    Get background cache janitor status and last-run stats.
+
+    Returns:
+        Running state, sweep interval, totals and the last sweep per category
+    """
+    return get_janitor_status()
+
+
 @router.get("/cache")
 async def list_cache(
     type: str = Query(None, description="Filter by type: videos, audio, transcriptions, screenshots"),
@@ -2,32 +2,61 @@
 Download router module.
 
 Provides endpoints for downloading videos from various platforms:
-- GET /download: Single video download with streaming response
-- POST /batch-download: Batch download multiple videos with automatic rate limiting
+- GET /download: Single video download served as a file response
+  (Content-Length, Range/206 and ETag; temp files are removed once sent),
+  or passed through from yt-dlp's stdout as it downloads (stream=true)
+- POST /batch-download: Batch download multiple videos, platforms in parallel
+  (app.services.batch_download); /batch-download/stream reports per-URL
+  progress and GET /batch-download/{batch_id} the stored results
 """
 
 import os
-import time
+import json
 import uuid
-import random
-from typing import List
+import asyncio
 
-import yt_dlp
 from fastapi import APIRouter, Query, HTTPException, Depends, Body
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
 from app.dependencies import verify_api_key
-from app.config import DOWNLOADS_DIR, YTDLP_EXTRACTOR_ARGS
-from app.models import BatchDownloadRequest, BatchDownloadResponse, VideoDownloadResult
+from app.config import DOWNLOADS_DIR, YTDLP_BINARY, YTDLP_EXTRACTOR_ARGS
+from app.models import BatchDownloadRequest, BatchDownloadResponse
+from app.services import download_manifest
+from app.services.download_manifest import manifest_key
+from app.services.batch_download import BatchDownload, load_batch_state, summarize
+from app.services.ytdlp_pool import downloaded_filepath, ytdlp_extract_info
+from app.services.info_cache import get_video_info, stream_download
+from app.services.rate_limiter import rate_limit
+from app.utils.platform_utils import is_youtube_url
 from app.utils.filename_utils import (
     create_formatted_filename,
     encode_content_disposition_filename,
-    get_platform_prefix,
 )
 
 
 router = APIRouter(tags=["Download"])
 
+# Seconds a pass-through download may go without output before it is killed
+STREAM_IDLE_TIMEOUT = 120
+
+
+class TemporaryFileResponse(FileResponse):
+    """
+    FileResponse that deletes its file once the response is over.
+
+    A background task isn't enough: Starlette skips it when sending fails
+    because the client disconnected, which would leak the temp file.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                os.unlink(self.path)
+            except OSError as e:
+                print(f"WARNING: Failed to remove temporary download {self.path}: {str(e)}")
+
 
 @router.get("/download")
 async def download_video(
@@ -36,10 +65,24 @@ async def download_video(
     keep: bool = Query(False),
     custom_title: str = Query(None, description="Optional custom title for the downloaded file"),
     cookies_file: str = Query(None, description="Optional path to cookies file for sites requiring authentication"),
+    stream: bool = Query(False, description="Pass-through: send bytes while yt-dlp downloads (single-file formats, no keep/Range)"),
     _: bool = Depends(verify_api_key)
 ):
     """
-    Download a single video and stream it to the client.
+    Download a single video and send it to the client.
+
+    With stream=true the response starts as soon as yt-dlp produces output:
+    its stdout (-o -) is piped into the response, so time-to-first-byte is
+    the extraction time rather than the whole download and no temp file is
+    written. Only single-file formats can be streamed (no "+" merges), and
+    there is no Content-Length or Range support.
+
+    The finished file is served like a static file: Content-Length, ETag and
+    Last-Modified headers, and Range requests answered with 206 so clients
+    can resume (useful with keep=true, where the file stays on the server).
+    The body is sent with sendfile when the server supports it. Temporary
+    files (keep=false) are deleted once the response is over, also when the
+    client disconnects mid-transfer.
 
     Supports 1000+ platforms through yt-dlp including YouTube, TikTok, Instagram,
     Facebook, Twitter, and more.
@@ -50,13 +93,19 @@ async def download_video(
         keep: Save video to server storage (default: False)
         custom_title: Optional custom title for the downloaded file
         cookies_file: Optional path to cookies file for authenticated downloads
+        stream: Pass the download through as it happens (default: False)
 
     Returns:
-        StreamingResponse with video file
+        FileResponse with video file (StreamingResponse with stream=true)
 
     Raises:
-        HTTPException: If download fails or file not found
+        HTTPException: 400 for stream=true with keep or a merged format,
+                       503 if stream=true and the yt-dlp binary is missing,
+                       500 if download fails or file not found
     """
+    if stream:
+        return await _stream_video(url, format, keep, custom_title, cookies_file)
+
     try:
         # Prepare yt-dlp options for metadata extraction
         meta_opts = {'quiet': True, 'skip_download': True, 'extractor_args': YTDLP_EXTRACTOR_ARGS}
@@ -66,25 +115,24 @@ async def download_video(
             meta_opts['cookiefile'] = cookies_file
 
         # Extract metadata
-        with yt_dlp.YoutubeDL(meta_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            title = info.get("title", "video")
-            extension = "mp4"  # fallback extension
+        info = await ytdlp_extract_info(url, meta_opts)
+        title = info.get("title", "video")
+        extension = "mp4"  # fallback extension
 
-            # Create formatted filename with platform prefix
-            filename = create_formatted_filename(url, title, extension, custom_title)
+        # Create formatted filename with platform prefix
+        filename = create_formatted_filename(url, title, extension, custom_title)
 
         # Create output template based on keep parameter
         if keep:
             # Save to downloads directory with formatted filename
             # Extract just the name without extension for template
+            # (the video ID keeps same-titled videos apart, as in /batch-download)
             base_filename = filename.rsplit('.', 1)[0]
-            saved_filename = f"{base_filename}.%(ext)s"
+            saved_filename = f"{base_filename}-%(id)s.%(ext)s"
             output_template = os.path.join(DOWNLOADS_DIR, saved_filename)
         else:
             # Use temporary file
-            uid = uuid.uuid4().hex[:8]
-            output_template = f"/tmp/{uid}.%(ext)s"
+            output_template = f"/tmp/{uuid.uuid4().hex[:8]}.%(ext)s"
 
         ydl_opts = {
             'format': format,
@@ -98,35 +146,18 @@ async def download_video(
         if cookies_file and os.path.exists(cookies_file):
             ydl_opts['cookiefile'] = cookies_file
 
-        # Download the video using yt-dlp Python API
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.download([url])
-
-        # Find actual downloaded file
-        actual_file_path = None
-        if keep:
-            # Look in downloads directory for the formatted filename
-            base_filename = filename.rsplit('.', 1)[0]
-            for f in os.listdir(DOWNLOADS_DIR):
-                if f.startswith(base_filename):
-                    actual_file_path = os.path.join(DOWNLOADS_DIR, f)
-                    break
-        else:
-            # Look in temp directory
-            for f in os.listdir("/tmp"):
-                if f.startswith(uid):
-                    actual_file_path = os.path.join("/tmp", f)
-                    break
+        # Download the video using yt-dlp Python API; it reports the final
+        # path (after merging), so no directory search can pick another file
+        downloaded = await ytdlp_extract_info(url, ydl_opts, download=True)
+        actual_file_path = downloaded_filepath(downloaded)
 
         if not actual_file_path or not os.path.exists(actual_file_path):
             raise HTTPException(status_code=500, detail="Download failed or file not found.")
 
-        # Stream file
-        def iterfile():
-            with open(actual_file_path, "rb") as f:
-                yield from f
-            if not keep:
-                os.unlink(actual_file_path)  # only clean up temp files
+        # Register kept files so /batch-download skips them without a network call
+        key = manifest_key(url, info) if keep else None
+        if key:
+            await asyncio.to_thread(download_manifest.record_download, *key, url, actual_file_path, title)
 
         # Prepare response headers
         response_headers = {"Content-Disposition": encode_content_disposition_filename(filename)}
@@ -134,8 +165,10 @@ async def download_video(
             saved_path = os.path.relpath(actual_file_path, start=".")
             response_headers["X-Server-Path"] = saved_path
 
-        return StreamingResponse(
-            iterfile(),
+        # Only clean up temp files
+        response_class = FileResponse if keep else TemporaryFileResponse
+        return response_class(
+            actual_file_path,
             media_type="application/octet-stream",
             headers=response_headers
         )
@@ -144,6 +177,51 @@ async def download_video(
         raise HTTPException(status_code=500, detail=f"Error during download: {str(e)}")
 
 
+async def _stream_video(
+    url: str,
+    format: str,
+    keep: bool,
+    custom_title: str,
+    cookies_file: str
+) -> StreamingResponse:
+    """Pass-through mode of /download: yt-dlp -o - piped into the response."""
+    if keep:
+        raise HTTPException(status_code=400, detail="stream=true can't be combined with keep=true")
+    if "+" in format:
+        raise HTTPException(
+            status_code=400,
+            detail="stream=true needs a single-file format (merged formats like bestvideo+bestaudio need a file)"
+        )
+    if not os.path.exists(YTDLP_BINARY):
+        raise HTTPException(status_code=503, detail="stream=true requires the yt-dlp binary")
+
+    use_binary = is_youtube_url(url)
+    await rate_limit(url, None if use_binary else cookies_file)
+
+    # Resolve metadata once (title for the filename); yt-dlp reuses the info dict
+    info = None
+    try:
+        info = await get_video_info(url, use_binary=use_binary, cookies_file=cookies_file, fresh_urls=True)
+        title = info.get("title", "video")
+    except Exception:
+        title = "video"
+
+    try:
+        chunks = await stream_download(url, info, format, cookies_file, idle_timeout=STREAM_IDLE_TIMEOUT)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error during download: {str(e)}")
+
+    filename = create_formatted_filename(url, title, "mp4", custom_title)
+    return StreamingResponse(
+        chunks,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": encode_content_disposition_filename(filename),
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 @router.post("/batch-download")
 async def batch_download_videos(
     request: BatchDownloadRequest = Body(...),
@@ -156,125 +234,83 @@ async def batch_download_videos(
     Independent error handling - one failure doesn't stop the batch.
 
     Args:
-        request: BatchDownloadRequest with URLs, format, keep, delays, and cookies_file
+        request: BatchDownloadRequest with URLs, format, keep, delays, cookies_file
+                 and optional batch_id (resume)
 
     Returns:
-        BatchDownloadResponse with download results and statistics
+        BatchDownloadResponse with download results, statistics and batch_id
 
     Features:
-        - Automatic rate limiting with random delays between downloads
-        - Skip already downloaded files (when keep=True)
+        - Platforms download in parallel; per platform at most DOWNLOAD_CONCURRENCY
+          downloads (YouTube: 1) with random delays between them (non-blocking)
+        - Skip already downloaded videos (when keep=True) via the download manifest,
+          without network calls when the video ID can be parsed from the URL
+        - Resumable: pass the returned batch_id again to skip URLs it completed
         - Independent error handling per video
         - Detailed per-video results with platform, title, file size
     """
-    start_time = time.time()
-    results: List[VideoDownloadResult] = []
-    successful = 0
-    failed = 0
-    skipped = 0
-    total_size = 0
+    return await BatchDownload(request).run()
 
-    os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
-    for idx, url in enumerate(request.urls, 1):
-        result = VideoDownloadResult(url=url, success=False)
+@router.post("/batch-download/stream")
+async def batch_download_videos_stream(
+    request: BatchDownloadRequest = Body(...),
+    stream_format: str = Query("sse", description="Stream format: sse (Server-Sent Events) or ndjson"),
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Run a batch download, streaming per-URL progress as it happens.
+
+    Events (SSE "event:" name, or the "event" field of each NDJSON line):
+    - start: {batch_id, total, resumed}
+    - started: {url, lane}
+    - progress: {url, downloaded_bytes, total_bytes, percent} (at most once per second per URL)
+    - result: {result: per-video result, completed, total}
+    - done: {summary: the /batch-download response}
+    - error: {status_code, detail}
+
+    Disconnecting cancels the remaining downloads; POST again with the
+    batch_id from the start event to resume.
+    """
+    if stream_format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="stream_format must be 'sse' or 'ndjson'")
+    batch = BatchDownload(request)
+
+    def encode(event: dict) -> str:
+        if stream_format == "ndjson":
+            return json.dumps(event) + "\n"
+        payload = {k: v for k, v in event.items() if k != "event"}
+        return f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
 
+    async def events():
         try:
-            platform_prefix = get_platform_prefix(url)
-            result.platform = platform_prefix
-
-            # Extract metadata without downloading
-            meta_opts = {'quiet': True, 'skip_download': True, 'extractor_args': YTDLP_EXTRACTOR_ARGS}
-            if request.cookies_file and os.path.exists(request.cookies_file):
-                meta_opts['cookiefile'] = request.cookies_file
-
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                title = info.get("title", "video")
-                result.title = title
-                extension = "mp4"
-                filename = create_formatted_filename(url, title, extension, None)
-                result.filename = filename
-
-            # Set up output path
-            if request.keep:
-                base_filename = filename.rsplit('.', 1)[0]
-                saved_filename = f"{base_filename}.%(ext)s"
-                output_template = os.path.join(DOWNLOADS_DIR, saved_filename)
-                expected_file = os.path.join(DOWNLOADS_DIR, filename)
-
-                # Skip if already exists
-                if os.path.exists(expected_file):
-                    file_stat = os.stat(expected_file)
-                    result.success = True
-                    result.file_path = os.path.relpath(expected_file, start=".")
-                    result.file_size = file_stat.st_size
-                    total_size += file_stat.st_size
-                    skipped += 1
-                    results.append(result)
-                    continue
-            else:
-                uid = uuid.uuid4().hex[:8]
-                output_template = f"/tmp/{uid}.%(ext)s"
-
-            # Download video
-            ydl_opts = {
-                'format': request.format,
-                'outtmpl': output_template,
-                'quiet': True,
-                'merge_output_format': 'mp4',
-                'extractor_args': YTDLP_EXTRACTOR_ARGS,
-            }
-
-            if request.cookies_file and os.path.exists(request.cookies_file):
-                ydl_opts['cookiefile'] = request.cookies_file
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-
-            # Verify file exists
-            actual_file_path = None
-            if request.keep:
-                for f in os.listdir(DOWNLOADS_DIR):
-                    if f.startswith(base_filename):
-                        actual_file_path = os.path.join(DOWNLOADS_DIR, f)
-                        break
-            else:
-                for f in os.listdir("/tmp"):
-                    if f.startswith(uid):
-                        actual_file_path = os.path.join("/tmp", f)
-                        break
-
-            if actual_file_path and os.path.exists(actual_file_path):
-                file_stat = os.stat(actual_file_path)
-                result.success = True
-                result.file_path = os.path.relpath(actual_file_path, start=".") if request.keep else actual_file_path
-                result.file_size = file_stat.st_size
-                total_size += file_stat.st_size
-                successful += 1
-            else:
-                result.error = "Download completed but file not found"
-                failed += 1
-
+            async for event in batch.events():
+                yield encode(event)
         except Exception as e:
-            result.error = str(e)
-            failed += 1
-
-        results.append(result)
-
-        # Add delay between downloads (prevents rate limiting)
-        if idx < len(request.urls):
-            delay = random.randint(request.min_delay, request.max_delay)
-            time.sleep(delay)
-
-    duration = time.time() - start_time
-
-    return BatchDownloadResponse(
-        total=len(request.urls),
-        successful=successful,
-        failed=failed,
-        skipped=skipped,
-        downloads=results,
-        total_size=total_size,
-        duration_seconds=round(duration, 2)
+            yield encode({"event": "error", "status_code": 500, "detail": f"Error during batch download: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/batch-download/{batch_id}")
+async def get_batch_download(
+    batch_id: str,
+    _: bool = Depends(verify_api_key)
+) -> BatchDownloadResponse:
+    """
+    Get the stored results of a batch (finished, running or interrupted).
+
+    URLs without a result yet are reported with status "pending";
+    duration_seconds is the time between the batch's creation and its last update.
+    """
+    state = await asyncio.to_thread(load_batch_state, batch_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return summarize(
+        state["request"]["urls"], state["results"],
+        state["updated_at"] - state["created_at"], batch_id
     )
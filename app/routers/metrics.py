@@ -0,0 +1,75 @@
+"""
+Metrics router.
+
+GET /metrics serves this process's metrics in the Prometheus text exposition
+format: request latency per router, transcription semaphore wait time and
+occupancy, rate-limiter sleeps, yt-dlp/ffmpeg durations and exit codes, cache
+lookups, bytes on disk per cache category, /v2/jobs queue depth, queue job
+stage durations and Supabase call latency.
+"""
+
+import sqlite3
+import asyncio
+from typing import List
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.dependencies import verify_metrics_access
+from app.services import cache_index, job_store
+from app.routers.transcription import transcription_semaphore
+from app.utils.metrics_utils import CONTENT_TYPE, Gauge, LabeledHistogram, metrics
+from app.utils.timing_utils import job_stage_histograms
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _storage_metrics() -> List:
+    """Gauges read from the cache index and job store (blocking SQLite queries)."""
+    cache_bytes = Gauge("cache_bytes", "Bytes on disk per cache category", ("category",))
+    cache_files = Gauge("cache_files", "Files per cache category", ("category",))
+    jobs = Gauge("async_jobs", "Stored /v2/jobs jobs by status", ("status",))
+    try:
+        for category, totals in cache_index.category_totals().items():
+            cache_bytes.set(totals["bytes"], category=category)
+            cache_files.set(totals["files"], category=category)
+        for status, count in job_store.count_jobs_by_status().items():
+            jobs.set(count, status=status)
+    except sqlite3.Error as e:
+        print(f"WARNING: Failed to read storage metrics: {str(e)}")
+    return [cache_bytes, cache_files, jobs]
+
+
+def _semaphore_metrics() -> List:
+    """Occupancy of the transcription semaphore."""
+    labels = {"semaphore": transcription_semaphore.name}
+    capacity = Gauge("semaphore_capacity", "Concurrent holders allowed", ("semaphore",))
+    in_use = Gauge("semaphore_in_use", "Current holders", ("semaphore",))
+    waiting = Gauge("semaphore_waiting", "Tasks waiting to acquire", ("semaphore",))
+    capacity.set(transcription_semaphore.capacity, **labels)
+    in_use.set(transcription_semaphore.in_use, **labels)
+    waiting.set(transcription_semaphore.waiting, **labels)
+    return [capacity, in_use, waiting]
+
+
+def _job_stage_metrics() -> List:
+    """The /admin/job-timings histograms as one labelled histogram."""
+    stages = LabeledHistogram(
+        "job_stage_duration_seconds", "Duration of queue job pipeline stages", ("stage",)
+    )
+    for stage, histogram in job_stage_histograms.items():
+        stages.attach(histogram, stage=stage)
+    return [stages]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(_: bool = Depends(verify_metrics_access)):
+    """
+    Get this process's metrics in the Prometheus text exposition format.
+
+    Values are per process and reset on restart. Cache hit ratio is
+    rate(cache_lookups_total{result="hit"}) / rate(cache_lookups_total).
+    Requires X-API-Key unless METRICS_REQUIRE_API_KEY=false.
+    """
+    extra = _semaphore_metrics() + _job_stage_metrics() + await asyncio.to_thread(_storage_metrics)
+    return PlainTextResponse(metrics.render(extra), media_type=CONTENT_TYPE)
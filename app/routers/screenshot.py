@@ -6,19 +6,21 @@ with support for caching, Supabase upload, and multiple timestamp formats.
 """
 
 import os
+import asyncio
 import hashlib
-import yt_dlp
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Body
 
 from app.dependencies import verify_api_key
 from app.config import CACHE_DIR, YTDLP_BINARY
 from app.models import ScreenshotRequest, ScreenshotResponse, ScreenshotResult
-from app.services.ytdlp_service import run_ytdlp_binary, youtube_rate_limit
+from app.services.rate_limiter import rate_limit
 from app.services.screenshot_service import extract_screenshot
 from app.services.supabase_service import upload_screenshot_to_supabase, save_screenshot_metadata
-from app.services.cache_service import get_cached_video, cleanup_cache
-from app.utils.platform_utils import is_youtube_url, get_platform_prefix
+from app.services.cache_service import get_cached_video, find_cached_output
+from app.services import cache_index
+from app.services.info_cache import get_video_info, download_with_info
+from app.utils.platform_utils import is_youtube_url, get_platform_prefix, get_platform_from_url
 from app.utils.timestamp_utils import parse_timestamp_to_seconds, format_seconds_to_srt
 
 
@@ -44,41 +46,25 @@ async def screenshot_video(
     4. Optional: upload to Supabase
     5. Return screenshot paths
     """
-    # Trigger cache cleanup at start of request
-    cleanup_cache()
-
     try:
         use_binary = is_youtube_url(request.video_url) and os.path.exists(YTDLP_BINARY)
         platform = get_platform_prefix(request.video_url)
+        platform_name = get_platform_from_url(request.video_url)
+
+        # Apply per-platform rate limiting
+        await rate_limit(request.video_url)
 
-        # Apply rate limiting for YouTube
-        if is_youtube_url(request.video_url):
-            await youtube_rate_limit()
-
-        # Extract video metadata
-        if use_binary:
-            # Use standalone binary for YouTube (requires Deno)
-            stdout, stderr, code = run_ytdlp_binary([
-                '--skip-download', '--print', '%(id)s\n%(title)s\n%(duration)s',
-                request.video_url
-            ])
-            if code != 0:
-                raise HTTPException(status_code=500, detail=f"Failed to extract metadata: {stderr}")
-            lines = stdout.strip().split('\n')
-            video_id = lines[0] if len(lines) > 0 else None
-            title = lines[1] if len(lines) > 1 else 'Unknown'
-            duration = int(lines[2]) if len(lines) > 2 and lines[2].isdigit() else None
-        else:
-            # Use Python library for non-YouTube
-            meta_opts = {'quiet': True, 'skip_download': True}
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                info = ydl.extract_info(request.video_url, download=False)
-                video_id = info.get('id')
-                title = info.get('title', 'Unknown')
-                duration = info.get('duration')
+        # Extract video metadata (shared with other endpoints via the info cache)
+        try:
+            info = await get_video_info(request.video_url, use_binary=use_binary)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to extract metadata: {str(e)}")
+        video_id = info.get('id')
+        title = info.get('title') or 'Unknown'
+        duration = info.get('duration')
 
         # Check cache for existing video
-        video_path = get_cached_video(video_id)
+        video_path = await asyncio.to_thread(get_cached_video, video_id)
         video_cached = video_path is not None
 
         if not video_path:
@@ -86,33 +72,33 @@ async def screenshot_video(
             video_filename = f"{platform}-{video_id}.mp4"
             video_path = os.path.join(CACHE_DIR, "videos", video_filename)
 
-            if use_binary:
-                # Use standalone binary for YouTube
-                stdout, stderr, code = run_ytdlp_binary([
-                    '-f', 'best[height<=1080]',
-                    '-o', video_path.replace('.mp4', '.%(ext)s'),
-                    '--merge-output-format', 'mp4',
-                    request.video_url
-                ], timeout=600)
-                if code != 0:
-                    raise HTTPException(status_code=500, detail=f"Failed to download video: {stderr}")
-            else:
-                # Use Python library for non-YouTube
-                ydl_opts = {
-                    'format': 'best[height<=1080]',
-                    'outtmpl': video_path.replace('.mp4', '.%(ext)s'),
-                    'quiet': True,
-                    'merge_output_format': 'mp4',
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([request.video_url])
+            try:
+                await download_with_info(
+                    request.video_url,
+                    info,
+                    use_binary=use_binary,
+                    binary_args=[
+                        '-f', 'best[height<=1080]',
+                        '-o', video_path.replace('.mp4', '.%(ext)s'),
+                        '--merge-output-format', 'mp4',
+                    ],
+                    ydl_opts={
+                        'format': 'best[height<=1080]',
+                        'outtmpl': video_path.replace('.mp4', '.%(ext)s'),
+                        'quiet': True,
+                        'merge_output_format': 'mp4',
+                    },
+                    timeout=600
+                )
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Failed to download video: {str(e)}")
 
             # Find actual downloaded file (extension may vary)
-            cache_videos_dir = os.path.join(CACHE_DIR, "videos")
-            for f in os.listdir(cache_videos_dir):
-                if f.startswith(f"{platform}-{video_id}"):
-                    video_path = os.path.join(cache_videos_dir, f)
-                    break
+            video_path = find_cached_output(
+                os.path.join(CACHE_DIR, "videos"), f"{platform}-{video_id}", ["mp4", "webm", "mkv"]
+            )
+            if video_path:
+                await asyncio.to_thread(cache_index.record_file, video_path, "video", platform_name, video_id)
 
         if not video_path or not os.path.exists(video_path):
             raise HTTPException(status_code=500, detail="Failed to download video")
@@ -132,7 +118,10 @@ async def screenshot_video(
                 output_path = os.path.join(screenshots_dir, output_filename)
 
                 # Extract frame
-                result = extract_screenshot(video_path, ts_seconds, output_path, request.quality)
+                result = await extract_screenshot(video_path, ts_seconds, output_path, request.quality)
+                await asyncio.to_thread(
+                    cache_index.record_file, output_path, "screenshot", platform_name, video_id, "jpg"
+                )
 
                 screenshot_result = ScreenshotResult(
                     timestamp=ts_seconds,
@@ -5,20 +5,26 @@ Handles audio transcription using whisperX or OpenAI Whisper API,
 and manages transcription data storage in Supabase.
 """
 
-import asyncio
+import json
 from fastapi import APIRouter, Query, Depends, HTTPException, Body
+from fastapi.responses import StreamingResponse
 
 from app.dependencies import verify_api_key
 from app.config import MAX_CONCURRENT_TRANSCRIPTIONS
 from app.models import TranscriptionSaveRequest, TranscriptionSaveResponse
-from app.services.transcription_service import _transcribe_audio_internal
+from app.services.transcription_service import (
+    _transcribe_audio_internal,
+    _validate_transcription_request,
+    stream_transcription
+)
 from app.services.supabase_service import get_supabase_client
+from app.utils.metrics_utils import InstrumentedSemaphore, supabase_timer
 
 
 router = APIRouter(tags=["Transcription"])
 
-# Semaphore for concurrency control
-transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+# Semaphore for concurrency control (wait time and occupancy are exported at /metrics)
+transcription_semaphore = InstrumentedSemaphore(MAX_CONCURRENT_TRANSCRIPTIONS, name="transcription")
 
 
 @router.post("/transcribe")
@@ -26,7 +32,7 @@ async def transcribe_audio(
     audio_file: str = Query(..., description="Path to audio file on server (from /extract-audio)"),
     language: str = Query(None, description="Language code (auto-detect if not specified)"),
     model_size: str = Query("medium", description="Model size: tiny, small, medium, large-v2, large-v3, turbo"),
-    provider: str = Query("local", description="Provider: local (whisperX) or openai"),
+    provider: str = Query("local", description="Provider: local (whisperX), faster-whisper (CTranslate2, CPU) or openai"),
     output_format: str = Query("json", description="Output format: json, srt, vtt, text"),
     video_id: str = Query(None, description="Video ID from /extract-audio (for unified response)"),
     url: str = Query(None, description="Video URL from /extract-audio (for unified response)"),
@@ -59,6 +65,64 @@ async def transcribe_audio(
         )
 
 
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    audio_file: str = Query(..., description="Path to audio file on server (from /extract-audio)"),
+    language: str = Query(None, description="Language code (auto-detect if not specified)"),
+    model_size: str = Query("medium", description="Model size: tiny, small, medium, large-v2, large-v3, turbo"),
+    provider: str = Query("local", description="Provider: local (whisperX), faster-whisper (CTranslate2, CPU) or openai"),
+    stream_format: str = Query("sse", description="Stream format: sse (Server-Sent Events) or ndjson"),
+    video_id: str = Query(None, description="Video ID from /extract-audio (for unified response)"),
+    url: str = Query(None, description="Video URL from /extract-audio (for unified response)"),
+    duration: int = Query(None, description="Video duration from /extract-audio (for unified response)"),
+    platform: str = Query(None, description="Platform name from /extract-audio (for unified response)"),
+    _: bool = Depends(verify_api_key)
+):
+    """
+    Transcribe audio file using AI, streaming segments as they are ready.
+
+    The audio is transcribed in TRANSCRIBE_STREAM_CHUNK_SECONDS chunks (cut at
+    pauses) and each chunk's segments are sent as soon as it finishes, so the
+    first segments arrive within seconds even for long media.
+
+    Events (SSE "event:" name, or the "event" field of each NDJSON line):
+    - segments: {index, start, end, duration, segments: [{start, end, text}]}
+    - done: {result: unified transcription response without segments}
+    - error: {status_code, detail}
+
+    Shares the MAX_CONCURRENT_TRANSCRIPTIONS limit with /transcribe.
+    """
+    if stream_format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="stream_format must be 'sse' or 'ndjson'")
+    # Report a missing file or bad provider as a normal HTTP error, before the stream starts
+    _validate_transcription_request(audio_file, provider)
+
+    def encode(event: dict) -> str:
+        if stream_format == "ndjson":
+            return json.dumps(event) + "\n"
+        payload = {k: v for k, v in event.items() if k != "event"}
+        return f"event: {event['event']}\ndata: {json.dumps(payload)}\n\n"
+
+    async def events():
+        async with transcription_semaphore:
+            try:
+                async for event in stream_transcription(
+                    audio_file, language, model_size, provider,
+                    video_id, url, duration, platform
+                ):
+                    yield encode(event)
+            except HTTPException as e:
+                yield encode({"event": "error", "status_code": e.status_code, "detail": e.detail})
+            except Exception as e:
+                yield encode({"event": "error", "status_code": 500, "detail": f"Error during transcription: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/transcriptions/save")
 async def save_transcription(
     request: TranscriptionSaveRequest = Body(...),
@@ -97,10 +161,11 @@ async def save_transcription(
 
         # Upsert into document_transcriptions table
         # on_conflict uses the unique constraint on document_id
-        result = supabase.table("document_transcriptions").upsert(
-            transcription_data,
-            on_conflict="document_id"
-        ).execute()
+        with supabase_timer("save_transcript"):
+            result = supabase.table("document_transcriptions").upsert(
+                transcription_data,
+                on_conflict="document_id"
+            ).execute()
 
         if not result.data or len(result.data) == 0:
             raise HTTPException(
@@ -145,9 +210,10 @@ async def check_transcription_exists(
         supabase = get_supabase_client()
 
         # Query by document_id (which has unique constraint)
-        result = supabase.table("document_transcriptions").select(
-            "id, document_id, language, source, confidence_score, created_at, updated_at"
-        ).eq("document_id", document_id).execute()
+        with supabase_timer("check_transcript"):
+            result = supabase.table("document_transcriptions").select(
+                "id, document_id, language, source, confidence_score, created_at, updated_at"
+            ).eq("document_id", document_id).execute()
 
         if not result.data or len(result.data) == 0:
             return {
@@ -0,0 +1,339 @@
+"""
+Concurrent engine for POST /batch-download.
+
+The endpoint used to download its URLs one after another and call
+time.sleep(delay) between them, which froze the whole event loop (every other
+request included) for the length of the batch. A BatchDownload instead:
+
+- Groups URLs into lanes by platform (by host for unknown platforms). Lanes run
+  in parallel; within a lane at most DOWNLOAD_CONCURRENCY[platform] downloads
+  run at once (YouTube defaults to 1, others to DOWNLOAD_CONCURRENCY_DEFAULT)
+- Waits min_delay..max_delay seconds between downloads of the same lane with
+  asyncio.sleep, on top of the per-platform rate limiter
+- Emits per-URL events (started, progress, result) that /batch-download/stream
+  sends to the client as they happen
+- Persists each URL's result in DOWNLOADS_DIR/.batches/{batch_id}.json, so a
+  batch interrupted by a disconnect or restart can be resumed with its
+  batch_id: URLs it already downloaded or skipped are not fetched again
+- With keep=True, skips videos listed in the download manifest
+  (app.services.download_manifest) before any network call, and records the
+  ones it downloads
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import tempfile
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.config import DOWNLOADS_DIR, DOWNLOAD_CONCURRENCY, DOWNLOAD_CONCURRENCY_DEFAULT, YTDLP_EXTRACTOR_ARGS
+from app.models import BatchDownloadRequest, BatchDownloadResponse, VideoDownloadResult
+from app.services import download_manifest
+from app.services.download_manifest import manifest_key
+from app.services.rate_limiter import rate_limit
+from app.services.ytdlp_pool import downloaded_filepath, ytdlp_extract_info
+from app.utils.filename_utils import create_formatted_filename, get_platform_prefix
+from app.utils.platform_utils import get_platform_from_url
+
+
+BATCH_STATE_DIR = os.path.join(DOWNLOADS_DIR, ".batches")
+
+# Minimum seconds between progress events for one URL
+_PROGRESS_INTERVAL = 1.0
+
+# Results that count as done when a batch is resumed
+_DONE_STATUSES = ("downloaded", "skipped")
+
+
+def lane_for_url(url: str) -> str:
+    """Concurrency lane of a URL: its platform, or its host for unknown platforms."""
+    platform = get_platform_from_url(url)
+    if platform != "unknown":
+        return platform
+    return urlsplit(url).hostname or "unknown"
+
+
+def lane_concurrency(lane: str) -> int:
+    """Concurrent downloads allowed in a lane."""
+    return DOWNLOAD_CONCURRENCY.get(lane, DOWNLOAD_CONCURRENCY_DEFAULT)
+
+
+def _state_path(batch_id: str) -> str:
+    return os.path.join(BATCH_STATE_DIR, f"{batch_id}.json")
+
+
+def load_batch_state(batch_id: str) -> Optional[Dict[str, Any]]:
+    """Stored state of a batch (request, per-URL results, timestamps), or None."""
+    try:
+        with open(_state_path(batch_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(state: Dict[str, Any]) -> None:
+    """Write batch state atomically (a crash never leaves a truncated file)."""
+    os.makedirs(BATCH_STATE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=BATCH_STATE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, _state_path(state["batch_id"]))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def summarize(
+    urls: List[str],
+    results: Dict[str, Dict[str, Any]],
+    duration: float,
+    batch_id: Optional[str] = None,
+    resumed: int = 0
+) -> BatchDownloadResponse:
+    """Build the /batch-download response from per-URL results (in request order)."""
+    downloads = [
+        VideoDownloadResult(**results[url]) if url in results
+        else VideoDownloadResult(url=url, success=False, status="pending")
+        for url in urls
+    ]
+    return BatchDownloadResponse(
+        total=len(urls),
+        successful=sum(1 for d in downloads if d.status == "downloaded"),
+        failed=sum(1 for d in downloads if d.status == "failed"),
+        skipped=sum(1 for d in downloads if d.status == "skipped"),
+        downloads=downloads,
+        total_size=sum(d.file_size or 0 for d in downloads if d.success),
+        duration_seconds=round(duration, 2),
+        batch_id=batch_id,
+        resumed=resumed
+    )
+
+
+def _skipped(result: VideoDownloadResult, entry: Dict[str, Any]) -> VideoDownloadResult:
+    """Fill a result for a video found in the download manifest."""
+    result.success = True
+    result.status = "skipped"
+    result.title = entry.get("title")
+    result.filename = os.path.basename(entry["path"])
+    result.file_path = os.path.relpath(entry["path"], start=".")
+    result.file_size = entry["size"]
+    return result
+
+
+class BatchDownload:
+    """One run of a /batch-download request."""
+
+    def __init__(self, request: BatchDownloadRequest):
+        self.request = request
+        self.batch_id = request.batch_id or uuid.uuid4().hex[:16]
+        # Duplicate URLs are downloaded once
+        self.urls = list(dict.fromkeys(request.urls))
+        previous = load_batch_state(self.batch_id) if request.batch_id else None
+        self.results: Dict[str, Dict[str, Any]] = {
+            url: result for url, result in ((previous or {}).get("results") or {}).items()
+            if url in self.urls and result.get("status") in _DONE_STATUSES
+        }
+        self.resumed = len(self.results)
+        self.created_at = (previous or {}).get("created_at") or time.time()
+        self._started = time.time()
+        self._events: Optional[asyncio.Queue] = None
+        self._state_lock = asyncio.Lock()
+
+    def response(self) -> BatchDownloadResponse:
+        return summarize(
+            self.request.urls, self.results, time.time() - self._started, self.batch_id, self.resumed
+        )
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        if self._events is not None:
+            self._events.put_nowait(event)
+
+    async def _save_state(self) -> None:
+        state = {
+            "batch_id": self.batch_id,
+            "created_at": self.created_at,
+            "updated_at": time.time(),
+            "request": self.request.model_dump(),
+            "results": self.results,
+        }
+        async with self._state_lock:
+            await asyncio.to_thread(_write_state, state)
+
+    def _progress_hook(self, url: str):
+        """yt-dlp progress hook (runs in a pool thread) forwarding throttled progress events."""
+        loop = asyncio.get_running_loop()
+        last = {"time": 0.0}
+
+        def hook(status: Dict[str, Any]) -> None:
+            now = time.monotonic()
+            if status.get("status") != "downloading" or now - last["time"] < _PROGRESS_INTERVAL:
+                return
+            last["time"] = now
+            downloaded = status.get("downloaded_bytes") or 0
+            total = status.get("total_bytes") or status.get("total_bytes_estimate")
+            loop.call_soon_threadsafe(self._emit, {
+                "event": "progress",
+                "url": url,
+                "downloaded_bytes": downloaded,
+                "total_bytes": total,
+                "percent": round(downloaded * 100 / total, 1) if total else None,
+            })
+
+        return hook
+
+    async def _download_one(self, url: str) -> VideoDownloadResult:
+        """Download one URL (independent error handling - failures become a result)."""
+        request = self.request
+        result = VideoDownloadResult(url=url, success=False)
+        try:
+            result.platform = get_platform_prefix(url)
+
+            # Skip already downloaded videos without any network call
+            key = manifest_key(url) if request.keep else None
+            if key:
+                entry = await asyncio.to_thread(download_manifest.lookup, *key)
+                if entry:
+                    return _skipped(result, entry)
+
+            cookies_file = request.cookies_file if request.cookies_file and os.path.exists(request.cookies_file) else None
+            await rate_limit(url, cookies_file)
+
+            # Extract metadata without downloading
+            meta_opts = {'quiet': True, 'skip_download': True, 'extractor_args': YTDLP_EXTRACTOR_ARGS}
+            if cookies_file:
+                meta_opts['cookiefile'] = cookies_file
+
+            info = await ytdlp_extract_info(url, meta_opts)
+            title = info.get("title", "video")
+            result.title = title
+            filename = create_formatted_filename(url, title, "mp4", None)
+            result.filename = filename
+
+            # Set up output path (the video ID keeps same-titled videos that
+            # download concurrently from writing to the same file)
+            if request.keep:
+                base_filename = filename.rsplit('.', 1)[0]
+                output_template = os.path.join(DOWNLOADS_DIR, f"{base_filename}-%(id)s.%(ext)s")
+
+                # URLs whose ID can't be parsed locally are checked by the extracted ID
+                key = manifest_key(url, info)
+                entry = await asyncio.to_thread(download_manifest.lookup, *key) if key else None
+                # A file missing from the manifest is only adopted when its name
+                # carries this video's ID (a title match alone may be another video)
+                if entry is None and key and info.get("id"):
+                    expected_file = os.path.join(DOWNLOADS_DIR, f"{base_filename}-{info['id']}.mp4")
+                    if os.path.exists(expected_file):
+                        entry = await asyncio.to_thread(
+                            download_manifest.record_download, *key, url, expected_file, title
+                        )
+                if entry:
+                    return _skipped(result, entry)
+            else:
+                output_template = f"/tmp/{uuid.uuid4().hex[:8]}.%(ext)s"
+
+            ydl_opts = {
+                'format': request.format,
+                'outtmpl': output_template,
+                'quiet': True,
+                'merge_output_format': 'mp4',
+                'extractor_args': YTDLP_EXTRACTOR_ARGS,
+                'progress_hooks': [self._progress_hook(url)],
+            }
+            if cookies_file:
+                ydl_opts['cookiefile'] = cookies_file
+
+            downloaded = await ytdlp_extract_info(url, ydl_opts, download=True)
+
+            # Verify file exists (yt-dlp reports the final path, after merging)
+            actual_file_path = downloaded_filepath(downloaded)
+            if actual_file_path and os.path.exists(actual_file_path):
+                result.success = True
+                result.status = "downloaded"
+                if request.keep:
+                    result.filename = os.path.basename(actual_file_path)
+                result.file_path = os.path.relpath(actual_file_path, start=".") if request.keep else actual_file_path
+                result.file_size = os.path.getsize(actual_file_path)
+                if request.keep and key:
+                    await asyncio.to_thread(
+                        download_manifest.record_download, *key, url, actual_file_path, title
+                    )
+            else:
+                result.error = "Download completed but file not found"
+                result.status = "failed"
+        except Exception as e:
+            result.error = str(e)
+            result.status = "failed"
+        return result
+
+    async def _run_lane(self, lane: str, queue: "asyncio.Queue[str]") -> None:
+        """One lane worker: download queued URLs, pausing between them."""
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            self._emit({"event": "started", "url": url, "lane": lane})
+            result = await self._download_one(url)
+            self.results[url] = result.model_dump()
+            await self._save_state()
+            self._emit({
+                "event": "result",
+                "result": self.results[url],
+                "completed": len(self.results),
+                "total": len(self.urls),
+            })
+            # Delay between downloads (prevents rate limiting) - only this lane waits
+            if not queue.empty():
+                delay = random.randint(self.request.min_delay, max(self.request.min_delay, self.request.max_delay))
+                await asyncio.sleep(delay)
+
+    async def _run_all(self) -> None:
+        lanes: Dict[str, asyncio.Queue] = defaultdict(asyncio.Queue)
+        for url in self.urls:
+            if url not in self.results:
+                lanes[lane_for_url(url)].put_nowait(url)
+        os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+        await self._save_state()
+        await asyncio.gather(*(
+            self._run_lane(lane, queue)
+            for lane, queue in lanes.items()
+            for _ in range(min(lane_concurrency(lane), queue.qsize()))
+        ))
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the batch, yielding events as URLs start, progress and finish.
+
+        Events: start {batch_id, total, resumed}, started {url, lane},
+        progress {url, downloaded_bytes, total_bytes, percent},
+        result {result, completed, total} and done {summary}.
+        Closing the iterator early cancels the remaining downloads; the batch
+        can then be resumed with its batch_id.
+        """
+        self._events = asyncio.Queue()
+        yield {"event": "start", "batch_id": self.batch_id, "total": len(self.urls), "resumed": self.resumed}
+
+        task = asyncio.create_task(self._run_all())
+        task.add_done_callback(lambda _: self._events.put_nowait(None))
+        try:
+            while True:
+                event = await self._events.get()
+                if event is None:
+                    break
+                yield event
+            task.result()  # re-raise engine errors
+        finally:
+            task.cancel()
+        yield {"event": "done", "summary": self.response().model_dump()}
+
+    async def run(self) -> BatchDownloadResponse:
+        """Run the batch to completion and return the response."""
+        await self._run_all()
+        return self.response()
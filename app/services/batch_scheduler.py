@@ -0,0 +1,144 @@
+"""
+Concurrent scheduler for job batches.
+
+process_job_batch and process_screenshot_job_batch used to run their jobs one
+after another, so a batch of ten documents with platform subtitles took ten
+times the network latency although subtitle jobs never touch the GPU. A
+BatchScheduler runs all jobs of a batch concurrently and limits each kind of
+work separately instead:
+
+- "subtitle": platform subtitle lookups (network only)
+- "download": audio/video metadata + downloads
+- "db": Supabase database/storage calls (blocking clients, run in threads)
+- "audio_buffer": jobs holding downloaded audio that hasn't been transcribed
+  yet. Sized MAX_CONCURRENT_TRANSCRIPTIONS + BATCH_AUDIO_PREFETCH, so the next
+  jobs' audio downloads while the GPU is busy (download -> transcribe
+  pipeline) but prefetched audio can't pile up on disk
+- GPU transcription keeps using the global transcription_semaphore
+
+Per-class limits come from BATCH_CONCURRENCY (BATCH_*_CONCURRENCY settings).
+A job only holds a slot while it is in that stage, so a job waiting for the
+GPU doesn't block the next job's subtitle lookup. Per-platform request rates
+are still enforced by the rate limiter.
+
+Schedulers are created per batch, inside the event loop running the batch.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, AsyncIterator, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from app.config import BATCH_CONCURRENCY
+from app.utils.metrics_utils import supabase_timer
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchScheduler:
+    """Per-class concurrency limits for one batch of jobs."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            limits: Concurrency per class (defaults to BATCH_CONCURRENCY)
+        """
+        self.limits = dict(limits or BATCH_CONCURRENCY)
+        self._semaphores = {name: asyncio.Semaphore(max(1, n)) for name, n in self.limits.items()}
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        self.active = {name: 0 for name in self.limits}
+        self.peak = {name: 0 for name in self.limits}
+
+    @asynccontextmanager
+    async def slot(self, job_class: str) -> AsyncIterator[None]:
+        """
+        Hold one slot of a concurrency class for the duration of the block.
+
+        Args:
+            job_class: "subtitle", "download", "db" or "audio_buffer"
+        """
+        async with self._semaphores[job_class]:
+            self.active[job_class] += 1
+            self.peak[job_class] = max(self.peak[job_class], self.active[job_class])
+            try:
+                yield
+            finally:
+                self.active[job_class] -= 1
+
+    @asynccontextmanager
+    async def key_lock(self, key: str) -> AsyncIterator[None]:
+        """Serialize work on the same key (e.g. two jobs downloading one video)."""
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            yield
+
+    async def run_db(self, func: Callable[[], R]) -> R:
+        """Run a blocking database call in a worker thread under the "db" limit."""
+        async with self.slot("db"):
+            return await asyncio.to_thread(func)
+
+    async def run_all(self, items: Iterable[T], worker: Callable[[T], Awaitable[Any]]) -> List[Any]:
+        """
+        Run worker(item) for all items concurrently.
+
+        Returns:
+            Results in the same order as items (workers are expected to catch
+            their own errors and return a result dict)
+
+        Raises:
+            Exception: The first error a worker raised, once all workers finished
+        """
+        results = await asyncio.gather(*(worker(item) for item in items), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return list(results)
+
+
+async def run_db_call(
+    scheduler: Optional[BatchScheduler],
+    func: Callable[[], R],
+    operation: str = "query"
+) -> R:
+    """
+    Run a blocking database call, through the scheduler when one is active.
+
+    Without a scheduler (single job) the call runs inline, as before. The
+    call itself (not the wait for a "db" slot) is observed in
+    supabase_call_duration_seconds under `operation`.
+    """
+    def timed_call() -> R:
+        with supabase_timer(operation):
+            return func()
+
+    if scheduler is None:
+        return timed_call()
+    return await scheduler.run_db(timed_call)
+
+
+@asynccontextmanager
+async def scheduler_slot(
+    scheduler: Optional[BatchScheduler],
+    job_class: str,
+    key: Optional[str] = None
+) -> AsyncIterator[None]:
+    """
+    Hold a scheduler slot if a scheduler is active, otherwise do nothing.
+
+    Args:
+        scheduler: Active batch scheduler, or None
+        job_class: Concurrency class
+        key: Also serialize with other jobs using the same key (taken before
+             the slot, so waiting on a key doesn't occupy a slot)
+    """
+    if scheduler is None:
+        yield
+        return
+    if key is None:
+        async with scheduler.slot(job_class):
+            yield
+        return
+    async with scheduler.key_lock(key):
+        async with scheduler.slot(job_class):
+            yield
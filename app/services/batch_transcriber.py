@@ -0,0 +1,200 @@
+"""
+Cross-file batched WhisperX inference for short clips.
+
+WhisperX splits audio into <=30s speech chunks with VAD and runs them through
+the model batch_size at a time. A 30-second TikTok clip yields one or two
+chunks, so transcribing clips one file at a time leaves a batch of 16 almost
+empty. The batch transcriber packs the VAD chunks of several queued clips into
+one inference pass and splits the text back out per file:
+
+- Requests for the same pooled model arriving within BATCH_TRANSCRIBE_WINDOW_MS
+  (or until BATCH_TRANSCRIBE_MAX_FILES are queued) form one batch
+- VAD runs per file; the chunks of all files go through a single
+  model(...) pipeline call, in order, so outputs map back to (file, chunk)
+- Inference runs in a worker thread under the pooled model's lock, one batch
+  per model at a time
+- Only models pinned to a language (tokenizer set) are batched, because all
+  chunks of a batch are decoded with the same tokenizer
+
+Mirrors FasterWhisperPipeline.transcribe() from WhisperX (3.1 and 3.3+ VAD APIs).
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+
+from app.config import BATCH_TRANSCRIBE_WINDOW_MS, BATCH_TRANSCRIBE_MAX_FILES
+from app.services.model_pool import PooledModel
+
+
+SAMPLE_RATE = 16000
+
+# WhisperX merges VAD speech regions into chunks of at most this many seconds
+_CHUNK_SIZE = 30
+
+
+def can_batch(model: Any) -> bool:
+    """Whether a loaded WhisperX pipeline can take part in cross-file batches."""
+    return getattr(model, "tokenizer", None) is not None and hasattr(model, "vad_model")
+
+
+def _vad_chunks(model: Any, audio: Any) -> List[Dict[str, Any]]:
+    """Run the pipeline's VAD and merge speech regions into <=30s chunks."""
+    vad_model = model.vad_model
+    params = model._vad_params
+    if hasattr(vad_model, "preprocess_audio") and hasattr(vad_model, "merge_chunks"):
+        # WhisperX >= 3.3 (Pyannote/Silero VAD classes)
+        waveform = vad_model.preprocess_audio(audio)
+        merge_chunks = vad_model.merge_chunks
+    else:
+        import torch
+        from whisperx.vad import merge_chunks
+        waveform = torch.from_numpy(audio).unsqueeze(0)
+
+    segments = vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+    return merge_chunks(segments, _CHUNK_SIZE, onset=params["vad_onset"], offset=params["vad_offset"])
+
+
+def transcribe_batch(model: Any, audios: List[Any], batch_size: int = 16) -> List[Dict[str, Any]]:
+    """
+    Transcribe several audio arrays in one inference pass (blocking).
+
+    Args:
+        model: WhisperX pipeline with a fixed language (see can_batch)
+        audios: 16 kHz mono float arrays, one per file
+        batch_size: Chunks per forward pass
+
+    Returns:
+        One WhisperX-style result per input: {"segments": [...], "language": ...}
+    """
+    chunks: List[Tuple[int, Dict[str, Any]]] = []
+    for index, audio in enumerate(audios):
+        for chunk in _vad_chunks(model, audio):
+            chunks.append((index, chunk))
+
+    def inputs():
+        for index, chunk in chunks:
+            start = int(chunk["start"] * SAMPLE_RATE)
+            end = int(chunk["end"] * SAMPLE_RATE)
+            yield {"inputs": audios[index][start:end]}
+
+    language = model.tokenizer.language_code
+    results = [{"segments": [], "language": language} for _ in audios]
+    outputs = model(inputs(), batch_size=batch_size, num_workers=0)
+    for (index, chunk), output in zip(chunks, outputs):
+        text = output["text"]
+        if batch_size in [0, 1, None]:
+            text = text[0]
+        results[index]["segments"].append({
+            "text": text,
+            "start": round(chunk["start"], 3),
+            "end": round(chunk["end"], 3)
+        })
+    return results
+
+
+@dataclass
+class _Request:
+    audio: Any
+    future: asyncio.Future
+
+
+class BatchTranscriber:
+    """Collects short-clip requests per model and runs them as shared batches."""
+
+    def __init__(self, window_ms: int = BATCH_TRANSCRIBE_WINDOW_MS, max_files: int = BATCH_TRANSCRIBE_MAX_FILES):
+        self.window = max(0, window_ms) / 1000.0
+        self.max_files = max(1, max_files)
+        self._pending: Dict[Tuple[int, int, int], List[_Request]] = {}
+        # The loop only keeps weak references to tasks - hold running batches here
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {
+            "batches": 0,
+            "files": 0,
+            "errors": 0,
+            "max_files_per_batch": 0,
+            "total_inference_seconds": 0.0,
+        }
+
+    async def transcribe(self, pooled: PooledModel, audio: Any, batch_size: int = 16) -> Dict[str, Any]:
+        """
+        Transcribe one clip, sharing an inference batch with other queued clips.
+
+        Args:
+            pooled: Pooled WhisperX model (see can_batch)
+            audio: 16 kHz mono float array
+            batch_size: Chunks per forward pass
+
+        Returns:
+            {"segments": [...], "language": ...} for this clip
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), id(pooled), batch_size)
+        request = _Request(audio=audio, future=loop.create_future())
+
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = []
+            loop.call_later(self.window, self._flush, key, group, pooled, batch_size)
+        group.append(request)
+        if len(group) >= self.max_files:
+            self._flush(key, group, pooled, batch_size)
+
+        return await request.future
+
+    def _flush(self, key: Tuple[int, int, int], group: List[_Request], pooled: PooledModel, batch_size: int) -> None:
+        # The window timer of a group that was already flushed (max_files) is a no-op
+        if self._pending.get(key) is not group:
+            return
+        del self._pending[key]
+        task = asyncio.ensure_future(self._run(group, pooled, batch_size))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"WARNING: Batched transcription task failed: {str(task.exception())}")
+
+    async def _run(self, group: List[_Request], pooled: PooledModel, batch_size: int) -> None:
+        audios = [request.audio for request in group]
+
+        def work() -> List[Dict[str, Any]]:
+            with pooled.lock:
+                return transcribe_batch(pooled.model, audios, batch_size)
+
+        start = time.time()
+        try:
+            results = await asyncio.to_thread(work)
+        except Exception as e:
+            self._stats["errors"] += 1
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        self._stats["batches"] += 1
+        self._stats["files"] += len(group)
+        self._stats["max_files_per_batch"] = max(self._stats["max_files_per_batch"], len(group))
+        self._stats["total_inference_seconds"] += time.time() - start
+        if len(group) > 1:
+            print(f"INFO: Batched transcription of {len(group)} clips in {time.time() - start:.1f}s")
+
+        for request, result in zip(group, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counts, files per batch and inference time."""
+        stats = dict(self._stats)
+        stats["queued"] = sum(len(group) for group in self._pending.values())
+        stats["avg_files_per_batch"] = round(stats["files"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["total_inference_seconds"] = round(stats["total_inference_seconds"], 3)
+        stats["window_ms"] = int(self.window * 1000)
+        stats["max_files"] = self.max_files
+        return stats
+
+
+# Process-wide batch transcriber
+batch_transcriber = BatchTranscriber()
@@ -0,0 +1,336 @@
+"""
+Persistent index of files stored in CACHE_DIR.
+
+Lookups used to walk os.listdir(CACHE_DIR/<category>) and substring-match every
+filename. This module keeps an SQLite index (CACHE_DIR/cache_index.sqlite3)
+mapping (platform, video_id, kind, format) to path, size, mtime, last access
+and hit count, so lookups stay O(1) with tens of thousands of cached files.
+
+- Writers call record_file() after a file lands in the cache
+- Readers call lookup(), which verifies the file still exists and refreshes
+  its last access time
+- Eviction walks list_entries() in LRU/LFU order and calls remove_path()
+- Files already on disk when the index is first created are registered by a
+  one-time bootstrap scan
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from app.config import CACHE_DIR
+from app.utils.metrics_utils import record_cache_lookup
+
+
+INDEX_PATH = os.path.join(CACHE_DIR, "cache_index.sqlite3")
+
+# Cache subdirectory -> entry kind
+CATEGORY_KINDS = {
+    "videos": "video",
+    "audio": "audio",
+    "screenshots": "screenshot",
+    "transcriptions": "transcription",
+}
+KIND_CATEGORIES = {kind: category for category, kind in CATEGORY_KINDS.items()}
+
+# Filename prefix (see get_platform_prefix) -> platform name
+_PREFIX_PLATFORMS = {
+    "YT": "youtube",
+    "TT": "tiktok",
+    "IG": "instagram",
+    "FB": "facebook",
+    "X": "twitter",
+    "VM": "vimeo",
+    "DM": "dailymotion",
+    "TW": "twitch",
+    "VIDEO": "unknown",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    platform TEXT,
+    video_id TEXT,
+    format TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    mtime REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_cache_lookup
+    ON cache_entries (video_id, kind, platform, format);
+CREATE INDEX IF NOT EXISTS idx_cache_category_access
+    ON cache_entries (category, last_access);
+CREATE TABLE IF NOT EXISTS cache_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_local = threading.local()
+_bootstrap_lock = threading.Lock()
+_bootstrapped_paths = set()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection to the index, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == INDEX_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(INDEX_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = INDEX_PATH
+
+    with _bootstrap_lock:
+        if INDEX_PATH not in _bootstrapped_paths:
+            _bootstrap(conn)
+            _bootstrapped_paths.add(INDEX_PATH)
+    return conn
+
+
+def parse_cache_filename(category: str, filename: str) -> Dict[str, Optional[str]]:
+    """
+    Derive platform, video_id and format from a cache filename.
+
+    Naming conventions:
+    - videos: {PREFIX}-{video_id}.{ext} (e.g. YT-dQw4w9WgXcQ.mp4)
+    - screenshots: {video_id}-{timestamp_ms}.jpg
+    - audio/transcriptions: {uid or key}.{ext} (no video_id)
+    """
+    stem, _, ext = filename.rpartition(".")
+    if not stem:
+        stem, ext = filename, ""
+
+    platform = None
+    video_id = None
+
+    if category == "videos" and "-" in stem:
+        prefix, rest = stem.split("-", 1)
+        if prefix in _PREFIX_PLATFORMS:
+            platform = _PREFIX_PLATFORMS[prefix]
+            video_id = rest
+    elif category == "screenshots" and "-" in stem:
+        video_id = stem.rsplit("-", 1)[0]
+
+    return {"platform": platform, "video_id": video_id, "format": ext or None}
+
+
+def _bootstrap(conn: sqlite3.Connection) -> None:
+    """Register files that were cached before the index existed (runs once per index)."""
+    row = conn.execute("SELECT value FROM cache_meta WHERE key = 'bootstrapped'").fetchone()
+    if row:
+        return
+
+    count = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for category, kind in CATEGORY_KINDS.items():
+            dir_path = os.path.join(CACHE_DIR, category)
+            if not os.path.isdir(dir_path):
+                continue
+            for entry in os.scandir(dir_path):
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                stat = entry.stat()
+                parsed = parse_cache_filename(category, entry.name)
+                conn.execute(
+                    "INSERT OR IGNORE INTO cache_entries "
+                    "(path, category, kind, platform, video_id, format, size, mtime, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (entry.path, category, kind, parsed["platform"], parsed["video_id"],
+                     parsed["format"], stat.st_size, stat.st_mtime, stat.st_mtime)
+                )
+                count += 1
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('bootstrapped', ?)",
+            (str(time.time()),)
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    if count:
+        print(f"INFO: Cache index bootstrapped with {count} existing file(s)")
+
+
+def record_file(
+    path: str,
+    kind: str,
+    platform: Optional[str] = None,
+    video_id: Optional[str] = None,
+    fmt: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Register (or refresh) a cached file in the index.
+
+    Args:
+        path: Path to the cached file
+        kind: Entry kind (video, audio, screenshot, transcription)
+        platform: Platform name (youtube, tiktok, ...)
+        video_id: Platform video ID, if known
+        fmt: File format/extension (defaults to the path's extension)
+
+    Returns:
+        The stored entry, or None if the file doesn't exist or indexing failed
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    category = KIND_CATEGORIES.get(kind, kind)
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".") or None
+    now = time.time()
+
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT INTO cache_entries "
+            "(path, category, kind, platform, video_id, format, size, mtime, last_access, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0) "
+            "ON CONFLICT(path) DO UPDATE SET "
+            "category = excluded.category, kind = excluded.kind, "
+            "platform = COALESCE(excluded.platform, cache_entries.platform), "
+            "video_id = COALESCE(excluded.video_id, cache_entries.video_id), "
+            "format = excluded.format, size = excluded.size, mtime = excluded.mtime, "
+            "last_access = excluded.last_access",
+            (path, category, kind, platform, video_id, fmt, stat.st_size, stat.st_mtime, now)
+        )
+    except sqlite3.Error as e:
+        print(f"WARNING: Cache index write failed for {path}: {str(e)}")
+        return None
+
+    return {
+        "path": path, "category": category, "kind": kind, "platform": platform,
+        "video_id": video_id, "format": fmt, "size": stat.st_size,
+        "mtime": stat.st_mtime, "last_access": now
+    }
+
+
+def lookup(
+    video_id: str,
+    kind: str,
+    platform: Optional[str] = None,
+    fmt: Optional[str] = None,
+    touch: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Find the newest cached file for a video.
+
+    Entries whose file has disappeared are dropped from the index.
+
+    Args:
+        video_id: Platform video ID
+        kind: Entry kind (video, audio, screenshot, transcription)
+        platform: Optional platform filter
+        fmt: Optional format filter
+        touch: Refresh last_access and hit count on a hit
+
+    Returns:
+        Entry dict (path, size, mtime, last_access, hits, ...) or None
+    """
+    query = "SELECT * FROM cache_entries WHERE video_id = ? AND kind = ?"
+    params: List[Any] = [video_id, kind]
+    if platform:
+        query += " AND platform = ?"
+        params.append(platform)
+    if fmt:
+        query += " AND format = ?"
+        params.append(fmt)
+    query += " ORDER BY mtime DESC"
+
+    try:
+        conn = _connect()
+        rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error as e:
+        print(f"WARNING: Cache index lookup failed: {str(e)}")
+        return None
+
+    for row in rows:
+        if not os.path.exists(row["path"]):
+            remove_path(row["path"])
+            continue
+        record_cache_lookup(kind, hit=True)
+        entry = dict(row)
+        if touch:
+            entry["last_access"] = time.time()
+            entry["hits"] += 1
+            try:
+                conn.execute(
+                    "UPDATE cache_entries SET last_access = ?, hits = hits + 1 WHERE path = ?",
+                    (entry["last_access"], entry["path"])
+                )
+            except sqlite3.Error:
+                pass
+        return entry
+    record_cache_lookup(kind, hit=False)
+    return None
+
+
+def remove_path(path: str) -> None:
+    """Drop a file from the index (call after deleting it)."""
+    try:
+        _connect().execute("DELETE FROM cache_entries WHERE path = ?", (path,))
+    except sqlite3.Error as e:
+        print(f"WARNING: Cache index delete failed for {path}: {str(e)}")
+
+
+def record_existing(path: str, category: str) -> Optional[Dict[str, Any]]:
+    """Register a file found on disk but missing from the index, using its filename."""
+    parsed = parse_cache_filename(category, os.path.basename(path))
+    return record_file(
+        path, CATEGORY_KINDS.get(category, category),
+        parsed["platform"], parsed["video_id"], parsed["format"]
+    )
+
+
+def indexed_paths(category: str) -> Set[str]:
+    """Return the set of indexed paths in a category."""
+    rows = _connect().execute(
+        "SELECT path FROM cache_entries WHERE category = ?", (category,)
+    ).fetchall()
+    return {row["path"] for row in rows}
+
+
+def list_entries(category: Optional[str] = None, order: str = "lru") -> List[Dict[str, Any]]:
+    """
+    Return indexed entries in eviction order.
+
+    Args:
+        category: Optional category filter
+        order: "lru" (least recently accessed first) or
+               "lfu" (fewest hits first, ties by least recent access)
+    """
+    query = "SELECT * FROM cache_entries"
+    params: List[Any] = []
+    if category:
+        query += " WHERE category = ?"
+        params.append(category)
+    if order == "lfu":
+        query += " ORDER BY hits ASC, last_access ASC"
+    else:
+        query += " ORDER BY last_access ASC"
+    return [dict(row) for row in _connect().execute(query, params).fetchall()]
+
+
+def category_totals() -> Dict[str, Dict[str, int]]:
+    """Return file count and bytes per category from the index."""
+    totals = {category: {"files": 0, "bytes": 0} for category in CATEGORY_KINDS}
+    rows = _connect().execute(
+        "SELECT category, COUNT(*) AS files, COALESCE(SUM(size), 0) AS bytes "
+        "FROM cache_entries GROUP BY category"
+    ).fetchall()
+    for row in rows:
+        totals[row["category"]] = {"files": row["files"], "bytes": row["bytes"]}
+    return totals
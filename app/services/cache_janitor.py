@@ -0,0 +1,221 @@
+"""
+Background cache janitor.
+
+Cache cleanup used to run synchronously at the start of /extract-audio,
+/subtitles, /screenshot/video and every transcription, walking all four cache
+directories inside async handlers. The janitor moves that work off the
+request path:
+
+- Each tick sweeps ONE category (round robin) via sweep_cache_category(), so
+  no single pass stats the whole cache
+- Byte budgets are checked for EVERY category on each tick (one indexed query
+  on the cache index), so a burst of downloads can't overfill the volume while
+  its category waits for its turn in the rotation
+- In the API the loop is an asyncio task started from the main.py lifespan and
+  sweeps run in a worker thread (asyncio.to_thread)
+- Expired entries of the on-disk info store (CACHE_DIR/info) are pruned once
+  per full rotation
+- Processes without an event loop (RunPod handler) use start_janitor_thread()
+- get_janitor_status() exposes last-run stats for /cache/janitor/status
+"""
+
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.config import CACHE_JANITOR_ENABLED, CACHE_JANITOR_INTERVAL
+from app.services.cache_service import CACHE_CATEGORIES, enforce_cache_budgets, sweep_cache_category
+from app.services.info_cache import prune_info_store
+
+
+_janitor_task: Optional[asyncio.Task] = None
+_janitor_shutdown_event: Optional[asyncio.Event] = None
+_janitor_thread: Optional[threading.Thread] = None
+_janitor_thread_stop: Optional[threading.Event] = None
+
+_stats_lock = threading.Lock()
+_next_category = 0
+_janitor_stats: Dict[str, Any] = {
+    "sweeps": 0,
+    "errors": 0,
+    "total_deleted": 0,
+    "total_evicted": 0,
+    "total_freed_bytes": 0,
+    "info_pruned": 0,
+    "last_run": None,
+    "last_error": None,
+    "categories": {},
+}
+
+
+def run_janitor_tick() -> Dict[str, Any]:
+    """
+    Sweep the next cache category, enforce every category's byte budget and record stats.
+
+    Blocking; call from a worker thread when inside an event loop.
+
+    Returns:
+        Stats for this sweep (category, deleted, evicted, freed_bytes, scanned,
+        budget_evicted and budget_evicted_bytes for the other categories, duration)
+    """
+    global _next_category
+
+    with _stats_lock:
+        category = CACHE_CATEGORIES[_next_category % len(CACHE_CATEGORIES)]
+        _next_category += 1
+
+    if category == CACHE_CATEGORIES[0]:
+        try:
+            pruned = prune_info_store()
+            with _stats_lock:
+                _janitor_stats["info_pruned"] += pruned
+        except Exception as e:
+            print(f"WARNING: Cache janitor failed to prune info store: {str(e)}")
+
+    start = time.time()
+    try:
+        result = sweep_cache_category(category)
+    except Exception as e:
+        with _stats_lock:
+            _janitor_stats["errors"] += 1
+            _janitor_stats["last_error"] = f"{category}: {str(e)}"
+        print(f"WARNING: Cache janitor sweep of '{category}' failed: {str(e)}")
+        return {"category": category, "error": str(e)}
+
+    # The swept category's budget was enforced by the sweep; check the others too
+    try:
+        budgets = enforce_cache_budgets(categories=[c for c in CACHE_CATEGORIES if c != category])
+    except Exception as e:
+        budgets = {"evicted": {}, "evicted_bytes": 0}
+        with _stats_lock:
+            _janitor_stats["errors"] += 1
+            _janitor_stats["last_error"] = f"budgets: {str(e)}"
+        print(f"WARNING: Cache janitor budget check failed: {str(e)}")
+    budget_evicted = sum(budgets["evicted"].values())
+
+    run = {
+        "category": category,
+        **result,
+        "budget_evicted": budget_evicted,
+        "budget_evicted_bytes": budgets["evicted_bytes"],
+        "duration": round(time.time() - start, 3),
+        "finished_at": datetime.now().isoformat(),
+    }
+
+    with _stats_lock:
+        _janitor_stats["sweeps"] += 1
+        _janitor_stats["total_deleted"] += result["deleted"]
+        _janitor_stats["total_evicted"] += result["evicted"] + budget_evicted
+        _janitor_stats["total_freed_bytes"] += result["freed_bytes"] + budgets["evicted_bytes"]
+        _janitor_stats["last_run"] = run
+        _janitor_stats["categories"][category] = run
+
+    if result["deleted"] or result["evicted"]:
+        print(
+            f"INFO: Cache janitor swept {category}: deleted {result['deleted']}, "
+            f"evicted {result['evicted']}, freed {result['freed_bytes']} bytes"
+        )
+    return run
+
+
+async def _janitor_loop() -> None:
+    """Run one incremental sweep every CACHE_JANITOR_INTERVAL seconds until shutdown."""
+    while not _janitor_shutdown_event.is_set():
+        await asyncio.to_thread(run_janitor_tick)
+        try:
+            await asyncio.wait_for(_janitor_shutdown_event.wait(), timeout=CACHE_JANITOR_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_janitor() -> None:
+    """Start the background janitor task (no-op if disabled or already running)."""
+    global _janitor_task, _janitor_shutdown_event
+
+    if not CACHE_JANITOR_ENABLED:
+        print("INFO: Cache janitor disabled (CACHE_JANITOR_ENABLED=false)")
+        return
+    if _janitor_task is not None and not _janitor_task.done():
+        return
+
+    _janitor_shutdown_event = asyncio.Event()
+    _janitor_task = asyncio.create_task(_janitor_loop())
+    print(f"INFO: Cache janitor started (one category sweep + budget check every {CACHE_JANITOR_INTERVAL}s)")
+
+
+async def stop_janitor() -> None:
+    """Signal the janitor to stop and wait for an in-flight sweep to finish."""
+    global _janitor_task, _janitor_shutdown_event
+
+    if _janitor_task is None:
+        return
+
+    _janitor_shutdown_event.set()
+    try:
+        await asyncio.wait_for(_janitor_task, timeout=30)
+    except asyncio.TimeoutError:
+        _janitor_task.cancel()
+        try:
+            await _janitor_task
+        except asyncio.CancelledError:
+            pass
+
+    _janitor_task = None
+    _janitor_shutdown_event = None
+    print("INFO: Cache janitor stopped")
+
+
+def start_janitor_thread() -> bool:
+    """
+    Start the janitor in a daemon thread for processes without an event loop.
+
+    Returns:
+        True if started, False if disabled or already running
+    """
+    global _janitor_thread, _janitor_thread_stop
+
+    if not CACHE_JANITOR_ENABLED:
+        return False
+    if _janitor_thread is not None and _janitor_thread.is_alive():
+        return False
+
+    _janitor_thread_stop = threading.Event()
+
+    def _run(stop: threading.Event) -> None:
+        while not stop.is_set():
+            run_janitor_tick()
+            stop.wait(CACHE_JANITOR_INTERVAL)
+
+    _janitor_thread = threading.Thread(
+        target=_run, args=(_janitor_thread_stop,), name="cache-janitor", daemon=True
+    )
+    _janitor_thread.start()
+    return True
+
+
+def get_janitor_status() -> Dict[str, Any]:
+    """
+    Get janitor status for monitoring.
+
+    Returns:
+        Dict with running state, configuration and sweep stats
+    """
+    running = (
+        (_janitor_task is not None and not _janitor_task.done())
+        or (_janitor_thread is not None and _janitor_thread.is_alive())
+    )
+    with _stats_lock:
+        stats = {
+            **_janitor_stats,
+            "categories": dict(_janitor_stats["categories"]),
+        }
+
+    return {
+        "running": running,
+        "enabled": CACHE_JANITOR_ENABLED,
+        "interval_seconds": CACHE_JANITOR_INTERVAL,
+        "full_pass_seconds": CACHE_JANITOR_INTERVAL * len(CACHE_CATEGORIES),
+        "stats": stats,
+    }
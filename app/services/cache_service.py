@@ -2,22 +2,41 @@
 Cache service module for managing temporary files.
 
 This module provides utilities for:
-- Finding cached videos by video_id
+- Finding cached videos by video_id (via the persistent cache index)
+- Resolving and indexing files written to the cache by yt-dlp
 - Checking video cache status with expiration details
 - Cleaning up expired cache files
+- Enforcing per-category size budgets with LRU/LFU eviction
 - Managing transcription file cleanup
 """
 
 import os
+import glob
+import asyncio
 import time
-import subprocess
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from app.config import (
     CACHE_DIR,
     CACHE_TTL_HOURS,
+    CACHE_MAX_BYTES,
+    CACHE_EVICTION_POLICY,
     TRANSCRIPTIONS_DIR,
     YTDLP_BINARY
 )
+from app.services import cache_index
+from app.services.info_cache import peek_video_info
+from app.utils.process_utils import run_process
+from app.utils.platform_utils import parse_video_url
+
+
+# Entries accessed this recently are skipped by budget eviction so a file
+# that was just downloaded or served is not deleted while still in use
+EVICTION_GRACE_SECONDS = 60
+
+CACHE_CATEGORIES = ["videos", "audio", "transcriptions", "screenshots"]
+
+# Partial/temporary files written by yt-dlp and atomic writers
+_PARTIAL_SUFFIXES = (".part", ".ytdl", ".tmp")
 
 
 def get_cached_video(video_id: str) -> Optional[str]:
@@ -38,25 +57,54 @@ def get_cached_video(video_id: str) -> Optional[str]:
         >>> if cached_path:
         ...     print(f"Using cached video: {cached_path}")
     """
-    cache_dir = os.path.join(CACHE_DIR, "videos")
-    if not os.path.exists(cache_dir):
+    entry = cache_index.lookup(video_id, "video")
+    if not entry:
         return None
 
-    for filename in os.listdir(cache_dir):
-        if f"-{video_id}." in filename:
-            filepath = os.path.join(cache_dir, filename)
-            age_hours = (time.time() - os.path.getmtime(filepath)) / 3600
-            if age_hours < CACHE_TTL_HOURS:
-                return filepath  # Fresh, reuse it
+    age_hours = (time.time() - entry["mtime"]) / 3600
+    if age_hours < CACHE_TTL_HOURS:
+        return entry["path"]  # Fresh, reuse it
     return None
 
 
-def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
+def find_cached_output(
+    directory: str,
+    stem: str,
+    expected_exts: Iterable[str] = ()
+) -> Optional[str]:
+    """
+    Locate a file yt-dlp wrote as {stem}.{ext} without listing the directory.
+
+    Expected extensions are probed with a direct stat first; a glob on the
+    stem is only used when yt-dlp picked an unexpected container.
+
+    Args:
+        directory: Cache subdirectory the file was written to
+        stem: Output filename without extension
+        expected_exts: Extensions to try first (e.g. ["mp3"], ["mp4", "webm"])
+
+    Returns:
+        Path to the file, or None if nothing matches
+    """
+    for ext in expected_exts:
+        candidate = os.path.join(directory, f"{stem}.{ext}")
+        if os.path.isfile(candidate):
+            return candidate
+
+    matches = [
+        path for path in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(stem)}.*"))
+        if not path.endswith(_PARTIAL_SUFFIXES)
+    ]
+    return matches[0] if matches else None
+
+
+async def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
     """
     Check if a video is cached and provide detailed cache status.
 
-    Extracts the video ID from the URL using yt-dlp, checks if the video
-    is in the cache, and calculates cache age and expiration time.
+    Resolves the video ID locally (URL parsing, then the info cache) and only
+    falls back to spawning yt-dlp --get-id for URLs it can't parse. Checks if
+    the video is in the cache and calculates cache age and expiration time.
 
     Args:
         video_url: URL of the video to check
@@ -74,14 +122,32 @@ def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
     try:
         logger.info(f"Extracting video ID from URL: {video_url}")
 
-        result = subprocess.run(
-            [YTDLP_BINARY, '--get-id', video_url],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        video_id = None
+        parsed = parse_video_url(video_url)
+        if parsed:
+            video_id = parsed[1]
+        else:
+            info = peek_video_info(video_url)
+            if info:
+                video_id = info.get("id")
 
-        if result.returncode != 0:
+        if video_id:
+            result = None
+        else:
+            result = await run_process([YTDLP_BINARY, '--get-id', video_url], timeout=30)
+
+        if result and result.timed_out:
+            logger.error("Video ID extraction timed out")
+            return {
+                "cached": False,
+                "cache_path": None,
+                "cache_age_seconds": None,
+                "expires_in_seconds": None,
+                "video_id": None,
+                "error": "Video ID extraction timed out"
+            }
+
+        if result and result.returncode != 0:
             logger.error(f"Failed to extract video ID: {result.stderr}")
             return {
                 "cached": False,
@@ -92,10 +158,11 @@ def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
                 "error": f"Failed to extract video ID: {result.stderr.strip()}"
             }
 
-        video_id = result.stdout.strip()
+        if result:
+            video_id = result.stdout.strip()
         logger.info(f"Video ID extracted: {video_id}")
 
-        cached_path = get_cached_video(video_id)
+        cached_path = await asyncio.to_thread(get_cached_video, video_id)
 
         if cached_path:
             cache_mtime = os.path.getmtime(cached_path)
@@ -125,16 +192,6 @@ def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
                 "error": None
             }
 
-    except subprocess.TimeoutExpired:
-        logger.error("Video ID extraction timed out")
-        return {
-            "cached": False,
-            "cache_path": None,
-            "cache_age_seconds": None,
-            "expires_in_seconds": None,
-            "video_id": None,
-            "error": "Video ID extraction timed out"
-        }
     except Exception as e:
         logger.error(f"Cache check error: {str(e)}")
         return {
@@ -147,41 +204,163 @@ def check_video_cache_status(video_url: str, logger) -> Dict[str, Any]:
         }
 
 
-def cleanup_cache() -> Dict[str, int]:
+def enforce_cache_budgets(
+    policy: Optional[str] = None,
+    categories: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
     """
-    Delete all cached files older than TTL.
+    Evict cached files until every category is within its byte budget.
+
+    Budgets come from CACHE_MAX_{VIDEOS,AUDIO,SCREENSHOTS,TRANSCRIPTIONS}_MB
+    (0 = unlimited). Entries are evicted in LRU order (last access) or LFU
+    order (hit count, then last access). Entries touched within the last
+    EVICTION_GRACE_SECONDS are skipped so in-flight files survive.
 
-    Iterates through all cache subdirectories (videos, audio, transcriptions, screenshots)
-    and removes files that have exceeded the configured TTL.
+    Args:
+        policy: "lru" or "lfu" (defaults to CACHE_EVICTION_POLICY)
+        categories: Categories to check (defaults to all)
 
     Returns:
         Dictionary containing:
-        - deleted: Count of files deleted per category
-        - total_deleted: Total number of files deleted
+        - evicted: Count of files evicted per category
+        - evicted_bytes: Total bytes evicted
+        - over_budget: Categories still above budget after eviction
+    """
+    policy = policy or CACHE_EVICTION_POLICY
+    categories = list(categories) if categories is not None else list(CACHE_MAX_BYTES)
+    evicted = {category: 0 for category in categories}
+    evicted_bytes = 0
+    over_budget = []
+
+    totals = cache_index.category_totals()
+    now = time.time()
+
+    for category in categories:
+        budget = CACHE_MAX_BYTES.get(category, 0)
+        used = totals.get(category, {}).get("bytes", 0)
+        if budget <= 0 or used <= budget:
+            continue
+
+        for entry in cache_index.list_entries(category, order=policy):
+            if used <= budget:
+                break
+            if now - entry["last_access"] < EVICTION_GRACE_SECONDS:
+                continue
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"WARNING: Failed to evict {entry['path']}: {str(e)}")
+                continue
+            cache_index.remove_path(entry["path"])
+            used -= entry["size"]
+            evicted[category] += 1
+            evicted_bytes += entry["size"]
+
+        if used > budget:
+            over_budget.append(category)
+            print(f"WARNING: Cache category '{category}' still over budget ({used} > {budget} bytes)")
+        elif evicted[category]:
+            print(f"INFO: Evicted {evicted[category]} file(s) from cache/{category} ({policy})")
+
+    return {
+        "evicted": evicted,
+        "evicted_bytes": evicted_bytes,
+        "over_budget": over_budget
+    }
+
+
+def sweep_cache_category(category: str) -> Dict[str, int]:
+    """
+    Run one incremental cleanup pass over a single cache subdirectory.
+
+    Deletes files older than TTL, reconciles the cache index with what is on
+    disk (registering unindexed files, dropping entries for vanished ones),
+    then evicts from the category if it is over its size budget.
+
+    Args:
+        category: Cache subdirectory (videos, audio, transcriptions, screenshots)
+
+    Returns:
+        Dictionary with deleted, evicted, freed_bytes and scanned counts
+    """
+    cutoff = time.time() - (CACHE_TTL_HOURS * 3600)
+    deleted = 0
+    freed_bytes = 0
+    scanned = 0
+
+    dir_path = os.path.join(CACHE_DIR, category)
+    if os.path.exists(dir_path):
+        indexed = cache_index.indexed_paths(category)
+        seen = set()
+        for entry in os.scandir(dir_path):
+            if not entry.is_file():
+                continue
+            scanned += 1
+            try:
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    os.remove(entry.path)
+                    cache_index.remove_path(entry.path)
+                    freed_bytes += stat.st_size
+                    deleted += 1
+                    continue
+            except FileNotFoundError:
+                continue
+            seen.add(entry.path)
+            # Register files written by paths that don't record themselves
+            if entry.path not in indexed and not entry.name.endswith(_PARTIAL_SUFFIXES):
+                cache_index.record_existing(entry.path, category)
+
+        # Drop index entries for files removed outside the cache manager
+        for path in indexed - seen:
+            cache_index.remove_path(path)
+
+    budget_result = enforce_cache_budgets(categories=[category])
+
+    return {
+        "deleted": deleted,
+        "evicted": budget_result["evicted"][category],
+        "freed_bytes": freed_bytes + budget_result["evicted_bytes"],
+        "scanned": scanned
+    }
+
+
+def cleanup_cache() -> Dict[str, Any]:
+    """
+    Delete cached files older than TTL and enforce per-category size budgets.
+
+    Runs sweep_cache_category() over every cache subdirectory (videos, audio,
+    transcriptions, screenshots). Request handlers don't call this; the cache
+    janitor sweeps in the background and /cache/cleanup triggers a full pass.
+
+    Returns:
+        Dictionary containing:
+        - deleted: Count of expired files deleted per category
+        - total_deleted: Total number of files deleted (expired + evicted)
         - freed_bytes: Total disk space freed in bytes
+        - evicted: Count of files evicted per category to meet budgets
 
     Example:
         >>> result = cleanup_cache()
         >>> print(f"Deleted {result['total_deleted']} files, freed {result['freed_bytes']} bytes")
     """
-    cutoff = time.time() - (CACHE_TTL_HOURS * 3600)
-    deleted = {"videos": 0, "audio": 0, "transcriptions": 0, "screenshots": 0}
+    deleted = {}
+    evicted = {}
     freed_bytes = 0
 
-    for subdir in deleted.keys():
-        dir_path = os.path.join(CACHE_DIR, subdir)
-        if os.path.exists(dir_path):
-            for filename in os.listdir(dir_path):
-                filepath = os.path.join(dir_path, filename)
-                if os.path.isfile(filepath) and os.path.getmtime(filepath) < cutoff:
-                    freed_bytes += os.path.getsize(filepath)
-                    os.remove(filepath)
-                    deleted[subdir] += 1
+    for category in CACHE_CATEGORIES:
+        result = sweep_cache_category(category)
+        deleted[category] = result["deleted"]
+        evicted[category] = result["evicted"]
+        freed_bytes += result["freed_bytes"]
 
     return {
         "deleted": deleted,
-        "total_deleted": sum(deleted.values()),
-        "freed_bytes": freed_bytes
+        "total_deleted": sum(deleted.values()) + sum(evicted.values()),
+        "freed_bytes": freed_bytes,
+        "evicted": evicted
     }
 
 
@@ -0,0 +1,161 @@
+"""
+Persistent manifest of videos saved to DOWNLOADS_DIR.
+
+/batch-download used to find out whether a URL was already downloaded by
+running a full yt-dlp extract_info (to learn the title), building the
+formatted filename and checking os.path.exists - a network round trip per
+URL just to skip it, and a miss whenever the title changed. This module keeps
+an SQLite manifest (DOWNLOADS_DIR/.download_manifest.sqlite3) keyed by
+(platform, video_id), where platform is the lowercased yt-dlp extractor key
+(youtube, tiktok, ...), so the check becomes a local lookup:
+
+- Callers parse the key from the URL with parse_video_url() (no network) and
+  call lookup(); URLs that can't be parsed locally use the info dict's
+  extractor_key/id after extraction
+- Writers call record_download() once a file with keep=True lands in
+  DOWNLOADS_DIR
+- Entries whose file has been deleted are dropped on lookup
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import DOWNLOADS_DIR
+from app.utils.metrics_utils import record_cache_lookup
+from app.utils.platform_utils import parse_video_url
+
+
+MANIFEST_PATH = os.path.join(DOWNLOADS_DIR, ".download_manifest.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    platform TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    downloaded_at REAL NOT NULL,
+    PRIMARY KEY (platform, video_id)
+);
+"""
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection to the manifest, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == MANIFEST_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(MANIFEST_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(MANIFEST_PATH, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = MANIFEST_PATH
+    return conn
+
+
+def manifest_key(url: str, info: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, str]]:
+    """
+    Manifest key of a video.
+
+    Args:
+        url: Video URL
+        info: yt-dlp info dict, if already extracted (its extractor_key/id win)
+
+    Returns:
+        (platform, video_id), e.g. ("youtube", "dQw4w9WgXcQ"), or None when
+        the URL can't be parsed locally and no info dict is given
+    """
+    if info and info.get("extractor_key") and info.get("id"):
+        return info["extractor_key"].lower(), str(info["id"])
+    parsed = parse_video_url(url)
+    if parsed:
+        return parsed[0].lower(), parsed[1]
+    return None
+
+
+def lookup(platform: str, video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Find a downloaded video.
+
+    Args:
+        platform: Lowercased extractor key (see manifest_key)
+        video_id: Platform video ID
+
+    Returns:
+        Entry dict (platform, video_id, url, title, path, size, downloaded_at),
+        or None if the video isn't in the manifest or its file is gone
+    """
+    try:
+        row = _connect().execute(
+            "SELECT * FROM downloads WHERE platform = ? AND video_id = ?", (platform, video_id)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"WARNING: Download manifest lookup failed: {str(e)}")
+        return None
+
+    if row and not os.path.exists(row["path"]):
+        remove(platform, video_id)
+        row = None
+    record_cache_lookup("download_manifest", hit=row is not None)
+    return dict(row) if row else None
+
+
+def record_download(
+    platform: str,
+    video_id: str,
+    url: str,
+    path: str,
+    title: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Register (or replace) a video saved to DOWNLOADS_DIR.
+
+    Args:
+        platform: Lowercased extractor key (see manifest_key)
+        video_id: Platform video ID
+        url: URL it was downloaded from
+        path: Path to the saved file
+        title: Video title
+
+    Returns:
+        The stored entry, or None if the file doesn't exist or the write failed
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+
+    entry = {
+        "platform": platform, "video_id": video_id, "url": url, "title": title,
+        "path": path, "size": size, "downloaded_at": time.time()
+    }
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO downloads (platform, video_id, url, title, path, size, downloaded_at) "
+            "VALUES (:platform, :video_id, :url, :title, :path, :size, :downloaded_at)",
+            entry
+        )
+    except sqlite3.Error as e:
+        print(f"WARNING: Download manifest write failed for {path}: {str(e)}")
+        return None
+    return entry
+
+
+def remove(platform: str, video_id: str) -> None:
+    """Drop a video from the manifest."""
+    try:
+        _connect().execute(
+            "DELETE FROM downloads WHERE platform = ? AND video_id = ?", (platform, video_id)
+        )
+    except sqlite3.Error as e:
+        print(f"WARNING: Download manifest delete failed for {platform}/{video_id}: {str(e)}")
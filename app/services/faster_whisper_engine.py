@@ -0,0 +1,165 @@
+"""
+faster-whisper (CTranslate2) transcription engine for CPU-only hosts.
+
+WhisperX runs at 3-5x real time on CPU. faster-whisper is the CTranslate2
+backend WhisperX itself builds on, used directly: int8 weights, tunable
+threading and an optional Silero VAD pass that skips non-speech. It is
+selected with provider=faster-whisper.
+
+Threading (CTranslate2 terms):
+- cpu_threads: intra-op threads of one transcription
+- num_workers: transcriptions one model runs in parallel (inter-op)
+
+Unset values are derived from the cores available to the process (cgroup /
+affinity aware): num_workers follows MAX_CONCURRENT_TRANSCRIPTIONS as long as
+every worker keeps at least 4 threads, and the cores are split between them.
+
+Models live in their own ModelPool (same LRU and limits as the WhisperX pool).
+scripts/benchmark_cpu_engines.py compares the engine with WhisperX.
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import (
+    WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE,
+    MAX_CONCURRENT_TRANSCRIPTIONS,
+    MODEL_POOL_MAX_MODELS,
+    MODEL_POOL_MEMORY_MB,
+    FASTER_WHISPER_CPU_THREADS,
+    FASTER_WHISPER_NUM_WORKERS,
+    FASTER_WHISPER_COMPUTE_TYPE,
+    FASTER_WHISPER_BEAM_SIZE,
+    FASTER_WHISPER_VAD_FILTER,
+    FASTER_WHISPER_VAD_MIN_SILENCE_MS
+)
+from app.services.model_pool import ModelPool, PooledModel
+
+
+# Fewer intra-op threads than this per worker costs more than parallel workers gain
+_MIN_THREADS_PER_WORKER = 4
+
+
+def available_cores() -> int:
+    """Number of CPU cores this process may run on (respects affinity / cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def thread_settings(
+    cores: Optional[int] = None,
+    cpu_threads: int = 0,
+    num_workers: int = 0,
+    concurrency: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Resolve intra-op threads and inter-op workers, filling unset (0) values from the core count.
+
+    Args:
+        cores: Available cores (default: available_cores())
+        cpu_threads: Configured threads per worker, 0 = auto
+        num_workers: Configured workers per model, 0 = auto
+        concurrency: Transcriptions expected to run at once (default MAX_CONCURRENT_TRANSCRIPTIONS)
+
+    Returns:
+        Tuple of (cpu_threads, num_workers)
+    """
+    cores = cores or available_cores()
+    concurrency = concurrency or MAX_CONCURRENT_TRANSCRIPTIONS
+    if num_workers <= 0:
+        num_workers = max(1, min(concurrency, cores // _MIN_THREADS_PER_WORKER))
+    if cpu_threads <= 0:
+        cpu_threads = max(1, cores // num_workers)
+    return cpu_threads, num_workers
+
+
+def engine_device() -> Tuple[str, str]:
+    """
+    Device and compute type for faster-whisper models.
+
+    CUDA hosts keep the GPU settings; everything else (including MPS, which
+    CTranslate2 doesn't support) runs on CPU with FASTER_WHISPER_COMPUTE_TYPE.
+    """
+    if WHISPER_DEVICE.startswith("cuda"):
+        return WHISPER_DEVICE, WHISPER_COMPUTE_TYPE
+    return "cpu", FASTER_WHISPER_COMPUTE_TYPE
+
+
+def _load_model(model_size: str, device: str, compute_type: str, language: Optional[str]):
+    """Load a faster-whisper model (imported lazily so the API runs without it)."""
+    from faster_whisper import WhisperModel
+
+    cpu_threads, num_workers = thread_settings(
+        cpu_threads=FASTER_WHISPER_CPU_THREADS, num_workers=FASTER_WHISPER_NUM_WORKERS
+    )
+    device, _, index = device.partition(":")
+    print(f"INFO: faster-whisper {model_size} on {device}: {cpu_threads} threads x {num_workers} workers")
+    return WhisperModel(
+        model_size,
+        device=device,
+        device_index=int(index or 0),
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers
+    )
+
+
+# Process-wide pool of faster-whisper models (language is chosen per call, not per model)
+faster_whisper_pool = ModelPool(
+    loader=_load_model,
+    max_models=MODEL_POOL_MAX_MODELS,
+    memory_budget_mb=MODEL_POOL_MEMORY_MB
+)
+
+
+def acquire_model(model_size: str) -> Tuple[PooledModel, bool]:
+    """
+    Get a warm faster-whisper model from the pool.
+
+    Returns:
+        Tuple of (PooledModel, cache_hit)
+
+    Raises:
+        ImportError: If faster-whisper is not installed
+        Exception: Whatever the loader raises when the model cannot be loaded
+    """
+    device, compute_type = engine_device()
+    return faster_whisper_pool.acquire(model_size, device, compute_type, None)
+
+
+def transcribe(
+    model: Any,
+    audio: Any,
+    language: Optional[str] = None,
+    beam_size: Optional[int] = None,
+    vad_filter: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Transcribe with faster-whisper (blocking; run in a worker thread).
+
+    Args:
+        model: faster_whisper.WhisperModel
+        audio: Audio file path or 16 kHz float32 array
+        language: Language code, None = auto-detect
+        beam_size: Beam size (default FASTER_WHISPER_BEAM_SIZE)
+        vad_filter: Skip non-speech (default FASTER_WHISPER_VAD_FILTER)
+
+    Returns:
+        WhisperX-shaped result: {"segments": [{start, end, text}], "language"}
+    """
+    vad_filter = FASTER_WHISPER_VAD_FILTER if vad_filter is None else vad_filter
+    segments, info = model.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size or FASTER_WHISPER_BEAM_SIZE,
+        vad_filter=vad_filter,
+        vad_parameters={"min_silence_duration_ms": FASTER_WHISPER_VAD_MIN_SILENCE_MS} if vad_filter else None
+    )
+    # segments is a lazy generator - decoding happens while it is consumed
+    return {
+        "segments": [{"start": s.start, "end": s.end, "text": s.text} for s in segments],
+        "language": info.language
+    }
@@ -0,0 +1,486 @@
+"""
+Per-URL yt-dlp metadata (info dict) cache.
+
+/extract-audio and the job audio path used to resolve each URL up to three
+times: --print title, the download itself, then -j / extract_info again for
+id and duration. Every call is a full extractor round trip and counts against
+YouTube rate limits. This module resolves a URL once and lets the download
+reuse the result:
+
+- get_video_info() memoizes info dicts in memory keyed by normalized URL
+  (+ cookies identity) for INFO_CACHE_TTL_SECONDS; concurrent callers for the
+  same URL share one extraction
+- Anonymous lookups also go through an on-disk store in CACHE_DIR/info, keyed
+  by extractor + video ID and shared by every worker process, so the
+  screenshot, subtitle and audio paths resolve a video once per
+  INFO_DISK_CACHE_TTL_SECONDS. Stored info is sanitized (no private keys or
+  cookies). Lookups with a cookies file skip the disk store.
+- download_with_info() hands the cached info to yt-dlp (--load-info-json for
+  the binary, process_ie_result for the library) so the download skips
+  extraction - but only while the info's signed format URLs are still valid;
+  otherwise it downloads from the URL.
+- stream_download() does the same for a binary download to stdout
+  (yt-dlp -o -), returning the bytes as they arrive
+"""
+
+import os
+import json
+import time
+import asyncio
+import re
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+
+import yt_dlp
+
+from app.config import (
+    CACHE_DIR,
+    INFO_CACHE_TTL_SECONDS,
+    INFO_DISK_CACHE_TTL_SECONDS,
+    YTDLP_EXTRACTOR_ARGS
+)
+from app.utils.metrics_utils import record_cache_lookup
+from app.utils.platform_utils import parse_video_url
+from app.utils.process_utils import stream_process
+from app.services.ytdlp_service import build_ytdlp_command, run_ytdlp_binary
+from app.services.ytdlp_pool import ytdlp_extract_info, ytdlp_download, ytdlp_download_with_info
+
+
+_MAX_ENTRIES = 256
+
+# Don't start a download from cached format URLs that expire sooner than this
+_FORMAT_URL_MARGIN_SECONDS = 300
+
+_EXPIRE_IN_PATH = re.compile(r'/expire/(\d+)')
+
+# Query parameters that never change what a URL resolves to
+_TRACKING_PARAMS = {"si", "feature", "pp", "fbclid", "gclid", "igshid", "ref", "ref_src"}
+
+_memory: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# Per-key extraction lock and the number of callers holding or waiting for it;
+# the entry is dropped only when that count reaches 0, so a caller arriving
+# while others still wait joins the same lock instead of creating a new one
+_inflight: Dict[Tuple[str, str], Tuple[asyncio.Lock, int]] = {}
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a video URL so equivalent forms share a cache entry.
+
+    Lowercases scheme/host, drops fragments and tracking parameters, sorts the
+    query, and maps youtu.be/<id> and /shorts/<id> to watch?v=<id>.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m."):
+        host = host[2:]
+    path = parts.path.rstrip("/") or "/"
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    ]
+
+    if host == "youtu.be" and path != "/":
+        host, query = "youtube.com", [("v", path.lstrip("/"))] + query
+        path = "/watch"
+    elif host.endswith("youtube.com") and path.startswith("/shorts/"):
+        query = [("v", path.split("/")[2])] + query
+        host, path = "youtube.com", "/watch"
+    elif host.endswith("youtube.com") and path == "/watch":
+        # Playback position doesn't change the video
+        query = [(k, v) for k, v in query if k != "t"]
+
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def _cache_key(url: str, use_binary: bool, cookies_file: Optional[str]) -> Tuple[str, str]:
+    identity = "binary" if use_binary else (cookies_file or "")
+    return normalize_url(url), identity
+
+
+def _memory_get(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    entry = _memory.get(key)
+    if not entry:
+        return None
+    expires_at, info = entry
+    if time.time() >= expires_at:
+        _memory.pop(key, None)
+        return None
+    _memory.move_to_end(key)
+    return info
+
+
+def _memory_put(key: Tuple[str, str], info: Dict[str, Any]) -> None:
+    _memory[key] = (time.time() + INFO_CACHE_TTL_SECONDS, info)
+    _memory.move_to_end(key)
+    while len(_memory) > _MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _info_dir() -> str:
+    return os.path.join(CACHE_DIR, "info")
+
+
+def _disk_path(extractor_key: str, video_id: str) -> str:
+    safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', str(video_id))
+    return os.path.join(_info_dir(), f"{extractor_key.lower()}-{safe_id}.json")
+
+
+def _disk_get(url: str) -> Optional[Dict[str, Any]]:
+    """Load a stored info dict for a URL whose ID can be parsed locally."""
+    if INFO_DISK_CACHE_TTL_SECONDS <= 0 or "list=" in url:
+        return None
+    parsed = parse_video_url(url)
+    if not parsed:
+        return None
+
+    path = _disk_path(*parsed)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() >= entry.get("expires_at", 0):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return entry.get("info")
+
+
+def _strip_cookies(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _strip_cookies(v) for k, v in obj.items() if k != "cookies"}
+    if isinstance(obj, list):
+        return [_strip_cookies(v) for v in obj]
+    return obj
+
+
+def _disk_put(info: Dict[str, Any]) -> None:
+    """Store a sanitized single-video info dict (atomic, safe across processes)."""
+    if INFO_DISK_CACHE_TTL_SECONDS <= 0:
+        return
+    if info.get("_type", "video") != "video" or not info.get("extractor_key") or not info.get("id"):
+        return
+
+    path = _disk_path(info["extractor_key"], info["id"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    now = time.time()
+    entry = {
+        "stored_at": now,
+        "expires_at": now + INFO_DISK_CACHE_TTL_SECONDS,
+        "info": _strip_cookies(yt_dlp.YoutubeDL.sanitize_info(dict(info), remove_private_keys=True)),
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _format_urls_expire_at(info: Dict[str, Any]) -> Optional[float]:
+    """Earliest expire= timestamp among the info's signed media/subtitle URLs, if any."""
+    urls = [info.get("url")] + [f.get("url") for f in info.get("formats") or []]
+    for field in ("subtitles", "automatic_captions"):
+        for tracks in (info.get(field) or {}).values():
+            urls.extend(t.get("url") for t in tracks or [])
+    expiries = []
+    for media_url in urls:
+        if not media_url:
+            continue
+        values = parse_qs(urlsplit(media_url).query).get("expire")
+        if values and values[0].isdigit():
+            expiries.append(int(values[0]))
+            continue
+        match = _EXPIRE_IN_PATH.search(media_url)
+        if match:
+            expiries.append(int(match.group(1)))
+    return min(expiries) if expiries else None
+
+
+def formats_reusable(info: Dict[str, Any]) -> bool:
+    """
+    Check whether an info dict's format URLs can still be used for a download.
+
+    Uses the signed URLs' expire= timestamp when present; otherwise only
+    trusts info extracted within INFO_CACHE_TTL_SECONDS.
+    """
+    now = time.time()
+    expires_at = _format_urls_expire_at(info)
+    if expires_at is not None:
+        return expires_at > now + _FORMAT_URL_MARGIN_SECONDS
+    epoch = info.get("epoch")
+    return bool(epoch) and now - epoch < INFO_CACHE_TTL_SECONDS
+
+
+async def _extract(url: str, use_binary: bool, cookies_file: Optional[str]) -> Dict[str, Any]:
+    """Resolve a URL with yt-dlp (binary -J or library extract_info)."""
+    if use_binary:
+        stdout, stderr, code = await run_ytdlp_binary(['--skip-download', '-J', url])
+        if code != 0:
+            raise Exception(f"yt-dlp metadata extraction failed: {stderr.strip()}")
+        return json.loads(stdout)
+
+    meta_opts = {'quiet': True, 'skip_download': True, 'extractor_args': YTDLP_EXTRACTOR_ARGS}
+    if cookies_file and os.path.exists(cookies_file):
+        meta_opts['cookiefile'] = cookies_file
+    return await ytdlp_extract_info(url, meta_opts)
+
+
+async def get_video_info(
+    url: str,
+    use_binary: bool = False,
+    cookies_file: Optional[str] = None,
+    fresh_urls: bool = False
+) -> Dict[str, Any]:
+    """
+    Get the yt-dlp info dict for a URL, resolving it at most once per TTL.
+
+    Lookup order: in-memory cache, on-disk store (anonymous lookups only),
+    then yt-dlp.
+
+    Args:
+        url: Video URL
+        use_binary: Resolve with the standalone binary (YouTube) instead of the library
+        cookies_file: Cookies file for library extraction (part of the cache key)
+        fresh_urls: Skip cached entries whose signed URLs may have expired
+                    (for callers that fetch the info's media/subtitle URLs directly)
+
+    Returns:
+        yt-dlp info dict (treat as read-only; it is shared between callers)
+
+    Raises:
+        Exception: If extraction fails
+    """
+    key = _cache_key(url, use_binary, cookies_file)
+
+    def usable(cached: Optional[Dict[str, Any]]) -> bool:
+        return cached is not None and (not fresh_urls or formats_reusable(cached))
+
+    info = _memory_get(key)
+    if usable(info):
+        _stats["hits"] += 1
+        record_cache_lookup("info", hit=True)
+        return info
+
+    lock, refs = _inflight.get(key) or (asyncio.Lock(), 0)
+    _inflight[key] = (lock, refs + 1)
+    try:
+        async with lock:
+            # Another caller may have resolved it while we waited
+            info = _memory_get(key)
+            if usable(info):
+                _stats["hits"] += 1
+                record_cache_lookup("info", hit=True)
+                return info
+
+            if not cookies_file:
+                info = await asyncio.to_thread(_disk_get, url)
+                if usable(info):
+                    _stats["disk_hits"] += 1
+                    record_cache_lookup("info", hit=True)
+                    _memory_put(key, info)
+                    return info
+
+            _stats["misses"] += 1
+            record_cache_lookup("info", hit=False)
+            info = await _extract(url, use_binary, cookies_file)
+            _memory_put(key, info)
+            if not cookies_file:
+                try:
+                    await asyncio.to_thread(_disk_put, info)
+                except Exception as e:
+                    print(f"WARNING: Failed to store video info on disk: {str(e)}")
+            return info
+    finally:
+        lock, refs = _inflight[key]
+        if refs <= 1:
+            del _inflight[key]
+        else:
+            _inflight[key] = (lock, refs - 1)
+
+
+@contextmanager
+def info_json_file(info: Dict[str, Any]) -> Iterator[str]:
+    """Write an info dict to a temporary file for yt-dlp --load-info-json."""
+    fd, info_path = tempfile.mkstemp(suffix=".info.json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        yield info_path
+    finally:
+        os.remove(info_path)
+
+
+async def download_with_info(
+    url: str,
+    info: Optional[Dict[str, Any]],
+    use_binary: bool,
+    binary_args: List[str],
+    ydl_opts: Dict[str, Any],
+    timeout: int = 600
+) -> None:
+    """
+    Download a URL, reusing an already-extracted info dict when available.
+
+    Args:
+        url: Video URL (used directly when info is None)
+        info: Info dict from get_video_info(), or None
+        use_binary: Download with the standalone binary instead of the library
+        binary_args: yt-dlp binary arguments without the URL (format, -o, ...)
+        ydl_opts: YoutubeDL options for the library path
+        timeout: Binary download timeout in seconds
+
+    Raises:
+        Exception: If the download fails
+    """
+    if info is not None and not formats_reusable(info):
+        # Signed format URLs expired (or may have) - let yt-dlp resolve again
+        info = None
+
+    if use_binary:
+        if info is None:
+            stdout, stderr, code = await run_ytdlp_binary(binary_args + [url], timeout=timeout)
+        else:
+            with info_json_file(info) as info_path:
+                stdout, stderr, code = await run_ytdlp_binary(
+                    binary_args + ['--load-info-json', info_path], timeout=timeout
+                )
+        if code != 0:
+            raise Exception(stderr)
+        return
+
+    if info is None:
+        await ytdlp_download([url], ydl_opts)
+    else:
+        await ytdlp_download_with_info(info, ydl_opts, url)
+
+
+async def stream_download(
+    url: str,
+    info: Optional[Dict[str, Any]],
+    format_selector: str,
+    cookies_file: Optional[str] = None,
+    idle_timeout: Optional[float] = None
+) -> AsyncIterator[bytes]:
+    """
+    Start a yt-dlp binary download to stdout and return its output stream.
+
+    Waits for the first chunk, so failures before any output (unavailable
+    video, format not found, auth errors) raise here instead of after the
+    response has started. The format must select a single file: merging
+    needs a seekable output file.
+
+    Args:
+        url: Video URL (used directly when info is None)
+        info: Info dict from get_video_info(), or None
+        format_selector: yt-dlp format selector without "+" (e.g. "best")
+        cookies_file: Cookies file overriding the configured YouTube cookies
+        idle_timeout: Seconds without output before the download is killed
+
+    Returns:
+        Async iterator over the downloaded bytes (raises if yt-dlp fails mid-stream)
+
+    Raises:
+        Exception: If yt-dlp fails before producing output
+    """
+    if info is not None and not formats_reusable(info):
+        info = None
+
+    with (info_json_file(info) if info is not None else nullcontext()) as info_path:
+        args = ['-f', format_selector, '--quiet', '--no-progress', '-o', '-']
+        cmd = build_ytdlp_command(args + (['--load-info-json', info_path] if info_path else [url]))
+        if cookies_file and os.path.exists(cookies_file):
+            # The last --cookies wins over the configured default
+            cmd.extend(['--cookies', cookies_file])
+        chunks = stream_process(cmd, idle_timeout=idle_timeout)
+        # yt-dlp has read the info file once it produces output
+        first = await anext(chunks, b"")
+
+    async def output() -> AsyncIterator[bytes]:
+        try:
+            if first:
+                yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    return output()
+
+
+def peek_video_info(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a cached info dict for a URL without calling yt-dlp.
+
+    Checks the in-memory cache (any identity) and then the on-disk store.
+    Blocking file read; fine for occasional use in async code.
+
+    Returns:
+        Info dict, or None if the URL hasn't been resolved recently
+    """
+    normalized = normalize_url(url)
+    for (cached_url, _identity) in list(_memory.keys()):
+        if cached_url == normalized:
+            info = _memory_get((cached_url, _identity))
+            if info is not None:
+                return info
+    return _disk_get(url)
+
+
+def prune_info_store() -> int:
+    """
+    Delete expired (or unreadable) entries from the on-disk info store.
+
+    Returns:
+        Number of files removed
+    """
+    info_dir = _info_dir()
+    if not os.path.isdir(info_dir):
+        return 0
+
+    removed = 0
+    now = time.time()
+    for entry in os.scandir(info_dir):
+        if not entry.is_file():
+            continue
+        try:
+            if entry.name.endswith(".tmp"):
+                # Orphaned partial write
+                expired = now - entry.stat().st_mtime > 3600
+            else:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    expired = now >= json.load(f).get("expires_at", 0)
+        except (OSError, ValueError):
+            expired = True
+        if expired:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def clear_info_cache() -> None:
+    """Drop all in-memory info dicts."""
+    _memory.clear()
+
+
+def get_info_cache_stats() -> Dict[str, Any]:
+    """Return entry count and hit/miss counters for the info cache."""
+    return {"entries": len(_memory), "ttl_seconds": INFO_CACHE_TTL_SECONDS, **_stats}
@@ -0,0 +1,256 @@
+"""
+In-process worker queue for async API jobs (POST /v2/jobs).
+
+/extract-audio and /transcribe hold the HTTP connection (and a load balancer
+slot) for as long as the work takes - ten minutes and more for long media.
+The job API stores the request in the job store and returns its id at once;
+workers in every API process then run the same endpoint functions:
+
+- JOB_QUEUE_WORKERS asyncio tasks per process, started from the main.py
+  lifespan, claim queued jobs from the store (oldest first)
+- submit_job() wakes a local worker; workers also poll the store, so jobs
+  submitted to (or orphaned by) another process are picked up too
+- Handlers report progress and the current stage through the store;
+  transcriptions of long-form media report every finished chunk
+- HTTPExceptions keep the status code and detail the synchronous endpoint
+  would have returned
+- Store calls run in worker threads (asyncio.to_thread): the SQLite file is
+  shared by every uvicorn worker and a contended write can wait seconds
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from app.config import JOB_QUEUE_WORKERS
+from app.services import job_store
+
+
+# Seconds between store polls when idle (jobs of other processes, heartbeats, orphans)
+_POLL_INTERVAL = 5
+# Seconds between prunes of finished jobs
+_PRUNE_INTERVAL = 3600
+
+Reporter = Callable[[Optional[float], Optional[str]], Awaitable[None]]
+
+_wakeup: Optional[asyncio.Event] = None
+_shutdown_event: Optional[asyncio.Event] = None
+_tasks: List[asyncio.Task] = []
+
+
+async def _run_extract_audio(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    """Run /extract-audio."""
+    from app.routers.audio import extract_audio
+
+    await report(None, "extracting audio")
+    return await extract_audio(**params, _=True)
+
+
+async def _run_transcribe(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    """Run /transcribe under the shared MAX_CONCURRENT_TRANSCRIPTIONS limit."""
+    from app.routers.transcription import transcription_semaphore
+    from app.services.transcription_service import _transcribe_audio_internal
+
+    async def on_chunk(chunk: Dict[str, Any]) -> None:
+        total = chunk.get("duration")
+        await report(
+            min(chunk["end"] / total, 0.99) if total else None,
+            f"transcribed {chunk['end']:.0f}s of {total:.0f}s" if total else "transcribing"
+        )
+
+    await report(None, "waiting for a transcription slot")
+    async with transcription_semaphore:
+        await report(None, "transcribing")
+        return await _transcribe_audio_internal(**params, on_chunk=on_chunk)
+
+
+# Job type -> (handler, {param: default}); REQUIRED params have no default
+REQUIRED = object()
+JOB_HANDLERS: Dict[str, Any] = {
+    "extract-audio": (_run_extract_audio, {
+        "url": None,
+        "local_file": None,
+        "output_format": "mp3",
+        "quality": "192",
+        "cookies_file": None,
+    }),
+    "transcribe": (_run_transcribe, {
+        "audio_file": REQUIRED,
+        "language": None,
+        "model_size": "medium",
+        "provider": "local",
+        "output_format": "json",
+        "video_id": None,
+        "url": None,
+        "duration": None,
+        "platform": None,
+    }),
+}
+
+
+def build_params(job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate job parameters and fill in the endpoint defaults.
+
+    Args:
+        job_type: Job type (key of JOB_HANDLERS)
+        params: Query parameters of the synchronous endpoint
+
+    Returns:
+        Complete keyword arguments for the handler
+
+    Raises:
+        HTTPException: 400 for an unknown type, unknown or missing parameters
+    """
+    if job_type not in JOB_HANDLERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid job type '{job_type}'. Must be one of: {', '.join(JOB_HANDLERS)}"
+        )
+    _, defaults = JOB_HANDLERS[job_type]
+
+    unknown = sorted(set(params) - set(defaults))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown parameters for '{job_type}': {', '.join(unknown)}")
+    missing = [name for name, default in defaults.items() if default is REQUIRED and params.get(name) is None]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing parameters for '{job_type}': {', '.join(missing)}")
+
+    return {name: params.get(name, default) for name, default in defaults.items()}
+
+
+async def submit_job(job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate and store a job, then wake a local worker.
+
+    Transcription requests are checked up front (missing file, bad provider)
+    so those errors come back from the submit call instead of a failed job.
+
+    Returns:
+        The queued job
+
+    Raises:
+        HTTPException: For invalid parameters
+    """
+    params = build_params(job_type, params)
+    if job_type == "transcribe":
+        from app.services.transcription_service import _validate_transcription_request
+        _validate_transcription_request(params["audio_file"], params["provider"])
+
+    job = await asyncio.to_thread(job_store.create_job, job_type, params)
+    if _wakeup is not None:
+        _wakeup.set()
+    return job
+
+
+async def run_job(job: Dict[str, Any]) -> None:
+    """Run a claimed job and store its result or error."""
+    handler, _ = JOB_HANDLERS[job["type"]]
+
+    async def report(progress: Optional[float] = None, stage: Optional[str] = None) -> None:
+        try:
+            await asyncio.to_thread(job_store.update_job, job["id"], progress=progress, stage=stage)
+        except Exception as e:
+            print(f"WARNING: Failed to update job {job['id']}: {str(e)}")
+
+    print(f"INFO: Job {job['id']} ({job['type']}) started")
+    try:
+        result = await handler(job["params"], report)
+    except HTTPException as e:
+        await asyncio.to_thread(job_store.finish_job, job["id"], error=str(e.detail), status_code=e.status_code)
+        print(f"WARNING: Job {job['id']} failed ({e.status_code}): {e.detail}")
+        return
+    except Exception as e:
+        await asyncio.to_thread(job_store.finish_job, job["id"], error=str(e), status_code=500)
+        print(f"WARNING: Job {job['id']} failed: {str(e)}")
+        return
+    # Store exactly what the synchronous endpoint would have serialized
+    await asyncio.to_thread(job_store.finish_job, job["id"], result=jsonable_encoder(result))
+    print(f"INFO: Job {job['id']} ({job['type']}) completed")
+
+
+async def _worker_loop() -> None:
+    """Claim and run jobs until shutdown, waiting for a wakeup or poll when the queue is empty."""
+    while not _shutdown_event.is_set():
+        # Clear before claiming so a submit during the claim still wakes us
+        _wakeup.clear()
+        try:
+            job = await asyncio.to_thread(job_store.claim_next_job)
+            if job is not None:
+                await run_job(job)
+                continue
+        except Exception as e:
+            print(f"WARNING: Job queue worker error: {str(e)}")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _maintenance_loop() -> None:
+    """Heartbeat this process's running jobs, requeue orphans and prune old jobs."""
+    since_prune = _PRUNE_INTERVAL
+    while not _shutdown_event.is_set():
+        try:
+            await asyncio.to_thread(job_store.heartbeat_jobs)
+            if await asyncio.to_thread(job_store.requeue_orphaned_jobs):
+                _wakeup.set()
+            if since_prune >= _PRUNE_INTERVAL:
+                pruned = await asyncio.to_thread(job_store.prune_jobs)
+                if pruned:
+                    print(f"INFO: Pruned {pruned} finished jobs")
+                since_prune = 0
+        except Exception as e:
+            print(f"WARNING: Job queue maintenance failed: {str(e)}")
+        try:
+            await asyncio.wait_for(_shutdown_event.wait(), timeout=_POLL_INTERVAL * 6)
+        except asyncio.TimeoutError:
+            since_prune += _POLL_INTERVAL * 6
+
+
+async def start_job_queue() -> None:
+    """Start the job workers (no-op if JOB_QUEUE_WORKERS is 0 or already running)."""
+    global _wakeup, _shutdown_event, _tasks
+
+    if JOB_QUEUE_WORKERS <= 0:
+        print("INFO: Job queue disabled (JOB_QUEUE_WORKERS=0)")
+        return
+    if _tasks:
+        return
+
+    requeued = await asyncio.to_thread(job_store.requeue_orphaned_jobs, include_own=True)
+    if requeued:
+        print(f"INFO: Requeued {requeued} jobs interrupted by a restart")
+
+    _wakeup = asyncio.Event()
+    _shutdown_event = asyncio.Event()
+    _tasks = [asyncio.create_task(_worker_loop()) for _ in range(JOB_QUEUE_WORKERS)]
+    _tasks.append(asyncio.create_task(_maintenance_loop()))
+    print(f"INFO: Job queue started ({JOB_QUEUE_WORKERS} workers)")
+
+
+async def stop_job_queue() -> None:
+    """
+    Stop the job workers.
+
+    Running jobs are cancelled and left in the store as running; the next
+    process to start requeues them.
+    """
+    global _wakeup, _shutdown_event, _tasks
+
+    if not _tasks:
+        return
+
+    _shutdown_event.set()
+    _wakeup.set()
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+
+    _tasks = []
+    _wakeup = None
+    _shutdown_event = None
+    print("INFO: Job queue stopped")
@@ -8,10 +8,15 @@ Job Processing Flow:
 1. Claim document (atomic pending -> processing update)
 2. Try to extract platform subtitles (YouTube, Vimeo, etc.) - faster & free
 3. If no subtitles: extract audio and transcribe with WhisperX/OpenAI
+   (long media saves partial transcripts as chunks finish)
 4. Save transcription to document_transcriptions
 5. Mark document completed
 6. Ack (delete) queue message
 
+Each stage is timed (app.utils.timing_utils); durations are returned in the
+job result, stored in the transcript metadata and aggregated into
+job_stage_histograms (GET /admin/job-timings).
+
 On failure:
 - If read_ct < MAX_RETRIES: return to pending, don't ack (will retry after VT)
 - If read_ct >= MAX_RETRIES: mark as error, archive message
@@ -21,24 +26,35 @@ import os
 import re
 import json
 import uuid
+import time
 import asyncio
+import inspect
 import requests
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
-import yt_dlp
 
 from app.config import (
     CACHE_DIR,
     CACHE_TTL_HOURS,
     YTDLP_BINARY,
-    YTDLP_EXTRACTOR_ARGS,
+    BATCH_TRANSCRIBE_ENABLED,
+    BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS,
+    AUDIO_PCM_STREAMING,
     get_settings
 )
 from app.services.supabase_service import get_supabase_client
-from app.services.ytdlp_service import run_ytdlp_binary, youtube_rate_limit
-from app.services.transcription_service import _transcribe_audio_internal
+from app.services.batch_scheduler import BatchScheduler, run_db_call, scheduler_slot
+from app.services.rate_limiter import rate_limit
+from app.services.transcription_service import LOCAL_PROVIDERS, _transcribe_audio_internal
+from app.services.cache_service import find_cached_output
+from app.services import cache_index
+from app.services.info_cache import get_video_info, download_with_info
+from app.services.pcm_stream import PCM_FORMAT, stream_pcm, pcm_duration
+from app.services.long_form import chunks_for_partial_transcripts
 from app.utils.platform_utils import get_platform_from_url, is_youtube_url
 from app.utils.timestamp_utils import convert_srt_timestamp_to_seconds
+from app.utils.timing_utils import StageTimer, job_stage_histograms
 from app.routers.transcription import transcription_semaphore
 
 
@@ -46,6 +62,13 @@ from app.routers.transcription import transcription_semaphore
 # Helper Functions
 # =============================================================================
 
+def _model_label(provider: str, model_size: str) -> str:
+    """Model name stored in transcript metadata."""
+    if provider == "faster-whisper":
+        return f"faster-whisper-{model_size}"
+    return f"WhisperX-{model_size}" if provider == "local" else "whisper-1"
+
+
 def _now_iso() -> str:
     """Return current UTC timestamp in ISO format."""
     return datetime.now(timezone.utc).isoformat()
@@ -58,10 +81,13 @@ async def _retry_with_delay(
     operation_name: str = "operation"
 ):
     """
-    Retry a synchronous function with fixed delay between attempts.
+    Retry a function with fixed delay between attempts.
+
+    Blocking work should be handed off (yt-dlp pool, asyncio.to_thread) and
+    returned as an awaitable so retries don't stall the event loop.
 
     Args:
-        func: Callable to execute (no arguments)
+        func: Callable to execute (no arguments); may return an awaitable
         max_attempts: Maximum number of attempts (default 3)
         delay_seconds: Delay between retries in seconds (default 3.0)
         operation_name: Name for logging purposes
@@ -75,7 +101,10 @@ async def _retry_with_delay(
     last_error = None
     for attempt in range(1, max_attempts + 1):
         try:
-            return func()
+            result = func()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
         except Exception as e:
             last_error = e
             if attempt < max_attempts:
@@ -271,30 +300,20 @@ async def _try_extract_platform_subtitles(
     """
     target_lang = lang or 'en'
 
-    # Apply rate limiting for YouTube
-    if is_youtube_url(url):
-        await youtube_rate_limit()
+    # Apply per-platform rate limiting
+    await rate_limit(url)
 
     try:
-        # Configure yt-dlp for subtitle extraction only
-        ydl_opts = {
-            'writesubtitles': True,
-            'writeautomaticsub': include_auto_captions,
-            'skip_download': True,
-            'quiet': True,
-            'subtitleslangs': [target_lang],
-            'extractor_args': YTDLP_EXTRACTOR_ARGS,
-        }
-
+        # Subtitle tracks are part of the info dict. It goes through the info
+        # cache, so an audio fallback download reuses this extraction.
         # Retry yt-dlp extraction (3 attempts, 3s delay)
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await _retry_with_delay(
-                    func=lambda: ydl.extract_info(url, download=False),
-                    max_attempts=3,
-                    delay_seconds=3.0,
-                    operation_name="yt-dlp subtitle extraction"
-                )
+            info = await _retry_with_delay(
+                func=lambda: get_video_info(url, fresh_urls=True),
+                max_attempts=3,
+                delay_seconds=3.0,
+                operation_name="yt-dlp subtitle extraction"
+            )
         except Exception as e:
             print(f"WARNING: Platform subtitle extraction failed after retries: {str(e)}")
             return None
@@ -369,7 +388,7 @@ async def _try_extract_platform_subtitles(
         # Download subtitle content with retry (3 attempts, 3s delay)
         try:
             response = await _retry_with_delay(
-                func=lambda: requests.get(subtitle_url, timeout=30),
+                func=lambda: asyncio.to_thread(requests.get, subtitle_url, timeout=30),
                 max_attempts=3,
                 delay_seconds=3.0,
                 operation_name="subtitle content download"
@@ -410,19 +429,23 @@ async def _try_extract_platform_subtitles(
 # Audio Extraction (Internal)
 # =============================================================================
 
-async def _extract_audio_from_url(url: str) -> Dict[str, Any]:
+async def _extract_audio_from_url(url: str, pcm: bool = False) -> Dict[str, Any]:
     """
     Extract audio from URL using yt-dlp.
 
     This is a simplified version that only handles URLs (not local files)
     for the job processing flow.
 
+    Args:
+        url: Media URL
+        pcm: Stream straight to a raw 16 kHz PCM file (local provider only),
+             falling back to the MP3 download if streaming fails
+
     Returns:
         Dict with audio_file path and metadata (video_id, url, duration, platform)
     """
-    # Apply rate limiting for YouTube
-    if is_youtube_url(url):
-        await youtube_rate_limit()
+    # Apply per-platform rate limiting
+    await rate_limit(url)
 
     # Generate unique ID for audio file
     audio_uid = uuid.uuid4().hex[:8]
@@ -430,83 +453,73 @@ async def _extract_audio_from_url(url: str) -> Dict[str, Any]:
     audio_path = os.path.join(CACHE_DIR, "audio", f"{audio_uid}.{output_format}")
 
     use_binary = is_youtube_url(url) and os.path.exists(YTDLP_BINARY)
+    platform = get_platform_from_url(url)
 
-    # Get metadata
-    title = "Unknown"
+    # Resolve metadata once; the download reuses this info dict
+    info = None
     try:
-        if use_binary:
-            stdout, stderr, code = run_ytdlp_binary([
-                '--skip-download', '--print', '%(title)s',
-                url
-            ])
-            title = stdout.strip() if code == 0 else "Unknown"
+        info = await get_video_info(url, use_binary=use_binary)
+    except Exception as e:
+        print(f"WARNING: Metadata extraction failed, downloading by URL: {str(e)}")
+
+    title = info.get("title", "Unknown") if info else "Unknown"
+    video_id = info.get("id") if info else None
+    video_duration = info.get("duration") if info else None
+
+    if pcm:
+        pcm_path = os.path.join(CACHE_DIR, "audio", f"{audio_uid}.{PCM_FORMAT}")
+        try:
+            await stream_pcm(url, info, pcm_path, use_binary=use_binary)
+        except Exception as e:
+            print(f"WARNING: PCM streaming failed, falling back to {output_format} download: {str(e)}")
         else:
-            meta_opts = {'quiet': True, 'skip_download': True}
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                title = info.get("title", "Unknown")
-    except Exception:
-        pass
+            await asyncio.to_thread(cache_index.record_file, pcm_path, "audio", platform, video_id)
+            return {
+                "audio_file": pcm_path,
+                "format": PCM_FORMAT,
+                "title": title,
+                "video_id": video_id,
+                "url": url,
+                "duration": video_duration or round(pcm_duration(pcm_path)),
+                "platform": platform
+            }
 
     # Extract audio using yt-dlp
-    if use_binary:
-        stdout, stderr, code = run_ytdlp_binary([
-            '-f', 'bestaudio/best',
-            '-x', '--audio-format', output_format,
-            '--audio-quality', '192',
-            '-o', audio_path.replace(f'.{output_format}', '.%(ext)s'),
-            url
-        ], timeout=600)
-        if code != 0:
-            raise Exception(f"yt-dlp failed: {stderr}")
-    else:
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': output_format,
-                'preferredquality': '192',
-            }],
-            'outtmpl': audio_path.replace(f'.{output_format}', '.%(ext)s'),
-            'quiet': True,
-        }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+    try:
+        await download_with_info(
+            url,
+            info,
+            use_binary=use_binary,
+            binary_args=[
+                '-f', 'bestaudio/best',
+                '-x', '--audio-format', output_format,
+                '--audio-quality', '192',
+                '-o', audio_path.replace(f'.{output_format}', '.%(ext)s'),
+            ],
+            ydl_opts={
+                'format': 'bestaudio/best',
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': output_format,
+                    'preferredquality': '192',
+                }],
+                'outtmpl': audio_path.replace(f'.{output_format}', '.%(ext)s'),
+                'quiet': True,
+            },
+            timeout=600
+        )
+    except Exception as e:
+        raise Exception(f"yt-dlp failed: {str(e)}")
 
     # Find actual audio file (yt-dlp may change extension)
-    actual_audio_path = None
-    audio_cache_dir = os.path.join(CACHE_DIR, "audio")
-    for f in os.listdir(audio_cache_dir):
-        if f.startswith(audio_uid):
-            actual_audio_path = os.path.join(audio_cache_dir, f)
-            break
+    actual_audio_path = find_cached_output(
+        os.path.join(CACHE_DIR, "audio"), audio_uid, [output_format]
+    )
 
     if not actual_audio_path or not os.path.exists(actual_audio_path):
         raise Exception("Audio extraction completed but file not found")
 
-    # Get additional metadata
-    video_id = None
-    video_duration = None
-    platform = get_platform_from_url(url)
-
-    try:
-        if use_binary:
-            import json
-            stdout, _, code = run_ytdlp_binary([
-                '--skip-download', '-j', url
-            ])
-            if code == 0:
-                info = json.loads(stdout)
-                video_id = info.get("id")
-                video_duration = info.get("duration")
-        else:
-            meta_opts = {'quiet': True, 'skip_download': True}
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                video_id = info.get("id")
-                video_duration = info.get("duration")
-    except Exception:
-        pass
+    await asyncio.to_thread(cache_index.record_file, actual_audio_path, "audio", platform, video_id)
 
     return {
         "audio_file": actual_audio_path,
@@ -519,6 +532,57 @@ async def _extract_audio_from_url(url: str) -> Dict[str, Any]:
     }
 
 
+def _partial_transcript_writer(
+    supabase,
+    scheduler: Optional[BatchScheduler],
+    document_id: str,
+    model_size: str,
+    provider: str
+):
+    """
+    Build an on_chunk callback that saves a chunked transcript as it grows.
+
+    Each finished chunk upserts the segments so far into document_transcriptions
+    with metadata.partial = true; the final save of the job replaces the row.
+    Failed partial saves are logged and never fail the job.
+
+    Returns:
+        Async callback for _transcribe_audio_internal(on_chunk=...)
+    """
+    segments: List[Dict[str, Any]] = []
+    settings = get_settings()
+
+    async def save_chunk(chunk: Dict[str, Any]) -> None:
+        for segment in chunk["segments"]:
+            segments.append({**segment, "segment_id": len(segments) + 1})
+
+        upsert_data = {
+            "document_id": document_id,
+            "segments": list(segments),
+            "language": chunk.get("language") or "unknown",
+            "source": "ai",
+            "confidence_score": None,
+            "metadata": {
+                "model": _model_label(provider, model_size),
+                "provider": settings.provider_name,
+                "duration": chunk.get("duration"),
+                "partial": True,
+                "transcribed_seconds": chunk.get("end"),
+                "segment_count": len(segments)
+            },
+            "updated_at": _now_iso()
+        }
+        try:
+            await run_db_call(scheduler, lambda: supabase.table("document_transcriptions").upsert(
+                upsert_data,
+                on_conflict="document_id"
+            ).execute(), operation="save_transcript")
+        except Exception as e:
+            print(f"WARNING: Partial transcript save failed for document {document_id}: {str(e)}")
+
+    return save_chunk
+
+
 # =============================================================================
 # Job Processing
 # =============================================================================
@@ -528,7 +592,8 @@ async def process_single_job(
     queue_name: str,
     max_retries: int = 5,
     model_size: str = "medium",
-    provider: str = "local"
+    provider: str = "local",
+    scheduler: Optional[BatchScheduler] = None
 ) -> Dict[str, Any]:
     """
     Process a single transcription job.
@@ -539,9 +604,12 @@ async def process_single_job(
         max_retries: Maximum retry attempts before marking as error
         model_size: Whisper model size (tiny, small, medium, large-v2, etc.)
         provider: Transcription provider (local or openai)
+        scheduler: Batch scheduler limiting subtitle/download/db concurrency
+                   (None when the job runs on its own)
 
     Returns:
-        Result dict with status, msg_id, document_id, and any error info
+        Result dict with status, msg_id, document_id, timings (seconds per
+        stage) and any error info
     """
     msg_id = job.get("msg_id")
     read_ct = int(job.get("read_ct", 1))
@@ -559,15 +627,16 @@ async def process_single_job(
     # Validate job data
     if not document_id:
         print(f"WARNING: Job {msg_id} missing document_id - archiving")
-        _ack_archive(supabase, queue_name, msg_id)
+        await run_db_call(scheduler, lambda: _ack_archive(supabase, queue_name, msg_id), operation="ack_archive")
         return {
             "msg_id": msg_id,
             "status": "archived",
             "reason": "missing document_id"
         }
 
-    # Track which step failed for better error messages
+    # Track which step failed for better error messages, and how long each took
     current_step = "initialization"
+    timer = StageTimer(histograms=job_stage_histograms)
 
     try:
         # =================================================================
@@ -575,20 +644,22 @@ async def process_single_job(
         # =================================================================
         current_step = "claiming document"
 
-        claim_result = supabase.table("documents").update({
-            "processing_status": "processing",
-            "updated_at": _now_iso()
-        }).eq("id", document_id).eq("processing_status", "pending").execute()
+        with timer.stage("claim"):
+            claim_result = await run_db_call(scheduler, lambda: supabase.table("documents").update({
+                "processing_status": "processing",
+                "updated_at": _now_iso()
+            }).eq("id", document_id).eq("processing_status", "pending").execute(), operation="claim_document")
 
         if not claim_result.data or len(claim_result.data) == 0:
             # Document not pending - already processed or being processed
             print(f"INFO: Document {document_id} not pending - ack delete stale message")
-            _ack_delete(supabase, queue_name, msg_id)
+            await run_db_call(scheduler, lambda: _ack_delete(supabase, queue_name, msg_id), operation="ack_delete")
             return {
                 "msg_id": msg_id,
                 "status": "deleted",
                 "reason": "not pending",
-                "document_id": document_id
+                "document_id": document_id,
+                "timings": timer.finish()
             }
 
         # =================================================================
@@ -596,9 +667,10 @@ async def process_single_job(
         # =================================================================
         current_step = "fetching document details"
 
-        doc_result = supabase.table("documents").select(
-            "id, canonical_url, metadata, media_format, lang, title"
-        ).eq("id", document_id).single().execute()
+        with timer.stage("fetch_document"):
+            doc_result = await run_db_call(scheduler, lambda: supabase.table("documents").select(
+                "id, canonical_url, metadata, media_format, lang, title"
+            ).eq("id", document_id).single().execute(), operation="fetch_document")
 
         if not doc_result.data:
             raise ValueError(f"Document {document_id} not found after claiming")
@@ -640,11 +712,13 @@ async def process_single_job(
         # and if skip_subtitles flag is not set
         if media_format == "video" and not skip_subtitles:
             print(f"INFO: Trying to extract platform subtitles...")
-            subtitle_result = await _try_extract_platform_subtitles(
-                url=media_url,
-                lang=doc.get("lang"),
-                include_auto_captions=True
-            )
+            with timer.stage("subtitles"):
+                async with scheduler_slot(scheduler, "subtitle"):
+                    subtitle_result = await _try_extract_platform_subtitles(
+                        url=media_url,
+                        lang=doc.get("lang"),
+                        include_auto_captions=True
+                    )
         elif skip_subtitles:
             print(f"INFO: Skipping platform subtitles (skip_subtitles=True), using AI transcription")
 
@@ -679,37 +753,66 @@ async def process_single_job(
             # =================================================================
             # Step 5: Extract audio (fallback when no subtitles)
             # =================================================================
-            current_step = f"extracting audio from {media_url[:60]}"
-
-            print(f"INFO: No platform subtitles available, extracting audio...")
-            try:
-                audio_result = await _extract_audio_from_url(media_url)
-                audio_file = audio_result["audio_file"]
-                print(f"INFO: Audio extracted: {audio_file}")
-            except Exception as audio_err:
-                raise Exception(f"Audio extraction failed: {str(audio_err)}")
-
-            # =================================================================
-            # Step 6: Transcribe audio with WhisperX/OpenAI
-            # =================================================================
-            current_step = f"transcribing audio with {provider}/{model_size}"
-
-            print(f"INFO: Transcribing with provider={provider} model={model_size}...")
-            try:
-                async with transcription_semaphore:
-                    transcription = await _transcribe_audio_internal(
-                        audio_file=audio_file,
-                        language=doc.get("lang"),
-                        model_size=model_size,
-                        provider=provider,
-                        output_format="json",
-                        video_id=audio_result.get("video_id"),
-                        url=media_url,
-                        duration=audio_result.get("duration"),
-                        platform=audio_result.get("platform")
-                    )
-            except Exception as transcribe_err:
-                raise Exception(f"Transcription failed: {str(transcribe_err)}")
+            # Downloads run ahead of the GPU (pipeline), but only
+            # MAX_CONCURRENT_TRANSCRIPTIONS + BATCH_AUDIO_PREFETCH jobs of a batch
+            # may hold downloaded, not yet transcribed audio at once
+            wait_start = time.perf_counter()
+            async with scheduler_slot(scheduler, "audio_buffer"):
+                timer.record("audio_buffer_wait", time.perf_counter() - wait_start)
+                current_step = f"extracting audio from {media_url[:60]}"
+
+                print(f"INFO: No platform subtitles available, extracting audio...")
+                try:
+                    with timer.stage("audio_download"):
+                        async with scheduler_slot(scheduler, "download"):
+                            audio_result = await _extract_audio_from_url(
+                                media_url, pcm=AUDIO_PCM_STREAMING and provider in LOCAL_PROVIDERS
+                            )
+                    audio_file = audio_result["audio_file"]
+                    print(f"INFO: Audio extracted: {audio_file}")
+                except Exception as audio_err:
+                    raise Exception(f"Audio extraction failed: {str(audio_err)}")
+
+                # =================================================================
+                # Step 6: Transcribe audio with WhisperX/OpenAI
+                # =================================================================
+                current_step = f"transcribing audio with {provider}/{model_size}"
+
+                print(f"INFO: Transcribing with provider={provider} model={model_size}...")
+                # Short clips are batched across files by the transcriber (one
+                # inference at a time per model), so they don't take a
+                # transcription_semaphore slot each. Batching needs a pinned
+                # language (see batch_transcriber.can_batch); without one the
+                # clip is transcribed on its own and takes a slot like any other
+                clip_duration = audio_result.get("duration")
+                short_clip = (
+                    BATCH_TRANSCRIBE_ENABLED and provider == "local" and doc.get("lang")
+                    and clip_duration and clip_duration <= BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS
+                    and not chunks_for_partial_transcripts(clip_duration)
+                )
+                try:
+                    wait_start = time.perf_counter()
+                    async with (nullcontext() if short_clip else transcription_semaphore):
+                        timer.record("transcription_wait", time.perf_counter() - wait_start)
+                        with timer.stage("transcription"):
+                            transcription = await _transcribe_audio_internal(
+                                audio_file=audio_file,
+                                language=doc.get("lang"),
+                                model_size=model_size,
+                                provider=provider,
+                                output_format="json",
+                                video_id=audio_result.get("video_id"),
+                                url=media_url,
+                                duration=audio_result.get("duration"),
+                                platform=audio_result.get("platform"),
+                                # Long media (>= PARTIAL_TRANSCRIPT_MIN_SECONDS): save
+                                # segments chunk by chunk as they finish
+                                on_chunk=_partial_transcript_writer(
+                                    supabase, scheduler, document_id, model_size, provider
+                                )
+                            )
+                except Exception as transcribe_err:
+                    raise Exception(f"Transcription failed: {str(transcribe_err)}")
 
             transcription_source = "ai"
             segments = transcription.get("segments", [])
@@ -730,10 +833,13 @@ async def process_single_job(
             word_count = sum(len(s.get('text', '').split()) for s in segments)
 
             metadata = {
-                "model": f"WhisperX-{model_size}" if provider == "local" else "whisper-1",
+                "model": _model_label(provider, model_size),
                 "provider": settings.provider_name,
                 "duration": video_duration,
                 "processing_time": trans_metadata.get("transcription_time"),
+                "model_load_time": trans_metadata.get("model_load_time"),
+                "model_cache_hit": trans_metadata.get("model_cache_hit"),
+                "transcription_cache_hit": trans_metadata.get("transcription_cache_hit"),
                 "word_count": word_count,
                 "segment_count": segment_count
             }
@@ -749,6 +855,9 @@ async def process_single_job(
         segment_count = len(segments)
         word_count = sum(len(s.get('text', '').split()) for s in segments)
 
+        # Stages up to transcription (saving is still in progress)
+        metadata["stage_timings"] = timer.as_dict()
+
         upsert_data = {
             "document_id": document_id,
             "segments": segments,
@@ -760,10 +869,11 @@ async def process_single_job(
         }
 
         try:
-            supabase.table("document_transcriptions").upsert(
-                upsert_data,
-                on_conflict="document_id"
-            ).execute()
+            with timer.stage("save"):
+                await run_db_call(scheduler, lambda: supabase.table("document_transcriptions").upsert(
+                    upsert_data,
+                    on_conflict="document_id"
+                ).execute(), operation="save_transcript")
         except Exception as db_err:
             raise Exception(f"Database save failed: {str(db_err)}")
 
@@ -775,19 +885,24 @@ async def process_single_job(
         current_step = "marking document as completed"
 
         try:
-            supabase.table("documents").update({
-                "processing_status": "completed",
-                "processed_at": _now_iso(),
-                "processing_error": None,
-                "updated_at": _now_iso()
-            }).eq("id", document_id).execute()
+            with timer.stage("complete"):
+                await run_db_call(scheduler, lambda: supabase.table("documents").update({
+                    "processing_status": "completed",
+                    "processed_at": _now_iso(),
+                    "processing_error": None,
+                    "updated_at": _now_iso()
+                }).eq("id", document_id).execute(), operation="mark_completed")
         except Exception as update_err:
             raise Exception(f"Failed to mark document completed: {str(update_err)}")
 
         # =================================================================
         # Step 9: Ack delete message
         # =================================================================
-        _ack_delete(supabase, queue_name, msg_id)
+        with timer.stage("ack"):
+            await run_db_call(scheduler, lambda: _ack_delete(supabase, queue_name, msg_id), operation="ack_delete")
+
+        timings = timer.finish()
+        print(f"INFO: Job timings for document {document_id}: {timings}")
 
         print(f"INFO: Job completed for document {document_id} (source: {transcription_source})")
 
@@ -797,7 +912,8 @@ async def process_single_job(
             "document_id": document_id,
             "source": transcription_source,  # "subtitle" or "ai"
             "word_count": word_count,
-            "segment_count": segment_count
+            "segment_count": segment_count,
+            "timings": timings
         }
 
     except Exception as e:
@@ -819,23 +935,24 @@ async def process_single_job(
             final_error_msg = f"Failed after {read_ct} attempts. Last error: {error_msg}"
 
             try:
-                supabase.table("documents").update({
+                await run_db_call(scheduler, lambda: supabase.table("documents").update({
                     "processing_status": "error",
                     "processing_error": final_error_msg,
                     "updated_at": _now_iso()
-                }).eq("id", document_id).execute()
+                }).eq("id", document_id).execute(), operation="mark_error")
                 print(f"INFO: Document {document_id} marked as error")
             except Exception as update_err:
                 print(f"WARNING: Failed to update document error status: {update_err}")
 
-            _ack_archive(supabase, queue_name, msg_id)
+            await run_db_call(scheduler, lambda: _ack_archive(supabase, queue_name, msg_id), operation="ack_archive")
 
             return {
                 "msg_id": msg_id,
                 "status": "archived",
                 "error": error_msg,
                 "read_ct": read_ct,
-                "document_id": document_id
+                "document_id": document_id,
+                "timings": timer.finish()
             }
         else:
             # Will retry - mark as pending with retry info
@@ -844,11 +961,11 @@ async def process_single_job(
             retry_error_msg = f"Retry {read_ct}/{max_retries}: {error_msg}"
 
             try:
-                supabase.table("documents").update({
+                await run_db_call(scheduler, lambda: supabase.table("documents").update({
                     "processing_status": "pending",
                     "processing_error": retry_error_msg,
                     "updated_at": _now_iso()
-                }).eq("id", document_id).execute()
+                }).eq("id", document_id).execute(), operation="mark_retry")
                 print(f"INFO: Document {document_id} returned to pending with retry info")
             except Exception as update_err:
                 print(f"WARNING: Failed to update document retry status: {update_err}")
@@ -859,7 +976,8 @@ async def process_single_job(
                 "status": "retry",
                 "error": error_msg,
                 "read_ct": read_ct,
-                "document_id": document_id
+                "document_id": document_id,
+                "timings": timer.finish()
             }
 
 
@@ -886,19 +1004,17 @@ async def process_job_batch(
 
     print(f"INFO: Processing batch of {len(jobs)} job(s) from queue '{queue_name}'")
 
-    results = []
-
-    # Process jobs sequentially to respect rate limiting and resource constraints
-    # Note: The semaphore inside process_single_job handles transcription concurrency
-    for job in jobs:
-        result = await process_single_job(
-            job=job,
-            queue_name=queue_name,
-            max_retries=max_retries,
-            model_size=model_size,
-            provider=provider
-        )
-        results.append(result)
+    # Run jobs concurrently; the scheduler limits subtitle lookups, downloads
+    # and DB writes per class, transcription_semaphore limits GPU work
+    scheduler = BatchScheduler()
+    results = await scheduler.run_all(jobs, lambda job: process_single_job(
+        job=job,
+        queue_name=queue_name,
+        max_retries=max_retries,
+        model_size=model_size,
+        provider=provider,
+        scheduler=scheduler
+    ))
 
     # Count results by status
     completed = sum(1 for r in results if r.get("status") == "completed")
@@ -0,0 +1,278 @@
+"""
+Persistent store for async API jobs (POST /v2/jobs).
+
+Jobs live in an SQLite database (CACHE_DIR/jobs.sqlite3) shared by every
+uvicorn worker process on the host, so any process can answer
+GET /v2/jobs/{id} and a restart doesn't lose queued work:
+
+- create_job() inserts a queued job
+- claim_next_job() atomically moves the oldest queued job to running and tags
+  it with the claiming process (host:pid), so two processes never run the
+  same job
+- update_job() records progress; finish_job() stores the result or error
+- heartbeat_jobs() keeps this process's running jobs fresh;
+  requeue_orphaned_jobs() puts running jobs whose process has died (or has
+  stopped heart-beating) back in the queue
+- prune_jobs() drops finished jobs older than JOB_RETENTION_HOURS
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.config import CACHE_DIR, JOB_RETENTION_HOURS
+
+
+JOBS_DB_PATH = os.path.join(CACHE_DIR, "jobs.sqlite3")
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+# Running jobs without a heartbeat for this long are considered orphaned
+JOB_STALE_SECONDS = 300
+# Jobs whose process died this many times are failed instead of requeued (e.g. OOM kills)
+JOB_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    stage TEXT,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+    ON jobs (status, created_at);
+"""
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection to the job store, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == JOBS_DB_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(JOBS_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = JOBS_DB_PATH
+    return conn
+
+
+def process_owner() -> str:
+    """Identifier of this process in the owner column (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a jobs row to the API representation."""
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+
+def create_job(job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert a new queued job.
+
+    Args:
+        job_type: Job type (see job_queue.JOB_HANDLERS)
+        params: Handler keyword arguments (JSON-serializable)
+
+    Returns:
+        The stored job
+    """
+    now = time.time()
+    job_id = uuid.uuid4().hex
+    _connect().execute(
+        "INSERT INTO jobs (id, type, status, params, created_at, updated_at) "
+        "VALUES (?, ?, 'queued', ?, ?, ?)",
+        (job_id, job_type, json.dumps(params), now, now)
+    )
+    return get_job(job_id)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a job by id, or None if it doesn't exist (or was pruned)."""
+    row = _connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def list_jobs(status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """List jobs, newest first, optionally filtered by status."""
+    if status:
+        rows = _connect().execute(
+            "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+        ).fetchall()
+    else:
+        rows = _connect().execute(
+            "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+
+def count_jobs_by_status() -> Dict[str, int]:
+    """Number of stored jobs per status (every status in JOB_STATUSES, 0 if none)."""
+    counts = {status: 0 for status in JOB_STATUSES}
+    rows = _connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+    for row in rows:
+        counts[row["status"]] = row["n"]
+    return counts
+
+
+def claim_next_job() -> Optional[Dict[str, Any]]:
+    """
+    Atomically take the oldest queued job and mark it running for this process.
+
+    Returns:
+        The claimed job, or None if the queue is empty
+    """
+    now = time.time()
+    row = _connect().execute(
+        "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, "
+        "started_at = ?, updated_at = ? "
+        "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+        "AND status = 'queued' RETURNING *",
+        (process_owner(), now, now)
+    ).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def update_job(job_id: str, progress: Optional[float] = None, stage: Optional[str] = None) -> None:
+    """Record progress (0-1) and/or the current stage of a running job."""
+    _connect().execute(
+        "UPDATE jobs SET progress = COALESCE(?, progress), stage = COALESCE(?, stage), updated_at = ? "
+        "WHERE id = ?",
+        (progress, stage, time.time(), job_id)
+    )
+
+
+def finish_job(
+    job_id: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+    status_code: Optional[int] = None
+) -> None:
+    """
+    Mark a job completed (with its result) or failed (with an error).
+
+    Args:
+        job_id: Job id
+        result: Handler return value for completed jobs
+        error: Error detail for failed jobs
+        status_code: HTTP status the synchronous endpoint would have returned
+    """
+    now = time.time()
+    if error is None:
+        _connect().execute(
+            "UPDATE jobs SET status = 'completed', progress = 1, result = ?, status_code = 200, "
+            "updated_at = ?, finished_at = ? WHERE id = ?",
+            (json.dumps(result), now, now, job_id)
+        )
+    else:
+        _connect().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, status_code = ?, "
+            "updated_at = ?, finished_at = ? WHERE id = ?",
+            (error, status_code or 500, now, now, job_id)
+        )
+
+
+def heartbeat_jobs() -> None:
+    """Refresh updated_at of this process's running jobs so they aren't taken for orphans."""
+    _connect().execute(
+        "UPDATE jobs SET updated_at = ? WHERE status = 'running' AND owner = ?",
+        (time.time(), process_owner())
+    )
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """Whether the process that claimed a job still runs (only checkable on this host)."""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def requeue_orphaned_jobs(include_own: bool = False) -> int:
+    """
+    Put running jobs of dead processes (crash, restart, deploy) back in the queue.
+
+    A job is orphaned when its owner process on this host is gone, or when it
+    hasn't had a heartbeat for JOB_STALE_SECONDS (owners on other hosts).
+    Orphans that already ran JOB_MAX_ATTEMPTS times are failed instead.
+
+    Args:
+        include_own: Also requeue jobs tagged with this process (at startup,
+            they belong to a previous process that had the same pid)
+
+    Returns:
+        Number of jobs requeued
+    """
+    conn = _connect()
+    stale_before = time.time() - JOB_STALE_SECONDS
+    rows = conn.execute("SELECT id, owner, attempts, updated_at FROM jobs WHERE status = 'running'").fetchall()
+    requeued = 0
+    for row in rows:
+        own = row["owner"] == process_owner()
+        if own and not include_own:
+            continue
+        if not own and row["updated_at"] >= stale_before and _owner_alive(row["owner"]):
+            continue
+        now = time.time()
+        if row["attempts"] >= JOB_MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, status_code = 500, updated_at = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND owner IS ?",
+                (f"Worker process died {row['attempts']} times while running this job", now, now,
+                 row["id"], row["owner"])
+            )
+            continue
+        cursor = conn.execute(
+            "UPDATE jobs SET status = 'queued', owner = NULL, stage = 'requeued after restart', "
+            "updated_at = ? WHERE id = ? AND status = 'running' AND owner IS ?",
+            (now, row["id"], row["owner"])
+        )
+        requeued += cursor.rowcount
+    return requeued
+
+
+def prune_jobs(max_age_hours: Optional[int] = None) -> int:
+    """
+    Delete finished jobs older than max_age_hours (default JOB_RETENTION_HOURS).
+
+    Returns:
+        Number of jobs deleted
+    """
+    hours = JOB_RETENTION_HOURS if max_age_hours is None else max_age_hours
+    cursor = _connect().execute(
+        "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND finished_at < ?",
+        (time.time() - hours * 3600,)
+    )
+    return cursor.rowcount
@@ -0,0 +1,420 @@
+"""
+Chunked transcription of long-form media (podcasts, streams, lectures).
+
+A 3-hour podcast used to go through whisperx.load_audio as one array - about
+700 MB of float32 samples held for the whole transcription, with no progress
+until the end. Long media is transcribed in chunks instead:
+
+- Chunk boundaries are planned lazily: for every boundary ffmpeg's
+  silencedetect scans only the last 20% before the target length, and the cut
+  goes in the longest pause found there (or hard at the target when there is
+  none). Nothing scans the whole file up front, so the first chunk starts
+  transcribing right away
+- Each chunk is decoded on its own (ffmpeg input seeking, or a slice of the
+  memory-mapped raw PCM), extended by LONG_FORM_OVERLAP_SECONDS on both sides
+  so words at a hard cut are heard in full by one of the two chunks
+- One worker per device (the pooled model plus LONG_FORM_DEVICES) takes chunks
+  in order, decoding its next chunk while the current one is on the model, so
+  at most two chunks per worker are in memory
+- Finished chunks are released in media order (iter_chunk_results); segments
+  are shifted by their chunk's offset, kept by the chunk that owns their
+  midpoint, and lines repeated in the overlap are dropped
+
+transcribe_long_form() collects everything for /transcribe and queue jobs;
+the streaming endpoint consumes iter_chunk_results() with short chunks.
+"""
+
+import re
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import (
+    LONG_FORM_MIN_SECONDS,
+    PARTIAL_TRANSCRIPT_MIN_SECONDS,
+    LONG_FORM_CHUNK_SECONDS,
+    LONG_FORM_OVERLAP_SECONDS,
+    LONG_FORM_DEVICES
+)
+from app.services.model_pool import PooledModel, model_pool
+from app.services.pcm_stream import PCM_SAMPLE_RATE, audio_duration, decode_pcm, is_pcm_file
+from app.utils.process_utils import run_process
+
+
+# silencedetect: quieter than this for at least this long counts as a pause
+_SILENCE_NOISE_DB = -35
+_SILENCE_MIN_SECONDS = 0.4
+
+# Boundaries are searched in the last 20% of each chunk; the final chunk may
+# grow by 20% rather than leave a short tail chunk
+_SEARCH_FRACTION = 0.2
+
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end: ([\d.]+)")
+
+
+@dataclass
+class Chunk:
+    """A span of the media: [start, end) is owned, [audio_start, audio_end) is decoded."""
+    index: int
+    start: float
+    end: float
+    audio_start: float
+    audio_end: float
+    last: bool = False
+
+
+async def is_long_form(audio_file: str, duration: Optional[float] = None) -> bool:
+    """
+    Whether a file should be transcribed in chunks.
+
+    Args:
+        audio_file: Audio file
+        duration: Known duration in seconds (probed when missing)
+    """
+    if not duration:
+        duration = await audio_duration(audio_file)
+    return bool(duration) and duration >= LONG_FORM_MIN_SECONDS
+
+
+def chunks_for_partial_transcripts(duration: Optional[float]) -> bool:
+    """
+    Whether media is chunked so a caller saving partial transcripts (on_chunk)
+    gets them before the whole file is done, although it isn't long-form.
+    """
+    return PARTIAL_TRANSCRIPT_MIN_SECONDS > 0 and bool(duration) and duration >= PARTIAL_TRANSCRIPT_MIN_SECONDS
+
+
+def parse_silences(stderr: str) -> List[Tuple[float, float]]:
+    """Parse (start, end) pauses from ffmpeg silencedetect output."""
+    silences = []
+    start = None
+    for line in stderr.splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+
+async def detect_silences(audio_file: str, start: float, duration: float) -> List[Tuple[float, float]]:
+    """
+    Find pauses in one window of an audio file with ffmpeg silencedetect.
+
+    Args:
+        audio_file: Audio file (any ffmpeg-readable format or raw .f32 PCM)
+        start: Window start in seconds
+        duration: Window length in seconds
+
+    Returns:
+        (start, end) pairs in media seconds; empty if detection fails
+    """
+    cmd = ['ffmpeg', '-hide_banner', '-nostats', '-ss', f"{start:.3f}", '-t', f"{duration:.3f}"]
+    if is_pcm_file(audio_file):
+        cmd.extend(['-f', 'f32le', '-ar', str(PCM_SAMPLE_RATE), '-ac', '1'])
+    cmd.extend([
+        '-i', audio_file, '-vn',
+        '-af', f"silencedetect=noise={_SILENCE_NOISE_DB}dB:d={_SILENCE_MIN_SECONDS}",
+        '-f', 'null', '-'
+    ])
+    result = await run_process(cmd, timeout=120)
+    if result.returncode != 0:
+        print(f"WARNING: Silence detection failed, cutting at fixed length: {result.stderr.strip()[-200:]}")
+        return []
+    # Input seeking restarts timestamps at 0
+    return [(start + s, start + e) for s, e in parse_silences(result.stderr)]
+
+
+def next_cut(position: float, chunk_seconds: float, silences: List[Tuple[float, float]]) -> float:
+    """
+    Choose the end of the chunk starting at position.
+
+    Args:
+        position: Chunk start in seconds
+        chunk_seconds: Target chunk length
+        silences: Pauses found near the target
+
+    Returns:
+        Middle of the longest pause in the search window (the latest among
+        equally long ones), or the target itself when there is none
+    """
+    target = position + chunk_seconds
+    candidates = [
+        (start, end) for start, end in silences
+        if target - chunk_seconds * _SEARCH_FRACTION <= (start + end) / 2 <= target
+    ]
+    if not candidates:
+        return target
+    start, end = max(candidates, key=lambda s: (round(s[1] - s[0], 1), s[0]))
+    return (start + end) / 2
+
+
+class ChunkPlanner:
+    """Hands out chunks in media order, placing each boundary when it is needed."""
+
+    def __init__(
+        self,
+        audio_file: str,
+        duration: float,
+        chunk_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            audio_file: Audio file the boundaries are searched in
+            duration: Media duration in seconds
+            chunk_seconds: Target chunk length (default LONG_FORM_CHUNK_SECONDS)
+            overlap_seconds: Audio added on both sides of every cut (default LONG_FORM_OVERLAP_SECONDS)
+        """
+        self.audio_file = audio_file
+        self.duration = duration
+        self.chunk_seconds = chunk_seconds or LONG_FORM_CHUNK_SECONDS
+        self.overlap_seconds = LONG_FORM_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+        self._position = 0.0
+        self._index = 0
+        self._lock = asyncio.Lock()
+
+    async def next(self) -> Optional[Chunk]:
+        """Plan the next chunk (None once the media is covered)."""
+        async with self._lock:
+            if self._position >= self.duration:
+                return None
+            start = self._position
+            if self.duration - start > self.chunk_seconds * (1 + _SEARCH_FRACTION):
+                window = self.chunk_seconds * _SEARCH_FRACTION
+                silences = await detect_silences(self.audio_file, start + self.chunk_seconds - window, window)
+                end = next_cut(start, self.chunk_seconds, silences)
+            else:
+                end = self.duration
+            chunk = Chunk(
+                index=self._index,
+                start=start,
+                end=end,
+                audio_start=max(0.0, start - self.overlap_seconds),
+                audio_end=min(self.duration, end + self.overlap_seconds),
+                last=end >= self.duration
+            )
+            self._position = end
+            self._index += 1
+            return chunk
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class Stitcher:
+    """Merges per-chunk results, fed in media order, into one timeline."""
+
+    def __init__(self):
+        self.segments: List[Dict[str, Any]] = []
+
+    def add(self, chunk: Chunk, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Add one chunk's WhisperX result.
+
+        Segment times are shifted by the chunk's decode offset. A segment is kept
+        only by the chunk owning its midpoint, and a line repeated across the
+        overlap (same text, overlapping time) extends the earlier one instead.
+
+        Returns:
+            The segments this chunk added, in media time
+        """
+        owned_from = chunk.start if chunk.index > 0 else float("-inf")
+        owned_to = float("inf") if chunk.last else chunk.end
+        added = []
+        for segment in result.get("segments", []):
+            start = segment["start"] + chunk.audio_start
+            end = segment["end"] + chunk.audio_start
+            if not owned_from <= (start + end) / 2 < owned_to:
+                continue
+            if self.segments:
+                previous = self.segments[-1]
+                if start < previous["end"] and _normalize(segment["text"]) == _normalize(previous["text"]):
+                    previous["end"] = round(max(previous["end"], end), 3)
+                    continue
+                start = min(max(start, previous["end"]), end)
+            merged = {"start": round(start, 3), "end": round(end, 3), "text": segment["text"]}
+            self.segments.append(merged)
+            added.append(merged)
+        return added
+
+
+def _device_id(device: str) -> str:
+    """Normalize a device name so "cuda" and "cuda:0" compare equal."""
+    name, _, index = device.partition(":")
+    return f"{name}:{index or 0}"
+
+
+async def _chunk_models(pooled: PooledModel) -> List[PooledModel]:
+    """The pooled model plus the same model on each extra LONG_FORM_DEVICES device."""
+    models = [pooled]
+    model_size, device, compute_type, language = pooled.key
+    for extra in LONG_FORM_DEVICES:
+        if _device_id(extra) in (_device_id(m.device) for m in models):
+            continue
+        # Loading more models than the pool holds would evict the ones in use
+        if len(models) >= model_pool.max_models:
+            print(f"WARNING: Long-form device {extra} skipped - raise MODEL_POOL_MAX_MODELS to use it")
+            continue
+        try:
+            entry, _ = await asyncio.to_thread(model_pool.acquire, model_size, extra, compute_type, language)
+        except Exception as e:
+            print(f"WARNING: Long-form device {extra} unavailable: {str(e)}")
+            continue
+        models.append(entry)
+    return models
+
+
+async def iter_chunk_results(
+    pooled: PooledModel,
+    audio_file: str,
+    duration: float,
+    batch_size: int = 16,
+    chunk_seconds: Optional[float] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Transcribe media chunk by chunk, yielding finished chunks in media order.
+
+    Chunks are transcribed concurrently on all devices; a chunk that finishes
+    early waits until the chunks before it are out. Closing the iterator
+    (e.g. a client disconnect) cancels the remaining work.
+
+    Args:
+        pooled: Pooled WhisperX model (first worker; extra devices reuse its settings)
+        audio_file: Audio file (any ffmpeg-readable format or raw .f32 PCM)
+        duration: Media duration in seconds
+        batch_size: Chunks per forward pass inside each WhisperX call
+        chunk_seconds: Target chunk length (default LONG_FORM_CHUNK_SECONDS)
+
+    Yields:
+        {"index", "start", "end", "duration", "device", "language", "segments"}
+        where segments are the stitched segments the chunk added
+
+    Raises:
+        Exception: If decoding or inference of any chunk fails
+    """
+    planner = ChunkPlanner(audio_file, duration, chunk_seconds=chunk_seconds)
+    models = await _chunk_models(pooled)
+    print(f"INFO: Chunked transcription: {duration / 60:.0f} min in ~{planner.chunk_seconds:.0f}s chunks on {', '.join(m.device for m in models)}")
+
+    finished: Dict[int, Tuple[Chunk, Dict[str, Any], str]] = {}
+    signals: "asyncio.Queue[Any]" = asyncio.Queue()
+    all_done = object()
+
+    async def take() -> Optional[Tuple[Chunk, "asyncio.Task[Any]"]]:
+        chunk = await planner.next()
+        if chunk is None:
+            return None
+        return chunk, asyncio.create_task(
+            decode_pcm(audio_file, chunk.audio_start, chunk.audio_end - chunk.audio_start)
+        )
+
+    async def worker(entry: PooledModel) -> None:
+        def infer(audio: Any) -> Dict[str, Any]:
+            with entry.lock:
+                return entry.model.transcribe(audio, batch_size=batch_size)
+
+        current = None
+        try:
+            current = await take()
+            while current is not None:
+                chunk, task = current
+                inference = asyncio.ensure_future(asyncio.to_thread(infer, await task))
+                # Plan and decode the next chunk while this one is on the model
+                current = await take()
+                finished[chunk.index] = (chunk, await inference, entry.device)
+                signals.put_nowait(chunk.index)
+        except Exception as e:
+            signals.put_nowait(e)
+        finally:
+            if current is not None:
+                current[1].cancel()
+
+    async def run_workers() -> None:
+        await asyncio.gather(*(worker(entry) for entry in models))
+        signals.put_nowait(all_done)
+
+    runner = asyncio.create_task(run_workers())
+    stitcher = Stitcher()
+    next_index = 0
+    try:
+        while True:
+            signal = await signals.get()
+            if isinstance(signal, Exception):
+                raise signal
+            while next_index in finished:
+                chunk, result, device = finished.pop(next_index)
+                next_index += 1
+                print(f"INFO: Chunk {chunk.index + 1} done ({chunk.start / 60:.1f}-{chunk.end / 60:.1f} of {duration / 60:.1f} min, {device})")
+                yield {
+                    "index": chunk.index,
+                    "start": round(chunk.start, 3),
+                    "end": round(chunk.end, 3),
+                    "duration": round(duration, 3),
+                    "device": device,
+                    "language": result.get("language"),
+                    "segments": stitcher.add(chunk, result)
+                }
+            if signal is all_done:
+                return
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+async def transcribe_long_form(
+    pooled: PooledModel,
+    audio_file: str,
+    duration: Optional[float] = None,
+    language: Optional[str] = None,
+    batch_size: int = 16,
+    on_chunk: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    chunk_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Transcribe long media chunk by chunk across the available devices.
+
+    Args:
+        pooled: Pooled WhisperX model (first worker; extra devices reuse its settings)
+        audio_file: Audio file (any ffmpeg-readable format or raw .f32 PCM)
+        duration: Duration in seconds (probed when missing)
+        language: Requested language (None = majority of detected chunk languages)
+        batch_size: Chunks per forward pass inside each WhisperX call
+        on_chunk: Awaited with every finished chunk (see iter_chunk_results),
+                  in media order - used to save partial transcripts
+        chunk_seconds: Target chunk length (default LONG_FORM_CHUNK_SECONDS)
+
+    Returns:
+        {"segments": [...], "language": ..., "chunks": n}
+
+    Raises:
+        Exception: If decoding or inference of any chunk fails (remaining work is cancelled)
+    """
+    if not duration:
+        duration = await audio_duration(audio_file)
+        if not duration:
+            raise Exception(f"Could not determine duration of {audio_file}")
+
+    segments: List[Dict[str, Any]] = []
+    languages: Counter = Counter()
+    chunks = 0
+    async for chunk in iter_chunk_results(
+        pooled, audio_file, duration, batch_size=batch_size, chunk_seconds=chunk_seconds
+    ):
+        segments.extend(chunk["segments"])
+        if chunk["language"]:
+            languages[chunk["language"]] += 1
+        chunks += 1
+        if on_chunk:
+            await on_chunk(chunk)
+
+    if not language and languages:
+        language = languages.most_common(1)[0][0]
+
+    return {"segments": segments, "language": language, "chunks": chunks}
@@ -0,0 +1,323 @@
+"""
+WhisperX model pool for reusing loaded models across transcriptions.
+
+Loading a WhisperX model takes seconds (tiny) to minutes (large-v3) and used to
+happen on every transcription. This module keeps loaded models resident for the
+lifetime of the process so that /transcribe, the job pipeline and the RunPod
+handler all share warm models.
+
+Features:
+- Process-wide registry keyed by (model_size, device, compute_type, language)
+- LRU eviction bounded by model count and an estimated memory budget
+- Per-key load locks so concurrent requests never load the same model twice
+- Per-model locks so callers can serialize inference on a shared model
+- Hit/miss/eviction statistics for monitoring
+"""
+
+import gc
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import (
+    MODEL_POOL_MAX_MODELS,
+    MODEL_POOL_MEMORY_MB,
+    WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE,
+    get_settings
+)
+
+
+# Approximate resident size of each model at float16 (MB).
+# int8 models use roughly half of this.
+_MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 300,
+    "small": 1000,
+    "medium": 2600,
+    "large-v1": 5000,
+    "large-v2": 5000,
+    "large-v3": 5000,
+    "turbo": 3200,
+    "large-v3-turbo": 3200,
+}
+
+ModelKey = Tuple[str, str, str, Optional[str]]
+
+
+def estimate_model_memory_mb(model_size: str, compute_type: str) -> int:
+    """
+    Estimate memory footprint of a model.
+
+    Args:
+        model_size: Model size name (tiny, small, medium, large-v3, ...)
+        compute_type: Compute type (float16, float32, int8, ...)
+
+    Returns:
+        Estimated size in MB (unknown sizes fall back to the medium estimate)
+    """
+    base = _MODEL_MEMORY_MB.get(model_size, _MODEL_MEMORY_MB["medium"])
+    if compute_type.startswith("int8"):
+        return base // 2
+    if compute_type == "float32":
+        return base * 2
+    return base
+
+
+def _default_loader(model_size: str, device: str, compute_type: str, language: Optional[str]):
+    """
+    Load a WhisperX model (imported lazily so the API runs without whisperX).
+
+    Devices may carry an index ("cuda:1") to place a model on a specific GPU.
+    """
+    import whisperx
+    device, _, index = device.partition(":")
+    return whisperx.load_model(
+        model_size,
+        device,
+        device_index=int(index or 0),
+        compute_type=compute_type,
+        language=language
+    )
+
+
+@dataclass
+class PooledModel:
+    """A resident model plus bookkeeping used by the pool."""
+    key: ModelKey
+    model: Any
+    memory_mb: int
+    load_time: float
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def device(self) -> str:
+        return self.key[1]
+
+    @property
+    def compute_type(self) -> str:
+        return self.key[2]
+
+
+class ModelPool:
+    """
+    Thread-safe LRU registry of loaded models.
+
+    Models are evicted in least-recently-used order when either the number of
+    resident models exceeds max_models or the estimated memory of resident
+    models would exceed memory_budget_mb (0 disables the memory budget).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[..., Any] = _default_loader,
+        max_models: int = 2,
+        memory_budget_mb: int = 0
+    ):
+        self._loader = loader
+        self.max_models = max(1, max_models)
+        self.memory_budget_mb = max(0, memory_budget_mb)
+        self._models: "OrderedDict[ModelKey, PooledModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "load_errors": 0,
+            "total_load_time": 0.0
+        }
+
+    def acquire(
+        self,
+        model_size: str,
+        device: str,
+        compute_type: str,
+        language: Optional[str] = None
+    ) -> Tuple[PooledModel, bool]:
+        """
+        Return a resident model, loading it if necessary.
+
+        Args:
+            model_size: Model size name
+            device: Device (cuda, mps, cpu)
+            compute_type: Compute type (float16, int8, ...)
+            language: Language the model is pinned to (None = auto-detect)
+
+        Returns:
+            Tuple of (PooledModel, cache_hit)
+
+        Raises:
+            Exception: Whatever the loader raises when the model cannot be loaded
+        """
+        key: ModelKey = (model_size, device, compute_type, language)
+
+        entry = self._get(key)
+        if entry:
+            return entry, True
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another caller may have loaded it while we waited
+            entry = self._get(key)
+            if entry:
+                return entry, True
+
+            memory_mb = estimate_model_memory_mb(model_size, compute_type)
+            self._make_room(memory_mb)
+
+            start = time.time()
+            try:
+                model = self._loader(model_size, device, compute_type, language)
+            except Exception:
+                with self._lock:
+                    self._stats["load_errors"] += 1
+                raise
+            load_time = time.time() - start
+
+            entry = PooledModel(key=key, model=model, memory_mb=memory_mb, load_time=load_time)
+            entry.uses = 1
+            with self._lock:
+                self._models[key] = entry
+                self._stats["misses"] += 1
+                self._stats["total_load_time"] += load_time
+
+            print(f"INFO: Model pool loaded {model_size} on {device} ({compute_type}, language={language or 'auto'}) in {load_time:.1f}s")
+            return entry, False
+
+    def _get(self, key: ModelKey) -> Optional[PooledModel]:
+        """Look up a resident model and mark it most recently used."""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return None
+            self._models.move_to_end(key)
+            entry.last_used = time.time()
+            entry.uses += 1
+            self._stats["hits"] += 1
+            return entry
+
+    def _make_room(self, incoming_mb: int) -> None:
+        """Evict least recently used models until the incoming model fits."""
+        evicted = []
+        with self._lock:
+            while self._models:
+                used_mb = sum(m.memory_mb for m in self._models.values())
+                over_count = len(self._models) >= self.max_models
+                over_budget = self.memory_budget_mb and used_mb + incoming_mb > self.memory_budget_mb
+                if not over_count and not over_budget:
+                    break
+                _, entry = self._models.popitem(last=False)
+                self._stats["evictions"] += 1
+                evicted.append(entry)
+
+        for entry in evicted:
+            print(f"INFO: Model pool evicted {entry.key[0]} on {entry.device} (idle {time.time() - entry.last_used:.0f}s)")
+            self._release(entry)
+
+    def _release(self, entry: PooledModel) -> None:
+        """Drop references to an evicted model and free accelerator memory."""
+        entry.model = None
+        gc.collect()
+        if entry.device.startswith("cuda"):
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+    def evict(self, model_size: str, device: str, compute_type: str, language: Optional[str] = None) -> bool:
+        """Evict a specific model. Returns True if it was resident."""
+        with self._lock:
+            entry = self._models.pop((model_size, device, compute_type, language), None)
+            if entry:
+                self._stats["evictions"] += 1
+        if entry:
+            self._release(entry)
+        return entry is not None
+
+    def clear(self) -> None:
+        """Evict all resident models."""
+        with self._lock:
+            entries = list(self._models.values())
+            self._models.clear()
+            self._stats["evictions"] += len(entries)
+        for entry in entries:
+            self._release(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool configuration, statistics and resident models."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "max_models": self.max_models,
+                "memory_budget_mb": self.memory_budget_mb,
+                "resident_memory_mb": sum(m.memory_mb for m in self._models.values()),
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else None,
+                "evictions": self._stats["evictions"],
+                "load_errors": self._stats["load_errors"],
+                "total_load_time": round(self._stats["total_load_time"], 2),
+                "models": [
+                    {
+                        "model_size": m.key[0],
+                        "device": m.key[1],
+                        "compute_type": m.key[2],
+                        "language": m.key[3],
+                        "memory_mb": m.memory_mb,
+                        "load_time": round(m.load_time, 2),
+                        "uses": m.uses,
+                        "idle_seconds": round(time.time() - m.last_used, 1)
+                    }
+                    for m in reversed(self._models.values())
+                ]
+            }
+
+
+# Process-wide pool shared by /transcribe, job_service and handler.py
+model_pool = ModelPool(
+    max_models=MODEL_POOL_MAX_MODELS,
+    memory_budget_mb=MODEL_POOL_MEMORY_MB
+)
+
+
+def prewarm_worker_model() -> Optional[Dict[str, Any]]:
+    """
+    Load the WORKER_MODEL_SIZE model into the pool ahead of the first job.
+
+    Skipped when MODEL_PREWARM is disabled, the worker provider is not local,
+    or whisperX is not installed. Failures are logged, never raised.
+
+    Returns:
+        Dict with model_size, device, load_time if a model was loaded, else None
+    """
+    settings = get_settings()
+    if not settings.model_prewarm or settings.worker_provider != "local":
+        return None
+
+    try:
+        import whisperx  # noqa: F401
+    except ImportError:
+        print("INFO: Model prewarm skipped - whisperX not installed")
+        return None
+
+    model_size = settings.worker_model_size
+    try:
+        entry, _ = model_pool.acquire(model_size, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE, None)
+        print(f"INFO: Prewarmed WhisperX model '{model_size}' on {WHISPER_DEVICE}")
+        return {
+            "model_size": model_size,
+            "device": entry.device,
+            "load_time": round(entry.load_time, 2)
+        }
+    except Exception as e:
+        print(f"WARNING: Model prewarm failed for '{model_size}' on {WHISPER_DEVICE}: {str(e)}")
+        return None
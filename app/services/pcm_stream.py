@@ -0,0 +1,213 @@
+"""
+Streaming audio decode straight to 16 kHz PCM for local transcription.
+
+The default job pipeline downloads the best audio stream, has ffmpeg re-encode
+it to a 192k MP3 in CACHE_DIR/audio, and whisperx.load_audio then runs ffmpeg
+again to decode that MP3 back to 16 kHz PCM - a lossy encode/decode cycle and
+an extra full-file write per job. With AUDIO_PCM_STREAMING the downloaded
+stream goes through a single ffmpeg process instead:
+
+- YouTube (binary): yt-dlp -o - | ffmpeg, connected by an OS pipe; the cached
+  info dict is reused with --load-info-json
+- Other platforms: ffmpeg reads the best audio format URL of the info dict
+  directly (with the extractor's HTTP headers)
+- ffmpeg writes raw 16 kHz mono float32 samples (the array WhisperX expects)
+  to CACHE_DIR/audio/{uid}.f32; the transcriber memory-maps that file instead
+  of decoding it
+
+Only the local provider can use raw PCM (the OpenAI API needs an encoded
+file). Callers fall back to the MP3 download when streaming fails.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from app.services.info_cache import formats_reusable, info_json_file
+from app.services.ytdlp_service import build_ytdlp_command
+from app.utils.process_utils import run_pipeline, run_process
+
+
+PCM_FORMAT = "f32"
+PCM_SAMPLE_RATE = 16000
+PCM_BYTES_PER_SECOND = PCM_SAMPLE_RATE * 4
+
+# Format protocols ffmpeg can read by URL (DASH segments, f4m, ... need yt-dlp)
+_FFMPEG_PROTOCOLS = {None, "http", "https", "m3u8", "m3u8_native"}
+
+
+def is_pcm_file(path: str) -> bool:
+    """Whether a path is a raw PCM file written by stream_pcm()."""
+    return path.endswith(f".{PCM_FORMAT}")
+
+
+def load_pcm(path: str) -> Any:
+    """
+    Memory-map a raw PCM file as a float32 array (no decode, no full read).
+
+    Pages are copy-on-write, so consumers that modify the array in place
+    never touch the cached file.
+    """
+    import numpy as np
+
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="c")
+
+
+def pcm_duration(path: str) -> float:
+    """Duration in seconds of a raw PCM file."""
+    return os.path.getsize(path) / PCM_BYTES_PER_SECOND
+
+
+async def audio_duration(path: str) -> Optional[float]:
+    """
+    Duration in seconds of an audio file without decoding it.
+
+    Raw PCM is measured by size; anything else is probed with ffprobe.
+
+    Returns:
+        Duration, or None if it can't be determined
+    """
+    if is_pcm_file(path):
+        return pcm_duration(path)
+    result = await run_process([
+        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1', path
+    ], timeout=30)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+async def decode_pcm(path: str, start: float, duration: float) -> Any:
+    """
+    Decode one window of an audio file to a 16 kHz float32 array.
+
+    Raw PCM files are sliced from the memory map; other files are decoded by
+    ffmpeg with input seeking, so only the window is ever held in memory.
+
+    Args:
+        path: Audio file
+        start: Window start in seconds
+        duration: Window length in seconds
+
+    Raises:
+        Exception: If ffmpeg fails
+    """
+    import numpy as np
+
+    if is_pcm_file(path):
+        first = int(start * PCM_SAMPLE_RATE)
+        return load_pcm(path)[first:first + int(duration * PCM_SAMPLE_RATE)]
+
+    result = await run_process(_ffmpeg_command(path, 'pipe:1', start=start, duration=duration), text=False)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg failed: {result.stderr.strip()}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def select_audio_format(info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Pick the best format with audio that ffmpeg can read by URL.
+
+    Prefers audio-only formats, highest bitrate first; falls back to the
+    info dict itself for single-format extractors.
+
+    Returns:
+        Format dict with url (and usually http_headers), or None
+    """
+    candidates = [
+        f for f in info.get("formats") or []
+        if f.get("url") and f.get("acodec") != "none" and f.get("protocol") in _FFMPEG_PROTOCOLS
+    ]
+    audio_only = [f for f in candidates if f.get("vcodec") == "none"]
+    candidates = audio_only or candidates
+    if candidates:
+        return max(candidates, key=lambda f: f.get("abr") or f.get("tbr") or 0)
+    if info.get("url") and info.get("protocol") in _FFMPEG_PROTOCOLS:
+        return info
+    return None
+
+
+def _ffmpeg_command(
+    source: str,
+    output_path: str,
+    headers: Optional[Dict[str, str]] = None,
+    start: Optional[float] = None,
+    duration: Optional[float] = None
+) -> List[str]:
+    """ffmpeg command decoding source (or a window of it) to raw 16 kHz mono float32 samples."""
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+    if start is not None:
+        cmd.extend(['-ss', f"{start:.3f}", '-t', f"{duration:.3f}"])
+    if headers:
+        cmd.extend(['-headers', "".join(f"{key}: {value}\r\n" for key, value in headers.items())])
+    cmd.extend([
+        '-i', source,
+        '-vn', '-ac', '1', '-ar', str(PCM_SAMPLE_RATE),
+        '-f', 'f32le', '-y', output_path
+    ])
+    return cmd
+
+
+async def stream_pcm(
+    url: str,
+    info: Optional[Dict[str, Any]],
+    output_path: str,
+    use_binary: bool,
+    timeout: int = 600
+) -> None:
+    """
+    Download a URL's audio and decode it straight to a raw PCM file.
+
+    Args:
+        url: Video URL
+        info: Info dict from get_video_info(), or None
+        output_path: Destination .f32 file (written atomically)
+        use_binary: Stream with the standalone yt-dlp binary (YouTube)
+        timeout: Seconds before the download/decode is killed
+
+    Raises:
+        Exception: If no stream could be decoded
+    """
+    if info is not None and not formats_reusable(info):
+        info = None
+
+    part_path = f"{output_path}.part"
+    try:
+        if use_binary:
+            args = ['-f', 'bestaudio/best', '--quiet', '--no-progress', '-o', '-']
+            if info is None:
+                producer, consumer = await run_pipeline(
+                    build_ytdlp_command(args + [url]),
+                    _ffmpeg_command('pipe:0', part_path),
+                    timeout=timeout
+                )
+            else:
+                with info_json_file(info) as info_path:
+                    producer, consumer = await run_pipeline(
+                        build_ytdlp_command(args + ['--load-info-json', info_path]),
+                        _ffmpeg_command('pipe:0', part_path),
+                        timeout=timeout
+                    )
+            if producer.returncode != 0:
+                raise Exception(f"yt-dlp failed: {producer.stderr.strip()}")
+            result = consumer
+        else:
+            fmt = select_audio_format(info) if info else None
+            if fmt is None:
+                raise Exception("No audio stream URL ffmpeg can read")
+            result = await run_process(
+                _ffmpeg_command(fmt["url"], part_path, fmt.get("http_headers")),
+                timeout=timeout
+            )
+
+        if result.returncode != 0:
+            raise Exception(f"ffmpeg failed: {result.stderr.strip()}")
+        if not os.path.exists(part_path) or os.path.getsize(part_path) == 0:
+            raise Exception("ffmpeg decoded no audio")
+        os.replace(part_path, output_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
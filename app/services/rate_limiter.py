@@ -0,0 +1,193 @@
+"""
+Per-platform token-bucket rate limiting for outbound extractor requests.
+
+youtube_rate_limit() used to hold one global asyncio.Lock and sleep 7-25s
+while holding it, so all YouTube work across endpoints ran one at a time and
+the sleep applied even when nothing else had hit YouTube recently. This
+module replaces it with token buckets:
+
+- One bucket per (platform, cookie identity): YouTube requests made with
+  different cookies files, and requests to TikTok/Vimeo/etc., never wait on
+  each other
+- Rate and burst per platform from RATE_LIMITS (platform=per_minute:burst);
+  other platforms use RATE_LIMIT_DEFAULT, or are unlimited if it's empty
+- Fair queuing: a caller that finds the bucket empty reserves the next token
+  instead of polling, so waiters are served strictly in arrival order and no
+  lock is held while sleeping
+- Wait-time metrics via get_rate_limit_stats() (/admin/rate-limits/status)
+  and the rate_limit_wait_seconds histogram (/metrics)
+
+Buckets are guarded by a threading.Lock, so one limiter is shared by the API
+event loop and worker threads with their own loops.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import RATE_LIMITS, RATE_LIMIT_DEFAULT, YTDLP_COOKIES_FILE
+from app.utils.metrics_utils import RATE_LIMIT_WAIT_SECONDS
+from app.utils.platform_utils import get_platform_from_url
+
+
+class TokenBucket:
+    """Token bucket with FIFO reservations."""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (requests allowed back to back)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before using the token (0 if available now)
+        """
+        self._refill()
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self) -> None:
+        """Return a reserved token (the caller gave up before using it)."""
+        self._refill()
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def available(self) -> float:
+        """Tokens currently available (negative while callers are queued)."""
+        self._refill()
+        return self.tokens
+
+
+_lock = threading.Lock()
+_buckets: Dict[Tuple[str, str], Optional[TokenBucket]] = {}
+
+
+def _identity(cookies_file: Optional[str]) -> str:
+    """Cookie identity used in the bucket key (file name only, never contents)."""
+    if cookies_file and os.path.exists(cookies_file):
+        return os.path.basename(cookies_file)
+    return "anonymous"
+
+
+def _get_bucket(platform: str, identity: str) -> Optional[TokenBucket]:
+    key = (platform, identity)
+    if key not in _buckets:
+        limit = RATE_LIMITS.get(platform, RATE_LIMIT_DEFAULT)
+        _buckets[key] = TokenBucket(*limit) if limit else None
+    return _buckets[key]
+
+
+async def rate_limit(url: str, cookies_file: Optional[str] = None) -> float:
+    """
+    Wait for a request slot for the URL's platform and cookie identity.
+
+    Args:
+        url: URL about to be requested (determines the platform)
+        cookies_file: Cookies file the request will use. YouTube defaults to
+                      YTDLP_COOKIES_FILE, which the binary always uses.
+
+    Returns:
+        Seconds waited
+    """
+    platform = get_platform_from_url(url)
+    if cookies_file is None and platform == "youtube":
+        cookies_file = YTDLP_COOKIES_FILE
+    identity = _identity(cookies_file)
+
+    with _lock:
+        bucket = _get_bucket(platform, identity)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            bucket.waiting += 1
+            queued = bucket.waiting
+
+    if wait > 0:
+        print(f"INFO: Rate limiting {platform} ({identity}) - waiting {wait:.1f}s, {queued} queued")
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            with _lock:
+                bucket.refund()
+            raise
+        finally:
+            with _lock:
+                bucket.waiting -= 1
+
+    with _lock:
+        bucket.acquired += 1
+        if wait > 0:
+            bucket.delayed += 1
+            bucket.total_wait += wait
+            bucket.max_wait = max(bucket.max_wait, wait)
+    RATE_LIMIT_WAIT_SECONDS.observe(wait, platform=platform)
+    return wait
+
+
+async def youtube_rate_limit() -> float:
+    """Wait for a YouTube request slot (default cookies identity)."""
+    return await rate_limit("https://www.youtube.com/")
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """
+    Get limiter configuration and per-bucket wait metrics.
+
+    Returns:
+        Dict with configured limits and, per platform/identity bucket, available
+        tokens, queued waiters, acquired/delayed counts and wait times
+    """
+    buckets = []
+    with _lock:
+        for (platform, identity), bucket in _buckets.items():
+            if bucket is None:
+                continue
+            buckets.append({
+                "platform": platform,
+                "identity": identity,
+                "requests_per_minute": round(bucket.rate * 60, 3),
+                "burst": bucket.burst,
+                "available_tokens": round(bucket.available(), 3),
+                "waiting": bucket.waiting,
+                "acquired": bucket.acquired,
+                "delayed": bucket.delayed,
+                "total_wait_seconds": round(bucket.total_wait, 3),
+                "max_wait_seconds": round(bucket.max_wait, 3),
+                "avg_wait_seconds": round(bucket.total_wait / bucket.acquired, 3) if bucket.acquired else 0.0,
+            })
+
+    def describe(limit: Optional[Tuple[float, int]]) -> Optional[Dict[str, Any]]:
+        return {"requests_per_minute": round(limit[0] * 60, 3), "burst": limit[1]} if limit else None
+
+    return {
+        "limits": {platform: describe(limit) for platform, limit in RATE_LIMITS.items()},
+        "default": describe(RATE_LIMIT_DEFAULT),
+        "buckets": buckets,
+    }
+
+
+def reset_rate_limits() -> None:
+    """Drop all buckets (limits are re-read on next use)."""
+    with _lock:
+        _buckets.clear()
@@ -36,10 +36,10 @@ Note: timestamps can be either:
 
 import os
 import uuid
+import asyncio
 import hashlib
-import yt_dlp
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from app.config import CACHE_DIR, YTDLP_BINARY
 from app.services.supabase_service import (
@@ -48,9 +48,14 @@ from app.services.supabase_service import (
     mark_transcription_screenshots_extracted
 )
 from app.services.screenshot_service import extract_screenshot
-from app.services.ytdlp_service import run_ytdlp_binary, youtube_rate_limit
-from app.services.cache_service import get_cached_video
-from app.utils.platform_utils import is_youtube_url, get_platform_prefix
+from app.services.ytdlp_service import run_ytdlp_binary
+from app.services.rate_limiter import rate_limit
+from app.services.batch_scheduler import BatchScheduler, run_db_call, scheduler_slot
+from app.services.cache_service import get_cached_video, find_cached_output
+from app.services import cache_index
+from app.services.ytdlp_pool import ytdlp_download
+from app.services.info_cache import get_video_info
+from app.utils.platform_utils import is_youtube_url, get_platform_prefix, get_platform_from_url
 from app.utils.timestamp_utils import parse_timestamp_to_seconds, format_seconds_to_srt
 
 
@@ -87,50 +92,21 @@ async def _extract_video_metadata(video_url: str) -> Dict[str, Any]:
     """
     use_binary = is_youtube_url(video_url) and os.path.exists(YTDLP_BINARY)
 
-    # Apply rate limiting for YouTube
-    if is_youtube_url(video_url):
-        await youtube_rate_limit()
+    # Apply per-platform rate limiting
+    await rate_limit(video_url)
 
     try:
-        if use_binary:
-            # Use standalone binary for YouTube
-            stdout, stderr, code = run_ytdlp_binary([
-                '--skip-download', '--print', '%(id)s\n%(title)s\n%(duration)s',
-                video_url
-            ])
-            if code != 0:
-                raise Exception(f"yt-dlp binary failed: {stderr}")
-
-            lines = stdout.strip().split('\n')
-            video_id = lines[0] if len(lines) > 0 else None
-            title = lines[1] if len(lines) > 1 else 'Unknown'
-            duration = int(lines[2]) if len(lines) > 2 and lines[2].isdigit() else None
-
-            if not video_id:
-                raise Exception("Failed to extract video_id from metadata")
-
-            return {
-                "video_id": video_id,
-                "title": title,
-                "duration": duration
-            }
-        else:
-            # Use Python library for non-YouTube
-            meta_opts = {'quiet': True, 'skip_download': True}
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                video_id = info.get('id')
-                title = info.get('title', 'Unknown')
-                duration = info.get('duration')
-
-                if not video_id:
-                    raise Exception("Failed to extract video_id from metadata")
+        # Shared with the audio/subtitle paths via the info cache
+        info = await get_video_info(video_url, use_binary=use_binary)
+        video_id = info.get('id')
+        if not video_id:
+            raise Exception("Failed to extract video_id from metadata")
 
-                return {
-                    "video_id": video_id,
-                    "title": title,
-                    "duration": duration
-                }
+        return {
+            "video_id": video_id,
+            "title": info.get('title') or 'Unknown',
+            "duration": info.get('duration')
+        }
     except Exception as e:
         raise Exception(f"Metadata extraction failed: {str(e)}")
 
@@ -159,7 +135,7 @@ async def _download_or_get_cached_video(
     platform = get_platform_prefix(video_url)
 
     # Check cache first
-    video_path = get_cached_video(video_id)
+    video_path = await asyncio.to_thread(get_cached_video, video_id)
     if video_path:
         print(f"INFO: Using cached video: {video_path}")
         return video_path
@@ -171,14 +147,13 @@ async def _download_or_get_cached_video(
 
     use_binary = is_youtube_url(video_url) and os.path.exists(YTDLP_BINARY)
 
-    # Apply rate limiting for YouTube
-    if is_youtube_url(video_url):
-        await youtube_rate_limit()
+    # Apply per-platform rate limiting
+    await rate_limit(video_url)
 
     try:
         if use_binary:
             # Use standalone binary for YouTube
-            stdout, stderr, code = run_ytdlp_binary([
+            stdout, stderr, code = await run_ytdlp_binary([
                 '-f', 'best[height<=1080]',
                 '-o', video_path.replace('.mp4', '.%(ext)s'),
                 '--merge-output-format', 'mp4',
@@ -194,16 +169,12 @@ async def _download_or_get_cached_video(
                 'quiet': True,
                 'merge_output_format': 'mp4',
             }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            await ytdlp_download([video_url], ydl_opts)
 
         # Find actual downloaded file (extension may vary)
-        cache_videos_dir = os.path.join(CACHE_DIR, "videos")
-        actual_video_path = None
-        for f in os.listdir(cache_videos_dir):
-            if f.startswith(f"{platform}-{video_id}"):
-                actual_video_path = os.path.join(cache_videos_dir, f)
-                break
+        actual_video_path = find_cached_output(
+            os.path.join(CACHE_DIR, "videos"), f"{platform}-{video_id}", ["mp4", "webm", "mkv"]
+        )
 
         if not actual_video_path or not os.path.exists(actual_video_path):
             raise Exception("Video download completed but file not found")
@@ -213,6 +184,10 @@ async def _download_or_get_cached_video(
         if file_size < 1024:  # Less than 1KB indicates corruption
             raise Exception(f"Downloaded video appears corrupted (size: {file_size} bytes)")
 
+        await asyncio.to_thread(
+            cache_index.record_file, actual_video_path, "video", get_platform_from_url(video_url), video_id
+        )
+
         print(f"INFO: Video downloaded: {actual_video_path} ({file_size} bytes)")
         return actual_video_path
 
@@ -226,7 +201,8 @@ async def _download_or_get_cached_video(
 
 async def _process_single_screenshot_job(
     job: Dict[str, Any],
-    worker: str
+    worker: str,
+    scheduler: Optional[BatchScheduler] = None
 ) -> Dict[str, Any]:
     """
     Process a single screenshot extraction job.
@@ -234,6 +210,7 @@ async def _process_single_screenshot_job(
     Args:
         job: Job data containing video_url, timestamps, quality, document_id
         worker: Worker name (e.g., "runpod", "local")
+        scheduler: Batch scheduler limiting download/db concurrency (None = unlimited)
 
     Returns:
         Result dict with status, job_id, total_extracted, failed_timestamps, error
@@ -297,7 +274,8 @@ async def _process_single_screenshot_job(
         current_step = "extracting video metadata"
         print(f"INFO: [{job_id}] Extracting metadata...")
 
-        metadata = await _extract_video_metadata(video_url)
+        async with scheduler_slot(scheduler, "download"):
+            metadata = await _extract_video_metadata(video_url)
         video_id = metadata["video_id"]
         video_title = metadata["title"]
         video_duration = metadata["duration"]
@@ -310,7 +288,9 @@ async def _process_single_screenshot_job(
         current_step = "downloading video"
         print(f"INFO: [{job_id}] Checking cache / downloading video...")
 
-        video_path = await _download_or_get_cached_video(video_url, video_id)
+        # Jobs for the same video wait for one download and then hit the cache
+        async with scheduler_slot(scheduler, "download", key=video_id):
+            video_path = await _download_or_get_cached_video(video_url, video_id)
 
         # =================================================================
         # Step 3: Extract screenshots at each timestamp
@@ -360,11 +340,16 @@ async def _process_single_screenshot_job(
                 output_path = os.path.join(screenshots_dir, output_filename)
 
                 # Extract frame using FFmpeg
-                result = extract_screenshot(video_path, ts_seconds, output_path, quality)
+                result = await extract_screenshot(video_path, ts_seconds, output_path, quality)
+                await asyncio.to_thread(
+                    cache_index.record_file, output_path, "screenshot", video_id=video_id, fmt="jpg"
+                )
 
                 # Upload to Supabase storage
                 storage_path = f"screenshots/{video_id}/{ts_ms}.jpg"
-                upload_result = upload_screenshot_to_supabase(output_path, storage_path)
+                upload_result = await run_db_call(
+                    scheduler, lambda: upload_screenshot_to_supabase(output_path, storage_path)
+                )
                 public_url = upload_result["public_url"]
 
                 # Prepare base metadata for this screenshot
@@ -404,7 +389,9 @@ async def _process_single_screenshot_job(
 
                 # Save to database with job metadata
                 try:
-                    save_screenshot_with_job_metadata(base_data, screenshot_job_metadata)
+                    await run_db_call(
+                        scheduler, lambda: save_screenshot_with_job_metadata(base_data, screenshot_job_metadata)
+                    )
                 except Exception as db_err:
                     # Log but don't fail - screenshot was extracted and uploaded successfully
                     print(f"WARNING: [{job_id}] Failed to save metadata to DB: {str(db_err)}")
@@ -426,11 +413,11 @@ async def _process_single_screenshot_job(
 
         # Update transcription status to 'extracted' if we have a transcription_id
         if transcription_id and extracted_count > 0:
-            mark_transcription_screenshots_extracted(
+            await run_db_call(scheduler, lambda: mark_transcription_screenshots_extracted(
                 transcription_id=transcription_id,
                 runpod_job_id=job_id,
                 extracted_count=extracted_count
-            )
+            ), operation="mark_screenshots_extracted")
         elif not transcription_id and extracted_count > 0:
             print(f"WARNING: [{job_id}] No transcription_id provided - status not updated")
 
@@ -526,12 +513,11 @@ async def process_screenshot_job_batch(
     print(f"INFO: Processing batch of {len(jobs)} screenshot job(s) from queue '{queue_name}'")
     print(f"INFO: Worker: {worker}")
 
-    results = []
-
-    # Process jobs sequentially to respect rate limiting and resource constraints
-    for job in jobs:
-        result = await _process_single_screenshot_job(job=job, worker=worker)
-        results.append(result)
+    # Run jobs concurrently; the scheduler limits downloads and DB/storage writes
+    scheduler = BatchScheduler()
+    results = await scheduler.run_all(
+        jobs, lambda job: _process_single_screenshot_job(job=job, worker=worker, scheduler=scheduler)
+    )
 
     # Count results by status
     completed = sum(1 for r in results if r.get("status") == "completed")
@@ -7,11 +7,12 @@ including frame capture, quality control, and metadata extraction.
 
 import os
 import json
-import subprocess
 from typing import Dict
 
+from app.utils.process_utils import run_process
 
-def extract_screenshot(video_path: str, timestamp_seconds: float, output_path: str, quality: int = 2) -> dict:
+
+async def extract_screenshot(video_path: str, timestamp_seconds: float, output_path: str, quality: int = 2) -> dict:
     """
     Extract single frame from video using FFmpeg.
     Returns metadata dict or raises exception.
@@ -38,7 +39,7 @@ def extract_screenshot(video_path: str, timestamp_seconds: float, output_path: s
         output_path
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = await run_process(cmd, timeout=30)
 
     if result.returncode != 0 or not os.path.exists(output_path):
         raise Exception(f"FFmpeg failed: {result.stderr}")
@@ -46,7 +47,7 @@ def extract_screenshot(video_path: str, timestamp_seconds: float, output_path: s
     # Get image dimensions using ffprobe
     probe_cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
                  '-show_entries', 'stream=width,height', '-of', 'json', output_path]
-    probe_result = subprocess.run(probe_cmd, capture_output=True, text=True)
+    probe_result = await run_process(probe_cmd, timeout=30)
 
     width, height = 0, 0
     if probe_result.returncode == 0:
@@ -0,0 +1,202 @@
+"""
+Content-addressed transcription result cache.
+
+Transcription results are stored under CACHE_DIR/transcriptions keyed by a
+SHA-256 of the audio content plus provider, model, language and (for models run
+in this process) the device/compute type, so e.g. results of the int8 CPU
+fallback are never served to float16 GPU requests. Retried jobs
+(after a visibility timeout) and duplicate documents that resolve to the same
+audio are served from disk in milliseconds instead of re-running WhisperX or
+the OpenAI API.
+
+Entries expire with the regular cache TTL (CACHE_TTL_HOURS).
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import (
+    TRANSCRIPTIONS_DIR,
+    CACHE_TTL_HOURS,
+    TRANSCRIPTION_CACHE_ENABLED
+)
+from app.services import cache_index
+from app.utils.metrics_utils import record_cache_lookup
+
+
+# Bump when the cached payload format changes
+_CACHE_VERSION = 1
+
+# Memoized audio hashes keyed by (path, size, mtime_ns) to avoid rehashing
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+_hash_memo_lock = threading.Lock()
+_HASH_MEMO_MAX = 512
+
+
+def compute_audio_hash(audio_file: str) -> str:
+    """
+    Compute SHA-256 of an audio file's content.
+
+    Reads in 1 MB chunks so memory stays flat for long media. Results are
+    memoized per (path, size, mtime) so repeated lookups are free.
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        Hex digest of the file content
+    """
+    stat = os.stat(audio_file)
+    memo_key = (os.path.abspath(audio_file), stat.st_size, stat.st_mtime_ns)
+
+    with _hash_memo_lock:
+        cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(audio_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    audio_hash = digest.hexdigest()
+
+    with _hash_memo_lock:
+        if len(_hash_memo) >= _HASH_MEMO_MAX:
+            _hash_memo.clear()
+        _hash_memo[memo_key] = audio_hash
+    return audio_hash
+
+
+def make_cache_key(
+    audio_hash: str,
+    provider: str,
+    model: str,
+    language: Optional[str],
+    variant: Optional[str] = None
+) -> str:
+    """Build the cache key for an (audio, provider, model, language, variant) combination."""
+    raw = f"v{_CACHE_VERSION}:{audio_hash}:{provider}:{model}:{language or 'auto'}"
+    if variant:
+        raw += f":{variant}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(TRANSCRIPTIONS_DIR, f"{key}.json")
+
+
+def get_cached_transcription(
+    audio_file: str,
+    provider: str,
+    model: str,
+    language: Optional[str],
+    variant: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached transcription result.
+
+    Args:
+        audio_file: Path to the audio file about to be transcribed
+        provider: Transcription provider (local, openai)
+        model: Model name (model_size for local, whisper-1 for openai)
+        language: Requested language (None = auto-detect)
+        variant: Device/compute type the result must come from (e.g. cuda/float16),
+                 None for remote providers
+
+    Returns:
+        Dict with segments, language, transcription_time, cache_key, or None on miss
+    """
+    if not TRANSCRIPTION_CACHE_ENABLED:
+        return None
+
+    entry = _read_entry(audio_file, provider, model, language, variant)
+    record_cache_lookup("transcription", hit=entry is not None)
+    return entry
+
+
+def _read_entry(
+    audio_file: str,
+    provider: str,
+    model: str,
+    language: Optional[str],
+    variant: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Load a valid, unexpired cache entry for get_cached_transcription (None if absent)."""
+    try:
+        key = make_cache_key(compute_audio_hash(audio_file), provider, model, language, variant)
+        path = _cache_path(key)
+        if not os.path.exists(path):
+            return None
+
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        if age_hours >= CACHE_TTL_HOURS:
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+
+        if entry.get("version") != _CACHE_VERSION or "segments" not in entry:
+            return None
+
+        entry["cache_key"] = key
+        return entry
+    except Exception as e:
+        # A broken cache entry must never fail a transcription
+        print(f"WARNING: Transcription cache lookup failed: {str(e)}")
+        return None
+
+
+def save_cached_transcription(
+    audio_file: str,
+    provider: str,
+    model: str,
+    language: Optional[str],
+    segments: List[Dict[str, Any]],
+    detected_language: str,
+    transcription_time: float,
+    variant: Optional[str] = None
+) -> Optional[str]:
+    """
+    Store a transcription result in the cache.
+
+    Written to a temp file and renamed so readers never see partial JSON.
+    variant is the device/compute type the result actually came from.
+
+    Returns:
+        Cache key on success, None if caching is disabled or the write failed
+    """
+    if not TRANSCRIPTION_CACHE_ENABLED:
+        return None
+
+    try:
+        audio_hash = compute_audio_hash(audio_file)
+        key = make_cache_key(audio_hash, provider, model, language, variant)
+        path = _cache_path(key)
+        os.makedirs(TRANSCRIPTIONS_DIR, exist_ok=True)
+
+        entry = {
+            "version": _CACHE_VERSION,
+            "audio_hash": audio_hash,
+            "provider": provider,
+            "model": model,
+            "variant": variant,
+            "requested_language": language,
+            "language": detected_language,
+            "segments": segments,
+            "transcription_time": transcription_time,
+            "created_at": time.time()
+        }
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        cache_index.record_file(path, "transcription", fmt="json")
+        return key
+    except Exception as e:
+        print(f"WARNING: Failed to write transcription cache: {str(e)}")
+        return None
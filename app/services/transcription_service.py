@@ -2,15 +2,20 @@
 Transcription service for AI and subtitle-based transcriptions.
 
 This module handles all transcription logic including:
-- WhisperX local transcription
+- WhisperX local transcription (short clips share cross-file inference batches,
+  long media is transcribed in silence-aligned chunks)
+- Streaming transcription: segments are yielded chunk by chunk
+- faster-whisper (CTranslate2) transcription for CPU-only hosts
 - OpenAI Whisper API transcription
 - Unified response formatting for both subtitle and AI sources
 """
 
 import os
 import time
+import asyncio
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
 
 import requests
 from fastapi import HTTPException
@@ -19,36 +24,24 @@ from app.config import (
     WHISPER_DEVICE,
     WHISPER_COMPUTE_TYPE,
     WHISPER_GPU_INFO,
-    CACHE_DIR,
     MAX_CONCURRENT_TRANSCRIPTIONS,
-    CACHE_TTL_HOURS
+    BATCH_TRANSCRIBE_ENABLED,
+    BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS,
+    LONG_FORM_ENABLED,
+    TRANSCRIBE_STREAM_CHUNK_SECONDS
 )
+from app.services.model_pool import PooledModel, model_pool
+from app.services.batch_transcriber import batch_transcriber, can_batch, SAMPLE_RATE
+from app.services.pcm_stream import is_pcm_file, load_pcm, audio_duration
+from app.services.long_form import (
+    chunks_for_partial_transcripts, is_long_form, iter_chunk_results, transcribe_long_form
+)
+from app.services.transcription_cache import get_cached_transcription, save_cached_transcription
+from app.services import faster_whisper_engine
 
 
-def cleanup_cache() -> dict:
-    """
-    Delete all cached files older than TTL.
-    Returns summary of deleted files.
-    """
-    cutoff = time.time() - (CACHE_TTL_HOURS * 3600)
-    deleted = {"videos": 0, "audio": 0, "transcriptions": 0, "screenshots": 0}
-    freed_bytes = 0
-
-    for subdir in deleted.keys():
-        dir_path = os.path.join(CACHE_DIR, subdir)
-        if os.path.exists(dir_path):
-            for filename in os.listdir(dir_path):
-                filepath = os.path.join(dir_path, filename)
-                if os.path.isfile(filepath) and os.path.getmtime(filepath) < cutoff:
-                    freed_bytes += os.path.getsize(filepath)
-                    os.remove(filepath)
-                    deleted[subdir] += 1
-
-    return {
-        "deleted": deleted,
-        "total_deleted": sum(deleted.values()),
-        "freed_bytes": freed_bytes
-    }
+# Providers that run a model in this process (and can read raw PCM)
+LOCAL_PROVIDERS = ("local", "faster-whisper")
 
 
 def create_unified_transcription_response(
@@ -63,7 +56,10 @@ def create_unified_transcription_response(
     model: Optional[str] = None,
     source_format: Optional[str] = None,
     transcription_time: Optional[float] = None,
-    platform: Optional[str] = None
+    platform: Optional[str] = None,
+    model_load_time: Optional[float] = None,
+    model_cache_hit: Optional[bool] = None,
+    transcription_cache_hit: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Create unified transcription response structure.
@@ -81,6 +77,9 @@ def create_unified_transcription_response(
         source_format: Original format (srt, vtt, etc. if source="subtitle")
         transcription_time: Processing time in seconds (if source="ai")
         platform: Platform name (youtube, tiktok, etc.)
+        model_load_time: Seconds spent loading the model (0 on pool hit, if source="ai")
+        model_cache_hit: Whether the model came from the warm model pool (if source="ai")
+        transcription_cache_hit: Whether the result came from the transcription cache (if source="ai")
 
     Returns:
         Unified transcription response dict
@@ -97,6 +96,12 @@ def create_unified_transcription_response(
     }
     if transcription_time is not None:
         metadata["transcription_time"] = round(transcription_time, 2)
+    if model_load_time is not None:
+        metadata["model_load_time"] = round(model_load_time, 2)
+    if model_cache_hit is not None:
+        metadata["model_cache_hit"] = model_cache_hit
+    if transcription_cache_hit is not None:
+        metadata["transcription_cache_hit"] = transcription_cache_hit
 
     # Build unified response
     response = {
@@ -119,6 +124,115 @@ def create_unified_transcription_response(
     return response
 
 
+def _cache_variant(provider: str, pooled: Optional[PooledModel] = None) -> Optional[str]:
+    """
+    Device/compute type part of the transcription cache key.
+
+    Lookups use the configured device (what a healthy load produces); saves
+    pass the pooled model actually used, so CPU fallback results get their
+    own entries. None for the OpenAI provider.
+    """
+    if pooled is not None:
+        device, compute_type = pooled.device, pooled.compute_type
+    elif provider == "local":
+        device, compute_type = WHISPER_DEVICE, WHISPER_COMPUTE_TYPE
+    elif provider == "faster-whisper":
+        device, compute_type = faster_whisper_engine.engine_device()
+    else:
+        return None
+    # cuda:0 and cuda:1 produce the same results
+    return f"{device.partition(':')[0]}/{compute_type}"
+
+
+def _acquire_local_model(model_size: str, language: Optional[str]) -> Tuple[PooledModel, bool]:
+    """
+    Get a warm WhisperX model from the pool, falling back to CPU if the GPU fails.
+
+    Returns:
+        Tuple of (PooledModel, cache_hit)
+
+    Raises:
+        HTTPException: If whisperX is missing or the model can't be loaded
+    """
+    try:
+        import whisperx  # noqa: F401
+        import torch  # noqa: F401
+    except ImportError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Local provider error: whisperX not installed - {str(e)}. Run: pip install whisperx OR use provider=openai"
+        )
+
+    # Use global device configuration detected at server startup
+    device = WHISPER_DEVICE
+    compute_type = WHISPER_COMPUTE_TYPE
+
+    # Reuse a warm model from the pool, with automatic fallback to CPU if GPU fails
+    model_load_error = None
+    try:
+        pooled, model_cache_hit = model_pool.acquire(
+            model_size,
+            device,
+            compute_type,
+            language
+        )
+    except Exception as e:
+        model_load_error = str(e)
+        # If GPU (CUDA or MPS) failed, try CPU fallback
+        if device in ["cuda", "mps"]:
+            try:
+                device = "cpu"
+                compute_type = "int8"
+                pooled, model_cache_hit = model_pool.acquire(
+                    model_size,
+                    device,
+                    compute_type,
+                    language
+                )
+                # Successfully loaded on CPU after GPU failure
+                print(f"WARNING: {WHISPER_DEVICE.upper()} failed ({model_load_error}), fell back to CPU")
+            except Exception as cpu_error:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Local provider error: Failed to load model '{model_size}' on {WHISPER_DEVICE.upper()} ({model_load_error}) and CPU ({str(cpu_error)})"
+                )
+        else:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Local provider error: Failed to load model '{model_size}' on {device.upper()} - {str(e)}"
+            )
+
+    return pooled, model_cache_hit
+
+
+def _validate_transcription_request(audio_file: str, provider: str) -> None:
+    """
+    Check that the audio file exists and the provider can read it.
+
+    Raises:
+        HTTPException: 404 for a missing file, 400 for an invalid provider
+    """
+    # Validate audio file exists
+    if not os.path.exists(audio_file):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Audio file not found: {audio_file}. Did you run /extract-audio first?"
+        )
+
+    # Validate provider
+    valid_providers = ["local", "faster-whisper", "openai"]
+    if provider not in valid_providers:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid provider '{provider}'. Must be one of: {', '.join(valid_providers)}"
+        )
+    if provider not in LOCAL_PROVIDERS and is_pcm_file(audio_file):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provider '{provider}' needs an encoded audio file, not raw PCM. Use provider=local"
+        )
+
+
 async def _transcribe_audio_internal(
     audio_file: str,
     language: str,
@@ -128,27 +242,20 @@ async def _transcribe_audio_internal(
     video_id: Optional[str] = None,
     url: Optional[str] = None,
     duration: Optional[int] = None,
-    platform: Optional[str] = None
+    platform: Optional[str] = None,
+    on_chunk: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
 ):
-    """Internal transcription logic (separated for semaphore control)."""
-    try:
-        # Run cleanup at start of transcription
-        cleanup_cache()
-
-        # Validate audio file exists
-        if not os.path.exists(audio_file):
-            raise HTTPException(
-                status_code=404,
-                detail=f"Audio file not found: {audio_file}. Did you run /extract-audio first?"
-            )
+    """
+    Internal transcription logic (separated for semaphore control).
 
-        # Validate provider
-        valid_providers = ["local", "openai"]
-        if provider not in valid_providers:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid provider '{provider}'. Must be one of: {', '.join(valid_providers)}"
-            )
+    on_chunk is awaited with every finished chunk of long-form media (see
+    long_form.iter_chunk_results), in media order. Local media of at least
+    PARTIAL_TRANSCRIPT_MIN_SECONDS is chunked by TRANSCRIBE_STREAM_CHUNK_SECONDS
+    when on_chunk is given; shorter audio is transcribed in one piece and
+    never calls it.
+    """
+    try:
+        _validate_transcription_request(audio_file, provider)
 
         # Get basic file info
         title = os.path.basename(audio_file)
@@ -157,68 +264,74 @@ async def _transcribe_audio_internal(
         transcribe_start = time.time()
         segments = []
         detected_language = language or 'unknown'
-
-        if provider == "local":
-            # Local whisperX transcription
-            try:
-                import whisperx
-                import torch
-            except ImportError as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Local provider error: whisperX not installed - {str(e)}. Run: pip install whisperx OR use provider=openai"
-                )
-
-            # Use global device configuration detected at server startup
-            device = WHISPER_DEVICE
-            compute_type = WHISPER_COMPUTE_TYPE
-
-            # Load model with automatic fallback to CPU if GPU fails
-            model_load_error = None
+        model_load_time = None
+        model_cache_hit = None
+        model_name = model_size if provider in LOCAL_PROVIDERS else "whisper-1"
+
+        # Identical audio + provider + model + language: reuse the stored result
+        # (hashing the audio reads the whole file - keep it off the event loop)
+        cached_result = await asyncio.to_thread(
+            get_cached_transcription, audio_file, provider, model_name, language, _cache_variant(provider)
+        )
+        pooled = None
+
+        if cached_result:
+            segments = cached_result["segments"]
+            detected_language = cached_result.get("language") or detected_language
+            print(f"INFO: Transcription cache hit ({provider}/{model_name}, key={cached_result['cache_key'][:12]})")
+
+        elif provider == "local":
+            # Local whisperX transcription (a cold load or pool swap blocks - keep it off the loop)
+            pooled, model_cache_hit = await asyncio.to_thread(_acquire_local_model, model_size, language)
+            import whisperx
+
+            model = pooled.model
+            model_load_time = 0.0 if model_cache_hit else pooled.load_time
+            print(f"INFO: Model {model_size} on {pooled.device}: {'pool hit' if model_cache_hit else f'loaded in {model_load_time:.1f}s'}")
+
+            # Long media is decoded and transcribed chunk by chunk instead of as one array
+            long_form = LONG_FORM_ENABLED and await is_long_form(audio_file, duration)
+            # Callers saving partial transcripts (queue jobs) get shorter media
+            # chunked too, so the first partial row doesn't wait for the whole file
+            chunk_seconds = None
+            if LONG_FORM_ENABLED and not long_form and on_chunk is not None:
+                if chunks_for_partial_transcripts(duration or await audio_duration(audio_file)):
+                    long_form = True
+                    chunk_seconds = TRANSCRIBE_STREAM_CHUNK_SECONDS
+
+            # Load and transcribe audio (ffmpeg decode and inference run in worker
+            # threads so the event loop keeps serving other requests). Raw PCM
+            # from the streaming decode is already 16 kHz float32 - just map it
             try:
-                model = whisperx.load_model(
-                    model_size,
-                    device,
-                    compute_type=compute_type,
-                    language=language
-                )
-            except Exception as e:
-                model_load_error = str(e)
-                # If GPU (CUDA or MPS) failed, try CPU fallback
-                if device in ["cuda", "mps"]:
-                    try:
-                        device = "cpu"
-                        compute_type = "int8"
-                        model = whisperx.load_model(
-                            model_size,
-                            device,
-                            compute_type=compute_type,
-                            language=language
-                        )
-                        # Successfully loaded on CPU after GPU failure
-                        print(f"WARNING: {WHISPER_DEVICE.upper()} failed ({model_load_error}), fell back to CPU")
-                    except Exception as cpu_error:
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Local provider error: Failed to load model '{model_size}' on {WHISPER_DEVICE.upper()} ({model_load_error}) and CPU ({str(cpu_error)})"
-                        )
+                if long_form:
+                    audio = None
+                elif is_pcm_file(audio_file):
+                    audio = load_pcm(audio_file)
                 else:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Local provider error: Failed to load model '{model_size}' on {device.upper()} - {str(e)}"
-                    )
-
-            # Load and transcribe audio
-            try:
-                audio = whisperx.load_audio(audio_file)
+                    audio = await asyncio.to_thread(whisperx.load_audio, audio_file)
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
                     detail=f"Local provider error: Failed to load audio - {str(e)}. Audio format may not be supported."
                 )
 
+            def transcribe_locked():
+                # Pooled models are shared between requests - serialize inference per model
+                with pooled.lock:
+                    return model.transcribe(audio, batch_size=16)
+
             try:
-                result = model.transcribe(audio, batch_size=16)
+                if long_form:
+                    result = await transcribe_long_form(
+                        pooled, audio_file, language=language, batch_size=16,
+                        on_chunk=on_chunk, chunk_seconds=chunk_seconds
+                    )
+                elif (BATCH_TRANSCRIBE_ENABLED and can_batch(model)
+                        and len(audio) / SAMPLE_RATE <= BATCH_TRANSCRIBE_MAX_AUDIO_SECONDS):
+                    # Short clip: share an inference batch with other queued clips
+                    result = await batch_transcriber.transcribe(pooled, audio, batch_size=16)
+                else:
+                    result = await asyncio.to_thread(transcribe_locked)
             except RuntimeError as e:
                 if "out of memory" in str(e).lower():
                     raise HTTPException(
@@ -250,6 +363,39 @@ async def _transcribe_audio_internal(
                 })
             detected_language = result.get('language', language or 'unknown')
 
+        elif provider == "faster-whisper":
+            # CTranslate2 engine (int8 on CPU); models run FASTER_WHISPER_NUM_WORKERS
+            # transcriptions in parallel, so inference isn't serialized per model
+            try:
+                pooled, model_cache_hit = await asyncio.to_thread(faster_whisper_engine.acquire_model, model_size)
+            except ImportError as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"faster-whisper provider error: faster-whisper not installed - {str(e)}. Run: pip install faster-whisper OR use provider=local"
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"faster-whisper provider error: Failed to load model '{model_size}' - {str(e)}"
+                )
+            model_load_time = 0.0 if model_cache_hit else pooled.load_time
+            print(f"INFO: faster-whisper {model_size} on {pooled.device} ({pooled.compute_type}): {'pool hit' if model_cache_hit else f'loaded in {model_load_time:.1f}s'}")
+
+            # faster-whisper decodes files itself; raw PCM is passed as the mapped array
+            audio = load_pcm(audio_file) if is_pcm_file(audio_file) else audio_file
+            try:
+                result = await asyncio.to_thread(
+                    faster_whisper_engine.transcribe, pooled.model, audio, language
+                )
+            except Exception as e:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"faster-whisper provider error: Transcription failed - {str(e)}"
+                )
+
+            segments.extend(result["segments"])
+            detected_language = result.get("language") or language or 'unknown'
+
         elif provider == "openai":
             # OpenAI Whisper API
             openai_key = os.getenv("OPENAI_API_KEY")
@@ -324,6 +470,13 @@ async def _transcribe_audio_internal(
 
         transcribe_duration = time.time() - transcribe_start
 
+        if not cached_result:
+            await asyncio.to_thread(
+                save_cached_transcription,
+                audio_file, provider, model_name, language,
+                segments, detected_language, transcribe_duration, _cache_variant(provider, pooled)
+            )
+
         # Format output
         if output_format == "json":
             # Use unified response structure
@@ -336,10 +489,13 @@ async def _transcribe_audio_internal(
                 url=url,
                 duration=duration,
                 provider=provider,
-                model=model_size if provider == "local" else "whisper-1",
+                model=model_name,
                 source_format=None,
                 transcription_time=transcribe_duration,
-                platform=platform
+                platform=platform,
+                model_load_time=model_load_time,
+                model_cache_hit=model_cache_hit,
+                transcription_cache_hit=bool(cached_result)
             )
 
         elif output_format == "srt":
@@ -421,3 +577,109 @@ async def _transcribe_audio_internal(
             status_code=500,
             detail=f"Error during transcription: {str(e)}"
         )
+
+
+async def stream_transcription(
+    audio_file: str,
+    language: Optional[str],
+    model_size: str,
+    provider: str,
+    video_id: Optional[str] = None,
+    url: Optional[str] = None,
+    duration: Optional[int] = None,
+    platform: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Transcribe audio and yield segments as each chunk finishes.
+
+    Local transcriptions run in TRANSCRIBE_STREAM_CHUNK_SECONDS chunks, so
+    the first segments arrive after one chunk rather than the whole file.
+    Cached results and the faster-whisper and OpenAI providers produce all
+    segments at once.
+
+    Yields:
+        {"event": "segments", "index", "start", "end", "duration", "segments": [...]}
+        per chunk, then {"event": "done", "result": unified response without segments}
+
+    Raises:
+        HTTPException: On validation, model or transcription errors
+    """
+    _validate_transcription_request(audio_file, provider)
+
+    model_name = model_size if provider in LOCAL_PROVIDERS else "whisper-1"
+    if provider != "local" or await asyncio.to_thread(
+        get_cached_transcription, audio_file, provider, model_name, language, _cache_variant(provider)
+    ):
+        response = await _transcribe_audio_internal(
+            audio_file, language, model_size, provider, "json",
+            video_id, url, duration, platform
+        )
+        segments = response.pop("segments")
+        end = segments[-1]["end"] if segments else 0.0
+        yield {"event": "segments", "index": 0, "start": 0.0, "end": end, "duration": duration, "segments": segments}
+        yield {"event": "done", "result": response}
+        return
+
+    pooled, model_cache_hit = await asyncio.to_thread(_acquire_local_model, model_size, language)
+    media_duration = await audio_duration(audio_file)
+    if not media_duration:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Local provider error: Could not determine duration of {audio_file}"
+        )
+
+    transcribe_start = time.time()
+    segments = []
+    languages: Counter = Counter()
+    try:
+        async for chunk in iter_chunk_results(
+            pooled, audio_file, media_duration,
+            batch_size=16, chunk_seconds=TRANSCRIBE_STREAM_CHUNK_SECONDS
+        ):
+            segments.extend(chunk["segments"])
+            if chunk["language"]:
+                languages[chunk["language"]] += 1
+            yield {
+                "event": "segments",
+                "index": chunk["index"],
+                "start": chunk["start"],
+                "end": chunk["end"],
+                "duration": chunk["duration"],
+                "segments": chunk["segments"]
+            }
+    except RuntimeError as e:
+        if "out of memory" in str(e).lower():
+            raise HTTPException(
+                status_code=500,
+                detail=f"Local provider error: Out of memory. Try smaller model (tiny/small) or use provider=openai"
+            )
+        raise HTTPException(status_code=500, detail=f"Local provider error: Transcription failed - {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Local provider error: {str(e)}")
+
+    detected_language = language or (languages.most_common(1)[0][0] if languages else 'unknown')
+    transcribe_duration = time.time() - transcribe_start
+    await asyncio.to_thread(
+        save_cached_transcription,
+        audio_file, provider, model_name, language,
+        segments, detected_language, transcribe_duration, _cache_variant(provider, pooled)
+    )
+
+    response = create_unified_transcription_response(
+        title=os.path.basename(audio_file),
+        language=detected_language,
+        segments=segments,
+        source="ai",
+        video_id=video_id,
+        url=url,
+        duration=duration,
+        provider=provider,
+        model=model_name,
+        transcription_time=transcribe_duration,
+        platform=platform,
+        model_load_time=0.0 if model_cache_hit else pooled.load_time,
+        model_cache_hit=model_cache_hit,
+        transcription_cache_hit=False
+    )
+    response.pop("segments")
+    yield {"event": "done", "result": response}
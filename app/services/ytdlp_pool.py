@@ -0,0 +1,236 @@
+"""
+Bounded thread pool for yt-dlp Python library calls.
+
+yt_dlp.YoutubeDL.extract_info/.download are blocking (network + parsing, and
+ffmpeg post-processing for downloads). Called directly from async endpoints
+they stall every other request on the event loop. All library work goes
+through this module instead:
+
+- A dedicated ThreadPoolExecutor sized by YTDLP_LIBRARY_WORKERS, so extraction
+  can neither block the loop nor exhaust the default executor shared with
+  asyncio.to_thread
+- Per-call timeouts (YTDLP_LIBRARY_TIMEOUT / YTDLP_LIBRARY_DOWNLOAD_TIMEOUT);
+  calls still queued at the timeout are cancelled. A call that is already
+  running cannot be interrupted and finishes in the background.
+- Queue depth, wait and run time metrics via get_ytdlp_pool_stats()
+
+yt_dlp.YoutubeDL is resolved at call time so tests can patch it.
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import yt_dlp
+
+from app.config import (
+    YTDLP_LIBRARY_WORKERS,
+    YTDLP_LIBRARY_TIMEOUT,
+    YTDLP_LIBRARY_DOWNLOAD_TIMEOUT
+)
+
+
+_executor = ThreadPoolExecutor(max_workers=YTDLP_LIBRARY_WORKERS, thread_name_prefix="ytdlp")
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {
+    "queued": 0,
+    "running": 0,
+    "max_queue_depth": 0,
+    "completed": 0,
+    "failed": 0,
+    "timed_out": 0,
+    "total_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+}
+
+
+async def run_in_ytdlp_pool(
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    operation: str = "yt-dlp call"
+) -> Any:
+    """
+    Run a blocking yt-dlp function in the bounded pool.
+
+    Args:
+        func: Blocking callable
+        *args: Arguments for func
+        timeout: Seconds to wait for the result (None = no limit)
+        operation: Name used in timeout errors
+
+    Returns:
+        Result of func(*args)
+
+    Raises:
+        TimeoutError: If the call didn't finish within timeout
+        Exception: Whatever func raised
+    """
+    submitted_at = time.time()
+
+    def _run() -> Any:
+        started_at = time.time()
+        with _stats_lock:
+            _stats["queued"] -= 1
+            _stats["running"] += 1
+            _stats["total_wait_seconds"] += started_at - submitted_at
+        try:
+            result = func(*args)
+            with _stats_lock:
+                _stats["completed"] += 1
+            return result
+        except Exception:
+            with _stats_lock:
+                _stats["failed"] += 1
+            raise
+        finally:
+            with _stats_lock:
+                _stats["running"] -= 1
+                _stats["total_run_seconds"] += time.time() - started_at
+
+    with _stats_lock:
+        _stats["queued"] += 1
+        _stats["max_queue_depth"] = max(_stats["max_queue_depth"], _stats["queued"])
+
+    future = _executor.submit(_run)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+    except asyncio.TimeoutError:
+        with _stats_lock:
+            _stats["timed_out"] += 1
+            # Never started - drop it from the queue
+            if future.cancel():
+                _stats["queued"] -= 1
+        raise TimeoutError(f"{operation} timed out after {timeout}s")
+
+
+def _extract_info(url: str, opts: Dict[str, Any], download: bool) -> Dict[str, Any]:
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        return ydl.extract_info(url, download=download)
+
+
+def _download(urls: List[str], opts: Dict[str, Any]) -> int:
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        return ydl.download(urls)
+
+
+def _download_with_info(info: Dict[str, Any], opts: Dict[str, Any], url: str) -> int:
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        try:
+            ydl.process_ie_result(ydl.sanitize_info(info), download=True)
+            return 0
+        except Exception as e:
+            # Stale info (expired format URLs etc.) - resolve the URL again
+            print(f"WARNING: Download from cached info failed ({str(e)}), retrying with URL")
+            return ydl.download([url])
+
+
+def downloaded_filepath(info: Dict[str, Any]) -> Optional[str]:
+    """
+    Final path of a download, from the info dict extract_info(download=True) returns.
+
+    Prefer this over searching the output directory for the filename: a title
+    prefix also matches other videos' files and .part files.
+    """
+    for download in info.get("requested_downloads") or []:
+        if download.get("filepath"):
+            return download["filepath"]
+    return info.get("filepath") or info.get("_filename")
+
+
+async def ytdlp_extract_info(
+    url: str,
+    opts: Dict[str, Any],
+    download: bool = False,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run YoutubeDL(opts).extract_info(url) in the yt-dlp pool.
+
+    Args:
+        url: Video/playlist URL
+        opts: YoutubeDL options
+        download: Also download (defaults to metadata only)
+        timeout: Seconds before giving up (defaults to YTDLP_LIBRARY_TIMEOUT,
+                 or YTDLP_LIBRARY_DOWNLOAD_TIMEOUT when download=True)
+
+    Returns:
+        yt-dlp info dict
+    """
+    if timeout is None:
+        timeout = YTDLP_LIBRARY_DOWNLOAD_TIMEOUT if download else YTDLP_LIBRARY_TIMEOUT
+    return await run_in_ytdlp_pool(
+        _extract_info, url, opts, download, timeout=timeout, operation="yt-dlp extract_info"
+    )
+
+
+async def ytdlp_download(
+    urls: List[str],
+    opts: Dict[str, Any],
+    timeout: Optional[float] = None
+) -> int:
+    """
+    Run YoutubeDL(opts).download(urls) in the yt-dlp pool.
+
+    Args:
+        urls: URLs to download
+        opts: YoutubeDL options
+        timeout: Seconds before giving up (defaults to YTDLP_LIBRARY_DOWNLOAD_TIMEOUT)
+
+    Returns:
+        yt-dlp return code
+    """
+    return await run_in_ytdlp_pool(
+        _download, urls, opts,
+        timeout=YTDLP_LIBRARY_DOWNLOAD_TIMEOUT if timeout is None else timeout,
+        operation="yt-dlp download"
+    )
+
+
+async def ytdlp_download_with_info(
+    info: Dict[str, Any],
+    opts: Dict[str, Any],
+    url: str,
+    timeout: Optional[float] = None
+) -> int:
+    """
+    Download from an already-extracted info dict in the yt-dlp pool.
+
+    Skips the extractor round trip; falls back to downloading url if the
+    info can no longer be processed.
+
+    Args:
+        info: Info dict from extract_info
+        opts: YoutubeDL options (format, outtmpl, postprocessors, ...)
+        url: Original URL for the fallback
+        timeout: Seconds before giving up (defaults to YTDLP_LIBRARY_DOWNLOAD_TIMEOUT)
+
+    Returns:
+        yt-dlp return code
+    """
+    return await run_in_ytdlp_pool(
+        _download_with_info, info, opts, url,
+        timeout=YTDLP_LIBRARY_DOWNLOAD_TIMEOUT if timeout is None else timeout,
+        operation="yt-dlp download"
+    )
+
+
+def get_ytdlp_pool_stats() -> Dict[str, Any]:
+    """
+    Get yt-dlp pool metrics.
+
+    Returns:
+        Dict with workers, current queue depth, running calls, totals and averages
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    finished = stats["completed"] + stats["failed"]
+    stats["workers"] = YTDLP_LIBRARY_WORKERS
+    stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / finished, 3) if finished else 0.0
+    stats["avg_run_seconds"] = round(stats["total_run_seconds"] / finished, 3) if finished else 0.0
+    stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+    stats["total_run_seconds"] = round(stats["total_run_seconds"], 3)
+    return stats
@@ -7,11 +7,8 @@ and automatic cookie refresh on auth failures.
 
 import os
 import re
-import time
-import random
 import asyncio
-import subprocess
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
 from app.config import (
     YTDLP_BINARY,
@@ -22,43 +19,22 @@ from app.config import (
     YTDLP_EXTRACTOR_ARGS,
     CACHE_DIR,
 )
-from scripts.cookie_scheduler import trigger_manual_refresh
+from scripts.cookie_scheduler import trigger_manual_refresh_async
+from app.utils.process_utils import run_process
 from app.services.supabase_service import send_youtube_auth_alert
 
 
-# Track last YouTube request time for rate limiting
-_last_youtube_request = 0
-_youtube_request_lock = asyncio.Lock()
-
-
-async def youtube_rate_limit():
-    """Apply rate limiting for YouTube requests with random delay."""
-    global _last_youtube_request
-    async with _youtube_request_lock:
-        now = time.time()
-        elapsed = now - _last_youtube_request
-        if elapsed < YTDLP_MIN_SLEEP:
-            delay = random.uniform(YTDLP_MIN_SLEEP, YTDLP_MAX_SLEEP)
-            print(f"INFO: Rate limiting - sleeping {delay:.1f}s before YouTube request")
-            await asyncio.sleep(delay)
-        _last_youtube_request = time.time()
-
-
-def run_ytdlp_binary(args: list, timeout: int = 300, retry_on_auth_failure: bool = True) -> tuple:
+def build_ytdlp_command(args: list) -> list:
     """
-    Run yt-dlp standalone binary with given arguments.
-    Returns (stdout, stderr, return_code).
-    Uses Deno for JavaScript challenges (required for YouTube 2025.11+).
+    Build the full yt-dlp binary command line.
 
-    Auto-detects authentication failures and triggers cookie refresh on first retry.
+    Appends rate limiting options and the cookies file (if configured) to args.
 
     Args:
         args: List of yt-dlp command arguments
-        timeout: Command timeout in seconds
-        retry_on_auth_failure: If True, attempt cookie refresh and retry once on auth errors
 
     Returns:
-        Tuple of (stdout, stderr, return_code)
+        Command list ready for execution
     """
     cmd = [YTDLP_BINARY] + args
 
@@ -76,13 +52,39 @@ def run_ytdlp_binary(args: list, timeout: int = 300, retry_on_auth_failure: bool
     else:
         print(f"WARNING: Cookies file not found: {YTDLP_COOKIES_FILE} (exists={os.path.exists(YTDLP_COOKIES_FILE) if YTDLP_COOKIES_FILE else 'N/A'})")
 
+    return cmd
+
+
+async def run_ytdlp_binary(
+    args: list,
+    timeout: int = 300,
+    retry_on_auth_failure: bool = True,
+    stderr_callback: Optional[Callable[[str], None]] = None
+) -> Tuple[str, str, int]:
+    """
+    Run yt-dlp standalone binary with given arguments.
+    Returns (stdout, stderr, return_code).
+    Uses Deno for JavaScript challenges (required for YouTube 2025.11+).
+
+    Runs as an asyncio subprocess so long downloads don't block the event loop;
+    the process is killed on timeout or when the awaiting task is cancelled.
+    Auto-detects authentication failures and triggers cookie refresh on first retry.
+
+    Args:
+        args: List of yt-dlp command arguments
+        timeout: Command timeout in seconds
+        retry_on_auth_failure: If True, attempt cookie refresh and retry once on auth errors
+        stderr_callback: Optional callback receiving each stderr line (progress output)
+
+    Returns:
+        Tuple of (stdout, stderr, return_code)
+    """
+    cmd = build_ytdlp_command(args)
+
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
+        result = await run_process(cmd, timeout=timeout, stderr_callback=stderr_callback)
+        if result.timed_out:
+            return "", "Command timed out", 1
 
         stdout, stderr, returncode = result.stdout, result.stderr, result.returncode
 
@@ -111,13 +113,15 @@ def run_ytdlp_binary(args: list, timeout: int = 300, retry_on_auth_failure: bool
             print(f"WARNING: Error message: {stderr[:200]}")
             print("INFO: Attempting automatic cookie refresh...")
 
-            # Trigger cookie refresh
-            refresh_result = trigger_manual_refresh()
+            # Trigger cookie refresh (async variant - we're on the event loop)
+            refresh_result = await trigger_manual_refresh_async()
 
             if refresh_result.get("success"):
                 print("INFO: Cookie refresh successful, retrying download...")
                 # Retry once with fresh cookies (disable retry to prevent infinite loop)
-                return run_ytdlp_binary(args, timeout, retry_on_auth_failure=False)
+                return await run_ytdlp_binary(
+                    args, timeout, retry_on_auth_failure=False, stderr_callback=stderr_callback
+                )
             else:
                 print("=" * 60)
                 print("WARNING: YOUTUBE AUTHENTICATION FAILED")
@@ -133,14 +137,15 @@ def run_ytdlp_binary(args: list, timeout: int = 300, retry_on_auth_failure: bool
                 print("=" * 60)
 
                 # Send alert to system_alerts table (with 60-min cooldown)
-                send_youtube_auth_alert(
+                await asyncio.to_thread(
+                    send_youtube_auth_alert,
                     error_message=refresh_result.get('error', 'Unknown error'),
                     context={"stderr_preview": stderr[:500] if stderr else None}
                 )
 
         return stdout, stderr, returncode
 
-    except subprocess.TimeoutExpired:
-        return "", "Command timed out", 1
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
         return "", str(e), 1
@@ -0,0 +1,349 @@
+"""
+Process-wide metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms with labels, rendered by GET /metrics:
+
+    SUBPROCESS_SECONDS.observe(result.duration, program="ffmpeg")
+    CACHE_LOOKUPS_TOTAL.inc(cache="transcription", result="hit")
+
+Histograms reuse timing_utils.Histogram, so the buckets match the
+/admin/job-timings snapshots. Values are plain in-memory numbers guarded by
+threading locks: they are per process (each worker reports its own) and reset
+on restart, which Prometheus handles for counters.
+
+Gauges that are cheap to compute on demand (cache bytes, queue depths,
+semaphore occupancy) are built at scrape time and passed to render() instead
+of being kept up to date here.
+"""
+
+import math
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.utils.timing_utils import DEFAULT_BUCKETS, Histogram
+
+
+# HTTP requests are mostly fast (cache hits, status endpoints) but
+# /transcribe can hold a request for minutes
+HTTP_BUCKETS = (0.005, 0.01, 0.025) + DEFAULT_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """A named metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, List[Tuple[str, str]], float]]:
+        """(sample name, labels, value) triples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, List[Tuple[str, str]], float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, list(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class LabeledHistogram(_Metric):
+    """One Histogram per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._children: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, **labels: Any) -> Histogram:
+        """The Histogram for one label set (created on first use)."""
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._children.get(key)
+            if histogram is None:
+                histogram = self._children[key] = Histogram(self.buckets)
+        return histogram
+
+    def attach(self, histogram: Histogram, **labels: Any) -> None:
+        """Expose an existing Histogram under a label set (e.g. a HistogramSet entry)."""
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = histogram
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self.labels(**labels).observe(value)
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of the enclosed block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Tuple[str, List[Tuple[str, str]], float]]:
+        with self._lock:
+            children = sorted(self._children.items())
+        samples = []
+        for key, histogram in children:
+            labels = list(zip(self.labelnames, key))
+            cumulative = histogram.cumulative_counts()
+            for bound, count in zip(histogram.buckets, cumulative):
+                samples.append((f"{self.name}_bucket", labels + [("le", f"{bound:g}")], count))
+            samples.append((f"{self.name}_bucket", labels + [("le", "+Inf")], cumulative[-1]))
+            samples.append((f"{self.name}_sum", labels, histogram.sum))
+            samples.append((f"{self.name}_count", labels, cumulative[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """The metrics rendered by /metrics, in registration order."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> LabeledHistogram:
+        return self.register(LabeledHistogram(name, documentation, labelnames, buckets))
+
+    def render(self, extra: Iterable[_Metric] = ()) -> str:
+        """
+        Render all registered metrics in the text exposition format.
+
+        Args:
+            extra: Metrics built at scrape time, rendered after the registered ones
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in [*metrics, *extra])
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is sent, per router and route",
+    ("router", "route", "method", "status"),
+    buckets=HTTP_BUCKETS
+)
+SEMAPHORE_WAIT_SECONDS = metrics.histogram(
+    "semaphore_wait_seconds",
+    "Time spent waiting to acquire a concurrency-limiting semaphore",
+    ("semaphore",)
+)
+RATE_LIMIT_WAIT_SECONDS = metrics.histogram(
+    "rate_limit_wait_seconds",
+    "Time slept by the per-platform rate limiter before an outbound request",
+    ("platform",)
+)
+SUBPROCESS_SECONDS = metrics.histogram(
+    "subprocess_duration_seconds",
+    "Wall-clock duration of external commands (yt-dlp, ffmpeg, ffprobe)",
+    ("program",)
+)
+SUBPROCESS_EXITS_TOTAL = metrics.counter(
+    "subprocess_exits_total",
+    "Finished external commands by exit code (timeout when killed after the timeout)",
+    ("program", "exit_code")
+)
+CACHE_LOOKUPS_TOTAL = metrics.counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ("cache", "result")
+)
+SUPABASE_CALL_SECONDS = metrics.histogram(
+    "supabase_call_duration_seconds",
+    "Latency of blocking Supabase database calls",
+    ("operation", "outcome"),
+    buckets=HTTP_BUCKETS
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one cache lookup (hit ratio = hits / all lookups)."""
+    CACHE_LOOKUPS_TOTAL.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def supabase_timer(operation: str) -> Iterator[None]:
+    """Observe a Supabase call's latency, labelled ok or error by whether it raised."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        SUPABASE_CALL_SECONDS.observe(time.perf_counter() - start, operation=operation, outcome=outcome)
+
+
+class InstrumentedSemaphore(asyncio.Semaphore):
+    """asyncio.Semaphore that records wait times and tracks occupancy."""
+
+    def __init__(self, value: int, name: str):
+        """
+        Args:
+            value: Number of concurrent holders
+            name: semaphore label of SEMAPHORE_WAIT_SECONDS and the scrape-time gauges
+        """
+        super().__init__(value)
+        self.name = name
+        self.capacity = value
+        self.in_use = 0
+        self.waiting = 0
+
+    async def acquire(self) -> bool:
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await super().acquire()
+        finally:
+            self.waiting -= 1
+        SEMAPHORE_WAIT_SECONDS.observe(time.perf_counter() - start, semaphore=self.name)
+        self.in_use += 1
+        return True
+
+    def release(self) -> None:
+        self.in_use -= 1
+        super().release()
+
+
+def _route_labels(scope: Dict[str, Any]) -> Tuple[str, str]:
+    """(router, route) of the matched route; the path template keeps label values bounded."""
+    route = scope.get("route")
+    if route is None:
+        return "none", "unmatched"
+    tags = getattr(route, "tags", None)
+    return (tags[0] if tags else "Root"), getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing HTTP_REQUEST_SECONDS for every request.
+
+    Pure ASGI rather than BaseHTTPMiddleware so streaming responses (SSE,
+    file downloads) are timed until their last byte and aren't buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status: Optional[int] = None
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            router, route = _route_labels(scope)
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                router=router, route=route, method=scope.get("method", ""),
+                status=status if status is not None else 500
+            )
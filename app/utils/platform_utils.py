@@ -4,11 +4,31 @@ Platform utility functions for detecting and parsing video URLs.
 This module provides utilities for:
 - Detecting platform from URL
 - Extracting video IDs from URLs
+- Parsing extractor + native video ID from URLs without a network call
 - Checking if URLs are from specific platforms
 """
 
 import re
 import hashlib
+from typing import Optional, Tuple
+
+
+# Scheme and optional subdomains: hosts must match whole DNS labels, so
+# notyoutube.com or foox.com never parse as YouTube or X
+_HOST_PREFIX = r'^(?:https?://)?(?:[A-Za-z0-9-]+\.)*'
+
+# (yt-dlp extractor key, URL pattern capturing the native video ID)
+_VIDEO_ID_PATTERNS = [
+    ("Youtube", re.compile(
+        _HOST_PREFIX +
+        r'(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|live/|v/)|youtu\.be/)'
+        r'([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])', re.IGNORECASE)),
+    ("TikTok", re.compile(_HOST_PREFIX + r'tiktok\.com/@[^/]+/video/(\d+)', re.IGNORECASE)),
+    ("Instagram", re.compile(_HOST_PREFIX + r'instagram\.com/(?:[^/]+/)?(?:p|reels?|tv)/([A-Za-z0-9_-]+)', re.IGNORECASE)),
+    ("Twitter", re.compile(_HOST_PREFIX + r'(?:twitter|x)\.com/[^/]+/status/(\d+)', re.IGNORECASE)),
+    ("Vimeo", re.compile(_HOST_PREFIX + r'vimeo\.com/(?:video/)?(\d+)(?:[/?#]|$)', re.IGNORECASE)),
+    ("Dailymotion", re.compile(_HOST_PREFIX + r'(?:dailymotion\.com/video/|dai\.ly/)([A-Za-z0-9]+)', re.IGNORECASE)),
+]
 
 
 def is_youtube_url(url: str) -> bool:
@@ -27,6 +47,24 @@ def get_video_id_from_url(url: str) -> str:
     return hashlib.md5(url.encode()).hexdigest()[:12]
 
 
+def parse_video_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Parse the yt-dlp extractor key and native video ID from a URL locally.
+
+    Only recognises single-video URL shapes of the major platforms; anything
+    else (short links, playlists, unknown sites) returns None and callers
+    fall back to yt-dlp.
+
+    Returns:
+        (extractor_key, video_id), e.g. ("Youtube", "dQw4w9WgXcQ"), or None
+    """
+    for extractor_key, pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.match(url.strip())
+        if match:
+            return extractor_key, match.group(1)
+    return None
+
+
 def get_platform_from_url(url: str) -> str:
     """
     Detect platform from URL and return lowercase platform name.
@@ -0,0 +1,338 @@
+"""
+Async subprocess execution for external binaries (yt-dlp, ffmpeg, ffprobe).
+
+subprocess.run inside an async endpoint blocks the whole event loop for the
+duration of the command - a 10 minute download froze every other request on
+the worker. run_process() uses asyncio.create_subprocess_exec instead so one
+worker can serve many concurrent requests.
+
+- Timeouts kill the process (SIGTERM, then SIGKILL) and report timed_out
+- Cancellation (client disconnect, task cancel) kills the process and re-raises
+- stderr is read incrementally and can be streamed line by line to a callback
+  (yt-dlp/ffmpeg progress lines end in \\r, so both \\r and \\n split lines)
+- run_pipeline() connects two processes with an OS pipe (yt-dlp -o - | ffmpeg)
+  so streamed media never passes through Python or a temporary file
+- stream_process() yields a process's stdout as it is produced (yt-dlp -o -
+  straight into an HTTP response)
+- Every finished command's duration and exit code is recorded in the
+  subprocess metrics served by /metrics
+"""
+
+import os
+import re
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Union
+
+from app.utils.metrics_utils import SUBPROCESS_EXITS_TOTAL, SUBPROCESS_SECONDS
+
+
+# Seconds to wait for a process to exit after SIGTERM before SIGKILL
+_TERMINATE_GRACE_SECONDS = 5
+
+_LINE_SPLIT = re.compile(r"[\r\n]+")
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a finished (or killed) subprocess."""
+
+    stdout: Union[str, bytes]
+    stderr: str
+    returncode: int
+    duration: float
+    timed_out: bool = False
+
+
+def _record(cmd: List[str], result: ProcessResult) -> ProcessResult:
+    """Observe a finished command in the subprocess metrics (labelled by program name)."""
+    program = os.path.basename(cmd[0]) if cmd else "unknown"
+    SUBPROCESS_SECONDS.observe(result.duration, program=program)
+    SUBPROCESS_EXITS_TOTAL.inc(
+        program=program, exit_code="timeout" if result.timed_out else result.returncode
+    )
+    return result
+
+
+async def _kill_process(proc: asyncio.subprocess.Process) -> None:
+    """Terminate a process, escalating to SIGKILL if it doesn't exit."""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=_TERMINATE_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+async def run_process(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    stderr_callback: Optional[Callable[[str], None]] = None,
+    text: bool = True
+) -> ProcessResult:
+    """
+    Run a command without blocking the event loop.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process is killed (None = no limit)
+        stderr_callback: Called with each stderr line as it arrives
+        text: Decode stdout as UTF-8 (False returns raw bytes)
+
+    Returns:
+        ProcessResult with stdout, stderr, returncode, duration and timed_out.
+        A missing binary is reported as returncode 127 rather than raised.
+
+    Raises:
+        asyncio.CancelledError: If the awaiting task is cancelled (process is killed first)
+    """
+    start = time.time()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except (FileNotFoundError, PermissionError) as e:
+        return _record(cmd, ProcessResult(
+            stdout="" if text else b"", stderr=str(e), returncode=127,
+            duration=time.time() - start
+        ))
+
+    stdout_chunks: List[bytes] = []
+    stderr_parts: List[str] = []
+
+    async def read_stdout() -> None:
+        while True:
+            chunk = await proc.stdout.read(65536)
+            if not chunk:
+                break
+            stdout_chunks.append(chunk)
+
+    async def read_stderr() -> None:
+        pending = ""
+        while True:
+            chunk = await proc.stderr.read(4096)
+            if not chunk:
+                break
+            decoded = chunk.decode("utf-8", errors="replace")
+            stderr_parts.append(decoded)
+            if stderr_callback:
+                pending += decoded
+                *lines, pending = _LINE_SPLIT.split(pending)
+                for line in lines:
+                    if line:
+                        stderr_callback(line)
+        if stderr_callback and pending:
+            stderr_callback(pending)
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(read_stdout(), read_stderr(), proc.wait()),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+        await _kill_process(proc)
+    except asyncio.CancelledError:
+        await _kill_process(proc)
+        raise
+
+    stdout = b"".join(stdout_chunks)
+    stderr = "".join(stderr_parts)
+    if timed_out:
+        stderr = stderr + ("\n" if stderr else "") + f"Command timed out after {timeout}s"
+
+    return _record(cmd, ProcessResult(
+        stdout=stdout.decode("utf-8", errors="replace") if text else stdout,
+        stderr=stderr,
+        returncode=proc.returncode if proc.returncode is not None else -1,
+        duration=time.time() - start,
+        timed_out=timed_out
+    ))
+
+
+async def run_pipeline(
+    producer: List[str],
+    consumer: List[str],
+    timeout: Optional[float] = None
+) -> Tuple[ProcessResult, ProcessResult]:
+    """
+    Run producer | consumer without blocking the event loop.
+
+    The producer's stdout is connected to the consumer's stdin with an OS
+    pipe; the consumer's stdout is discarded (it is expected to write its
+    output to a file).
+
+    Args:
+        producer: Command writing to stdout
+        consumer: Command reading from stdin
+        timeout: Seconds before both processes are killed (None = no limit)
+
+    Returns:
+        (producer result, consumer result). stdout is always empty; a missing
+        binary is reported as returncode 127 rather than raised.
+
+    Raises:
+        asyncio.CancelledError: If the awaiting task is cancelled (processes are killed first)
+    """
+    start = time.time()
+    procs: List[asyncio.subprocess.Process] = []
+    read_fd, write_fd = os.pipe()
+    try:
+        procs.append(await asyncio.create_subprocess_exec(
+            *producer,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=write_fd,
+            stderr=asyncio.subprocess.PIPE
+        ))
+        procs.append(await asyncio.create_subprocess_exec(
+            *consumer,
+            stdin=read_fd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        ))
+    except (FileNotFoundError, PermissionError) as e:
+        for proc in procs:
+            await _kill_process(proc)
+        failed = ProcessResult(stdout=b"", stderr=str(e), returncode=127, duration=time.time() - start)
+        killed = ProcessResult(stdout=b"", stderr="", returncode=-1, duration=time.time() - start)
+        results = (killed, failed) if procs else (failed, killed)
+        return _record(producer, results[0]), _record(consumer, results[1])
+    finally:
+        # The children hold their own copies; closing ours lets the consumer
+        # see EOF when the producer exits
+        os.close(read_fd)
+        os.close(write_fd)
+
+    stderr_parts: List[List[str]] = [[], []]
+
+    async def read_stderr(proc: asyncio.subprocess.Process, parts: List[str]) -> None:
+        while True:
+            chunk = await proc.stderr.read(4096)
+            if not chunk:
+                break
+            parts.append(chunk.decode("utf-8", errors="replace"))
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(read_stderr(proc, parts) for proc, parts in zip(procs, stderr_parts)),
+                *(proc.wait() for proc in procs)
+            ),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        timed_out = True
+        for proc in procs:
+            await _kill_process(proc)
+    except asyncio.CancelledError:
+        for proc in procs:
+            await _kill_process(proc)
+        raise
+
+    duration = time.time() - start
+    results = []
+    for cmd, proc, parts in zip((producer, consumer), procs, stderr_parts):
+        stderr = "".join(parts)
+        if timed_out:
+            stderr = stderr + ("\n" if stderr else "") + f"Command timed out after {timeout}s"
+        results.append(_record(cmd, ProcessResult(
+            stdout=b"",
+            stderr=stderr,
+            returncode=proc.returncode if proc.returncode is not None else -1,
+            duration=duration,
+            timed_out=timed_out
+        )))
+    return results[0], results[1]
+
+
+async def stream_process(
+    cmd: List[str],
+    chunk_size: int = 65536,
+    idle_timeout: Optional[float] = None
+) -> AsyncIterator[bytes]:
+    """
+    Run a command and yield its stdout in chunks as it is produced.
+
+    Closing the generator early (consumer cancelled, client disconnected)
+    kills the process. The kill doesn't wait for the exit, because awaiting
+    inside an already-cancelled task would be interrupted again.
+
+    Args:
+        cmd: Command and arguments
+        chunk_size: Maximum bytes per chunk
+        idle_timeout: Seconds without output before the process is killed (None = no limit)
+
+    Yields:
+        stdout chunks
+
+    Raises:
+        Exception: If the command can't be started, stalls for idle_timeout or
+                   exits non-zero (raised after all of its output was yielded)
+    """
+    start = time.time()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except (FileNotFoundError, PermissionError) as e:
+        _record(cmd, ProcessResult(stdout=b"", stderr=str(e), returncode=127, duration=time.time() - start))
+        raise Exception(f"Failed to start {os.path.basename(cmd[0])}: {str(e)}")
+
+    stderr_parts: List[str] = []
+
+    async def read_stderr() -> None:
+        while True:
+            chunk = await proc.stderr.read(4096)
+            if not chunk:
+                break
+            stderr_parts.append(chunk.decode("utf-8", errors="replace"))
+
+    stderr_task = asyncio.create_task(read_stderr())
+    timed_out = False
+    finished = False
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(proc.stdout.read(chunk_size), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                proc.kill()
+                break
+            if not chunk:
+                break
+            yield chunk
+        await proc.wait()
+        await stderr_task
+        finished = True
+    finally:
+        if not finished:
+            stderr_task.cancel()
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+
+    stderr = "".join(stderr_parts)
+    if timed_out:
+        stderr = stderr + ("\n" if stderr else "") + f"No output for {idle_timeout}s"
+    result = _record(cmd, ProcessResult(
+        stdout=b"", stderr=stderr, returncode=proc.returncode,
+        duration=time.time() - start, timed_out=timed_out
+    ))
+    if timed_out or result.returncode != 0:
+        raise Exception(f"{os.path.basename(cmd[0])} failed: {stderr.strip()}")
@@ -0,0 +1,176 @@
+"""
+Lightweight stage timers and latency histograms.
+
+A StageTimer measures named stages of one unit of work (e.g. a queue job):
+
+    timer = StageTimer(histograms=job_stage_histograms)
+    with timer.stage("claim"):
+        ...
+    timer.durations  # {"claim": 0.042}
+
+Stages may be entered more than once (durations add up) and also work around
+awaits, since they only measure wall-clock time. Every finished stage is
+recorded in a HistogramSet, so per-stage distributions can be read from an
+admin endpoint without an external metrics stack.
+"""
+
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+# Upper bounds (seconds) of the default latency buckets: sub-second DB calls
+# up to hour-long transcriptions
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed cumulative buckets (Prometheus-style)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def cumulative_counts(self) -> List[int]:
+        """Observations <= each bucket bound, then the total (+Inf)."""
+        with self._lock:
+            counts = list(self._counts)
+        total = 0
+        cumulative = []
+        for count in counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket (None if empty)."""
+        cumulative = self.cumulative_counts()
+        total = cumulative[-1]
+        if total == 0:
+            return None
+        rank = q * total
+        lower_bound, lower_count = 0.0, 0
+        for bound, count in zip(list(self.buckets) + [math.inf], cumulative):
+            if count >= rank:
+                if math.isinf(bound):
+                    return self.max
+                in_bucket = count - lower_count
+                fraction = (rank - lower_count) / in_bucket if in_bucket else 1.0
+                return lower_bound + (bound - lower_bound) * fraction
+            lower_bound, lower_count = bound, count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary stats plus cumulative bucket counts keyed by upper bound."""
+        cumulative = self.cumulative_counts()
+        with self._lock:
+            count, total, maximum = self.count, self.sum, self.max
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "mean": round(total / count, 3) if count else None,
+            "max": round(maximum, 3),
+            "p50": _round(self.quantile(0.5)),
+            "p95": _round(self.quantile(0.95)),
+            "buckets": {
+                **{f"{bound:g}": n for bound, n in zip(self.buckets, cumulative)},
+                "+Inf": cumulative[-1],
+            },
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+class HistogramSet:
+    """Named histograms created on first use (one per stage)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def items(self) -> List[tuple]:
+        """(name, Histogram) pairs in creation order."""
+        with self._lock:
+            return list(self._histograms.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: histogram.snapshot() for name, histogram in self.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+class StageTimer:
+    """Per-stage wall-clock durations of one unit of work."""
+
+    def __init__(self, histograms: Optional[HistogramSet] = None):
+        self.durations: Dict[str, float] = {}
+        self._histograms = histograms
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage `name` (recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add an externally measured duration to a stage."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        if self._histograms is not None:
+            self._histograms.observe(name, seconds)
+
+    @property
+    def total(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations (rounded to ms) plus the running total."""
+        timings = {name: round(seconds, 3) for name, seconds in self.durations.items()}
+        timings["total"] = round(self.total, 3)
+        return timings
+
+    def finish(self) -> Dict[str, float]:
+        """Record the total in the histograms (as stage "total") and return as_dict()."""
+        timings = self.as_dict()
+        if self._histograms is not None:
+            self._histograms.observe("total", timings["total"])
+        return timings
+
+
+# Process-wide per-stage histograms of queue jobs (job_service.process_single_job)
+job_stage_histograms = HistogramSet()
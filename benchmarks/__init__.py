@@ -0,0 +1,10 @@
+"""
+Reproducible transcription benchmarks.
+
+- fixtures: deterministic synthetic audio with known durations
+- transcription: runs _transcribe_audio_internal per provider/model/fixture
+  at several concurrency levels and writes the results as JSON
+- compare: diffs two result files and flags regressions
+
+See benchmarks/README.md for usage.
+"""
@@ -0,0 +1,102 @@
+"""
+Compare two transcription benchmark result files.
+
+Cases are matched by provider, model, fixture, concurrency and cold/warm.
+A metric regresses when it gets worse by more than the threshold:
+
+- rtf_mean, peak_rss_mb, model_load_time: higher is worse
+- throughput: lower is worse
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 10
+
+Exits with status 1 if any metric regressed.
+"""
+
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Metric -> True if higher values are better
+METRICS = {
+    "rtf_mean": False,
+    "throughput": True,
+    "peak_rss_mb": False,
+    "model_load_time": False,
+}
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple:
+    return (result["provider"], result["model"], result["fixture"], result["concurrency"], result.get("cold", False))
+
+
+def compare_results(
+    base: Dict[str, Any],
+    head: Dict[str, Any],
+    threshold_pct: float = 10.0
+) -> List[Dict[str, Any]]:
+    """
+    Compute per-metric changes between two result files.
+
+    Args:
+        base: Baseline report (benchmarks.transcription JSON)
+        head: New report
+        threshold_pct: Percentage change counted as a regression
+
+    Returns:
+        One row per case and metric present in both: key, metric, base,
+        head, change_pct, regression
+    """
+    base_cases = {_case_key(r): r for r in base["results"]}
+    rows = []
+    for result in head["results"]:
+        key = _case_key(result)
+        previous = base_cases.get(key)
+        if previous is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            rows.append({
+                "key": key,
+                "metric": metric,
+                "base": old,
+                "head": new,
+                "change_pct": round(change, 1),
+                "regression": worse > threshold_pct,
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two transcription benchmark result files")
+    parser.add_argument("base", help="Baseline result JSON")
+    parser.add_argument("head", help="New result JSON")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent (default: 10)")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows = compare_results(base, head, args.threshold)
+    print(f"base {base['environment'].get('commit')} -> head {head['environment'].get('commit')}")
+    for row in rows:
+        provider, model, fixture, concurrency, cold = row["key"]
+        label = f"{provider}/{model} {fixture} x{concurrency}{' cold' if cold else ''}"
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{label:<44}{row['metric']:<17}{row['base']:>10} -> {row['head']:<10}{row['change_pct']:>+7.1f}%{flag}")
+
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(regressions)} regression(s) over {args.threshold:g}% in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Synthetic fixture audio for the transcription benchmarks.
+
+Benchmarks must be reproducible without downloading media or shipping audio
+in the repo, so fixtures are generated locally and deterministically (fixed
+seeds) as 16 kHz mono 16-bit WAV files with exact, known durations:
+
+- tone: a slow sine sweep (steady, non-speech signal)
+- noise: band-limited noise bursts modulated at syllable rate (~4 Hz) and
+  separated by short pauses, so VAD passes most of it through to the decoder
+  the way it would with speech (no TTS needed)
+
+Generated files are cached in benchmarks/.fixtures and reused.
+"""
+
+import os
+import math
+import wave
+import random
+from array import array
+from dataclasses import dataclass
+from typing import List
+
+
+SAMPLE_RATE = 16000
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fixtures")
+FIXTURE_KINDS = ("tone", "noise")
+
+
+@dataclass
+class Fixture:
+    """A generated audio file with its known duration."""
+    kind: str
+    duration: float
+    path: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}-{self.duration:g}s"
+
+
+def _tone_samples(duration: float) -> array:
+    """Sine sweep from 220 Hz to 880 Hz and back, at -12 dBFS."""
+    total = int(duration * SAMPLE_RATE)
+    samples = array("h")
+    phase = 0.0
+    for n in range(total):
+        t = n / SAMPLE_RATE
+        frequency = 550 + 330 * math.sin(2 * math.pi * t / max(duration, 1.0))
+        phase += 2 * math.pi * frequency / SAMPLE_RATE
+        samples.append(int(8000 * math.sin(phase)))
+    return samples
+
+
+def _noise_samples(duration: float, seed: int) -> array:
+    """Speech-like noise: 2-6 s bursts of low-passed noise with a ~4 Hz envelope, 0.3-1 s pauses."""
+    rng = random.Random(seed)
+    total = int(duration * SAMPLE_RATE)
+    samples = array("h")
+    low = 0.0
+    while len(samples) < total:
+        burst = int(rng.uniform(2.0, 6.0) * SAMPLE_RATE)
+        rate = rng.uniform(3.0, 5.0)
+        for n in range(min(burst, total - len(samples))):
+            # One-pole low-pass keeps the energy in the speech band
+            low += 0.3 * (rng.gauss(0.0, 1.0) - low)
+            envelope = 0.5 * (1 - math.cos(2 * math.pi * rate * n / SAMPLE_RATE))
+            samples.append(max(-32767, min(32767, int(12000 * envelope * low))))
+        pause = int(rng.uniform(0.3, 1.0) * SAMPLE_RATE)
+        samples.extend([0] * min(pause, total - len(samples)))
+    return samples
+
+
+def generate_fixture(kind: str, duration: float, directory: str = FIXTURE_DIR, seed: int = 0) -> Fixture:
+    """
+    Generate (or reuse) one fixture file.
+
+    Args:
+        kind: "tone" or "noise"
+        duration: Length in seconds
+        directory: Output directory
+        seed: Random seed for noise fixtures
+
+    Returns:
+        Fixture with the WAV path
+
+    Raises:
+        ValueError: For an unknown kind or non-positive duration
+    """
+    if kind not in FIXTURE_KINDS:
+        raise ValueError(f"Unknown fixture kind '{kind}'. Must be one of: {', '.join(FIXTURE_KINDS)}")
+    if duration <= 0:
+        raise ValueError("Fixture duration must be positive")
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{kind}-{duration:g}s-seed{seed}.wav")
+    if not os.path.exists(path):
+        samples = _tone_samples(duration) if kind == "tone" else _noise_samples(duration, seed)
+        part_path = f"{path}.part"
+        with wave.open(part_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(samples.tobytes())
+        os.replace(part_path, path)
+    return Fixture(kind=kind, duration=duration, path=path)
+
+
+def generate_fixtures(kinds: List[str], durations: List[float], directory: str = FIXTURE_DIR) -> List[Fixture]:
+    """Generate every kind x duration combination."""
+    return [generate_fixture(kind, duration, directory) for kind in kinds for duration in durations]
+
+
+def wav_duration(path: str) -> float:
+    """Duration in seconds of a WAV file."""
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
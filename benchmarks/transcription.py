@@ -0,0 +1,273 @@
+"""
+Transcription benchmark: real-time factor, peak RSS, model-load time and
+throughput per provider/model at several concurrency levels.
+
+Each provider/model pair starts from an empty model pool. One cold request
+on the shortest fixture measures model-load time, then every fixture runs at
+every concurrency level against the warm model. Requests call
+_transcribe_audio_internal directly (no HTTP, no MAX_CONCURRENT_TRANSCRIPTIONS
+semaphore) with the transcription result cache bypassed.
+
+Metrics per case:
+- rtf_mean / rtf_max: wall-clock seconds per audio second (lower is better)
+- throughput: audio seconds transcribed per wall-clock second, all requests
+- peak_rss_mb: peak resident memory of this process during the case
+- model_load_time: seconds to load the model (cold request)
+
+Usage:
+    python -m benchmarks.transcription --providers local,faster-whisper --models tiny,small \\
+        --durations 30,300 --concurrency 1,2,4 --output benchmarks/results/run.json
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import resource
+import subprocess
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fixtures import FIXTURE_KINDS, Fixture, generate_fixtures
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class RssSampler:
+    """Track the peak resident set size of this process while active."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def current_kb() -> int:
+        """Current RSS in KB (VmRSS on Linux, else the lifetime peak from getrusage)."""
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, self.current_kb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self.peak_kb = self.current_kb()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, self.current_kb())
+
+
+def _disable_result_cache() -> None:
+    """Make every request transcribe instead of hitting the transcription cache."""
+    from app.services import transcription_service
+
+    transcription_service.get_cached_transcription = lambda *args: None
+    transcription_service.save_cached_transcription = lambda *args: None
+
+
+def _clear_model_pools() -> None:
+    """Evict every resident model so the next request loads cold."""
+    from app.services.model_pool import model_pool
+    from app.services.faster_whisper_engine import faster_whisper_pool
+
+    model_pool.clear()
+    faster_whisper_pool.clear()
+
+
+async def _timed_request(provider: str, model_size: str, fixture: Fixture, language: Optional[str]) -> Dict[str, Any]:
+    """Run one transcription and return its timing (or error)."""
+    from fastapi import HTTPException
+    from app.services.transcription_service import _transcribe_audio_internal
+
+    start = time.perf_counter()
+    try:
+        response = await _transcribe_audio_internal(
+            fixture.path, language, model_size, provider, "json", duration=int(fixture.duration)
+        )
+    except HTTPException as e:
+        return {"elapsed": time.perf_counter() - start, "error": f"{e.status_code}: {e.detail}"}
+    except Exception as e:
+        return {"elapsed": time.perf_counter() - start, "error": str(e)}
+    metadata = response.get("metadata", {})
+    return {
+        "elapsed": time.perf_counter() - start,
+        "model_load_time": metadata.get("model_load_time"),
+        "segments": response.get("segment_count"),
+    }
+
+
+async def run_case(
+    provider: str,
+    model_size: str,
+    fixture: Fixture,
+    concurrency: int,
+    language: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run `concurrency` simultaneous transcriptions of one fixture.
+
+    Returns:
+        Case result with rtf_mean, rtf_max, throughput, peak_rss_mb and errors
+    """
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        requests = await asyncio.gather(*[
+            _timed_request(provider, model_size, fixture, language) for _ in range(concurrency)
+        ])
+        wall_time = time.perf_counter() - start
+
+    ok = [r for r in requests if "error" not in r]
+    rtfs = [r["elapsed"] / fixture.duration for r in ok]
+    return {
+        "provider": provider,
+        "model": model_size,
+        "fixture": fixture.name,
+        "audio_seconds": fixture.duration,
+        "concurrency": concurrency,
+        "wall_time": round(wall_time, 3),
+        "rtf_mean": round(sum(rtfs) / len(rtfs), 4) if rtfs else None,
+        "rtf_max": round(max(rtfs), 4) if rtfs else None,
+        "throughput": round(fixture.duration * len(ok) / wall_time, 2) if ok else None,
+        "peak_rss_mb": round(rss.peak_kb / 1024, 1),
+        "model_load_time": max((r.get("model_load_time") or 0 for r in ok), default=None),
+        "segments": ok[0]["segments"] if ok else None,
+        "errors": [r["error"] for r in requests if "error" in r],
+    }
+
+
+async def run_suite(
+    providers: List[str],
+    models: List[str],
+    fixtures: List[Fixture],
+    concurrency_levels: List[int],
+    language: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Run the cold-load case and the fixture x concurrency matrix for every provider/model."""
+    _disable_result_cache()
+    shortest = min(fixtures, key=lambda f: f.duration)
+    results = []
+    for provider in providers:
+        for model_size in models:
+            _clear_model_pools()
+            print(f"{provider}/{model_size}: cold load on {shortest.name}")
+            cold = await run_case(provider, model_size, shortest, 1, language)
+            results.append({**cold, "cold": True})
+            if cold["errors"]:
+                print(f"  skipped: {cold['errors'][0]}")
+                continue
+            for fixture in fixtures:
+                for concurrency in concurrency_levels:
+                    print(f"{provider}/{model_size}: {fixture.name} x{concurrency}")
+                    results.append({**await run_case(provider, model_size, fixture, concurrency, language), "cold": False})
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    """Host and configuration the results were measured on."""
+    from app.config import WHISPER_DEVICE, WHISPER_COMPUTE_TYPE, WHISPER_GPU_INFO
+    from app.services.faster_whisper_engine import available_cores
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cores": available_cores(),
+        "whisper_device": WHISPER_DEVICE,
+        "whisper_compute_type": WHISPER_COMPUTE_TYPE,
+        "gpu": WHISPER_GPU_INFO,
+    }
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print()
+    print(f"{'provider/model':<30}{'fixture':<14}{'conc':>5}{'rtf':>9}{'audio s/s':>11}{'rss MB':>9}{'load s':>8}")
+    for r in results:
+        label = f"{r['provider']}/{r['model']}" + (" (cold)" if r["cold"] else "")
+        rtf = "error" if r["rtf_mean"] is None else f"{r['rtf_mean']:.4f}"
+        print(
+            f"{label:<30}{r['fixture']:<14}{r['concurrency']:>5}{rtf:>9}"
+            f"{r['throughput'] if r['throughput'] is not None else '-':>11}{r['peak_rss_mb']:>9}"
+            f"{r['model_load_time'] if r['model_load_time'] is not None else '-':>8}"
+        )
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark _transcribe_audio_internal on synthetic audio")
+    parser.add_argument("--providers", type=_csv, default=["local"], help="Comma-separated providers (default: local)")
+    parser.add_argument("--models", type=_csv, default=["tiny"], help="Comma-separated model sizes (default: tiny)")
+    parser.add_argument("--kinds", type=_csv, default=list(FIXTURE_KINDS), help="Fixture kinds (default: tone,noise)")
+    parser.add_argument("--durations", type=lambda v: [float(d) for d in _csv(v)], default=[30.0, 300.0],
+                        help="Fixture durations in seconds (default: 30,300)")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in _csv(v)], default=[1, 2, 4],
+                        help="Concurrency levels (default: 1,2,4)")
+    parser.add_argument("--language", default="en", help="Language code, empty for auto-detect (default: en)")
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/<timestamp>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    print("Generating fixtures...")
+    fixtures = generate_fixtures(args.kinds, args.durations)
+    results = asyncio.run(run_suite(
+        args.providers, args.models, fixtures, args.concurrency, args.language or None
+    ))
+
+    report = {
+        "environment": environment_info(),
+        "config": {
+            "providers": args.providers,
+            "models": args.models,
+            "fixtures": [f.name for f in fixtures],
+            "concurrency": args.concurrency,
+            "language": args.language or None,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['environment']['commit'] or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    _print_table(results)
+    print(f"\nResults written to {output}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,8 @@ from app.utils.async_utils import run_async
 from app.services.job_service import process_job_batch
 from app.services.screenshot_job_service import process_screenshot_job_batch
 from app.services.cache_service import check_video_cache_status
+from app.services.model_pool import prewarm_worker_model
+from app.services.cache_janitor import start_janitor_thread
 from app.config import get_settings
 
 
@@ -114,7 +116,7 @@ def handler(job: Dict[str, Any]) -> Dict[str, Any]:
                 }
 
             logger.info(f"Checking cache for video: {video_url}")
-            cache_result = check_video_cache_status(video_url, logger)
+            cache_result = run_async(check_video_cache_status(video_url, logger))
 
             return {
                 "ok": True,
@@ -237,6 +239,17 @@ if __name__ == "__main__":
             files = os.listdir(cookies_dir)
             startup_logger.info(f"Files in {cookies_dir}: {files[:20]}")  # First 20 files
 
+    # Load the worker model once so the first job doesn't pay the model load
+    prewarm = prewarm_worker_model()
+    if prewarm:
+        startup_logger.info(f"Prewarmed model: {prewarm['model_size']} on {prewarm['device']} ({prewarm['load_time']}s)")
+    else:
+        startup_logger.info("Model prewarm skipped (MODEL_PREWARM=false, non-local provider, or load failed)")
+
+    # Cache cleanup no longer runs per transcription; sweep in the background instead
+    if start_janitor_thread():
+        startup_logger.info("Cache janitor: started (background thread)")
+
     startup_logger.info("Handler ready, waiting for jobs...")
     startup_logger.info("=" * 60)
 
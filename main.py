@@ -6,11 +6,16 @@ All business logic is organized in app/routers modules.
 Configuration is managed in app/config.
 """
 
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
+from app.services.model_pool import prewarm_worker_model
+from app.services.cache_janitor import start_janitor, stop_janitor
+from app.services.job_queue import start_job_queue, stop_job_queue
+from app.utils.metrics_utils import MetricsMiddleware
 from app.routers import (
     download,
     subtitles,
@@ -20,7 +25,9 @@ from app.routers import (
     screenshot,
     cache,
     admin,
-    jobs
+    jobs,
+    async_jobs,
+    metrics
 )
 
 
@@ -33,14 +40,26 @@ async def lifespan(app: FastAPI):
         - Directories are already created by app.config module
         - Cookie scheduler is started by admin router
         - Transcription worker is started by transcription router
+        - WORKER_MODEL_SIZE model is prewarmed in a background thread (MODEL_PREWARM)
+        - Cache janitor starts sweeping CACHE_DIR in the background
+        - /v2/jobs workers start (jobs interrupted by a restart are requeued)
 
     Shutdown:
+        - Job queue and cache janitor are stopped
         - Cleanup tasks handled by individual routers
     """
     # Startup
+    # Prewarm in a thread so a slow model load doesn't delay serving requests
+    prewarm_task = asyncio.create_task(asyncio.to_thread(prewarm_worker_model))
+    await start_janitor()
+    await start_job_queue()
     print("INFO: Application startup complete")
     yield
     # Shutdown
+    await stop_job_queue()
+    await stop_janitor()
+    if not prewarm_task.done():
+        prewarm_task.cancel()
     print("INFO: Application shutdown complete")
 
 
@@ -64,6 +83,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per router (http_request_duration_seconds at /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Register all routers
 # Note: Routers define their own path prefixes
 app.include_router(download.router)
@@ -75,6 +97,8 @@ app.include_router(screenshot.router)
 app.include_router(cache.router)
 app.include_router(admin.router)
 app.include_router(jobs.router)  # Supabase Edge Function job handler
+app.include_router(async_jobs.router)  # /v2/jobs async job API
+app.include_router(metrics.router)  # /metrics (Prometheus text format)
 
 
 @app.get("/", tags=["Root"])
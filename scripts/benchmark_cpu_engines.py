@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+CPU transcription benchmark: WhisperX vs faster-whisper (CTranslate2)
+
+Transcribes the same audio with both engines on CPU and reports load time,
+transcription time, real-time factor (audio seconds per wall-clock second)
+and how closely the faster-whisper transcript matches WhisperX's.
+
+faster-whisper runs once per thread/beam/VAD combination, so the script
+doubles as a tuning sweep for the FASTER_WHISPER_* settings.
+
+Usage:
+    # Defaults: small model, threads/workers from the core count, beam 5, VAD on
+    python scripts/benchmark_cpu_engines.py sample.mp3
+
+    # Sweep thread counts and greedy vs beam search, skip WhisperX
+    python scripts/benchmark_cpu_engines.py sample.mp3 --model medium \\
+        --threads 4,8,16 --beam-size 1,5 --skip-whisperx
+
+    # Machine-readable results
+    python scripts/benchmark_cpu_engines.py sample.mp3 --json results.json
+
+Requirements:
+    pip install whisperx faster-whisper (faster-whisper ships with whisperx)
+"""
+
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+import itertools
+from pathlib import Path
+
+# Run from anywhere: make the app package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.faster_whisper_engine import available_cores, thread_settings  # noqa: E402
+
+
+def _words(segments):
+    return " ".join(s["text"].strip() for s in segments).lower().split()
+
+
+def _agreement(reference, candidate):
+    """Word-level similarity (0-1) between two transcripts."""
+    if not reference and not candidate:
+        return 1.0
+    return round(difflib.SequenceMatcher(a=reference, b=candidate, autojunk=False).ratio(), 3)
+
+
+def run_whisperx(audio_path, model_size, language, threads):
+    import torch
+    import whisperx
+
+    torch.set_num_threads(threads)
+    start = time.time()
+    model = whisperx.load_model(model_size, "cpu", compute_type="int8", language=language,
+                                threads=threads)
+    load_time = time.time() - start
+
+    audio = whisperx.load_audio(audio_path)
+    start = time.time()
+    result = model.transcribe(audio, batch_size=16)
+    return {
+        "engine": "whisperx",
+        "threads": threads,
+        "load_time": round(load_time, 2),
+        "transcribe_time": round(time.time() - start, 2),
+        "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result["segments"]],
+        "language": result.get("language"),
+        "audio_seconds": len(audio) / 16000,
+    }
+
+
+def run_faster_whisper(audio_path, model_size, language, cpu_threads, num_workers, compute_type, beam_size, vad_filter):
+    from faster_whisper import WhisperModel
+
+    start = time.time()
+    model = WhisperModel(model_size, device="cpu", compute_type=compute_type,
+                         cpu_threads=cpu_threads, num_workers=num_workers)
+    load_time = time.time() - start
+
+    start = time.time()
+    segments, info = model.transcribe(audio_path, language=language, beam_size=beam_size, vad_filter=vad_filter)
+    segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+    return {
+        "engine": "faster-whisper",
+        "threads": cpu_threads,
+        "workers": num_workers,
+        "compute_type": compute_type,
+        "beam_size": beam_size,
+        "vad_filter": vad_filter,
+        "load_time": round(load_time, 2),
+        "transcribe_time": round(time.time() - start, 2),
+        "segments": segments,
+        "language": info.language,
+        "audio_seconds": info.duration,
+    }
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare WhisperX and faster-whisper transcription speed on CPU",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("audio", help="Audio file to transcribe")
+    parser.add_argument("--model", default="small", help="Model size (default: small)")
+    parser.add_argument("--language", default=None, help="Language code (default: auto-detect)")
+    parser.add_argument("--threads", type=_int_list, default=None,
+                        help="Comma-separated faster-whisper thread counts (default: from core count)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="faster-whisper workers per model (default: 1, one transcription at a time)")
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper compute type (default: int8)")
+    parser.add_argument("--beam-size", type=_int_list, default=[5], help="Comma-separated beam sizes (default: 5)")
+    parser.add_argument("--no-vad", action="store_true", help="Disable the faster-whisper VAD filter")
+    parser.add_argument("--skip-whisperx", action="store_true", help="Only run faster-whisper")
+    parser.add_argument("--json", dest="json_path", help="Write all results (with segments) to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.audio):
+        parser.error(f"Audio file not found: {args.audio}")
+
+    cores = available_cores()
+    default_threads, _ = thread_settings(cores=cores, num_workers=args.workers)
+    thread_counts = args.threads or [default_threads]
+    print(f"Cores available: {cores}; model: {args.model}; audio: {args.audio}")
+
+    results = []
+    if not args.skip_whisperx:
+        print("Running WhisperX (cpu, int8)...")
+        results.append(run_whisperx(args.audio, args.model, args.language, max(thread_counts)))
+
+    for threads, beam_size in itertools.product(thread_counts, args.beam_size):
+        print(f"Running faster-whisper ({threads} threads, beam {beam_size})...")
+        results.append(run_faster_whisper(
+            args.audio, args.model, args.language, threads, args.workers,
+            args.compute_type, beam_size, not args.no_vad
+        ))
+
+    reference = _words(results[0]["segments"]) if not args.skip_whisperx else None
+    print()
+    print(f"{'engine':<16}{'threads':>8}{'beam':>6}{'load s':>9}{'run s':>9}{'x RT':>8}{'agree':>8}")
+    for result in results:
+        result["realtime_factor"] = round(result["audio_seconds"] / max(result["transcribe_time"], 1e-6), 1)
+        if reference is not None:
+            result["agreement"] = _agreement(reference, _words(result["segments"]))
+        print(
+            f"{result['engine']:<16}{result['threads']:>8}{result.get('beam_size', '-'):>6}"
+            f"{result['load_time']:>9}{result['transcribe_time']:>9}{result['realtime_factor']:>8}"
+            f"{result.get('agreement', '-'):>8}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"cores": cores, "model": args.model, "audio": args.audio, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,13 @@ This module tests:
 - API authentication (401 for missing/invalid keys)
 - Input validation (422 for invalid params)
 - Endpoint responses (200 for valid requests with mocked yt-dlp)
-- All routers: download, subtitles, audio, transcription, playlist, screenshot, cache, admin
+- All routers: download, subtitles, audio, transcription, playlist, screenshot, cache, admin, v2 jobs, metrics
 """
 
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 import os
+import json
 
 
 class TestAuthentication:
@@ -63,6 +64,111 @@ class TestDownloadRouter:
         response = await client.post("/batch-download", headers=api_headers, json={})
         assert response.status_code == 422  # Invalid request body
 
+    @pytest.mark.asyncio
+    async def test_download_file_response_with_range(self, client, api_headers, youtube_url):
+        """Test that downloads carry Content-Length/ETag, honour Range and remove temp files."""
+        written = []
+
+        async def fake_extract(url, opts, download=False):
+            if not download:
+                return {"title": "Clip"}
+            path = opts["outtmpl"].replace("%(ext)s", "mp4")
+            with open(path, "wb") as f:
+                f.write(bytes(range(256)) * 4)
+            written.append(path)
+            return {"title": "Clip", "requested_downloads": [{"filepath": path}]}
+
+        with patch("app.routers.download.ytdlp_extract_info", side_effect=fake_extract):
+            response = await client.get(f"/download?url={youtube_url}", headers=api_headers)
+            assert response.status_code == 200
+            assert response.headers["content-length"] == "1024"
+            assert "etag" in response.headers
+            assert "attachment" in response.headers["content-disposition"]
+
+            response = await client.get(
+                f"/download?url={youtube_url}", headers={**api_headers, "Range": "bytes=256-511"}
+            )
+            assert response.status_code == 206
+            assert response.headers["content-range"] == "bytes 256-511/1024"
+            assert response.content == bytes(range(256))
+
+        assert written and not any(os.path.exists(path) for path in written)
+
+    @pytest.mark.asyncio
+    async def test_download_keep_serves_reported_file(self, client, api_headers, youtube_url, tmp_path):
+        """Test that keep=true serves and records the file yt-dlp reports, not a same-titled one."""
+        (tmp_path / "YT-Clip-otherid0000.mp4").write_bytes(b"another video")
+
+        async def fake_extract(url, opts, download=False):
+            info = {"title": "Clip", "id": "dQw4w9WgXcQ", "extractor_key": "Youtube"}
+            if download:
+                path = opts["outtmpl"].replace("%(id)s", info["id"]).replace("%(ext)s", "mp4")
+                with open(path, "wb") as f:
+                    f.write(b"this video")
+                info["requested_downloads"] = [{"filepath": path}]
+            return info
+
+        with patch("app.routers.download.DOWNLOADS_DIR", str(tmp_path)), \
+                patch("app.services.download_manifest.MANIFEST_PATH", str(tmp_path / "manifest.sqlite3")), \
+                patch("app.routers.download.ytdlp_extract_info", side_effect=fake_extract):
+            response = await client.get(f"/download?url={youtube_url}&keep=true", headers=api_headers)
+
+            from app.services import download_manifest
+            entry = download_manifest.lookup("youtube", "dQw4w9WgXcQ")
+
+        assert response.status_code == 200
+        assert response.content == b"this video"
+        assert entry["path"] == str(tmp_path / "YT-Clip-dQw4w9WgXcQ.mp4")
+
+    @pytest.mark.asyncio
+    async def test_download_stream_passthrough(self, client, api_headers, youtube_url):
+        """Test that stream=true pipes yt-dlp output and rejects merged formats."""
+        async def chunks():
+            yield b"part1"
+            yield b"part2"
+
+        response = await client.get(
+            f"/download?url={youtube_url}&stream=true&format=bestvideo%2Bbestaudio", headers=api_headers
+        )
+        assert response.status_code == 400
+
+        with patch("app.routers.download.os.path.exists", return_value=True), \
+                patch("app.routers.download.rate_limit", AsyncMock(return_value=0)), \
+                patch("app.routers.download.get_video_info", AsyncMock(return_value={"title": "Clip"})), \
+                patch("app.routers.download.stream_download", AsyncMock(return_value=chunks())) as mock_stream:
+            response = await client.get(f"/download?url={youtube_url}&stream=true", headers=api_headers)
+
+        assert response.status_code == 200
+        assert response.content == b"part1part2"
+        assert "content-length" not in response.headers
+        assert mock_stream.call_args.args[2] == "best"
+
+    @pytest.mark.asyncio
+    async def test_batch_download_stream_ndjson(self, client, api_headers, youtube_url, tmp_path):
+        """Test that the batch stream emits NDJSON events and the batch status is stored."""
+        from app.models import VideoDownloadResult
+
+        async def fake_download_one(self, url):
+            return VideoDownloadResult(url=url, success=True, status="downloaded", file_size=5)
+
+        with patch("app.services.batch_download.BATCH_STATE_DIR", str(tmp_path)), \
+                patch("app.services.batch_download.BatchDownload._download_one", fake_download_one):
+            response = await client.post(
+                "/batch-download/stream?stream_format=ndjson", headers=api_headers,
+                json={"urls": [youtube_url], "min_delay": 0, "max_delay": 0}
+            )
+            assert response.status_code == 200
+            events = [json.loads(line) for line in response.text.splitlines() if line]
+            assert events[0]["event"] == "start" and events[-1]["event"] == "done"
+
+            batch_id = events[0]["batch_id"]
+            response = await client.get(f"/batch-download/{batch_id}", headers=api_headers)
+            assert response.status_code == 200
+            assert response.json()["successful"] == 1
+
+            response = await client.get("/batch-download/unknown", headers=api_headers)
+            assert response.status_code == 404
+
 
 class TestSubtitlesRouter:
     """Test subtitles router endpoints."""
@@ -165,6 +271,30 @@ class TestTranscriptionRouter:
         response = await client.post("/transcribe", headers=api_headers)
         assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_transcribe_stream_missing_file(self, client, api_headers):
+        """Test streaming transcribe reports a missing file before streaming."""
+        response = await client.post("/transcribe/stream?audio_file=/nonexistent/a.mp3", headers=api_headers)
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_transcribe_stream_sse(self, client, api_headers, tmp_path):
+        """Test streaming transcribe sends segments and done as SSE events."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"mp3")
+
+        async def fake_stream(*args):
+            yield {"event": "segments", "index": 0, "segments": [{"start": 0.0, "end": 1.0, "text": "hi"}]}
+            yield {"event": "done", "result": {"language": "en"}}
+
+        with patch("app.routers.transcription.stream_transcription", side_effect=fake_stream):
+            response = await client.post(f"/transcribe/stream?audio_file={audio}", headers=api_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith('event: segments\ndata: {"index": 0, "segments": [{"start": 0.0')
+        assert 'event: done\ndata: {"result": {"language": "en"}}\n\n' in response.text
+
     @pytest.mark.asyncio
     async def test_transcriptions_save_missing_api_key(self, client):
         """Test save transcription endpoint rejects missing API key."""
@@ -393,6 +523,74 @@ class TestAdminRouter:
         data = response.json()
         assert "running" in data or "error" in data
 
+    @pytest.mark.asyncio
+    async def test_job_timings_with_api_key(self, client, api_headers):
+        """Test job stage timing histograms endpoint with valid API key."""
+        response = await client.get("/admin/job-timings", headers=api_headers)
+        assert response.status_code == 200
+        assert "stages" in response.json()
+
+
+class TestAsyncJobsRouter:
+    """Test /v2/jobs async job API endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_submit_and_poll(self, client, api_headers, tmp_path, monkeypatch):
+        """Test that a job is queued with 202 and can be polled by id."""
+        from app.services import job_store
+        monkeypatch.setattr(job_store, "JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+        response = await client.post(
+            "/v2/jobs", headers=api_headers,
+            json={"type": "extract-audio", "params": {"url": "https://youtu.be/abc"}}
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+
+        response = await client.get(f"/v2/jobs/{job['id']}", headers=api_headers)
+        assert response.status_code == 200
+        assert response.json()["params"]["output_format"] == "mp3"
+
+    @pytest.mark.asyncio
+    async def test_invalid_job_and_unknown_id(self, client, api_headers, tmp_path, monkeypatch):
+        """Test that invalid jobs are rejected up front and unknown ids return 404."""
+        from app.services import job_store
+        monkeypatch.setattr(job_store, "JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+        response = await client.post(
+            "/v2/jobs", headers=api_headers,
+            json={"type": "transcribe", "params": {"audio_file": "/nonexistent/a.mp3"}}
+        )
+        assert response.status_code == 404
+
+        response = await client.get("/v2/jobs/does-not-exist", headers=api_headers)
+        assert response.status_code == 404
+
+
+class TestMetricsRouter:
+    """Test the /metrics endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_requires_api_key(self, client):
+        """Test that /metrics is protected by the API key by default."""
+        response = await client.get("/metrics")
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_metrics_exposition(self, client, api_headers):
+        """Test that earlier requests show up per router and scrape-time gauges are included."""
+        await client.get("/cache", headers=api_headers)
+
+        response = await client.get("/metrics", headers=api_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'router="Cache",route="/cache",method="GET",status="200"' in body
+        assert 'semaphore_capacity{semaphore="transcription"}' in body
+        assert "cache_bytes{" in body
+
 
 class TestHealthCheck:
     """Test basic health check endpoint."""
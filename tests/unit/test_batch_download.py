@@ -0,0 +1,225 @@
+"""
+Unit tests for the concurrent batch-download engine.
+
+This module tests:
+- Platforms download in parallel while YouTube stays one at a time
+- Delays only pause the lane that downloaded, without blocking the loop
+- Results are persisted and a resumed batch skips completed URLs
+- Events are emitted per URL, ending with the summary
+- Videos in the download manifest are skipped without network calls
+- Same-titled videos downloaded concurrently get separate files
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.models import BatchDownloadRequest, VideoDownloadResult
+from app.services import batch_download, download_manifest
+from app.services.batch_download import BatchDownload, lane_for_url
+
+
+YT = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(3)]
+TT = [f"https://www.tiktok.com/@user/video/{i}" for i in range(3)]
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_download, "BATCH_STATE_DIR", str(tmp_path / "batches"))
+    monkeypatch.setattr(batch_download, "DOWNLOAD_CONCURRENCY", {"youtube": 1})
+    monkeypatch.setattr(batch_download, "DOWNLOAD_CONCURRENCY_DEFAULT", 4)
+    monkeypatch.setattr(batch_download, "DOWNLOADS_DIR", str(tmp_path))
+    monkeypatch.setattr(download_manifest, "MANIFEST_PATH", str(tmp_path / "manifest.sqlite3"))
+
+
+def _request(urls, **kwargs):
+    return BatchDownloadRequest(urls=urls, min_delay=0, max_delay=0, **kwargs)
+
+
+class FakeDownloads:
+    """Stand-in for BatchDownload._download_one tracking concurrency per lane."""
+
+    def __init__(self, fail=()):
+        self.active = {}
+        self.peak = {}
+        self.calls = []
+        self.fail = set(fail)
+
+    async def __call__(self, url):
+        lane = lane_for_url(url)
+        self.calls.append(url)
+        self.active[lane] = self.active.get(lane, 0) + 1
+        self.peak[lane] = max(self.peak.get(lane, 0), self.active[lane])
+        await asyncio.sleep(0.05)
+        self.active[lane] -= 1
+        if url in self.fail:
+            return VideoDownloadResult(url=url, success=False, status="failed", error="boom")
+        return VideoDownloadResult(url=url, success=True, status="downloaded", file_size=10)
+
+
+def fake_ytdlp(title="Clip", extractor_key="Youtube"):
+    """Stand-in for ytdlp_extract_info that writes the file on download=True."""
+    async def extract(url, opts, download=False):
+        video_id = url.rstrip("/").rsplit("/", 1)[-1].rsplit("=", 1)[-1]
+        info = {"title": title, "id": video_id, "extractor_key": extractor_key}
+        if download:
+            await asyncio.sleep(0.01)
+            path = opts["outtmpl"].replace("%(id)s", video_id).replace("%(ext)s", "mp4")
+            with open(path, "wb") as f:
+                f.write(video_id.encode())
+            info["requested_downloads"] = [{"filepath": path}]
+        return info
+    return AsyncMock(side_effect=extract)
+
+
+class TestLanes:
+    """Test per-platform concurrency."""
+
+    @pytest.mark.asyncio
+    async def test_youtube_serial_others_parallel(self, monkeypatch):
+        """Test that YouTube runs one at a time while TikTok downloads run together."""
+        fake = FakeDownloads()
+        batch = BatchDownload(_request(YT + TT))
+        monkeypatch.setattr(batch, "_download_one", fake)
+
+        response = await batch.run()
+
+        assert fake.peak == {"youtube": 1, "tiktok": 3}
+        assert response.successful == 6
+        assert response.total_size == 60
+        assert [d.url for d in response.downloads] == YT + TT
+
+    @pytest.mark.asyncio
+    async def test_delay_only_pauses_its_lane(self, monkeypatch):
+        """Test that delays are non-blocking and apply between same-lane downloads only."""
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(seconds):
+            if seconds >= 1:
+                sleeps.append(seconds)
+            await real_sleep(0)
+
+        monkeypatch.setattr(batch_download.asyncio, "sleep", fake_sleep)
+        batch = BatchDownload(BatchDownloadRequest(urls=YT[:2] + TT[:1], min_delay=5, max_delay=5))
+        monkeypatch.setattr(batch, "_download_one", FakeDownloads())
+
+        await batch.run()
+
+        # One pause between the two YouTube downloads, none after the single TikTok one
+        assert sleeps == [5]
+
+
+class TestResume:
+    """Test persisted batch state."""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_urls(self, monkeypatch):
+        """Test that a resumed batch only retries URLs that didn't finish."""
+        first = BatchDownload(_request(YT + TT))
+        monkeypatch.setattr(first, "_download_one", FakeDownloads(fail={TT[0]}))
+        response = await first.run()
+        assert response.failed == 1
+
+        fake = FakeDownloads()
+        second = BatchDownload(_request(YT + TT, batch_id=response.batch_id))
+        monkeypatch.setattr(second, "_download_one", fake)
+        response = await second.run()
+
+        assert fake.calls == [TT[0]]
+        assert response.resumed == 5
+        assert response.successful == 6
+        assert batch_download.load_batch_state(response.batch_id)["results"][TT[0]]["status"] == "downloaded"
+
+
+class TestEvents:
+    """Test streamed events."""
+
+    @pytest.mark.asyncio
+    async def test_event_sequence(self, monkeypatch):
+        """Test start, per-URL started/result events and the final summary."""
+        batch = BatchDownload(_request(YT[:1] + TT[:1]))
+        monkeypatch.setattr(batch, "_download_one", FakeDownloads())
+
+        events = [event async for event in batch.events()]
+
+        names = [event["event"] for event in events]
+        assert names[0] == "start" and names[-1] == "done"
+        assert names.count("started") == 2 and names.count("result") == 2
+        assert events[-2]["completed"] == 2
+        assert events[-1]["summary"]["successful"] == 2
+
+
+class TestManifest:
+    """Test the download manifest skip check."""
+
+    def test_lookup_drops_missing_files(self, tmp_path):
+        """Test that entries are keyed by platform and video ID and vanish with their file."""
+        video = tmp_path / "YT-Clip.mp4"
+        video.write_bytes(b"video")
+        key = download_manifest.manifest_key(YT[0])
+        assert key == ("youtube", "video000000")
+
+        download_manifest.record_download(*key, YT[0], str(video), "Clip")
+        assert download_manifest.lookup(*key)["size"] == 5
+
+        video.unlink()
+        assert download_manifest.lookup(*key) is None
+
+    @pytest.mark.asyncio
+    async def test_download_records_then_skips_offline(self, tmp_path, monkeypatch):
+        """Test that a kept download is recorded and a later batch skips it with no network calls."""
+        extract = fake_ytdlp()
+        monkeypatch.setattr(batch_download, "rate_limit", AsyncMock(return_value=0))
+        monkeypatch.setattr(batch_download, "ytdlp_extract_info", extract)
+
+        result = await BatchDownload(_request(YT[:1], keep=True))._download_one(YT[0])
+        assert result.status == "downloaded"
+        assert download_manifest.lookup("youtube", "video000000")["title"] == "Clip"
+
+        extract.reset_mock()
+        limiter = AsyncMock(return_value=0)
+        monkeypatch.setattr(batch_download, "rate_limit", limiter)
+        result = await BatchDownload(_request(YT[:1], keep=True))._download_one(YT[0])
+
+        assert result.status == "skipped"
+        assert result.file_size == 11 and result.title == "Clip"
+        extract.assert_not_called()
+        limiter.assert_not_called()
+
+
+class TestDownloadOne:
+    """Test output paths of concurrent downloads."""
+
+    @pytest.mark.asyncio
+    async def test_same_titles_get_separate_files(self, tmp_path, monkeypatch):
+        """Test that same-titled videos downloading at once don't share a file."""
+        monkeypatch.setattr(batch_download, "rate_limit", AsyncMock(return_value=0))
+        monkeypatch.setattr(batch_download, "ytdlp_extract_info", fake_ytdlp("Video", "TikTok"))
+
+        response = await BatchDownload(_request(TT[:2], keep=True)).run()
+
+        assert response.successful == 2
+        paths = [tmp_path / d.filename for d in response.downloads]
+        assert [d.filename for d in response.downloads] == ["TT-Video-0.mp4", "TT-Video-1.mp4"]
+        assert [p.read_bytes() for p in paths] == [b"0", b"1"]
+
+    @pytest.mark.asyncio
+    async def test_adopts_only_files_named_with_the_id(self, tmp_path, monkeypatch):
+        """Test that a same-titled file of another video isn't marked as downloaded."""
+        (tmp_path / "TT-Video.mp4").write_bytes(b"someone else")
+        (tmp_path / "TT-Video-1.mp4").write_bytes(b"1")
+        monkeypatch.setattr(batch_download, "rate_limit", AsyncMock(return_value=0))
+        extract = fake_ytdlp("Video", "TikTok")
+        monkeypatch.setattr(batch_download, "ytdlp_extract_info", extract)
+        monkeypatch.setattr(batch_download, "manifest_key", lambda url, info=None: (
+            download_manifest.manifest_key(url, info) if info else None
+        ))
+
+        batch = BatchDownload(_request(TT[:2], keep=True))
+        first, second = [await batch._download_one(url) for url in TT[:2]]
+
+        assert first.status == "downloaded"
+        assert first.filename == "TT-Video-0.mp4"
+        assert second.status == "skipped"
+        assert second.filename == "TT-Video-1.mp4"
+        assert download_manifest.lookup("tiktok", "1")["path"] == str(tmp_path / "TT-Video-1.mp4")
@@ -0,0 +1,163 @@
+"""
+Unit tests for the concurrent batch scheduler.
+
+This module tests:
+- Jobs of a batch run concurrently and results keep their order
+- Per-class limits cap concurrency
+- Jobs sharing a key are serialized
+- DB calls run in worker threads; without a scheduler they run inline
+- process_job_batch runs its jobs through the scheduler
+- Audio downloads are pipelined with transcription and bounded by the audio buffer
+"""
+
+import time
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.services import batch_scheduler
+from app.services.batch_scheduler import BatchScheduler, run_db_call, scheduler_slot
+
+
+class TestBatchScheduler:
+    """Test scheduling behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_in_order(self):
+        """Test that jobs overlap and results match input order."""
+        scheduler = BatchScheduler({"subtitle": 10, "download": 1, "db": 1})
+
+        async def job(n):
+            async with scheduler.slot("subtitle"):
+                await asyncio.sleep(0.1 - n * 0.01)
+            return n
+
+        start = time.monotonic()
+        results = await scheduler.run_all(range(5), job)
+
+        assert results == [0, 1, 2, 3, 4]
+        assert time.monotonic() - start < 0.3
+        assert scheduler.peak["subtitle"] == 5
+
+    @pytest.mark.asyncio
+    async def test_class_limit(self):
+        """Test that a class never exceeds its limit."""
+        scheduler = BatchScheduler({"subtitle": 10, "download": 2, "db": 1})
+
+        async def job(n):
+            async with scheduler.slot("download"):
+                await asyncio.sleep(0.02)
+
+        await scheduler.run_all(range(6), job)
+        assert scheduler.peak["download"] == 2
+
+    @pytest.mark.asyncio
+    async def test_same_key_serialized(self):
+        """Test that jobs with the same key don't overlap."""
+        scheduler = BatchScheduler({"subtitle": 1, "download": 5, "db": 1})
+        running = []
+        overlaps = []
+
+        async def job(n):
+            async with scheduler_slot(scheduler, "download", key="video-1"):
+                running.append(n)
+                overlaps.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(n)
+
+        await scheduler.run_all(range(3), job)
+        assert max(overlaps) == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_raised_after_all_finish(self):
+        """Test that a failing job doesn't abandon the others."""
+        scheduler = BatchScheduler()
+        finished = []
+
+        async def job(n):
+            if n == 0:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            finished.append(n)
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run_all(range(3), job)
+        assert sorted(finished) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_db_calls(self):
+        """Test that DB calls use worker threads only with a scheduler."""
+        main_thread = threading.get_ident()
+
+        assert await run_db_call(None, threading.get_ident) == main_thread
+        assert await run_db_call(BatchScheduler(), threading.get_ident) != main_thread
+
+
+class TestProcessJobBatch:
+    """Test process_job_batch integration."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_concurrently(self):
+        """Test that a batch of jobs is processed concurrently with the scheduler."""
+        from app.services import job_service
+
+        async def fake_job(job, queue_name, max_retries, model_size, provider, scheduler):
+            assert isinstance(scheduler, BatchScheduler)
+            await asyncio.sleep(0.1)
+            return {"msg_id": job["msg_id"], "status": "completed"}
+
+        jobs = [{"msg_id": n, "document_id": f"doc-{n}"} for n in range(5)]
+        with patch.object(job_service, "process_single_job", side_effect=fake_job):
+            start = time.monotonic()
+            result = await job_service.process_job_batch({"queue": "q", "jobs": jobs})
+
+        assert time.monotonic() - start < 0.4
+        assert [r["msg_id"] for r in result["results"]] == [0, 1, 2, 3, 4]
+        assert result["summary"]["completed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_audio_download_pipelined_with_transcription(self, monkeypatch):
+        """Test that audio prefetches while the GPU is busy, up to the buffer size."""
+        from app.services import job_service
+
+        monkeypatch.setattr(batch_scheduler, "BATCH_CONCURRENCY", {
+            "subtitle": 4, "download": 4, "db": 4, "audio_buffer": 2
+        })
+        monkeypatch.setattr(job_service, "transcription_semaphore", asyncio.Semaphore(1))
+
+        doc = {"id": "doc", "canonical_url": "https://example.com/a.mp3", "media_format": "audio", "lang": "en"}
+        supabase = MagicMock()
+        supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = \
+            SimpleNamespace(data=[doc])
+        supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = \
+            SimpleNamespace(data=doc)
+
+        events = []
+        held = {"now": 0, "max": 0}
+
+        async def fake_download(url, pcm=False):
+            events.append("download")
+            await asyncio.sleep(0.01)
+            held["now"] += 1
+            held["max"] = max(held["max"], held["now"])
+            return {"audio_file": "/tmp/a.mp3", "duration": 1}
+
+        async def fake_transcribe(**kwargs):
+            events.append("transcribe-start")
+            await asyncio.sleep(0.05)
+            held["now"] -= 1
+            events.append("transcribe-end")
+            return {"segments": [{"text": "hi"}], "language": "en", "metadata": {}}
+
+        jobs = [{"msg_id": n, "document_id": f"doc-{n}"} for n in range(4)]
+        with patch.object(job_service, "get_supabase_client", return_value=supabase), \
+                patch.object(job_service, "_extract_audio_from_url", side_effect=fake_download), \
+                patch.object(job_service, "_transcribe_audio_internal", side_effect=fake_transcribe):
+            result = await job_service.process_job_batch({"queue": "q", "jobs": jobs})
+
+        assert result["summary"]["completed"] == 4
+        # The second download happens before the first transcription finishes
+        assert events.index("download", 1) < events.index("transcribe-end")
+        # Never more than audio_buffer jobs hold downloaded audio
+        assert held["max"] <= 2
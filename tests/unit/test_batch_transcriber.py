@@ -0,0 +1,126 @@
+"""
+Unit tests for cross-file batched transcription.
+
+This module tests:
+- VAD chunks of several clips go through one model call and are split back per file
+- Clips queued within the window share a batch; max_files flushes early
+- Inference errors reach every clip of the batch
+- Only language-pinned pipelines are batched
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.services.batch_transcriber import BatchTranscriber, can_batch, transcribe_batch, SAMPLE_RATE
+from app.services.model_pool import PooledModel
+
+
+class FakeVad:
+    """VAD returning one speech region per second of audio."""
+
+    @staticmethod
+    def preprocess_audio(audio):
+        return audio
+
+    @staticmethod
+    def merge_chunks(segments, chunk_size, onset, offset):
+        return segments
+
+    def __call__(self, data):
+        seconds = len(data["waveform"]) // SAMPLE_RATE
+        return [{"start": float(s), "end": float(s + 1)} for s in range(seconds)]
+
+
+class FakePipeline:
+    """WhisperX-like pipeline that echoes each chunk's first sample as text."""
+
+    def __init__(self, fail=False):
+        self.vad_model = FakeVad()
+        self._vad_params = {"vad_onset": 0.5, "vad_offset": 0.363}
+        self.tokenizer = SimpleNamespace(language_code="en")
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, inputs, batch_size, num_workers):
+        if self.fail:
+            raise RuntimeError("CUDA out of memory")
+        chunks = list(inputs)
+        self.calls.append(len(chunks))
+        return [{"text": f"chunk-{c['inputs'][0]}"} for c in chunks]
+
+
+def _audio(tag, seconds):
+    """Fake audio whose samples all equal tag (lists slice like arrays)."""
+    return [tag] * (SAMPLE_RATE * seconds)
+
+
+def _pooled(model):
+    return PooledModel(key=("tiny", "cpu", "int8", "en"), model=model, memory_mb=0, load_time=0.0)
+
+
+class TestTranscribeBatch:
+    """Test the blocking batch inference."""
+
+    def test_results_split_per_file(self):
+        """Test that one model call covers all files and text maps back to each file."""
+        model = FakePipeline()
+        results = transcribe_batch(model, [_audio(1, 2), _audio(2, 1), _audio(3, 3)])
+
+        assert model.calls == [6]
+        assert [len(r["segments"]) for r in results] == [2, 1, 3]
+        assert results[1]["segments"][0] == {"text": "chunk-2", "start": 0.0, "end": 1.0}
+        assert all(r["language"] == "en" for r in results)
+
+    def test_can_batch_requires_language(self):
+        """Test that pipelines without a fixed tokenizer aren't batched."""
+        model = FakePipeline()
+        assert can_batch(model) is True
+        model.tokenizer = None
+        assert can_batch(model) is False
+
+
+class TestBatchTranscriber:
+    """Test request collection."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_clips_share_batch(self):
+        """Test that clips queued within the window run as one batch."""
+        model = FakePipeline()
+        pooled = _pooled(model)
+        transcriber = BatchTranscriber(window_ms=50, max_files=8)
+
+        results = await asyncio.gather(*[
+            transcriber.transcribe(pooled, _audio(n, 1)) for n in range(4)
+        ])
+
+        assert model.calls == [4]
+        assert [r["segments"][0]["text"] for r in results] == ["chunk-0", "chunk-1", "chunk-2", "chunk-3"]
+        assert transcriber.stats()["max_files_per_batch"] == 4
+
+    @pytest.mark.asyncio
+    async def test_max_files_flushes_early(self):
+        """Test that a full batch runs without waiting for the window."""
+        model = FakePipeline()
+        pooled = _pooled(model)
+        transcriber = BatchTranscriber(window_ms=10000, max_files=2)
+
+        await asyncio.wait_for(asyncio.gather(*[
+            transcriber.transcribe(pooled, _audio(n, 1)) for n in range(4)
+        ]), timeout=5)
+
+        assert model.calls == [2, 2]
+        await asyncio.sleep(0)
+        assert not transcriber._tasks  # finished batch tasks are released
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_all_clips(self):
+        """Test that a failed batch fails every clip in it."""
+        pooled = _pooled(FakePipeline(fail=True))
+        transcriber = BatchTranscriber(window_ms=10, max_files=8)
+
+        results = await asyncio.gather(*[
+            transcriber.transcribe(pooled, _audio(n, 1)) for n in range(2)
+        ], return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert transcriber.stats()["errors"] == 1
@@ -0,0 +1,76 @@
+"""
+Unit tests for the transcription benchmark suite.
+
+This module tests:
+- Fixtures have exact durations and are deterministic
+- Cases report RTF, throughput and errors
+- Result comparison flags regressions in the right direction
+"""
+
+import pytest
+from benchmarks import transcription
+from benchmarks.compare import compare_results
+from benchmarks.fixtures import generate_fixture, wav_duration
+
+
+class TestFixtures:
+    """Test synthetic audio generation."""
+
+    def test_exact_duration_and_deterministic(self, tmp_path):
+        """Test that fixtures have the requested length and identical bytes per seed."""
+        noise = generate_fixture("noise", 1.5, str(tmp_path / "a"))
+        again = generate_fixture("noise", 1.5, str(tmp_path / "b"))
+        tone = generate_fixture("tone", 2, str(tmp_path / "a"))
+
+        assert wav_duration(noise.path) == 1.5
+        assert wav_duration(tone.path) == 2.0
+        assert open(noise.path, "rb").read() == open(again.path, "rb").read()
+        assert noise.name == "noise-1.5s"
+
+    def test_rejects_unknown_kind(self, tmp_path):
+        """Test that unknown kinds are refused."""
+        with pytest.raises(ValueError):
+            generate_fixture("speech", 1, str(tmp_path))
+
+
+class TestRunCase:
+    """Test one benchmark case."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_and_errors(self, tmp_path, monkeypatch):
+        """Test that successful requests yield RTF/throughput and failures are listed."""
+        fixture = generate_fixture("tone", 1, str(tmp_path))
+        calls = []
+
+        async def fake_request(provider, model_size, fixture, language):
+            calls.append(provider)
+            if len(calls) == 2:
+                return {"elapsed": 0.1, "error": "500: Out of memory"}
+            return {"elapsed": 0.5, "model_load_time": 2.0, "segments": 3}
+
+        monkeypatch.setattr(transcription, "_timed_request", fake_request)
+
+        result = await transcription.run_case("local", "tiny", fixture, concurrency=2)
+
+        assert result["rtf_mean"] == 0.5
+        assert result["model_load_time"] == 2.0
+        assert result["errors"] == ["500: Out of memory"]
+        assert result["throughput"] > 0
+        assert result["peak_rss_mb"] > 0
+
+
+class TestCompare:
+    """Test regression detection."""
+
+    def test_direction_and_threshold(self):
+        """Test that slower RTF and lower throughput regress while small changes don't."""
+        case = {"provider": "local", "model": "tiny", "fixture": "noise-30s", "concurrency": 2, "cold": False}
+        base = {"results": [{**case, "rtf_mean": 0.10, "throughput": 20.0, "peak_rss_mb": 1000, "model_load_time": 0}]}
+        head = {"results": [{**case, "rtf_mean": 0.12, "throughput": 16.0, "peak_rss_mb": 1050, "model_load_time": 0}]}
+
+        rows = {row["metric"]: row for row in compare_results(base, head, threshold_pct=10)}
+
+        assert rows["rtf_mean"]["regression"] is True
+        assert rows["throughput"]["regression"] is True
+        assert rows["peak_rss_mb"]["regression"] is False
+        assert "model_load_time" not in rows
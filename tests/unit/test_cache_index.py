@@ -0,0 +1,193 @@
+"""
+Unit tests for the persistent cache index.
+
+This module tests:
+- Filename parsing for each cache category
+- Bootstrap registration of files cached before the index existed
+- record/lookup/remove round trips and stale entry pruning
+- get_cached_video and find_cached_output in cache_service
+- Per-category budget eviction (LRU/LFU) and index reconciliation
+"""
+
+import os
+import time
+import pytest
+from app.services import cache_index, cache_service
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the cache index at a temporary cache directory."""
+    for subdir in ["videos", "audio", "transcriptions", "screenshots"]:
+        (tmp_path / subdir).mkdir()
+    monkeypatch.setattr(cache_index, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_index, "INDEX_PATH", str(tmp_path / "cache_index.sqlite3"))
+    return tmp_path
+
+
+def _write(path, size=2048):
+    path.write_bytes(b"\x00" * size)
+    return str(path)
+
+
+class TestParseCacheFilename:
+    """Test filename conventions."""
+
+    def test_video_with_dash_in_id(self):
+        """Test that YouTube IDs containing dashes are kept intact."""
+        parsed = cache_index.parse_cache_filename("videos", "YT-ab-cd_EFGhi.mp4")
+        assert parsed == {"platform": "youtube", "video_id": "ab-cd_EFGhi", "format": "mp4"}
+
+    def test_screenshot(self):
+        """Test screenshot names yield the video_id before the timestamp."""
+        parsed = cache_index.parse_cache_filename("screenshots", "ab-cd-90500.jpg")
+        assert parsed["video_id"] == "ab-cd"
+        assert parsed["format"] == "jpg"
+
+    def test_audio_has_no_video_id(self):
+        """Test that uid-named audio files carry no video_id."""
+        assert cache_index.parse_cache_filename("audio", "a1b2c3d4.mp3")["video_id"] is None
+
+
+class TestCacheIndex:
+    """Test index reads and writes."""
+
+    def test_bootstrap_registers_existing_files(self, cache_dir):
+        """Test that files on disk before the index existed are found."""
+        path = _write(cache_dir / "videos" / "YT-dQw4w9WgXcQ.mp4")
+
+        entry = cache_index.lookup("dQw4w9WgXcQ", "video")
+
+        assert entry["path"] == path
+        assert entry["platform"] == "youtube"
+
+    def test_record_lookup_remove(self, cache_dir):
+        """Test that recorded files are returned and removal hides them."""
+        path = _write(cache_dir / "audio" / "a1b2c3d4.mp3")
+
+        cache_index.record_file(path, "audio", "tiktok", "7123")
+        entry = cache_index.lookup("7123", "audio", platform="tiktok", fmt="mp3")
+        assert entry["path"] == path
+        assert entry["size"] == 2048
+        assert entry["hits"] == 1
+
+        cache_index.remove_path(path)
+        assert cache_index.lookup("7123", "audio") is None
+
+    def test_missing_file_is_pruned(self, cache_dir):
+        """Test that entries whose file disappeared are dropped on lookup."""
+        path = _write(cache_dir / "videos" / "TT-999.mp4")
+        cache_index.record_file(path, "video", "tiktok", "999")
+        os.remove(path)
+
+        assert cache_index.lookup("999", "video") is None
+        assert cache_index.category_totals()["videos"]["files"] == 0
+
+    def test_category_totals(self, cache_dir):
+        """Test per-category byte totals."""
+        cache_index.record_file(_write(cache_dir / "screenshots" / "abc-0.jpg", 100), "screenshot", video_id="abc")
+        cache_index.record_file(_write(cache_dir / "screenshots" / "abc-1000.jpg", 50), "screenshot", video_id="abc")
+
+        assert cache_index.category_totals()["screenshots"] == {"files": 2, "bytes": 150}
+
+
+class TestCacheServiceLookups:
+    """Test cache_service helpers backed by the index."""
+
+    def test_get_cached_video_respects_ttl(self, cache_dir, monkeypatch):
+        """Test fresh videos are returned and expired ones are not."""
+        path = _write(cache_dir / "videos" / "YT-fresh.mp4")
+        cache_index.record_file(path, "video", "youtube", "fresh")
+        assert cache_service.get_cached_video("fresh") == path
+
+        old = time.time() - 10 * 3600
+        os.utime(path, (old, old))
+        cache_index.record_file(path, "video", "youtube", "fresh")
+        monkeypatch.setattr(cache_service, "CACHE_TTL_HOURS", 3)
+        assert cache_service.get_cached_video("fresh") is None
+
+    def test_find_cached_output(self, cache_dir):
+        """Test expected extensions win and unexpected ones are still found."""
+        videos = str(cache_dir / "videos")
+        _write(cache_dir / "videos" / "YT-x.webm")
+        _write(cache_dir / "videos" / "YT-x.webm.part")
+
+        assert cache_service.find_cached_output(videos, "YT-x", ["mp4"]) == os.path.join(videos, "YT-x.webm")
+        assert cache_service.find_cached_output(videos, "YT-missing", ["mp4"]) is None
+
+
+def _set_access(path, last_access, hits=0):
+    cache_index._connect().execute(
+        "UPDATE cache_entries SET last_access = ?, hits = ? WHERE path = ?",
+        (last_access, hits, path)
+    )
+
+
+@pytest.fixture
+def budgets(cache_dir, monkeypatch):
+    """Give the audio category a 3 KB budget and disable the grace window."""
+    monkeypatch.setattr(cache_service, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cache_service, "CACHE_MAX_BYTES", {
+        "videos": 0, "audio": 3 * 1024, "screenshots": 0, "transcriptions": 0
+    })
+    monkeypatch.setattr(cache_service, "EVICTION_GRACE_SECONDS", 0)
+    paths = []
+    for name in ["a.mp3", "b.mp3", "c.mp3"]:
+        path = _write(cache_dir / "audio" / name, 1024 + 512)
+        cache_index.record_file(path, "audio")
+        paths.append(path)
+    return paths
+
+
+class TestCacheBudgets:
+    """Test size-bounded eviction."""
+
+    def test_lru_evicts_least_recently_accessed(self, budgets):
+        """Test that the least recently accessed files go first."""
+        a, b, c = budgets
+        now = time.time()
+        _set_access(a, now - 10)
+        _set_access(b, now - 30)
+        _set_access(c, now - 20)
+
+        result = cache_service.enforce_cache_budgets("lru")
+
+        assert result["evicted"]["audio"] == 1
+        assert not os.path.exists(b)
+        assert os.path.exists(a) and os.path.exists(c)
+
+    def test_lfu_evicts_least_used(self, budgets):
+        """Test that the file with fewest hits goes first."""
+        a, b, c = budgets
+        now = time.time()
+        _set_access(a, now - 30, hits=5)
+        _set_access(b, now - 20, hits=0)
+        _set_access(c, now - 10, hits=2)
+
+        cache_service.enforce_cache_budgets("lfu")
+
+        assert not os.path.exists(b)
+        assert os.path.exists(a)
+
+    def test_grace_window_protects_recent_files(self, budgets, monkeypatch):
+        """Test that recently touched files are not evicted."""
+        monkeypatch.setattr(cache_service, "EVICTION_GRACE_SECONDS", 3600)
+
+        result = cache_service.enforce_cache_budgets()
+
+        assert result["evicted"]["audio"] == 0
+        assert result["over_budget"] == ["audio"]
+
+    def test_cleanup_reconciles_index(self, budgets, cache_dir):
+        """Test that unindexed files are registered and vanished ones dropped."""
+        a, b, c = budgets
+        os.remove(a)
+        stray = _write(cache_dir / "screenshots" / "vid-5000.jpg", 10)
+        for path in (b, c):
+            _set_access(path, time.time() - 100)
+
+        result = cache_service.cleanup_cache()
+
+        assert result["evicted"]["audio"] == 0
+        assert cache_index.lookup("vid", "screenshot")["path"] == stray
+        assert a not in cache_index.indexed_paths("audio")
@@ -0,0 +1,77 @@
+"""
+Unit tests for the background cache janitor.
+
+This module tests:
+- Ticks sweep one category at a time, round robin
+- Every tick enforces the byte budgets of all other categories
+- Sweep stats and failures are recorded for the status endpoint
+- The async janitor task starts and stops cleanly
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.services import cache_janitor
+
+
+SWEEP_RESULT = {"deleted": 2, "evicted": 1, "freed_bytes": 300, "scanned": 10}
+
+
+class TestCacheJanitor:
+    """Test janitor ticks and lifecycle."""
+
+    def test_ticks_round_robin_categories(self):
+        """Test that consecutive ticks sweep different categories."""
+        with patch.object(cache_janitor, "sweep_cache_category", return_value=SWEEP_RESULT) as mock_sweep:
+            categories = [cache_janitor.run_janitor_tick()["category"] for _ in range(4)]
+
+        assert sorted(categories) == sorted(cache_janitor.CACHE_CATEGORIES)
+        assert mock_sweep.call_count == 4
+
+    def test_tick_enforces_other_budgets(self):
+        """Test that budgets of categories not swept this tick are still enforced."""
+        budgets = {"evicted": {"videos": 3}, "evicted_bytes": 900}
+        with patch.object(cache_janitor, "sweep_cache_category", return_value=SWEEP_RESULT), \
+                patch.object(cache_janitor, "enforce_cache_budgets", return_value=budgets) as mock_budgets:
+            run = cache_janitor.run_janitor_tick()
+
+        checked = mock_budgets.call_args.kwargs["categories"]
+        assert sorted(checked + [run["category"]]) == sorted(cache_janitor.CACHE_CATEGORIES)
+        assert run["budget_evicted"] == 3
+        assert run["budget_evicted_bytes"] == 900
+
+    def test_tick_records_stats(self):
+        """Test that sweep results are reflected in janitor status."""
+        before = cache_janitor.get_janitor_status()["stats"]
+        with patch.object(cache_janitor, "sweep_cache_category", return_value=SWEEP_RESULT):
+            run = cache_janitor.run_janitor_tick()
+
+        stats = cache_janitor.get_janitor_status()["stats"]
+        assert stats["sweeps"] == before["sweeps"] + 1
+        assert stats["total_freed_bytes"] == before["total_freed_bytes"] + 300
+        assert stats["categories"][run["category"]]["deleted"] == 2
+
+    def test_tick_failure_is_recorded(self):
+        """Test that a failing sweep doesn't raise and is counted."""
+        before = cache_janitor.get_janitor_status()["stats"]["errors"]
+        with patch.object(cache_janitor, "sweep_cache_category", side_effect=OSError("disk gone")):
+            run = cache_janitor.run_janitor_tick()
+
+        assert "error" in run
+        assert cache_janitor.get_janitor_status()["stats"]["errors"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, monkeypatch):
+        """Test that the janitor task runs a sweep and stops on request."""
+        monkeypatch.setattr(cache_janitor, "CACHE_JANITOR_ENABLED", True)
+        with patch.object(cache_janitor, "sweep_cache_category", return_value=SWEEP_RESULT) as mock_sweep:
+            await cache_janitor.start_janitor()
+            assert cache_janitor.get_janitor_status()["running"] is True
+            for _ in range(100):
+                if mock_sweep.called:
+                    break
+                await asyncio.sleep(0.01)
+            await cache_janitor.stop_janitor()
+
+        assert mock_sweep.called
+        assert cache_janitor.get_janitor_status()["running"] is False
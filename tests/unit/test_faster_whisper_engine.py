@@ -0,0 +1,78 @@
+"""
+Unit tests for the faster-whisper CPU engine.
+
+This module tests:
+- Thread and worker defaults derived from the core count
+- faster-whisper output is converted to WhisperX-shaped results
+- provider=faster-whisper goes through the engine and the transcription cache
+"""
+
+import pytest
+from types import SimpleNamespace
+from app.services import faster_whisper_engine, transcription_service
+from app.services.faster_whisper_engine import thread_settings
+from app.services.transcription_service import _transcribe_audio_internal
+
+
+class FakeWhisperModel:
+    """faster_whisper.WhisperModel stand-in that records transcribe kwargs."""
+
+    def __init__(self):
+        self.kwargs = None
+
+    def transcribe(self, audio, **kwargs):
+        self.kwargs = kwargs
+        segments = (SimpleNamespace(start=i * 2.0, end=i * 2.0 + 1.5, text=f" word{i}") for i in range(3))
+        return segments, SimpleNamespace(language="de", duration=6.0)
+
+
+class TestThreadSettings:
+    """Test thread defaults."""
+
+    def test_auto_from_core_count(self):
+        """Test that workers follow concurrency while each keeps at least 4 threads."""
+        assert thread_settings(cores=16, concurrency=2) == (8, 2)
+        assert thread_settings(cores=4, concurrency=2) == (4, 1)
+        assert thread_settings(cores=2, concurrency=3) == (2, 1)
+
+    def test_explicit_values_win(self):
+        """Test that configured values are kept and only the rest is derived."""
+        assert thread_settings(cores=16, cpu_threads=6, num_workers=3) == (6, 3)
+        assert thread_settings(cores=16, num_workers=4) == (4, 4)
+
+
+class TestTranscribe:
+    """Test the engine wrapper."""
+
+    def test_converts_segments(self):
+        """Test that segments and language come back in the WhisperX shape with the tuning applied."""
+        model = FakeWhisperModel()
+
+        result = faster_whisper_engine.transcribe(model, "/tmp/a.mp3", language=None, beam_size=1, vad_filter=True)
+
+        assert result["language"] == "de"
+        assert result["segments"][1] == {"start": 2.0, "end": 3.5, "text": " word1"}
+        assert model.kwargs["beam_size"] == 1
+        assert model.kwargs["vad_parameters"] == {"min_silence_duration_ms": faster_whisper_engine.FASTER_WHISPER_VAD_MIN_SILENCE_MS}
+
+    @pytest.mark.asyncio
+    async def test_provider_integration(self, tmp_path, monkeypatch):
+        """Test that provider=faster-whisper transcribes through the pooled engine and caches the result."""
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"mp3")
+        model = FakeWhisperModel()
+        pooled = SimpleNamespace(model=model, device="cpu", compute_type="int8", load_time=0.8)
+        saved = []
+
+        monkeypatch.setattr(faster_whisper_engine, "acquire_model", lambda size: (pooled, False))
+        monkeypatch.setattr(transcription_service, "get_cached_transcription", lambda *a: None)
+        monkeypatch.setattr(transcription_service, "save_cached_transcription", lambda *a: saved.append(a))
+
+        result = await _transcribe_audio_internal(str(audio), None, "small", "faster-whisper", "json")
+
+        assert result["provider"] == "faster-whisper"
+        assert result["model"] == "small"
+        assert result["language"] == "de"
+        assert result["full_text"] == "word0 word1 word2"
+        assert result["metadata"]["model_load_time"] == 0.8
+        assert saved[0][1:3] == ("faster-whisper", "small")
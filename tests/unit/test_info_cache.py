@@ -0,0 +1,214 @@
+"""
+Unit tests for the per-URL info dict cache.
+
+This module tests:
+- URL normalization for equivalent URL forms
+- One extraction per URL (including concurrent callers) within the TTL
+- The on-disk store shares info between workers and honours its TTL
+- Downloads reuse the cached info (--load-info-json for the binary) only
+  while signed format URLs are valid
+- Pass-through downloads read the info file before it is removed and
+  report failures before any output
+"""
+
+import sys
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import info_cache
+
+
+YT_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def _info(expire=None):
+    url = "https://rr1.googlevideo.com/videoplayback?itag=18"
+    if expire:
+        url += f"&expire={int(expire)}"
+    return {
+        "id": "dQw4w9WgXcQ", "extractor_key": "Youtube", "title": "T",
+        "epoch": int(time.time()), "formats": [{"format_id": "18", "url": url, "cookies": "SID=secret"}],
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(tmp_path, monkeypatch):
+    """Start each test with an empty cache and a temporary CACHE_DIR."""
+    monkeypatch.setattr(info_cache, "CACHE_DIR", str(tmp_path))
+    info_cache.clear_info_cache()
+    yield
+    info_cache.clear_info_cache()
+
+
+class TestNormalizeUrl:
+    """Test URL normalization."""
+
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ?si=abc123",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42&utm_source=x",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ#comments",
+    ])
+    def test_youtube_forms_match(self, url):
+        """Test that equivalent YouTube URLs normalize to the same key."""
+        assert info_cache.normalize_url(url) == "https://youtube.com/watch?v=dQw4w9WgXcQ"
+
+    def test_other_params_kept(self):
+        """Test that meaningful query parameters are preserved."""
+        assert "list=PL1" in info_cache.normalize_url("https://youtube.com/watch?v=a&list=PL1")
+
+
+class TestGetVideoInfo:
+    """Test memoized extraction."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_once(self):
+        """Test that repeated and concurrent lookups share one extraction."""
+        async def slow_extract(url, use_binary, cookies_file):
+            await asyncio.sleep(0.05)
+            return {"id": "abc", "title": "T"}
+
+        with patch.object(info_cache, "_extract", side_effect=slow_extract) as mock_extract:
+            results = await asyncio.gather(*[
+                info_cache.get_video_info("https://youtu.be/abc") for _ in range(3)
+            ])
+            again = await info_cache.get_video_info("https://www.youtube.com/watch?v=abc")
+
+        assert mock_extract.call_count == 1
+        assert all(r["id"] == "abc" for r in results)
+        assert again["title"] == "T"
+
+    @pytest.mark.asyncio
+    async def test_failed_extractions_never_overlap(self):
+        """Test that callers arriving while others wait share the lock after a failure."""
+        active = {"now": 0, "peak": 0}
+
+        async def failing_extract(url, use_binary, cookies_file):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.03)
+            active["now"] -= 1
+            raise Exception("unavailable")
+
+        with patch.object(info_cache, "_extract", side_effect=failing_extract):
+            first = [asyncio.create_task(info_cache.get_video_info("https://youtu.be/abc")) for _ in range(3)]
+            await asyncio.sleep(0.04)  # first extraction failed, waiters queued
+            late = asyncio.create_task(info_cache.get_video_info("https://youtu.be/abc"))
+            results = await asyncio.gather(*first, late, return_exceptions=True)
+
+        assert all(isinstance(r, Exception) for r in results)
+        assert active["peak"] == 1
+        assert not info_cache._inflight
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self, monkeypatch):
+        """Test that entries older than the TTL are resolved again."""
+        monkeypatch.setattr(info_cache, "INFO_CACHE_TTL_SECONDS", 0)
+        with patch.object(info_cache, "_extract", AsyncMock(return_value={"id": "x"})) as mock_extract:
+            await info_cache.get_video_info("https://example.com/v/1")
+            await info_cache.get_video_info("https://example.com/v/1")
+
+        assert mock_extract.call_count == 2
+
+
+class TestDiskStore:
+    """Test the on-disk info store shared between workers."""
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_after_memory_cleared(self):
+        """Test that another worker (empty memory) reuses the stored info."""
+        with patch.object(info_cache, "_extract", AsyncMock(return_value=_info())) as mock_extract:
+            await info_cache.get_video_info(YT_URL)
+            info_cache.clear_info_cache()
+            info = await info_cache.get_video_info("https://youtu.be/dQw4w9WgXcQ")
+
+        assert mock_extract.call_count == 1
+        assert info["title"] == "T"
+        assert "cookies" not in info["formats"][0]
+
+    @pytest.mark.asyncio
+    async def test_cookie_lookups_skip_disk(self, tmp_path):
+        """Test that lookups with a cookies file are not written to disk."""
+        with patch.object(info_cache, "_extract", AsyncMock(return_value=_info())):
+            await info_cache.get_video_info(YT_URL, cookies_file="/tmp/cookies.txt")
+
+        assert not (tmp_path / "info").exists()
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_pruned(self, monkeypatch):
+        """Test that entries past the disk TTL are ignored and pruned."""
+        with patch.object(info_cache, "_extract", AsyncMock(return_value=_info())):
+            await info_cache.get_video_info(YT_URL)
+
+        monkeypatch.setattr(info_cache, "INFO_DISK_CACHE_TTL_SECONDS", 1)
+        info_cache.clear_info_cache()
+        assert info_cache.prune_info_store() == 0
+        monkeypatch.setattr(info_cache.time, "time", lambda: 4102444800.0)
+        assert info_cache.prune_info_store() == 1
+        assert info_cache.peek_video_info(YT_URL) is None
+
+
+class TestDownloadWithInfo:
+    """Test download reuse of cached info."""
+
+    @pytest.mark.asyncio
+    async def test_binary_uses_load_info_json(self):
+        """Test that the binary download skips extraction via --load-info-json."""
+        mock_run = AsyncMock(return_value=("", "", 0))
+        with patch.object(info_cache, "run_ytdlp_binary", mock_run):
+            await info_cache.download_with_info(
+                "https://youtu.be/abc", _info(expire=time.time() + 3600), use_binary=True,
+                binary_args=["-f", "bestaudio"], ydl_opts={}
+            )
+
+        args = mock_run.call_args[0][0]
+        assert "--load-info-json" in args
+        assert "https://youtu.be/abc" not in args
+
+    @pytest.mark.asyncio
+    async def test_expired_format_urls_download_from_url(self):
+        """Test that info with expired signed URLs isn't reused."""
+        mock_run = AsyncMock(return_value=("", "", 0))
+        with patch.object(info_cache, "run_ytdlp_binary", mock_run):
+            await info_cache.download_with_info(
+                YT_URL, _info(expire=time.time() + 60), use_binary=True,
+                binary_args=["-f", "bestaudio"], ydl_opts={}
+            )
+
+        args = mock_run.call_args[0][0]
+        assert "--load-info-json" not in args
+        assert YT_URL in args
+
+    @pytest.mark.asyncio
+    async def test_binary_failure_raises(self):
+        """Test that a failed binary download raises with stderr."""
+        with patch.object(info_cache, "run_ytdlp_binary", AsyncMock(return_value=("", "boom", 1))):
+            with pytest.raises(Exception, match="boom"):
+                await info_cache.download_with_info(
+                    "https://youtu.be/abc", None, use_binary=True, binary_args=[], ydl_opts={}
+                )
+
+
+class TestStreamDownload:
+    """Test yt-dlp pass-through downloads."""
+
+    @pytest.mark.asyncio
+    async def test_streams_with_info_file(self):
+        """Test that yt-dlp gets --load-info-json and its stdout is returned."""
+        def fake_command(args):
+            info_path = args[args.index("--load-info-json") + 1]
+            return [sys.executable, "-c", f"import sys; sys.stdout.write(open({info_path!r}).read()[:1] + 'ok')"]
+
+        with patch.object(info_cache, "build_ytdlp_command", side_effect=fake_command):
+            chunks = await info_cache.stream_download(YT_URL, _info(expire=time.time() + 3600), "best")
+            assert b"".join([chunk async for chunk in chunks]) == b"{ok"
+
+    @pytest.mark.asyncio
+    async def test_failure_before_output_raises(self):
+        """Test that yt-dlp errors surface before the response would start."""
+        command = [sys.executable, "-c", "import sys; sys.stderr.write('Video unavailable'); sys.exit(1)"]
+        with patch.object(info_cache, "build_ytdlp_command", return_value=command):
+            with pytest.raises(Exception, match="Video unavailable"):
+                await info_cache.stream_download(YT_URL, None, "best")
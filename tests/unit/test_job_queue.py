@@ -0,0 +1,155 @@
+"""
+Unit tests for the async job API queue and store.
+
+This module tests:
+- Parameter validation and endpoint defaults
+- Claiming is exclusive and oldest-first
+- Workers store results, progress and HTTP errors
+- Jobs of dead processes are requeued (or failed after repeated crashes)
+- Finished jobs are pruned
+"""
+
+import time
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.services import job_queue, job_store
+
+
+@pytest.fixture(autouse=True)
+def jobs_db(tmp_path, monkeypatch):
+    """Use a fresh job store per test."""
+    monkeypatch.setattr(job_store, "JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+
+class TestSubmit:
+    """Test job validation and submission."""
+
+    @pytest.mark.asyncio
+    async def test_fills_endpoint_defaults(self):
+        """Test that omitted parameters get the synchronous endpoint's defaults."""
+        job = await job_queue.submit_job("extract-audio", {"url": "https://youtu.be/abc"})
+
+        assert job["status"] == "queued"
+        assert job["params"]["output_format"] == "mp3"
+        assert job["params"]["quality"] == "192"
+        assert job_store.get_job(job["id"])["params"]["url"] == "https://youtu.be/abc"
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_requests(self):
+        """Test unknown types, unknown params and missing files."""
+        with pytest.raises(HTTPException) as exc:
+            await job_queue.submit_job("download", {})
+        assert exc.value.status_code == 400
+
+        with pytest.raises(HTTPException, match="Unknown parameters"):
+            await job_queue.submit_job("extract-audio", {"url": "x", "format": "mp3"})
+
+        with pytest.raises(HTTPException, match="Missing parameters"):
+            await job_queue.submit_job("transcribe", {})
+
+        with pytest.raises(HTTPException) as exc:
+            await job_queue.submit_job("transcribe", {"audio_file": "/nonexistent/a.mp3"})
+        assert exc.value.status_code == 404
+        assert job_store.list_jobs() == []
+
+
+class TestStore:
+    """Test claiming, orphan recovery and pruning."""
+
+    def test_claim_oldest_once(self):
+        """Test that jobs are claimed oldest first and only once."""
+        first = job_store.create_job("extract-audio", {"url": "a"})
+        second = job_store.create_job("extract-audio", {"url": "b"})
+
+        claimed = job_store.claim_next_job()
+        assert claimed["id"] == first["id"]
+        assert claimed["status"] == "running"
+        assert claimed["owner"] == job_store.process_owner()
+        assert job_store.claim_next_job()["id"] == second["id"]
+        assert job_store.claim_next_job() is None
+
+    def test_requeue_orphaned_jobs(self):
+        """Test that jobs of dead or silent processes go back to the queue."""
+        dead = job_store.create_job("extract-audio", {"url": "a"})
+        silent = job_store.create_job("extract-audio", {"url": "b"})
+        own = job_store.create_job("extract-audio", {"url": "c"})
+        for _ in range(3):
+            job_store.claim_next_job()
+
+        conn = job_store._connect()
+        conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (f"{job_store.socket.gethostname()}:999999999", dead["id"]))
+        conn.execute(
+            "UPDATE jobs SET owner = 'other-host:1', updated_at = ? WHERE id = ?",
+            (time.time() - job_store.JOB_STALE_SECONDS - 1, silent["id"])
+        )
+
+        assert job_store.requeue_orphaned_jobs() == 2
+        assert job_store.get_job(own["id"])["status"] == "running"
+        assert job_store.requeue_orphaned_jobs(include_own=True) == 1
+        assert {j["status"] for j in job_store.list_jobs()} == {"queued"}
+
+    def test_repeated_crashes_fail_the_job(self):
+        """Test that a job which keeps killing its process is failed, not requeued forever."""
+        job = job_store.create_job("transcribe", {"audio_file": "/a.mp3"})
+        for _ in range(job_store.JOB_MAX_ATTEMPTS):
+            job_store.claim_next_job()
+            job_store.requeue_orphaned_jobs(include_own=True)
+
+        stored = job_store.get_job(job["id"])
+        assert stored["status"] == "failed"
+        assert "died 3 times" in stored["error"]
+
+    def test_prune_finished_jobs(self):
+        """Test that only finished jobs past retention are deleted."""
+        old = job_store.create_job("extract-audio", {"url": "a"})
+        job_store.claim_next_job()
+        job_store.finish_job(old["id"], result={"ok": True})
+        queued = job_store.create_job("extract-audio", {"url": "b"})
+
+        assert job_store.prune_jobs(max_age_hours=1) == 0
+        assert job_store.prune_jobs(max_age_hours=0) == 1
+        assert job_store.get_job(old["id"]) is None
+        assert job_store.get_job(queued["id"]) is not None
+
+
+class TestWorkers:
+    """Test the worker loop."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_and_reports(self, monkeypatch):
+        """Test that submitted jobs run, report progress and store results or HTTP errors."""
+        async def fake_extract(params, report):
+            await report(0.5, "halfway")
+            assert job_store.get_job(job["id"])["stage"] == "halfway"
+            if params["url"] == "bad":
+                raise HTTPException(status_code=404, detail="Video not found")
+            return {"audio_file": "/cache/audio/a.mp3", "url": params["url"]}
+
+        monkeypatch.setitem(job_queue.JOB_HANDLERS, "extract-audio", (fake_extract, job_queue.JOB_HANDLERS["extract-audio"][1]))
+        monkeypatch.setattr(job_queue, "JOB_QUEUE_WORKERS", 1)
+
+        await job_queue.start_job_queue()
+        try:
+            job = await job_queue.submit_job("extract-audio", {"url": "good"})
+            for _ in range(100):
+                if job_store.get_job(job["id"])["status"] == "completed":
+                    break
+                await asyncio.sleep(0.01)
+            done = job_store.get_job(job["id"])
+
+            job = await job_queue.submit_job("extract-audio", {"url": "bad"})
+            for _ in range(100):
+                if job_store.get_job(job["id"])["status"] == "failed":
+                    break
+                await asyncio.sleep(0.01)
+            failed = job_store.get_job(job["id"])
+        finally:
+            await job_queue.stop_job_queue()
+
+        assert done["status"] == "completed"
+        assert done["progress"] == 1
+        assert done["result"] == {"audio_file": "/cache/audio/a.mp3", "url": "good"}
+        assert failed["status"] == "failed"
+        assert (failed["status_code"], failed["error"]) == (404, "Video not found")
+
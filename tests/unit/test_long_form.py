@@ -0,0 +1,205 @@
+"""
+Unit tests for chunked long-form transcription.
+
+This module tests:
+- silencedetect output parsing
+- Chunk boundaries land in pauses (planned on demand), with hard cuts and overlap otherwise
+- Stitching shifts offsets and de-duplicates the overlaps
+- Chunks are spread across devices and results come back in media order
+- Partial results are reported per chunk
+- Media below the long-form cutoff is chunked for partial transcripts
+"""
+
+import asyncio
+import pytest
+from app.services import long_form
+from app.services.long_form import (
+    Chunk, ChunkPlanner, Stitcher, next_cut, parse_silences, transcribe_long_form
+)
+from app.services.model_pool import ModelPool, PooledModel
+
+
+SILENCEDETECT_OUTPUT = """
+[silencedetect @ 0x55d] silence_start: -0.01
+[silencedetect @ 0x55d] silence_end: 1.2 | silence_duration: 1.21
+[silencedetect @ 0x55d] silence_start: 575.5
+[silencedetect @ 0x55d] silence_end: 576.5 | silence_duration: 1
+[silencedetect @ 0x55d] silence_start: 1790
+"""
+
+
+class TestPlanning:
+    """Test silence parsing and chunk planning."""
+
+    def test_parse_silences(self):
+        """Test that complete pauses are parsed and a trailing open one is ignored."""
+        assert parse_silences(SILENCEDETECT_OUTPUT) == [(0.0, 1.2), (575.5, 576.5)]
+
+    def test_cut_in_longest_pause(self):
+        """Test that a boundary goes in the middle of the longest pause near the target."""
+        silences = [(100, 101), (560, 560.5), (575.5, 576.5), (598, 598.5)]
+        assert next_cut(0.0, 600, silences) == 576.0
+        assert next_cut(0.0, 600, [(100, 102)]) == 600.0
+
+    @pytest.mark.asyncio
+    async def test_planner(self, monkeypatch):
+        """Test that chunks are planned on demand with overlap and a merged tail."""
+        windows = []
+
+        async def fake_silences(path, start, duration):
+            windows.append((start, duration))
+            return [(start + 95.5, start + 96.5)] if start < 500 else []
+
+        monkeypatch.setattr(long_form, "detect_silences", fake_silences)
+        planner = ChunkPlanner("/tmp/a.mp3", 1800, chunk_seconds=600, overlap_seconds=2)
+
+        chunks = []
+        while (chunk := await planner.next()) is not None:
+            chunks.append(chunk)
+
+        assert [(c.start, c.end) for c in chunks] == [(0.0, 576.0), (576.0, 1176.0), (1176.0, 1800)]
+        assert windows == [(480.0, 120.0), (1056.0, 120.0)]
+        assert (chunks[1].audio_start, chunks[0].audio_end) == (574.0, 578.0)
+        assert [c.last for c in chunks] == [False, False, True]
+
+
+class TestStitching:
+    """Test merging chunk results."""
+
+    def test_offsets_and_overlap_dedup(self):
+        """Test that segments move to media time and the overlap is kept once."""
+        chunks = [Chunk(0, 0.0, 10.0, 0.0, 12.0), Chunk(1, 10.0, 20.0, 8.0, 20.0, last=True)]
+        results = [
+            {"segments": [
+                {"start": 0.0, "end": 5.0, "text": "one"},
+                {"start": 8.5, "end": 11.0, "text": "two"},
+            ]},
+            {"segments": [
+                {"start": 1.5, "end": 3.1, "text": " Two"},
+                {"start": 3.1, "end": 6.0, "text": "three"},
+            ]},
+        ]
+
+        stitcher = Stitcher()
+        added = [stitcher.add(chunk, result) for chunk, result in zip(chunks, results)]
+        segments = stitcher.segments
+
+        assert [s["text"] for s in segments] == ["one", "two", "three"]
+        assert segments[1] == {"start": 8.5, "end": 11.1, "text": "two"}
+        assert segments[2] == {"start": 11.1, "end": 14.0, "text": "three"}
+        assert [len(a) for a in added] == [2, 1]
+
+
+class FakeModel:
+    """WhisperX-like model returning one segment per chunk tagged with its first sample."""
+
+    def __init__(self, device):
+        self.device = device
+        self.calls = []
+
+    def transcribe(self, audio, batch_size):
+        self.calls.append(audio[0])
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": f"chunk-{audio[0]}"}], "language": "en"}
+
+
+class TestTranscribeLongForm:
+    """Test the chunk workers."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_spread_across_devices(self, monkeypatch):
+        """Test that two devices share the chunks and output stays in media order."""
+        pool = ModelPool(loader=lambda size, device, compute, lang: FakeModel(device), max_models=2)
+        primary, _ = pool.acquire("tiny", "cuda:0", "float16", "en")
+        monkeypatch.setattr(long_form, "model_pool", pool)
+        monkeypatch.setattr(long_form, "LONG_FORM_DEVICES", ["cuda", "cuda:1"])
+
+        async def fake_silences(path, start, duration):
+            return []
+
+        async def fake_decode(path, start, duration):
+            await asyncio.sleep(0.01)
+            return [int(start)]
+
+        monkeypatch.setattr(long_form, "detect_silences", fake_silences)
+        monkeypatch.setattr(long_form, "decode_pcm", fake_decode)
+        monkeypatch.setattr(long_form, "LONG_FORM_CHUNK_SECONDS", 600)
+        monkeypatch.setattr(long_form, "LONG_FORM_OVERLAP_SECONDS", 0)
+        reported = []
+
+        async def on_chunk(chunk):
+            reported.append((chunk["index"], chunk["device"]))
+
+        result = await transcribe_long_form(primary, "/tmp/long.f32", duration=3600, on_chunk=on_chunk)
+
+        assert result["chunks"] == 6
+        assert result["language"] == "en"
+        assert [s["text"] for s in result["segments"]] == [f"chunk-{n * 600}" for n in range(6)]
+        assert [s["start"] for s in result["segments"]] == [n * 600.0 for n in range(6)]
+        secondary = pool._models[("tiny", "cuda:1", "float16", "en")].model
+        assert primary.model.calls and secondary.calls
+        assert [index for index, _ in reported] == list(range(6))
+        assert {device for _, device in reported} == {"cuda:0", "cuda:1"}
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_chunks(self, monkeypatch):
+        """Test that a failed chunk stops the other workers and raises."""
+        primary = PooledModel(key=("tiny", "cpu", "int8", "en"), model=FakeModel("cpu"), memory_mb=0, load_time=0.0)
+        monkeypatch.setattr(long_form, "LONG_FORM_DEVICES", [])
+        decoded = []
+
+        async def fake_silences(path, start, duration):
+            return []
+
+        async def fake_decode(path, start, duration):
+            decoded.append(start)
+            if len(decoded) == 2:
+                raise Exception("ffmpeg failed")
+            return [int(start)]
+
+        monkeypatch.setattr(long_form, "detect_silences", fake_silences)
+        monkeypatch.setattr(long_form, "decode_pcm", fake_decode)
+
+        with pytest.raises(Exception, match="ffmpeg failed"):
+            await transcribe_long_form(primary, "/tmp/long.f32", duration=7200)
+        assert len(decoded) == 2
+
+
+class TestPartialTranscripts:
+    """Test chunking of shorter media for partial transcript saves."""
+
+    def test_threshold(self, monkeypatch):
+        """Test PARTIAL_TRANSCRIPT_MIN_SECONDS and that 0 disables it."""
+        monkeypatch.setattr(long_form, "PARTIAL_TRANSCRIPT_MIN_SECONDS", 300)
+        assert long_form.chunks_for_partial_transcripts(1200)
+        assert not long_form.chunks_for_partial_transcripts(120)
+        assert not long_form.chunks_for_partial_transcripts(None)
+
+        monkeypatch.setattr(long_form, "PARTIAL_TRANSCRIPT_MIN_SECONDS", 0)
+        assert not long_form.chunks_for_partial_transcripts(1200)
+
+    @pytest.mark.asyncio
+    async def test_chunk_length_passed_through(self, monkeypatch):
+        """Test that transcribe_long_form plans chunks of the requested length."""
+        primary = PooledModel(key=("tiny", "cpu", "int8", "en"), model=FakeModel("cpu"), memory_mb=0, load_time=0.0)
+        monkeypatch.setattr(long_form, "LONG_FORM_DEVICES", [])
+        monkeypatch.setattr(long_form, "LONG_FORM_OVERLAP_SECONDS", 0)
+        reported = []
+
+        async def fake_silences(path, start, duration):
+            return []
+
+        async def fake_decode(path, start, duration):
+            return [int(start)]
+
+        async def on_chunk(chunk):
+            reported.append(chunk["end"])
+
+        monkeypatch.setattr(long_form, "detect_silences", fake_silences)
+        monkeypatch.setattr(long_form, "decode_pcm", fake_decode)
+
+        result = await transcribe_long_form(
+            primary, "/tmp/clip.f32", duration=90, on_chunk=on_chunk, chunk_seconds=30
+        )
+
+        assert result["chunks"] == 3
+        assert reported == [30, 60, 90]
@@ -0,0 +1,127 @@
+"""
+Unit tests for the metrics registry and instrumentation.
+
+This module tests:
+- Text exposition rendering of counters, gauges and histograms
+- Semaphore wait time and occupancy tracking
+- Subprocess, cache lookup and Supabase call instrumentation
+"""
+
+import sys
+import asyncio
+import pytest
+from app.utils.metrics_utils import (
+    CACHE_LOOKUPS_TOTAL,
+    SEMAPHORE_WAIT_SECONDS,
+    SUBPROCESS_EXITS_TOTAL,
+    InstrumentedSemaphore,
+    MetricsRegistry,
+    supabase_timer,
+    SUPABASE_CALL_SECONDS,
+)
+
+
+class TestRegistry:
+    """Test MetricsRegistry rendering."""
+
+    def test_render_exposition_format(self):
+        """Test HELP/TYPE lines, escaped labels and cumulative histogram buckets."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("path",))
+        latency = registry.histogram("latency_seconds", "Latency", ("path",), buckets=(0.1, 1))
+
+        requests.inc(path='/a"b')
+        requests.inc(2, path='/a"b')
+        latency.observe(0.05, path="/a")
+        latency.observe(0.5, path="/a")
+        latency.observe(5, path="/a")
+
+        text = registry.render()
+        assert "# HELP requests_total Requests\n# TYPE requests_total counter\n" in text
+        assert 'requests_total{path="/a\\"b"} 3\n' in text
+        assert 'latency_seconds_bucket{path="/a",le="0.1"} 1\n' in text
+        assert 'latency_seconds_bucket{path="/a",le="1"} 2\n' in text
+        assert 'latency_seconds_bucket{path="/a",le="+Inf"} 3\n' in text
+        assert 'latency_seconds_sum{path="/a"} 5.55\n' in text
+        assert 'latency_seconds_count{path="/a"} 3\n' in text
+
+    def test_rejects_wrong_labels_and_duplicates(self):
+        """Test that label names are enforced and names are unique."""
+        registry = MetricsRegistry()
+        counter = registry.counter("x_total", "X", ("a",))
+        with pytest.raises(ValueError):
+            counter.inc(b="1")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "X again")
+
+
+class TestInstrumentedSemaphore:
+    """Test InstrumentedSemaphore."""
+
+    @pytest.mark.asyncio
+    async def test_wait_and_occupancy(self):
+        """Test that holders and waiters are counted and waits are observed."""
+        semaphore = InstrumentedSemaphore(1, name="test-occupancy")
+        before = SEMAPHORE_WAIT_SECONDS.labels(semaphore="test-occupancy").count
+
+        async with semaphore:
+            waiter = asyncio.create_task(semaphore.acquire())
+            await asyncio.sleep(0.01)
+            assert semaphore.in_use == 1
+            assert semaphore.waiting == 1
+        await waiter
+        assert semaphore.waiting == 0
+        semaphore.release()
+
+        assert semaphore.in_use == 0
+        histogram = SEMAPHORE_WAIT_SECONDS.labels(semaphore="test-occupancy")
+        assert histogram.count == before + 2
+        assert histogram.max >= 0.01
+
+
+class TestInstrumentation:
+    """Test metrics recorded by instrumented services."""
+
+    @pytest.mark.asyncio
+    async def test_subprocess_exit_codes(self):
+        """Test that commands are recorded by program name and exit code."""
+        from app.utils.process_utils import run_process
+
+        program = sys.executable.rsplit("/", 1)[-1]
+        before = SUBPROCESS_EXITS_TOTAL.value(program=program, exit_code=3)
+        await run_process([sys.executable, "-c", "raise SystemExit(3)"])
+        await run_process(["/nonexistent/yt-dlp", "--version"])
+
+        assert SUBPROCESS_EXITS_TOTAL.value(program=program, exit_code=3) == before + 1
+        assert SUBPROCESS_EXITS_TOTAL.value(program="yt-dlp", exit_code=127) >= 1
+
+    def test_transcription_cache_hits_and_misses(self, tmp_path, monkeypatch):
+        """Test that transcription cache lookups count as hit or miss."""
+        from app.services import transcription_cache
+
+        monkeypatch.setattr(transcription_cache, "TRANSCRIPTIONS_DIR", str(tmp_path))
+        monkeypatch.setattr(transcription_cache, "TRANSCRIPTION_CACHE_ENABLED", True)
+        audio = tmp_path / "a.mp3"
+        audio.write_bytes(b"audio")
+        hits = CACHE_LOOKUPS_TOTAL.value(cache="transcription", result="hit")
+        misses = CACHE_LOOKUPS_TOTAL.value(cache="transcription", result="miss")
+
+        assert transcription_cache.get_cached_transcription(str(audio), "local", "tiny", "en") is None
+        transcription_cache.save_cached_transcription(
+            str(audio), "local", "tiny", "en", [{"text": "hi"}], "en", 1.0
+        )
+        assert transcription_cache.get_cached_transcription(str(audio), "local", "tiny", "en") is not None
+
+        assert CACHE_LOOKUPS_TOTAL.value(cache="transcription", result="miss") == misses + 1
+        assert CACHE_LOOKUPS_TOTAL.value(cache="transcription", result="hit") == hits + 1
+
+    def test_supabase_timer_outcome(self):
+        """Test that failed Supabase calls are labelled as errors."""
+        with pytest.raises(RuntimeError):
+            with supabase_timer("test_op"):
+                raise RuntimeError("connection reset")
+        with supabase_timer("test_op"):
+            pass
+
+        assert SUPABASE_CALL_SECONDS.labels(operation="test_op", outcome="error").count == 1
+        assert SUPABASE_CALL_SECONDS.labels(operation="test_op", outcome="ok").count == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for the WhisperX model pool.
+
+This module tests:
+- Cache hits reuse the loaded model
+- LRU eviction by model count and memory budget
+- Load failures are propagated and counted
+"""
+
+import pytest
+from app.services.model_pool import ModelPool, estimate_model_memory_mb
+
+
+class FakeLoader:
+    """Loader that records calls instead of loading whisperX models."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, model_size, device, compute_type, language):
+        self.calls.append((model_size, device, compute_type, language))
+        return object()
+
+
+class TestModelPool:
+    """Test ModelPool caching and eviction."""
+
+    def test_second_acquire_is_cache_hit(self):
+        """Test that the same key loads once and is then served from the pool."""
+        loader = FakeLoader()
+        pool = ModelPool(loader=loader, max_models=2)
+
+        first, hit1 = pool.acquire("tiny", "cpu", "int8", None)
+        second, hit2 = pool.acquire("tiny", "cpu", "int8", None)
+
+        assert hit1 is False
+        assert hit2 is True
+        assert first.model is second.model
+        assert len(loader.calls) == 1
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+
+    def test_language_is_part_of_key(self):
+        """Test that models pinned to different languages are cached separately."""
+        loader = FakeLoader()
+        pool = ModelPool(loader=loader, max_models=4)
+
+        pool.acquire("tiny", "cpu", "int8", "en")
+        pool.acquire("tiny", "cpu", "int8", "es")
+
+        assert len(loader.calls) == 2
+
+    def test_lru_eviction_by_count(self):
+        """Test that the least recently used model is evicted when full."""
+        loader = FakeLoader()
+        pool = ModelPool(loader=loader, max_models=2)
+
+        pool.acquire("tiny", "cpu", "int8", None)
+        pool.acquire("small", "cpu", "int8", None)
+        pool.acquire("tiny", "cpu", "int8", None)  # tiny is now most recent
+        pool.acquire("medium", "cpu", "int8", None)  # evicts small
+
+        resident = [m["model_size"] for m in pool.stats()["models"]]
+        assert sorted(resident) == ["medium", "tiny"]
+        assert pool.stats()["evictions"] == 1
+
+    def test_eviction_by_memory_budget(self):
+        """Test that models are evicted to fit the memory budget."""
+        loader = FakeLoader()
+        budget = estimate_model_memory_mb("medium", "float16")
+        pool = ModelPool(loader=loader, max_models=5, memory_budget_mb=budget)
+
+        pool.acquire("medium", "cuda", "float16", None)
+        pool.acquire("small", "cuda", "float16", None)
+
+        resident = [m["model_size"] for m in pool.stats()["models"]]
+        assert resident == ["small"]
+
+    def test_load_error_propagates(self):
+        """Test that loader exceptions are raised and counted."""
+        def failing_loader(*args):
+            raise RuntimeError("CUDA out of memory")
+
+        pool = ModelPool(loader=failing_loader, max_models=1)
+
+        with pytest.raises(RuntimeError, match="out of memory"):
+            pool.acquire("large-v3", "cuda", "float16", None)
+
+        assert pool.stats()["load_errors"] == 1
+        assert pool.stats()["models"] == []
+
+    def test_int8_estimate_is_smaller(self):
+        """Test memory estimate accounts for quantization."""
+        assert estimate_model_memory_mb("medium", "int8") < estimate_model_memory_mb("medium", "float16")
@@ -0,0 +1,142 @@
+"""
+Unit tests for streaming audio decode to raw PCM.
+
+This module tests:
+- Audio format selection for direct ffmpeg reads
+- ffmpeg is pointed at the format URL with its headers and writes f32le atomically
+- Failed decodes leave no partial file behind
+- Jobs fall back to the MP3 download when streaming fails
+"""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import pcm_stream
+from app.services.pcm_stream import select_audio_format, stream_pcm, is_pcm_file, pcm_duration
+from app.utils.process_utils import ProcessResult
+
+
+def _info(formats):
+    return {"id": "abc", "epoch": int(time.time()), "formats": formats}
+
+
+def _result(returncode=0, stderr=""):
+    return ProcessResult(stdout=b"", stderr=stderr, returncode=returncode, duration=0.1)
+
+
+class TestSelectAudioFormat:
+    """Test format selection."""
+
+    def test_prefers_best_audio_only(self):
+        """Test that the highest-bitrate audio-only format wins over muxed ones."""
+        info = _info([
+            {"format_id": "18", "url": "https://cdn/18", "acodec": "mp4a", "vcodec": "avc1", "tbr": 500, "protocol": "https"},
+            {"format_id": "139", "url": "https://cdn/139", "acodec": "mp4a", "vcodec": "none", "abr": 48, "protocol": "https"},
+            {"format_id": "140", "url": "https://cdn/140", "acodec": "mp4a", "vcodec": "none", "abr": 128, "protocol": "https"},
+        ])
+        assert select_audio_format(info)["format_id"] == "140"
+
+    def test_skips_unreadable_protocols(self):
+        """Test that formats ffmpeg can't fetch by URL are ignored."""
+        info = _info([
+            {"format_id": "dash", "url": "https://cdn/d", "acodec": "opus", "vcodec": "none", "protocol": "http_dash_segments"},
+            {"format_id": "hls", "url": "https://cdn/h.m3u8", "acodec": "mp4a", "vcodec": "avc1", "protocol": "m3u8_native"},
+        ])
+        assert select_audio_format(info)["format_id"] == "hls"
+
+    def test_single_format_info(self):
+        """Test that single-format extractors use the info URL."""
+        info = {"id": "x", "url": "https://cdn/clip.mp4", "protocol": "https"}
+        assert select_audio_format(info) is info
+        assert select_audio_format({"id": "x", "formats": []}) is None
+
+
+class TestStreamPcm:
+    """Test stream_pcm."""
+
+    @pytest.mark.asyncio
+    async def test_direct_ffmpeg_decode(self, tmp_path):
+        """Test that ffmpeg reads the format URL with its headers and the file lands atomically."""
+        output = tmp_path / "a.f32"
+        info = _info([{
+            "url": "https://cdn/140", "acodec": "mp4a", "vcodec": "none", "abr": 128,
+            "protocol": "https", "http_headers": {"User-Agent": "UA"}
+        }])
+
+        async def fake_ffmpeg(cmd, timeout=None):
+            assert cmd[cmd.index("-i") + 1] == "https://cdn/140"
+            assert cmd[cmd.index("-headers") + 1] == "User-Agent: UA\r\n"
+            assert cmd[cmd.index("-f") + 1] == "f32le" and cmd[cmd.index("-ar") + 1] == "16000"
+            with open(cmd[-1], "wb") as f:
+                f.write(b"\x00" * 64000)
+            return _result()
+
+        with patch.object(pcm_stream, "run_process", side_effect=fake_ffmpeg):
+            await stream_pcm("https://vimeo.com/1", info, str(output), use_binary=False)
+
+        assert is_pcm_file(str(output))
+        assert pcm_duration(str(output)) == 1.0
+        assert not (tmp_path / "a.f32.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_decode_removes_partial_file(self, tmp_path):
+        """Test that a failing ffmpeg leaves neither output nor partial file."""
+        output = tmp_path / "a.f32"
+        info = _info([{"url": "https://cdn/a", "acodec": "mp4a", "vcodec": "none", "protocol": "https"}])
+
+        async def fake_ffmpeg(cmd, timeout=None):
+            with open(cmd[-1], "wb") as f:
+                f.write(b"\x00" * 16)
+            return _result(1, "Connection reset")
+
+        with patch.object(pcm_stream, "run_process", side_effect=fake_ffmpeg):
+            with pytest.raises(Exception, match="Connection reset"):
+                await stream_pcm("https://vimeo.com/1", info, str(output), use_binary=False)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_binary_pipes_ytdlp_into_ffmpeg(self, tmp_path):
+        """Test that the binary path pipes yt-dlp stdout into ffmpeg and reuses the info dict."""
+        output = tmp_path / "a.f32"
+        info = _info([])
+        calls = []
+
+        async def fake_pipeline(producer, consumer, timeout=None):
+            calls.append(producer)
+            assert producer[producer.index("-o") + 1] == "-"
+            assert consumer[consumer.index("-i") + 1] == "pipe:0"
+            with open(consumer[-1], "wb") as f:
+                f.write(b"\x00" * 4)
+            return _result(), _result()
+
+        with patch.object(pcm_stream, "run_pipeline", side_effect=fake_pipeline):
+            await stream_pcm("https://youtu.be/x", info, str(output), use_binary=True)
+
+        assert "--load-info-json" in calls[0]
+        assert output.exists()
+
+
+class TestJobFallback:
+    """Test the job pipeline integration."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_mp3(self, tmp_path, monkeypatch):
+        """Test that a failed PCM stream falls back to the MP3 download."""
+        from app.services import job_service
+
+        (tmp_path / "audio").mkdir()
+        monkeypatch.setattr(job_service, "CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(job_service, "rate_limit", AsyncMock(return_value=0))
+        monkeypatch.setattr(job_service, "get_video_info", AsyncMock(return_value={"id": "abc", "duration": 5}))
+
+        async def fake_download(url, info, use_binary, binary_args, ydl_opts, timeout):
+            (tmp_path / "audio" / ydl_opts["outtmpl"].split("/")[-1].replace("%(ext)s", "mp3")).write_bytes(b"mp3")
+
+        with patch.object(job_service, "stream_pcm", AsyncMock(side_effect=Exception("ffmpeg failed"))), \
+                patch.object(job_service, "download_with_info", side_effect=fake_download), \
+                patch.object(job_service.cache_index, "record_file"):
+            result = await job_service._extract_audio_from_url("https://vimeo.com/1", pcm=True)
+
+        assert result["format"] == "mp3"
+        assert result["audio_file"].endswith(".mp3")
@@ -0,0 +1,163 @@
+"""
+Unit tests for the async subprocess runner.
+
+This module tests:
+- stdout/stderr capture and return codes
+- Timeouts kill the process
+- stderr lines are streamed to a callback (\\r and \\n separated)
+- Cancellation kills the process
+- Missing binaries are reported, not raised
+- run_pipeline streams one process into another
+- stream_process yields output incrementally and reports failures
+"""
+
+import sys
+import time
+import asyncio
+import pytest
+from app.utils.process_utils import run_process, run_pipeline, stream_process
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+class TestRunProcess:
+    """Test run_process behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_captures_output(self):
+        """Test stdout, stderr and exit code are returned."""
+        result = await run_process(_python(
+            "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+        ))
+
+        assert result.stdout.strip() == "out"
+        assert result.stderr.strip() == "err"
+        assert result.returncode == 3
+        assert result.timed_out is False
+
+    @pytest.mark.asyncio
+    async def test_binary_stdout(self):
+        """Test that text=False returns raw bytes."""
+        result = await run_process(_python("import sys; sys.stdout.buffer.write(b'\\x00\\x01')"), text=False)
+        assert result.stdout == b"\x00\x01"
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self):
+        """Test that a hung process is killed at the timeout."""
+        start = time.time()
+        result = await run_process(_python("import time; time.sleep(30)"), timeout=0.5)
+
+        assert result.timed_out is True
+        assert result.returncode != 0
+        assert time.time() - start < 10
+
+    @pytest.mark.asyncio
+    async def test_stderr_callback_streams_lines(self):
+        """Test that progress lines separated by \\r and \\n reach the callback."""
+        lines = []
+        await run_process(
+            _python("import sys; sys.stderr.write('10%\\r50%\\r100%\\ndone')"),
+            stderr_callback=lines.append
+        )
+        assert lines == ["10%", "50%", "100%", "done"]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_kills_process(self):
+        """Test that cancelling the awaiting task doesn't leave the process running."""
+        task = asyncio.create_task(run_process(_python("import time; time.sleep(30)")))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        start = time.time()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert time.time() - start < 10
+
+    @pytest.mark.asyncio
+    async def test_missing_binary(self):
+        """Test that a missing executable returns 127."""
+        result = await run_process(["/nonexistent/yt-dlp", "--version"])
+        assert result.returncode == 127
+
+
+class TestRunPipeline:
+    """Test run_pipeline behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_producer_streams_into_consumer(self, tmp_path):
+        """Test that the consumer reads everything the producer writes."""
+        output = tmp_path / "out.txt"
+        producer, consumer = await run_pipeline(
+            _python("import sys; sys.stdout.buffer.write(b'x' * 1000000)"),
+            _python(f"import sys; open({str(output)!r}, 'w').write(str(len(sys.stdin.buffer.read())))")
+        )
+
+        assert producer.returncode == 0
+        assert consumer.returncode == 0
+        assert output.read_text() == "1000000"
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_both(self):
+        """Test that a hung pipeline is killed at the timeout."""
+        start = time.time()
+        producer, consumer = await run_pipeline(
+            _python("import time; time.sleep(30)"),
+            _python("import sys; sys.stdin.read()"),
+            timeout=0.5
+        )
+
+        assert producer.timed_out and consumer.timed_out
+        assert time.time() - start < 10
+
+    @pytest.mark.asyncio
+    async def test_missing_consumer(self):
+        """Test that a missing consumer binary returns 127 and stops the producer."""
+        producer, consumer = await run_pipeline(
+            _python("import time; time.sleep(30)"),
+            ["/nonexistent/ffmpeg"]
+        )
+        assert consumer.returncode == 127
+        assert producer.returncode != 0
+
+
+class TestStreamProcess:
+    """Test stream_process behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_first_chunk_before_exit(self):
+        """Test that output arrives while the process is still running."""
+        chunks = stream_process(_python(
+            "import sys, time; sys.stdout.buffer.write(b'head'); sys.stdout.flush(); time.sleep(0.5); "
+            "sys.stdout.buffer.write(b'tail')"
+        ))
+        start = time.time()
+        assert await anext(chunks) == b"head"
+        assert time.time() - start < 0.5
+        assert b"".join([chunk async for chunk in chunks]) == b"tail"
+
+    @pytest.mark.asyncio
+    async def test_failure_raised_after_output(self):
+        """Test that a non-zero exit raises once the output was consumed."""
+        received = []
+        with pytest.raises(Exception, match="boom"):
+            async for chunk in stream_process(_python(
+                "import sys; sys.stdout.write('partial'); sys.stderr.write('boom'); sys.exit(1)"
+            )):
+                received.append(chunk)
+        assert b"".join(received) == b"partial"
+
+    @pytest.mark.asyncio
+    async def test_idle_timeout_and_early_close(self):
+        """Test that a stalled process times out and closing the stream stops it."""
+        with pytest.raises(Exception, match="No output"):
+            async for _ in stream_process(_python("import time; time.sleep(30)"), idle_timeout=0.3):
+                pass
+
+        chunks = stream_process(_python(
+            "import sys, time\nwhile True:\n    sys.stdout.write('x'); sys.stdout.flush(); time.sleep(0.05)"
+        ))
+        await anext(chunks)
+        start = time.time()
+        await chunks.aclose()
+        assert time.time() - start < 1
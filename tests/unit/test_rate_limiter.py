@@ -0,0 +1,104 @@
+"""
+Unit tests for the per-platform token-bucket rate limiter.
+
+This module tests:
+- Burst capacity is available immediately, then requests are spaced by the rate
+- Platforms and cookie identities have independent buckets
+- Waiters are served in arrival order and cancelled waiters return their token
+- Wait metrics are exported
+"""
+
+import time
+import asyncio
+import pytest
+from app.services import rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def fast_limits(monkeypatch):
+    """Use fast limits (10 requests/second, burst 2) and fresh buckets."""
+    monkeypatch.setattr(rate_limiter, "RATE_LIMITS", {"youtube": (10.0, 2), "vimeo": (10.0, 2)})
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_DEFAULT", None)
+    monkeypatch.setattr(rate_limiter, "YTDLP_COOKIES_FILE", None)
+    rate_limiter.reset_rate_limits()
+    yield
+    rate_limiter.reset_rate_limits()
+
+
+YT = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+VIMEO = "https://vimeo.com/76979871"
+
+
+class TestRateLimiter:
+    """Test token bucket behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test that burst requests pass immediately and the next one waits."""
+        assert await rate_limiter.rate_limit(YT) == 0
+        assert await rate_limiter.rate_limit(YT) == 0
+        waited = await rate_limiter.rate_limit(YT)
+        assert 0.05 < waited <= 0.1
+
+    @pytest.mark.asyncio
+    async def test_platforms_are_independent(self):
+        """Test that an exhausted YouTube bucket doesn't delay Vimeo."""
+        for _ in range(2):
+            await rate_limiter.rate_limit(YT)
+        assert await rate_limiter.rate_limit(VIMEO) == 0
+
+    @pytest.mark.asyncio
+    async def test_cookie_identities_are_independent(self, tmp_path):
+        """Test that requests with a different cookies file use their own bucket."""
+        cookies = tmp_path / "cookies.txt"
+        cookies.write_text("# Netscape HTTP Cookie File\n")
+        for _ in range(2):
+            await rate_limiter.rate_limit(YT)
+        assert await rate_limiter.rate_limit(YT, cookies_file=str(cookies)) == 0
+
+    @pytest.mark.asyncio
+    async def test_unlisted_platform_unlimited_without_default(self):
+        """Test that platforms without a limit never wait."""
+        for _ in range(5):
+            assert await rate_limiter.rate_limit("https://example.com/video/1") == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_in_order(self):
+        """Test that queued callers get tokens in arrival order."""
+        order = []
+
+        async def request(n):
+            await rate_limiter.rate_limit(YT)
+            order.append(n)
+
+        await asyncio.gather(*[request(n) for n in range(5)])
+        assert order == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_token(self):
+        """Test that cancelling a waiter doesn't delay the callers behind it."""
+        for _ in range(2):
+            await rate_limiter.rate_limit(YT)
+        task = asyncio.create_task(rate_limiter.rate_limit(YT))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        start = time.monotonic()
+        await rate_limiter.rate_limit(YT)
+        assert time.monotonic() - start < 0.15
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        """Test that acquired/delayed counts and waits are reported per bucket."""
+        for _ in range(3):
+            await rate_limiter.rate_limit(YT)
+
+        stats = rate_limiter.get_rate_limit_stats()
+        bucket = next(b for b in stats["buckets"] if b["platform"] == "youtube")
+        assert bucket["identity"] == "anonymous"
+        assert bucket["acquired"] == 3
+        assert bucket["delayed"] == 1
+        assert bucket["max_wait_seconds"] > 0
+        assert stats["limits"]["youtube"] == {"requests_per_minute": 600.0, "burst": 2}
@@ -0,0 +1,90 @@
+"""
+Unit tests for stage timers and histograms.
+
+This module tests:
+- Stages accumulate and are recorded even when they raise
+- Histogram buckets, summary stats and quantile estimates
+- Queue jobs return per-stage timings and store them in transcript metadata
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.utils.timing_utils import Histogram, HistogramSet, StageTimer
+
+
+class TestStageTimer:
+    """Test StageTimer."""
+
+    def test_stages_accumulate_and_feed_histograms(self):
+        """Test that repeated stages add up and every stage (and the total) is observed."""
+        histograms = HistogramSet()
+        timer = StageTimer(histograms=histograms)
+
+        timer.record("download", 1.5)
+        timer.record("download", 0.5)
+        with pytest.raises(ValueError):
+            with timer.stage("save"):
+                raise ValueError("db down")
+        timings = timer.finish()
+
+        assert timings["download"] == 2.0
+        assert "save" in timings and "total" in timings
+        snapshot = histograms.snapshot()
+        assert snapshot["download"]["count"] == 2
+        assert snapshot["save"]["count"] == 1
+        assert snapshot["total"]["count"] == 1
+
+
+class TestHistogram:
+    """Test Histogram."""
+
+    def test_buckets_and_quantiles(self):
+        """Test cumulative buckets, summary stats and interpolated quantiles."""
+        histogram = Histogram(buckets=(1, 10, 100))
+        for value in (0.5, 2, 4, 6, 8, 50, 500):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {"1": 1, "10": 5, "100": 6, "+Inf": 7}
+        assert snapshot["count"] == 7
+        assert snapshot["max"] == 500
+        assert 1 < snapshot["p50"] <= 10
+        assert snapshot["p95"] == 500
+        assert Histogram().quantile(0.5) is None
+
+
+class TestJobTimings:
+    """Test stage timings in the job pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_job_result_and_metadata_carry_timings(self):
+        """Test that a completed job reports its stages and saves them with the transcript."""
+        from app.services import job_service
+
+        doc = {"id": "doc", "canonical_url": "https://example.com/a.mp3", "media_format": "audio", "lang": "en"}
+        supabase = MagicMock()
+        supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = \
+            SimpleNamespace(data=[doc])
+        supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = \
+            SimpleNamespace(data=doc)
+
+        async def fake_download(url, pcm=False):
+            return {"audio_file": "/tmp/a.mp3", "duration": 1}
+
+        async def fake_transcribe(**kwargs):
+            return {"segments": [{"text": "hi"}], "language": "en", "metadata": {}}
+
+        histograms = HistogramSet()
+        with patch.object(job_service, "get_supabase_client", return_value=supabase), \
+                patch.object(job_service, "job_stage_histograms", histograms), \
+                patch.object(job_service, "_extract_audio_from_url", side_effect=fake_download), \
+                patch.object(job_service, "_transcribe_audio_internal", side_effect=fake_transcribe):
+            result = await job_service.process_single_job({"msg_id": 1, "document_id": "doc"}, "q")
+
+        assert result["status"] == "completed"
+        for stage in ("claim", "fetch_document", "audio_download", "transcription", "save", "complete", "total"):
+            assert stage in result["timings"]
+        saved = supabase.table.return_value.upsert.call_args.args[0]
+        assert "transcription" in saved["metadata"]["stage_timings"]
+        assert histograms.snapshot()["total"]["count"] == 1
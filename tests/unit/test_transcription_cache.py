@@ -0,0 +1,84 @@
+"""
+Unit tests for the content-addressed transcription cache.
+
+This module tests:
+- Round trip of save/get for identical audio content
+- Cache keys separate provider, model and language
+- Disabled cache and missing entries return None
+"""
+
+import pytest
+from app.services import transcription_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the transcription cache at a temporary directory."""
+    monkeypatch.setattr(transcription_cache, "TRANSCRIPTIONS_DIR", str(tmp_path / "transcriptions"))
+    monkeypatch.setattr(transcription_cache, "TRANSCRIPTION_CACHE_ENABLED", True)
+    return tmp_path
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    """Create a small fake audio file."""
+    path = tmp_path / "a1b2c3d4.mp3"
+    path.write_bytes(b"ID3" + b"\x00" * 2048)
+    return str(path)
+
+
+SEGMENTS = [{"start": 0.0, "end": 1.5, "text": "hello world"}]
+
+
+class TestTranscriptionCache:
+    """Test transcription cache lookups."""
+
+    def test_roundtrip(self, cache_dir, audio_file):
+        """Test a saved result is returned for the same audio and parameters."""
+        key = transcription_cache.save_cached_transcription(
+            audio_file, "local", "tiny", None, SEGMENTS, "en", 3.2
+        )
+        cached = transcription_cache.get_cached_transcription(audio_file, "local", "tiny", None)
+
+        assert key is not None
+        assert cached["segments"] == SEGMENTS
+        assert cached["language"] == "en"
+        assert cached["cache_key"] == key
+
+    def test_same_content_different_path_hits(self, cache_dir, audio_file, tmp_path):
+        """Test that a re-downloaded copy of the same audio hits the cache."""
+        transcription_cache.save_cached_transcription(
+            audio_file, "local", "tiny", "en", SEGMENTS, "en", 1.0
+        )
+        copy_path = tmp_path / "e5f6a7b8.mp3"
+        copy_path.write_bytes(open(audio_file, "rb").read())
+
+        assert transcription_cache.get_cached_transcription(str(copy_path), "local", "tiny", "en") is not None
+
+    def test_key_includes_model_provider_language(self, cache_dir, audio_file):
+        """Test that differing parameters miss the cache."""
+        transcription_cache.save_cached_transcription(
+            audio_file, "local", "tiny", None, SEGMENTS, "en", 1.0
+        )
+
+        assert transcription_cache.get_cached_transcription(audio_file, "local", "medium", None) is None
+        assert transcription_cache.get_cached_transcription(audio_file, "openai", "tiny", None) is None
+        assert transcription_cache.get_cached_transcription(audio_file, "local", "tiny", "es") is None
+
+    def test_key_includes_device_compute_type(self, cache_dir, audio_file):
+        """Test that CPU fallback results aren't served to GPU requests."""
+        transcription_cache.save_cached_transcription(
+            audio_file, "local", "tiny", None, SEGMENTS, "en", 1.0, "cpu/int8"
+        )
+
+        assert transcription_cache.get_cached_transcription(audio_file, "local", "tiny", None, "cuda/float16") is None
+        assert transcription_cache.get_cached_transcription(audio_file, "local", "tiny", None, "cpu/int8") is not None
+
+    def test_disabled_cache(self, cache_dir, audio_file, monkeypatch):
+        """Test that nothing is stored or returned when disabled."""
+        monkeypatch.setattr(transcription_cache, "TRANSCRIPTION_CACHE_ENABLED", False)
+
+        assert transcription_cache.save_cached_transcription(
+            audio_file, "local", "tiny", None, SEGMENTS, "en", 1.0
+        ) is None
+        assert transcription_cache.get_cached_transcription(audio_file, "local", "tiny", None) is None
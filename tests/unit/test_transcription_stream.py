@@ -0,0 +1,109 @@
+"""
+Unit tests for streaming transcription.
+
+This module tests:
+- Local transcriptions yield segments per chunk, then the unified result
+- Cached results are streamed in one piece
+- Queue jobs save partial transcripts as chunks finish
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.services import transcription_service
+from app.services.transcription_service import stream_transcription
+
+
+@pytest.fixture
+def audio(tmp_path):
+    path = tmp_path / "talk.mp3"
+    path.write_bytes(b"mp3")
+    return str(path)
+
+
+class TestStreamTranscription:
+    """Test the stream_transcription generator."""
+
+    @pytest.mark.asyncio
+    async def test_local_chunks_then_done(self, audio, monkeypatch):
+        """Test that every chunk is yielded as it finishes and the result is saved to the cache."""
+        pooled = SimpleNamespace(load_time=1.5, device="cpu", compute_type="int8")
+        saved = []
+
+        async def fake_chunks(pooled, audio_file, duration, batch_size, chunk_seconds):
+            for index in range(3):
+                yield {
+                    "index": index, "start": index * 30.0, "end": (index + 1) * 30.0, "duration": duration,
+                    "device": "cpu", "language": "en",
+                    "segments": [{"start": index * 30.0, "end": index * 30.0 + 2, "text": f"part {index}"}]
+                }
+
+        async def fake_duration(path):
+            return 90.0
+
+        monkeypatch.setattr(transcription_service, "get_cached_transcription", lambda *a: None)
+        monkeypatch.setattr(transcription_service, "save_cached_transcription", lambda *a: saved.append(a))
+        monkeypatch.setattr(transcription_service, "_acquire_local_model", lambda size, lang: (pooled, False))
+        monkeypatch.setattr(transcription_service, "audio_duration", fake_duration)
+        monkeypatch.setattr(transcription_service, "iter_chunk_results", fake_chunks)
+
+        events = [e async for e in stream_transcription(audio, None, "tiny", "local")]
+
+        assert [e["event"] for e in events] == ["segments", "segments", "segments", "done"]
+        assert events[1]["segments"][0]["text"] == "part 1"
+        result = events[-1]["result"]
+        assert "segments" not in result
+        assert result["segment_count"] == 3
+        assert result["language"] == "en"
+        assert result["full_text"] == "part 0 part 1 part 2"
+        assert saved[0][4][2]["text"] == "part 2"
+        assert saved[0][-1] == "cpu/int8"
+
+    @pytest.mark.asyncio
+    async def test_cached_result_streamed_at_once(self, audio, monkeypatch):
+        """Test that a transcription cache hit yields all segments in one event."""
+        monkeypatch.setattr(transcription_service, "get_cached_transcription", lambda *a: {
+            "segments": [{"start": 0.0, "end": 1.0, "text": "a"}, {"start": 1.0, "end": 2.0, "text": "b"}],
+            "language": "en", "cache_key": "0" * 64
+        })
+
+        events = [e async for e in stream_transcription(audio, "en", "tiny", "local")]
+
+        assert [e["event"] for e in events] == ["segments", "done"]
+        assert len(events[0]["segments"]) == 2
+        assert events[1]["result"]["metadata"]["transcription_cache_hit"] is True
+
+
+class TestPartialTranscriptWriter:
+    """Test progressive saves for queue jobs."""
+
+    @pytest.mark.asyncio
+    async def test_saves_growing_transcript(self):
+        """Test that each chunk upserts all segments so far, flagged partial."""
+        from app.services.job_service import _partial_transcript_writer
+
+        supabase = MagicMock()
+        save = _partial_transcript_writer(supabase, None, "doc-1", "medium", "local")
+
+        await save({"segments": [{"start": 0.0, "end": 1.0, "text": "a"}], "language": "en", "end": 600.0, "duration": 3600})
+        await save({"segments": [{"start": 600.5, "end": 602.0, "text": "b"}], "language": "en", "end": 1200.0, "duration": 3600})
+
+        upserts = [c.args[0] for c in supabase.table.return_value.upsert.call_args_list]
+        assert [len(u["segments"]) for u in upserts] == [1, 2]
+        last = upserts[-1]
+        assert [s["segment_id"] for s in last["segments"]] == [1, 2]
+        assert last["metadata"]["partial"] is True
+        assert last["metadata"]["transcribed_seconds"] == 1200.0
+
+    @pytest.mark.asyncio
+    async def test_failed_save_does_not_raise(self):
+        """Test that a database error during a partial save is only logged."""
+        from app.services.job_service import _partial_transcript_writer
+
+        supabase = MagicMock()
+        supabase.table.return_value.upsert.return_value.execute.side_effect = Exception("timeout")
+        save = _partial_transcript_writer(supabase, None, "doc-1", "medium", "local")
+
+        with patch("builtins.print") as printed:
+            await save({"segments": [], "language": None, "end": 600.0, "duration": 3600})
+        assert "Partial transcript save failed" in printed.call_args.args[0]
@@ -25,6 +25,7 @@ from app.utils.platform_utils import (
     get_video_id_from_url,
     get_platform_from_url,
     get_platform_prefix as platform_get_prefix,
+    parse_video_url,
 )
 
 
@@ -244,6 +245,26 @@ class TestPlatformUtils:
         # ID should be 12 characters
         assert len(id1) == 12
 
+    def test_parse_video_url(self):
+        """Test local extractor + video ID parsing."""
+        assert parse_video_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5") == ("Youtube", "dQw4w9WgXcQ")
+        assert parse_video_url("https://youtu.be/dQw4w9WgXcQ?si=x") == ("Youtube", "dQw4w9WgXcQ")
+        assert parse_video_url("https://youtube.com/shorts/dQw4w9WgXcQ") == ("Youtube", "dQw4w9WgXcQ")
+        assert parse_video_url("https://www.tiktok.com/@user/video/123") == ("TikTok", "123")
+        assert parse_video_url("https://vimeo.com/76979871") == ("Vimeo", "76979871")
+        assert parse_video_url("https://x.com/user/status/99") == ("Twitter", "99")
+
+    def test_parse_video_url_unknown(self):
+        """Test that unparseable URLs return None."""
+        assert parse_video_url("https://www.youtube.com/playlist?list=PL123") is None
+        assert parse_video_url("https://example.com/video/1") is None
+        # Hosts must match whole labels - lookalike domains aren't the platform
+        assert parse_video_url("https://foox.com/a/status/123") is None
+        assert parse_video_url("https://notyoutube.com/watch?v=abcdefghijk") is None
+        assert parse_video_url("https://evil.com/youtu.be/dQw4w9WgXcQ") is None
+        assert parse_video_url("https://mytiktok.com/@user/video/123") is None
+        assert parse_video_url("https://m.youtube.com/watch?v=dQw4w9WgXcQ") == ("Youtube", "dQw4w9WgXcQ")
+
     def test_get_platform_from_url_youtube(self):
         """Test platform detection for YouTube."""
         assert get_platform_from_url("https://www.youtube.com/watch?v=123") == "youtube"
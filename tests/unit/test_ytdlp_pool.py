@@ -0,0 +1,73 @@
+"""
+Unit tests for the bounded yt-dlp library thread pool.
+
+This module tests:
+- extract_info/download run off the event loop via yt_dlp.YoutubeDL
+- Per-call timeouts raise TimeoutError
+- Queue depth and completion metrics
+"""
+
+import time
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from app.services import ytdlp_pool
+
+
+class TestYtdlpPool:
+    """Test yt-dlp pool helpers."""
+
+    @pytest.mark.asyncio
+    async def test_extract_info_uses_youtubedl(self):
+        """Test that extract_info is called with the given options."""
+        with patch("yt_dlp.YoutubeDL") as mock_ytdlp:
+            mock_instance = MagicMock()
+            mock_instance.extract_info.return_value = {"id": "abc", "title": "Test"}
+            mock_ytdlp.return_value.__enter__.return_value = mock_instance
+
+            info = await ytdlp_pool.ytdlp_extract_info("https://example.com/v", {"quiet": True})
+
+        assert info["id"] == "abc"
+        mock_ytdlp.assert_called_once_with({"quiet": True})
+        mock_instance.extract_info.assert_called_once_with("https://example.com/v", download=False)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that a slow blocking call doesn't block other coroutines."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.time())
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(
+            ytdlp_pool.run_in_ytdlp_pool(time.sleep, 0.3),
+            ticker()
+        )
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.3
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test that a call exceeding its timeout raises TimeoutError."""
+        before = ytdlp_pool.get_ytdlp_pool_stats()["timed_out"]
+
+        with pytest.raises(TimeoutError):
+            await ytdlp_pool.run_in_ytdlp_pool(time.sleep, 0.5, timeout=0.05, operation="slow")
+
+        assert ytdlp_pool.get_ytdlp_pool_stats()["timed_out"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_stats_track_failures(self):
+        """Test that failures are counted and the queue drains."""
+        def boom():
+            raise ValueError("extractor error")
+
+        before = ytdlp_pool.get_ytdlp_pool_stats()
+        with pytest.raises(ValueError):
+            await ytdlp_pool.run_in_ytdlp_pool(boom)
+
+        stats = ytdlp_pool.get_ytdlp_pool_stats()
+        assert stats["failed"] == before["failed"] + 1
+        assert stats["workers"] == ytdlp_pool.YTDLP_LIBRARY_WORKERS